@@ -2,17 +2,43 @@
 Admin endpoints for deployment operations.
 Protected by ADMIN_API_KEY — used by GitHub Actions to push DB files to Railway.
 """
+import asyncio
+import logging
 import os
 import shutil
+import sqlite3
+import time
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Header, HTTPException
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException, Request
 
 from app.db.schema import DB_DIR, UNIFIED_DB_PATH, REALPAGE_DB_PATH
+from app.db.chunked_upload import CHUNK_SIZE, ENCODINGS, UploadError, upload_sessions
+from app.db.db_delta import DeltaError, apply_delta, cached_manifest
+from app.db.pool import unified_pool
+from app.db.state_store import state_store
+from app.db.executor import db_executor, run_blocking
+from app.db.iso_dates import migrate_db_file
+from app.services.cache_files import cache_files
+from app.services.response_cache import response_cache
+from app.services.warmup import warmup
+from app.services.context_engine import context_engine
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 ADMIN_API_KEY = os.environ.get("ADMIN_API_KEY", "")
 
+DB_PATHS = {
+    "unified": UNIFIED_DB_PATH,
+    "realpage": REALPAGE_DB_PATH,
+    "yardi": DB_DIR / "yardi_raw.db",
+}
+
+# One DB swap at a time: a delta's base check and its swap must not interleave with another upload
+_swap_lock = asyncio.Lock()
+
 
 def _check_admin_key(x_admin_key: str = Header(None)):
     if not ADMIN_API_KEY:
@@ -21,45 +47,219 @@ def _check_admin_key(x_admin_key: str = Header(None)):
         raise HTTPException(403, "Invalid admin key")
 
 
-@router.post("/admin/upload-db")
-async def upload_db(
-    db_type: str,
-    file: UploadFile = File(...),
-    x_admin_key: str = Header(None),
-):
+def _integrity_check(db_path: Path) -> str:
+    """PRAGMA integrity_check of a DB file: "ok", or the first problems found."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute("PRAGMA integrity_check(5)").fetchall()
+    except sqlite3.DatabaseError as e:
+        return str(e)
+    finally:
+        conn.close()
+    return "; ".join(r[0] for r in rows)
+
+
+async def _install_db(db_type: str, tmp: Path, target: Path) -> dict:
     """
-    Upload a SQLite DB file to replace the current one.
-    db_type: 'unified' | 'realpage' | 'yardi'
+    Verify a fully written temp file and swap it in for ``target``.
+    Returns the integrity check and swap times in seconds (plus, for unified,
+    the new pool generation, which is then warmed in the background).
     """
-    _check_admin_key(x_admin_key)
+    start = time.perf_counter()
+    result = await run_blocking(_integrity_check, tmp)
+    check_seconds = time.perf_counter() - start
+    if result != "ok":
+        tmp.unlink()
+        raise HTTPException(422, f"integrity_check failed for {db_type}: {result}")
+    start = time.perf_counter()
+    if db_type != "unified":
+        # Atomic replace
+        tmp.replace(target)
+        return {"check_seconds": round(check_seconds, 3), "swap_seconds": round(time.perf_counter() - start, 3)}
 
-    db_map = {
-        "unified": UNIFIED_DB_PATH,
-        "realpage": REALPAGE_DB_PATH,
-        "yardi": DB_DIR / "yardi_raw.db",
+    # Read paths filter on the ISO date columns — migrate older pushes
+    await run_blocking(migrate_db_file, tmp)
+    # New checkouts open the new file; in-flight requests finish on the old
+    # inode, which is released once they return their connections. Bumping
+    # the generation also retires every cached response.
+    generation = unified_pool.swap(tmp)
+    response_cache.purge_stale()
+    swap_seconds = time.perf_counter() - start
+    warmup.start(generation)
+    return {
+        "check_seconds": round(check_seconds, 3), "swap_seconds": round(swap_seconds, 3),
+        "generation": generation,
     }
 
-    if db_type not in db_map:
-        raise HTTPException(400, f"Invalid db_type: {db_type}. Use: {list(db_map.keys())}")
 
-    target = db_map[db_type]
+def _db_target(db_type: str) -> Path:
+    if db_type not in DB_PATHS:
+        raise HTTPException(400, f"Invalid db_type: {db_type}. Use: {list(DB_PATHS.keys())}")
+    target = DB_PATHS[db_type]
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return target
+
+
+def _file_target(filename: str) -> Path:
+    # Only allow safe filenames
+    safe_chars = set("abcdefghijklmnopqrstuvwxyz0123456789_-.")
+    if not filename or filename.startswith(".") or not all(c in safe_chars for c in filename.lower()):
+        raise HTTPException(400, f"Invalid filename: {filename}")
+    target = DB_DIR / filename
     target.parent.mkdir(parents=True, exist_ok=True)
+    return target
 
+
+async def _replace_db(db_type: str, write_tmp) -> dict:
+    """Full DB upload: ``write_tmp(tmp_path)`` produces the new file, which is verified and swapped in."""
+    target = _db_target(db_type)
     # Write to temp file first, then atomic rename
     tmp = target.with_suffix(".db.tmp")
     try:
-        with open(tmp, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        # Atomic replace
+        async with _swap_lock:
+            await run_blocking(write_tmp, tmp)
+            timings = await _install_db(db_type, tmp, target)
+    except HTTPException:
+        raise
+    except Exception as e:
+        if tmp.exists():
+            tmp.unlink()
+        raise HTTPException(500, f"Upload failed: {e}")
+    size_mb = target.stat().st_size / (1024 * 1024)
+    logger.info(f"[ADMIN] Full upload of {db_type}: {size_mb:.1f} MB, "
+                f"check {timings['check_seconds']:.2f}s, swap {timings['swap_seconds']:.2f}s")
+    return {
+        "status": "ok", "db_type": db_type, "mode": "full", "size_mb": round(size_mb, 2),
+        **timings, "path": str(target),
+    }
+
+
+async def _apply_db_delta(db_type: str, base_sha256: str, target_sha256: str, page_count: int, delta) -> dict:
+    """
+    Apply the changed pages of a DB (built against /admin/db-manifest) to a copy
+    of the served file and swap it in. 409 if the served file is no longer the
+    delta's base, 422 if the patched copy does not hash to ``target_sha256``;
+    the client then falls back to a full upload.
+    """
+    target = _db_target(db_type)
+    if not target.exists():
+        raise HTTPException(409, f"{db_type} DB not found: upload the full file")
+
+    tmp = target.with_suffix(".db.tmp")
+    async with _swap_lock:
+        start = time.perf_counter()
+        served = await run_blocking(cached_manifest, target)
+        if served["sha256"] != base_sha256:
+            raise HTTPException(409, f"Served {db_type} DB is {served['sha256'][:12]}, delta base is {base_sha256[:12]}")
+        try:
+            try:
+                pages = await run_blocking(
+                    apply_delta, target, delta, tmp, served["page_size"], page_count, target_sha256,
+                )
+            except DeltaError as e:
+                raise HTTPException(422, f"Delta rejected: {e}")
+            except Exception as e:
+                raise HTTPException(500, f"Upload failed: {e}")
+            apply_seconds = time.perf_counter() - start
+            try:
+                timings = await _install_db(db_type, tmp, target)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(500, f"Upload failed: {e}")
+        finally:
+            # Swapping in renames tmp away; anything left is a failed full-size copy
+            tmp.unlink(missing_ok=True)
+
+    delta_kb = pages * (served["page_size"] + 4) / 1024
+    size_mb = target.stat().st_size / (1024 * 1024)
+    logger.info(
+        f"[ADMIN] Delta upload of {db_type}: {pages} pages ({delta_kb:.0f} KB) -> {size_mb:.1f} MB, "
+        f"apply {apply_seconds:.2f}s, check {timings['check_seconds']:.2f}s, swap {timings['swap_seconds']:.2f}s"
+    )
+    return {
+        "status": "ok", "db_type": db_type, "mode": "delta", "pages_applied": pages,
+        "delta_kb": round(delta_kb, 1), "size_mb": round(size_mb, 2),
+        "apply_seconds": round(apply_seconds, 3), **timings, "path": str(target),
+    }
+
+
+async def _replace_file(filename: str, write_tmp) -> dict:
+    """Data file upload: ``write_tmp(tmp_path)`` produces the new file, which is swapped in and reloaded."""
+    target = _file_target(filename)
+    # Write to temp file first, then atomic rename: readers of the cache file
+    # see the old version or the new one, never a partial write
+    tmp = target.with_name(f".{filename}.tmp")
+    try:
+        await run_blocking(write_tmp, tmp)
         tmp.replace(target)
-        size_mb = target.stat().st_size / (1024 * 1024)
-        return {"status": "ok", "db_type": db_type, "size_mb": round(size_mb, 2), "path": str(target)}
+        # Services holding the parsed file would notice the new inode on their
+        # next read anyway; reload / import now so the first request doesn't pay for it
+        reloaded = await run_blocking(cache_files.reload, target)
+        reloaded = await run_blocking(state_store.sync_file, target) or reloaded
+        if reloaded:
+            response_cache.clear()
+        size_kb = target.stat().st_size / 1024
+        return {
+            "status": "ok", "filename": filename, "size_kb": round(size_kb, 1),
+            "path": str(target), "reloaded": reloaded,
+        }
     except Exception as e:
         if tmp.exists():
             tmp.unlink()
         raise HTTPException(500, f"Upload failed: {e}")
 
 
+def _copy_upload(file: UploadFile):
+    def write(tmp: Path):
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(file.file, f)
+    return write
+
+
+@router.post("/admin/upload-db")
+async def upload_db(
+    db_type: str,
+    file: UploadFile = File(...),
+    x_admin_key: str = Header(None),
+):
+    """
+    Upload a SQLite DB file to replace the current one (single request; see
+    /admin/uploads for the chunked, resumable protocol).
+    db_type: 'unified' | 'realpage' | 'yardi'
+    """
+    _check_admin_key(x_admin_key)
+    return await _replace_db(db_type, _copy_upload(file))
+
+
+@router.get("/admin/db-manifest")
+async def db_manifest(db_type: str, x_admin_key: str = Header(None)):
+    """
+    Content generation (whole-file SHA-256) and per-page hashes of a served DB,
+    for push_to_deployed.py to build a delta against (see app/db/db_delta.py).
+    """
+    _check_admin_key(x_admin_key)
+    target = _db_target(db_type)
+    if not target.exists():
+        raise HTTPException(404, f"{db_type} DB not found")
+    manifest = await run_blocking(cached_manifest, target)
+    return {"db_type": db_type, **manifest}
+
+
+@router.post("/admin/upload-db-delta")
+async def upload_db_delta(
+    db_type: str,
+    base_sha256: str,
+    target_sha256: str,
+    page_count: int,
+    file: UploadFile = File(...),
+    x_admin_key: str = Header(None),
+):
+    """Apply a page delta in a single request (see _apply_db_delta)."""
+    _check_admin_key(x_admin_key)
+    return await _apply_db_delta(db_type, base_sha256, target_sha256, page_count, file.file)
+
+
 @router.post("/admin/upload-file")
 async def upload_file(
     filename: str,
@@ -71,22 +271,103 @@ async def upload_file(
     Used for JSON cache files (reviews, etc.).
     """
     _check_admin_key(x_admin_key)
+    return await _replace_file(filename, _copy_upload(file))
 
-    # Only allow safe filenames
-    safe_chars = set("abcdefghijklmnopqrstuvwxyz0123456789_-.")
-    if not all(c in safe_chars for c in filename.lower()):
-        raise HTTPException(400, f"Invalid filename: {filename}")
 
-    target = DB_DIR / filename
-    target.parent.mkdir(parents=True, exist_ok=True)
+# ---- Chunked, resumable uploads (app/db/chunked_upload.py) ----
+
+UPLOAD_KINDS = ("db", "db-delta", "file")
+
+
+def _upload_error(e: UploadError) -> HTTPException:
+    return HTTPException(e.status, str(e))
+
 
+@router.post("/admin/uploads")
+async def open_upload(
+    kind: str,
+    name: str,
+    size: int,
+    sha256: str,
+    chunk_size: int = CHUNK_SIZE,
+    base_sha256: Optional[str] = None,
+    target_sha256: Optional[str] = None,
+    page_count: Optional[int] = None,
+    x_admin_key: str = Header(None),
+):
+    """
+    Open (or resume) a chunked upload. kind: 'db' | 'db-delta' (name = db_type)
+    or 'file' (name = filename). Returns the offsets already received.
+    """
+    _check_admin_key(x_admin_key)
+    if kind not in UPLOAD_KINDS:
+        raise HTTPException(400, f"Invalid kind: {kind}. Use: {list(UPLOAD_KINDS)}")
+    if kind == "file":
+        _file_target(name)
+    else:
+        _db_target(name)
+    params = {}
+    if kind == "db-delta":
+        if not (base_sha256 and target_sha256 and page_count):
+            raise HTTPException(400, "db-delta uploads need base_sha256, target_sha256 and page_count")
+        params = {"base_sha256": base_sha256, "target_sha256": target_sha256, "page_count": page_count}
     try:
-        with open(target, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        size_kb = target.stat().st_size / 1024
-        return {"status": "ok", "filename": filename, "size_kb": round(size_kb, 1), "path": str(target)}
-    except Exception as e:
-        raise HTTPException(500, f"Upload failed: {e}")
+        session = await run_blocking(upload_sessions.open, kind, name, size, sha256.lower(), chunk_size, params)
+    except UploadError as e:
+        raise _upload_error(e)
+    return {
+        "upload_id": session.id,
+        "chunk_size": session.chunk_size,
+        "received": sorted(session.received),
+        "encodings": list(ENCODINGS),
+    }
+
+
+@router.put("/admin/uploads/{upload_id}/chunks")
+async def upload_chunk(
+    upload_id: str,
+    offset: int,
+    sha256: str,
+    request: Request,
+    encoding: str = "identity",
+    x_admin_key: str = Header(None),
+):
+    """One chunk (raw request body, compressed per ``encoding``); ``sha256`` is of the uncompressed chunk."""
+    _check_admin_key(x_admin_key)
+    payload = await request.body()
+    try:
+        missing = await run_blocking(upload_sessions.write_chunk, upload_id, offset, payload, encoding, sha256.lower())
+    except UploadError as e:
+        raise _upload_error(e)
+    return {"status": "ok", "offset": offset, "missing": missing}
+
+
+@router.post("/admin/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str, x_admin_key: str = Header(None)):
+    """Check the whole-file SHA-256, then verify and swap the upload in like the single-request endpoints."""
+    _check_admin_key(x_admin_key)
+    try:
+        session = await run_blocking(upload_sessions.finish, upload_id)
+    except UploadError as e:
+        raise _upload_error(e)
+
+    kind, name, part = session.meta["kind"], session.meta["name"], session.part_path
+    try:
+        if kind == "db":
+            result = await _replace_db(name, lambda tmp: os.replace(part, tmp))
+        elif kind == "file":
+            result = await _replace_file(name, lambda tmp: os.replace(part, tmp))
+        else:
+            params = session.meta["params"]
+            with open(part, "rb") as delta:
+                result = await _apply_db_delta(
+                    name, params["base_sha256"], params["target_sha256"], params["page_count"], delta,
+                )
+    finally:
+        upload_sessions.discard(upload_id)
+    result["upload_id"] = upload_id
+    result["uploaded_mb"] = round(session.size / (1024 * 1024), 2)
+    return result
 
 
 @router.get("/admin/db-status")
@@ -94,14 +375,8 @@ async def db_status(x_admin_key: str = Header(None)):
     """Check which DB files exist and their sizes."""
     _check_admin_key(x_admin_key)
 
-    dbs = {
-        "unified": UNIFIED_DB_PATH,
-        "realpage": REALPAGE_DB_PATH,
-        "yardi": DB_DIR / "yardi_raw.db",
-    }
-
     result = {"db_dir": str(DB_DIR)}
-    for name, path in dbs.items():
+    for name, path in DB_PATHS.items():
         if path.exists():
             stat = path.stat()
             result[name] = {
@@ -112,4 +387,37 @@ async def db_status(x_admin_key: str = Header(None)):
         else:
             result[name] = {"exists": False}
 
+    result["unified_pool"] = unified_pool.stats()
+    result["warmup"] = warmup.stats()
     return result
+
+
+@router.get("/admin/cache-stats")
+async def cache_stats(x_admin_key: str = Header(None)):
+    """Response cache hit rates per endpoint, plus DB pool, executor, cache file, state store, upload and warmup counters."""
+    _check_admin_key(x_admin_key)
+    return {
+        "response_cache": response_cache.stats(),
+        "unified_pool": unified_pool.stats(),
+        "db_executor": db_executor.stats(),
+        "cache_files": cache_files.stats(),
+        "state_store": state_store.stats(),
+        "uploads": upload_sessions.stats(),
+        "warmup": warmup.stats(),
+    }
+
+
+@router.post("/admin/cache-clear")
+async def cache_clear(x_admin_key: str = Header(None)):
+    """Drop every cached response (e.g. after editing unified.db in place)."""
+    _check_admin_key(x_admin_key)
+    entries = response_cache.stats()["entries"]
+    response_cache.clear()
+    return {"status": "ok", "cleared": entries}
+
+
+@router.get("/admin/context-stats")
+async def context_stats(x_admin_key: str = Header(None)):
+    """AI context collector timings, errors/timeouts and the slowest collectors."""
+    _check_admin_key(x_admin_key)
+    return context_engine.stats()
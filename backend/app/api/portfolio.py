@@ -3,9 +3,18 @@ Portfolio API Endpoints - Multi-property aggregated views.
 READ-ONLY OPERATIONS ONLY.
 """
 from fastapi import APIRouter, Query, HTTPException, Depends, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
-from app.db.schema import UNIFIED_DB_PATH
-from app.services.portfolio_service import PortfolioService
+import json
+from app.db.pool import get_unified_connection
+from app.db.executor import offload, run_blocking
+from app.db.property_kpis import load_property_kpis
+from app.services.portfolio_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    PortfolioService,
+    decode_cursor,
+)
 from app.services.chat_service import chat_service
 from app.services.occupancy_service import OccupancyService
 from app.services.pricing_service import PricingService
@@ -67,7 +76,6 @@ def parse_property_configs(
     Returns:
         List of PMSConfig objects from the registry or created from unified.db
     """
-    import sqlite3
     from pathlib import Path
     
     ids = [p.strip() for p in property_ids.split(",") if p.strip()]
@@ -77,6 +85,23 @@ def parse_property_configs(
     if pms_types:
         type_filter = [t.strip().lower() for t in pms_types.split(",")]
     
+    # Properties not in the registry are looked up in unified.db in one query
+    unregistered = list(dict.fromkeys(p for p in ids if p not in ALL_PROPERTIES))
+    unified_sources = {}
+    if unregistered:
+        try:
+            conn = get_unified_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT unified_property_id, pms_source FROM unified_properties "
+                f"WHERE unified_property_id IN ({','.join('?' * len(unregistered))})",
+                unregistered
+            )
+            unified_sources = dict(cursor.fetchall())
+            conn.close()
+        except Exception:
+            unified_sources = {}
+    
     configs = []
     for prop_id in ids:
         # Look up from registry first
@@ -86,37 +111,18 @@ def parse_property_configs(
             if type_filter and prop.pms_config.pms_type.value not in type_filter:
                 continue
             configs.append(prop.pms_config)
-        else:
-            # Try to find in unified.db
-            db_path = UNIFIED_DB_PATH
-            try:
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT pms_property_id, pms_source FROM unified_properties WHERE unified_property_id = ?",
-                    (prop_id,)
-                )
-                row = cursor.fetchone()
-                conn.close()
-                
-                if row:
-                    pms_property_id, pms_source = row
-                    # Create a PMSConfig for unified.db properties
-                    pms_type = PMSSource.REALPAGE if pms_source == 'realpage' else PMSSource.YARDI
-                    if type_filter and pms_type.value not in type_filter:
-                        continue
-                    # Create config with unified_id as the property_id
-                    config = PMSConfig(
-                        pms_type=pms_type,
-                        property_id=prop_id,
-                        unified_property_id=prop_id,
-                    )
-                    configs.append(config)
-                else:
-                    # Not in registry or unified.db - skip silently
-                    continue
-            except Exception:
+        elif prop_id in unified_sources:
+            # Create a PMSConfig for unified.db properties
+            pms_type = PMSSource.REALPAGE if unified_sources[prop_id] == 'realpage' else PMSSource.YARDI
+            if type_filter and pms_type.value not in type_filter:
                 continue
+            # Create config with unified_id as the property_id
+            configs.append(PMSConfig(
+                pms_type=pms_type,
+                property_id=prop_id,
+                unified_property_id=prop_id,
+            ))
+        # Not in registry or unified.db - skip silently
     
     if not configs:
         raise HTTPException(
@@ -216,34 +222,86 @@ def get_portfolio_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _drill_through_response(
+    kind: str,
+    property_ids: str,
+    pms_types: Optional[str],
+    status: Optional[str],
+    floorplan: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    format: str,
+):
+    """
+    Shared body of /units and /residents.
+    
+    - ``format=ndjson``: stream every matching row (one JSON object per line)
+      straight from the SQLite cursor, starting after ``cursor`` if given.
+    - ``limit`` or ``cursor``: one keyset page; the next page's cursor is in
+      the ``X-Next-Cursor`` header (absent on the last page).
+    - otherwise: the whole list, as before.
+    """
+    if cursor:
+        try:
+            decode_cursor(kind, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        configs = parse_property_configs(property_ids, pms_types)
+        service = get_portfolio_service()
+        
+        if format == "ndjson":
+            rows = service.iter_drill_through(kind, configs, status, floorplan, cursor)
+            return StreamingResponse(
+                (json.dumps(row) + "\n" for row in rows),
+                media_type="application/x-ndjson",
+            )
+        
+        if limit is not None or cursor:
+            page, next_cursor = service.get_drill_through_page(
+                kind, configs, status, floorplan, cursor, limit or DEFAULT_PAGE_SIZE
+            )
+            headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+            return JSONResponse(page, headers=headers)
+        
+        if kind == "units":
+            rows = service.get_all_units(configs, status, floorplan)
+        else:
+            rows = service.get_all_residents(configs, status, floorplan)
+        # Rows are already in response-model shape; skip re-validating thousands of them
+        return JSONResponse(rows)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/units", response_model=List[UnifiedUnit])
 def get_portfolio_units(
     property_ids: str = Query(..., description="Comma-separated list of property IDs"),
     pms_types: Optional[str] = Query(None, description="Comma-separated list of PMS types (yardi/realpage)"),
     status: Optional[str] = Query(None, description="Filter by unit status (occupied/vacant/notice)"),
+    floorplan: Optional[str] = Query(None, description="Filter by floorplan code"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (enables cursor pagination)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json, or ndjson to stream every row"),
 ):
     """
     Get combined unit list from all properties (drill-through view).
     
     Each unit includes the `property_id` and `pms_source` for identification.
+    Rows are ordered by their unified.db id, so cursor pages are stable.
     
     **Example:**
     ```
     GET /api/portfolio/units?property_ids=prop1,prop2&status=vacant
+    GET /api/portfolio/units?property_ids=prop1,prop2&limit=500&cursor=<X-Next-Cursor>
+    GET /api/portfolio/units?property_ids=prop1,prop2&format=ndjson
     ```
     """
-    try:
-        configs = parse_property_configs(property_ids, pms_types)
-        service = get_portfolio_service()
-        units = service.get_all_units(configs)
-        
-        # Filter by status if provided
-        if status:
-            units = [u for u in units if u.status == status.lower()]
-        
-        return units
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _drill_through_response(
+        "units", property_ids, pms_types, status, floorplan, limit, cursor, format
+    )
 
 
 @router.get("/residents", response_model=List[UnifiedResident])
@@ -251,28 +309,32 @@ def get_portfolio_residents(
     property_ids: str = Query(..., description="Comma-separated list of property IDs"),
     pms_types: Optional[str] = Query(None, description="Comma-separated list of PMS types (yardi/realpage)"),
     status: Optional[str] = Query(None, description="Filter by resident status (current/future/past/notice)"),
+    floorplan: Optional[str] = Query(None, description="Filter by the floorplan of the resident's unit"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (enables cursor pagination)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json, or ndjson to stream every row"),
 ):
     """
     Get combined resident list from all properties (drill-through view).
     
     Each resident includes the `property_id` and `pms_source` for identification.
+    Status matches case-insensitively; Current residents with a notice date
+    are reported (and filtered) as Notice.
     
     **Example:**
     ```
     GET /api/portfolio/residents?property_ids=prop1,prop2&status=current
+    GET /api/portfolio/residents?property_ids=prop1,prop2&format=ndjson
     ```
     """
-    try:
-        configs = parse_property_configs(property_ids, pms_types)
-        service = get_portfolio_service()
-        residents = service.get_all_residents(configs, status)
-        return residents
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _drill_through_response(
+        "residents", property_ids, pms_types, status, floorplan, limit, cursor, format
+    )
 
 
 @router.get("/properties")
-async def list_portfolio_properties(
+@offload
+def list_portfolio_properties(
     owner_group: Optional[str] = Query(None, description="Filter by owner group (e.g. 'PHH')"),
     authorization: Optional[str] = Header(None),
 ):
@@ -289,14 +351,12 @@ async def list_portfolio_properties(
         payload = verify_token(token)
         if payload and payload.get("group"):
             owner_group = payload["group"]
-    import sqlite3
     from pathlib import Path
     
     # Load owner_group from unified.db for all properties
-    db_path = UNIFIED_DB_PATH
     owner_groups = {}
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT unified_property_id, owner_group FROM unified_properties")
         for row in cursor.fetchall():
@@ -327,7 +387,7 @@ async def list_portfolio_properties(
     
     # 2. Add properties from unified.db that aren't in config
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT unified_property_id, name, pms_source, owner_group FROM unified_properties")
         for row in cursor.fetchall():
@@ -355,14 +415,13 @@ async def list_portfolio_properties(
 
 
 @router.get("/owner-groups")
-async def list_owner_groups():
+@offload
+def list_owner_groups():
     """Return distinct owner groups for filter dropdown."""
-    import sqlite3
     from pathlib import Path
     
-    db_path = UNIFIED_DB_PATH
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT DISTINCT owner_group FROM unified_properties WHERE owner_group IS NOT NULL ORDER BY owner_group")
         groups = [row[0] for row in cursor.fetchall()]
@@ -373,7 +432,8 @@ async def list_owner_groups():
 
 
 @router.get("/watchlist")
-async def get_watchlist(
+@offload
+def get_watchlist(
     owner_group: Optional[str] = Query(None, description="Filter by owner group"),
     occ_threshold: float = Query(90.0, description="Occupancy % below which property is flagged"),
     delinq_threshold: float = Query(25000.0, description="Total delinquent $ above which property is flagged"),
@@ -400,69 +460,21 @@ async def get_watchlist(
     Returns properties sorted by number of flags (most flagged first).
     """
     import sqlite3
-    from pathlib import Path
-    
-    db_path = UNIFIED_DB_PATH
     
     # Get all properties
     properties = []
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT p.unified_property_id, p.name, p.owner_group, p.pms_source,
-                   o.total_units, o.occupied_units, o.vacant_units,
-                   o.physical_occupancy, o.preleased_vacant, o.notice_units
-            FROM unified_properties p
-            LEFT JOIN unified_occupancy_metrics o
-                ON o.unified_property_id = p.unified_property_id
-                AND o.snapshot_date = (
-                    SELECT MAX(snapshot_date) FROM unified_occupancy_metrics 
-                    WHERE unified_property_id = p.unified_property_id
-                )
-            ORDER BY p.name
-        """)
-        
+        cursor.execute("SELECT unified_property_id, name, owner_group FROM unified_properties ORDER BY name")
+        visible = []
         for row in cursor.fetchall():
             og = row["owner_group"] or "other"
             if owner_group and og.lower() not in _visible_groups(owner_group):
                 continue
-            
-            prop_id = row["unified_property_id"]
-            occ_pct = row["physical_occupancy"] or 0
-            total_units = row["total_units"] or 0
-            
-            properties.append({
-                "id": prop_id,
-                "name": row["name"] or prop_id,
-                "owner_group": og,
-                "total_units": total_units,
-                "occupancy_pct": occ_pct,
-                "vacant": row["vacant_units"] or 0,
-                "on_notice": row["notice_units"] or 0,
-                "preleased": row["preleased_vacant"] or 0,
-            })
-        
-        # Get delinquency totals per property
-        try:
-            cursor.execute("""
-                SELECT unified_property_id,
-                       SUM(CASE WHEN total_delinquent > 0 THEN total_delinquent ELSE 0 END) as total_delinq,
-                       COUNT(CASE WHEN total_delinquent > 0 THEN 1 END) as delinq_units
-                FROM unified_delinquency
-                WHERE status IS NULL OR LOWER(status) NOT LIKE '%former%'
-                GROUP BY unified_property_id
-            """)
-            delinq_map = {}
-            for row in cursor.fetchall():
-                delinq_map[row["unified_property_id"]] = {
-                    "total": row["total_delinq"] or 0,
-                    "units": row["delinq_units"] or 0,
-                }
-        except Exception:
-            delinq_map = {}
+            visible.append((row["unified_property_id"], row["name"], og))
         
         # Get risk scores per property
         try:
@@ -481,72 +493,31 @@ async def get_watchlist(
             risk_map = {}
         
         conn.close()
+        
+        # Occupancy, delinquency (current residents), 90-day renewal rate and
+        # Google rating: materialized per property at sync time
+        kpis = load_property_kpis([pid for pid, _, _ in visible]) if visible else {}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build watchlist: {str(e)}")
     
-    # Get renewal rates from unified tables
-    renewal_map = {}
-    try:
-        # Prefer unified_lease_expirations (report 4156), fall back to unified_leases
-        date_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
-        
-        # Check which properties have report 4156 data
-        props_with_4156 = set()
-        try:
-            cursor.execute("SELECT DISTINCT unified_property_id FROM unified_lease_expirations")
-            props_with_4156 = {row[0] for row in cursor.fetchall()}
-        except Exception:
-            pass
-        
-        rconn = sqlite3.connect(str(db_path))
-        rc = rconn.cursor()
-        
-        for prop in properties:
-            pid = prop["id"]
-            try:
-                if pid in props_with_4156:
-                    le_expr = "date(substr(lease_end_date,7,4)||'-'||substr(lease_end_date,1,2)||'-'||substr(lease_end_date,4,2))"
-                    rc.execute(f"""
-                        SELECT COUNT(*) as total,
-                               SUM(CASE WHEN decision = 'Renewed' THEN 1 ELSE 0 END) as renewed
-                        FROM unified_lease_expirations
-                        WHERE unified_property_id = ?
-                          AND lease_end_date IS NOT NULL AND lease_end_date != ''
-                          AND {le_expr} BETWEEN date('now') AND date('now', '+90 days')
-                    """, (pid,))
-                else:
-                    rc.execute(f"""
-                        SELECT COUNT(*) as total,
-                               SUM(CASE WHEN status = 'Current - Future' THEN 1 ELSE 0 END) as renewed
-                        FROM unified_leases
-                        WHERE unified_property_id = ?
-                          AND status IN ('Current', 'Current - Future')
-                          AND lease_end IS NOT NULL AND lease_end != ''
-                          AND {date_expr} BETWEEN date('now') AND date('now', '+90 days')
-                    """, (pid,))
-                
-                row = rc.fetchone()
-                if row and row[0] > 0:
-                    renewal_map[pid] = round(row[1] / row[0] * 100, 1)
-            except Exception:
-                continue
-        rconn.close()
-    except Exception:
-        pass
-    
-    # Get Google ratings from reviews cache
-    review_map = {}
-    try:
-        import json
-        cache_path = Path(__file__).parent.parent / "db" / "data" / "google_reviews_cache.json"
-        if cache_path.exists():
-            cache = json.loads(cache_path.read_text())
-            for pid, entry in cache.items():
-                data = entry.get("data", {})
-                if data.get("rating"):
-                    review_map[pid] = data["rating"]
-    except Exception:
-        pass
+    for prop_id, name, og in visible:
+        k = kpis.get(prop_id, {})
+        properties.append({
+            "id": prop_id,
+            "name": name or prop_id,
+            "owner_group": og,
+            "total_units": k.get("total_units") or 0,
+            "occupancy_pct": k.get("occupancy_pct") or 0,
+            "vacant": k.get("vacant_units") or 0,
+            "on_notice": k.get("notice_units") or 0,
+            "preleased": k.get("preleased_vacant") or 0,
+        })
+    delinq_map = {
+        pid: {"total": k.get("delinquent_total") or 0, "units": k.get("delinquent_units") or 0}
+        for pid, k in kpis.items()
+    }
+    renewal_map = {pid: k["renewal_rate"] for pid, k in kpis.items() if k.get("renewal_rate") is not None}
+    review_map = {pid: k["google_rating"] for pid, k in kpis.items() if k.get("google_rating")}
     
     # Score each property
     watchlist = []
@@ -642,7 +613,8 @@ async def portfolio_health_check():
 
 
 @router.get("/risk-scores")
-async def get_portfolio_risk_scores(
+@offload
+def get_portfolio_risk_scores(
     property_ids: Optional[str] = Query(None, description="Comma-separated list of property IDs. If omitted, returns all."),
 ):
     """
@@ -653,10 +625,8 @@ async def get_portfolio_risk_scores(
     import sqlite3
     from pathlib import Path
     
-    db_path = UNIFIED_DB_PATH
-    
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -786,7 +756,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
     if owner_group:
         visible = _visible_groups(owner_group)
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT unified_property_id, owner_group FROM unified_properties")
             for row in cursor.fetchall():
@@ -871,7 +841,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
                 
                 # Delinquency (direct DB query for summary)
                 try:
-                    conn_d = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_d = get_unified_connection()
                     cur_d = conn_d.cursor()
                     cur_d.execute("""
                         SELECT COALESCE(SUM(CASE WHEN status NOT LIKE '%former%' THEN total_delinquent ELSE 0 END), 0),
@@ -896,7 +866,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
                 
                 # Loss-to-lease (direct DB query)
                 try:
-                    conn_l = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_l = get_unified_connection()
                     cur_l = conn_l.cursor()
                     cur_l.execute("""
                         SELECT 
@@ -949,7 +919,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
                 
                 # Move-out reasons summary
                 try:
-                    conn_m = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_m = get_unified_connection()
                     cur_m = conn_m.cursor()
                     cur_m.execute("""
                         SELECT category, SUM(category_count) as total
@@ -966,7 +936,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
                 
                 # Vacancy aging summary
                 try:
-                    conn_va = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_va = get_unified_connection()
                     cur_va = conn_va.cursor()
                     cur_va.execute("""
                         SELECT
@@ -1016,7 +986,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
 
                 # Unit mix by bedroom type (AI-5: unit type vacancy/demand)
                 try:
-                    conn_bd = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_bd = get_unified_connection()
                     cur_bd = conn_bd.cursor()
                     cur_bd.execute("""
                         SELECT
@@ -1051,7 +1021,7 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
 
                 # Lead sources (AI source-level marketing context)
                 try:
-                    conn_ls = sqlite3.connect(UNIFIED_DB_PATH)
+                    conn_ls = get_unified_connection()
                     conn_ls.row_factory = sqlite3.Row
                     cur_ls = conn_ls.cursor()
                     lead_sources = {}
@@ -1230,105 +1200,55 @@ async def portfolio_chat(request: dict, authorization: Optional[str] = Header(No
 # Portfolio Watchpoints — aggregated metrics across all properties
 # =========================================================================
 
-async def _gather_portfolio_metrics(owner_group: str) -> dict:
-    """Aggregate metrics across all properties in the owner group."""
-    import sqlite3
-    from pathlib import Path
-    db_path = UNIFIED_DB_PATH
+@offload
+def _gather_portfolio_metrics(owner_group: str) -> dict:
+    """Aggregate metrics across all properties in the owner group (from materialized KPIs)."""
     metrics: dict = {}
     groups = _visible_groups(owner_group)
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         c = conn.cursor()
-
         # Get property IDs in group
         c.execute("SELECT unified_property_id, owner_group FROM unified_properties")
         group_props = [r[0] for r in c.fetchall() if (r[1] or "other").lower() in groups]
-
+        conn.close()
         if not group_props:
-            conn.close()
             return metrics
+        kpis = list(load_property_kpis(group_props).values())
+    except Exception:
+        return metrics
 
-        ph = ",".join("?" * len(group_props))
-
-        # Occupancy: sum across properties (latest snapshot per property)
-        c.execute(f"""
-            SELECT SUM(o.total_units), SUM(o.occupied_units), SUM(o.vacant_units),
-                   SUM(o.notice_units), SUM(o.preleased_vacant)
-            FROM unified_occupancy_metrics o
-            INNER JOIN (
-                SELECT unified_property_id, MAX(snapshot_date) as md
-                FROM unified_occupancy_metrics
-                WHERE unified_property_id IN ({ph})
-                GROUP BY unified_property_id
-            ) latest ON o.unified_property_id = latest.unified_property_id AND o.snapshot_date = latest.md
-        """, group_props)
-        occ = c.fetchone()
-        if occ and occ[0]:
-            total_units = occ[0] or 0
-            occupied = occ[1] or 0
-            metrics["occupancy_pct"] = round(occupied / total_units * 100, 1) if total_units > 0 else 0
-            metrics["vacant_units"] = occ[2] or 0
-            metrics["on_notice_units"] = occ[3] or 0
+    def _sum(col):
+        return sum(k[col] or 0 for k in kpis)
 
-        # ATR from unified_units (same source as availability endpoint)
-        c.execute(f"""
-            SELECT
-                SUM(CASE WHEN occupancy_status IN ('vacant','vacant_ready','vacant_not_ready') THEN 1 ELSE 0 END),
-                SUM(CASE WHEN occupancy_status = 'notice' THEN 1 ELSE 0 END),
-                SUM(CASE WHEN is_preleased = 1 THEN 1 ELSE 0 END),
-                SUM(CASE WHEN status = 'down' THEN 1 ELSE 0 END)
-            FROM unified_units WHERE unified_property_id IN ({ph})
-        """, group_props)
-        urow = c.fetchone()
-        if urow:
-            vacant = urow[0] or 0
-            on_notice = urow[1] or 0
-            preleased = urow[2] or 0
-            down = urow[3] or 0
-            atr = max(0, vacant + on_notice - preleased - down)
-            metrics["atr"] = atr
-            if occ and occ[0]:
-                metrics["atr_pct"] = round(atr / occ[0] * 100, 1)
+    # Occupancy: sum across properties (latest snapshot per property)
+    total_units = _sum("total_units")
+    if total_units:
+        metrics["occupancy_pct"] = round(_sum("occupied_units") / total_units * 100, 1)
+        metrics["vacant_units"] = _sum("vacant_units")
+        metrics["on_notice_units"] = _sum("notice_units")
 
-        # Delinquency: current residents only
-        c.execute(f"""
-            SELECT SUM(CASE WHEN total_delinquent > 0 THEN total_delinquent ELSE 0 END),
-                   COUNT(CASE WHEN total_delinquent > 0 THEN 1 END)
-            FROM unified_delinquency
-            WHERE unified_property_id IN ({ph})
-              AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
-        """, group_props)
-        drow = c.fetchone()
-        if drow:
-            metrics["delinquent_total"] = drow[0] or 0
-            metrics["delinquent_units"] = drow[1] or 0
+    # ATR from unified_units (same source as availability endpoint)
+    if any(k["atr"] is not None for k in kpis):
+        metrics["atr"] = _sum("atr")
+        if total_units:
+            metrics["atr_pct"] = round(metrics["atr"] / total_units * 100, 1)
 
-        # Avg rent
-        c.execute(f"""
-            SELECT AVG(market_rent) FROM unified_units
-            WHERE unified_property_id IN ({ph}) AND market_rent > 0
-        """, group_props)
-        rrow = c.fetchone()
-        if rrow and rrow[0]:
-            metrics["avg_rent"] = round(rrow[0], 0)
+    # Delinquency: current residents only
+    if any(k["delinquent_total"] is not None for k in kpis):
+        metrics["delinquent_total"] = _sum("delinquent_total")
+        metrics["delinquent_units"] = _sum("delinquent_units")
 
-        conn.close()
-    except Exception:
-        pass
+    # Avg in-place rent, weighted by units
+    rent_units = _sum("rent_unit_count")
+    if rent_units:
+        metrics["avg_rent"] = round(sum((k["avg_rent"] or 0) * (k["rent_unit_count"] or 0) for k in kpis) / rent_units, 0)
 
     # Google reviews: average rating
-    try:
-        import json as _json
-        cache_path = Path(__file__).parent.parent / "db" / "data" / "google_reviews_cache.json"
-        if cache_path.exists():
-            cache = _json.loads(cache_path.read_text())
-            ratings = [e.get("data", {}).get("rating") for e in cache.values() if e.get("data", {}).get("rating")]
-            if ratings:
-                metrics["google_rating"] = round(sum(ratings) / len(ratings), 2)
-    except Exception:
-        pass
+    ratings = [k["google_rating"] for k in kpis if k.get("google_rating")]
+    if ratings:
+        metrics["google_rating"] = round(sum(ratings) / len(ratings), 2)
 
     return metrics
 
@@ -1348,15 +1268,10 @@ async def get_portfolio_watchpoints(
 
     group_key = f"portfolio_{owner_group or 'all'}"
 
-    from app.services.watchpoint_service import (
-        get_watchpoints as _get_wps,
-        evaluate_watchpoints,
-        AVAILABLE_METRICS,
-    )
+    from app.services.watchpoint_service import evaluate_watchpoints, AVAILABLE_METRICS
 
     current_metrics = await _gather_portfolio_metrics(owner_group or "all")
-    wps = _get_wps(group_key)
-    evaluated = evaluate_watchpoints(group_key, current_metrics)
+    evaluated = await run_blocking(evaluate_watchpoints, group_key, current_metrics)
 
     return {
         "owner_group": owner_group,
@@ -1367,7 +1282,8 @@ async def get_portfolio_watchpoints(
 
 
 @router.post("/watchpoints")
-async def create_portfolio_watchpoint(
+@offload
+def create_portfolio_watchpoint(
     body: dict,
     owner_group: Optional[str] = Query(None),
     authorization: Optional[str] = Header(None),
@@ -1396,7 +1312,8 @@ async def create_portfolio_watchpoint(
 
 
 @router.delete("/watchpoints/{watchpoint_id}")
-async def delete_portfolio_watchpoint(
+@offload
+def delete_portfolio_watchpoint(
     watchpoint_id: str,
     owner_group: Optional[str] = Query(None),
     authorization: Optional[str] = Header(None),
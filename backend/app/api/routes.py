@@ -2,15 +2,23 @@
 API Routes - Owner Dashboard V2
 READ-ONLY endpoints. All operations are GET-only.
 """
+import inspect
+import time
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from datetime import datetime, timedelta
 
-from app.db.schema import UNIFIED_DB_PATH
+from app.db.pool import get_unified_connection
+from app.db.executor import offload, run_blocking
+from app.db.property_kpis import load_property_kpis, watchpoint_metrics
 from app.services.occupancy_service import OccupancyService
 from app.services.pricing_service import PricingService
 from app.services.market_comps_service import MarketCompsService
 from app.services.chat_service import chat_service
+from app.services.context_engine import context_engine
+from app.services.response_cache import cached_response
+from app.services.property_snapshot import PropertySnapshot
 from app.models import (
     Timeframe,
     OccupancyMetrics,
@@ -49,6 +57,7 @@ def get_properties():
 
 
 @router.get("/properties/{property_id}/occupancy", response_model=OccupancyMetrics)
+@cached_response
 def get_occupancy(
     property_id: str,
     timeframe: Timeframe = Query(Timeframe.CM, description="Timeframe: cm, pm, or ytd")
@@ -69,6 +78,7 @@ def get_occupancy(
 
 
 @router.get("/properties/{property_id}/exposure", response_model=ExposureMetrics)
+@cached_response
 def get_exposure(
     property_id: str,
     timeframe: Timeframe = Query(Timeframe.CM, description="Timeframe: cm, pm, or ytd")
@@ -82,14 +92,12 @@ def get_exposure(
     - Move-ins/outs for period
     - Net absorption
     """
-    import sqlite3
     from pathlib import Path
     from datetime import date
     
     # Try database first for properties without full PMS config
-    db_path = UNIFIED_DB_PATH
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("""
             SELECT exposure_30_days, exposure_60_days, notice_units, vacant_units
@@ -132,6 +140,7 @@ def get_exposure(
 
 
 @router.get("/properties/{property_id}/leasing-funnel", response_model=LeasingFunnelMetrics)
+@cached_response
 def get_leasing_funnel(
     property_id: str,
     timeframe: Timeframe = Query(Timeframe.CM, description="Timeframe: cm, pm, or ytd"),
@@ -167,9 +176,8 @@ def get_leasing_funnel(
     # Fall back to unified_activity table (synced from Excel report data)
     try:
         from app.services.timeframe import get_date_range
-        import sqlite3
         
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         c = conn.cursor()
         
         period_start, period_end = get_date_range(timeframe)
@@ -343,6 +351,7 @@ def get_leasing_funnel(
 
 
 @router.get("/properties/{property_id}/pricing", response_model=UnitPricingMetrics)
+@cached_response
 def get_pricing(property_id: str):
     """
     GET: Unit pricing metrics.
@@ -359,6 +368,7 @@ def get_pricing(property_id: str):
 
 
 @router.get("/properties/{property_id}/tradeouts")
+@cached_response
 def get_tradeouts(property_id: str, days: Optional[int] = None):
     """
     GET: Lease trade-out data.
@@ -380,6 +390,7 @@ def get_tradeouts(property_id: str, days: Optional[int] = None):
 
 
 @router.get("/properties/{property_id}/renewals")
+@cached_response
 def get_renewal_leases(
     property_id: str,
     days: Optional[int] = None,
@@ -399,6 +410,7 @@ def get_renewal_leases(
 
 
 @router.get("/properties/{property_id}/turn-time")
+@cached_response
 def get_turn_time(property_id: str):
     """
     GET: Average unit turn time for a property.
@@ -406,28 +418,21 @@ def get_turn_time(property_id: str):
     Calculates days between former lease move_out_date and next lease move_in_date
     for the same unit using unified_leases data.
     """
-    import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         c = conn.cursor()
         
-        # Dates in unified_leases are MM/DD/YYYY format (from RealPage)
-        date_iso = "substr({col},7,4)||'-'||substr({col},1,2)||'-'||substr({col},4,2)"
-        mi_iso = date_iso.format(col="move_in_date")
-        mo_iso = date_iso.format(col="move_out_date")
-        
-        c.execute(f"""
+        c.execute("""
             WITH unit_leases AS (
                 SELECT unit_number, move_in_date, move_out_date, status,
-                       {mi_iso} as mi_iso,
-                       {mo_iso} as mo_iso,
-                       ROW_NUMBER() OVER (PARTITION BY unit_number ORDER BY 
-                           substr(move_in_date,7,4)||substr(move_in_date,1,2)||substr(move_in_date,4,2) DESC) as rn
+                       move_in_date_iso as mi_iso,
+                       move_out_date_iso as mo_iso,
+                       ROW_NUMBER() OVER (PARTITION BY unit_number ORDER BY move_in_date_iso DESC) as rn
                 FROM unified_leases
                 WHERE unified_property_id = ?
                   AND unit_number IS NOT NULL AND unit_number != ''
-                  AND move_in_date IS NOT NULL AND move_in_date != ''
+                  AND move_in_date_iso IS NOT NULL
                   AND status IN ('Current', 'Former', 'Current - Past')
             ),
             turns AS (
@@ -438,7 +443,7 @@ def get_turn_time(property_id: str):
                 FROM unit_leases cur
                 JOIN unit_leases prev ON cur.unit_number = prev.unit_number
                 WHERE cur.rn = 1 AND prev.rn = 2
-                  AND prev.mo_iso IS NOT NULL AND prev.mo_iso NOT LIKE '--%'
+                  AND prev.mo_iso IS NOT NULL
                   AND prev.status = 'Former'
                   AND CAST(julianday(cur.mi_iso) - julianday(prev.mo_iso) AS INTEGER) BETWEEN 0 AND 180
             )
@@ -476,6 +481,7 @@ def get_turn_time(property_id: str):
 
 
 @router.get("/properties/{property_id}/loss-to-lease")
+@cached_response
 def get_loss_to_lease(property_id: str):
     """
     GET: Loss-to-lease estimate for a property.
@@ -484,18 +490,15 @@ def get_loss_to_lease(property_id: str):
     Expressed as total dollars and as percentage of potential gross rent.
     Source: unified_pricing_metrics (asking vs in-place) + unified_occupancy_metrics.
     """
-    import sqlite3
     from pathlib import Path
     
-    uni_db = UNIFIED_DB_PATH
-    
     # Normalize property_id
     normalized_id = property_id
     if property_id.startswith("kairoi-"):
         normalized_id = property_id.replace("kairoi-", "").replace("-", "_")
     
     try:
-        conn = sqlite3.connect(str(uni_db))
+        conn = get_unified_connection()
         c = conn.cursor()
         
         # Get weighted avg asking and in-place rent from pricing metrics
@@ -557,6 +560,7 @@ def get_loss_to_lease(property_id: str):
 
 
 @router.get("/properties/{property_id}/projected-occupancy")
+@cached_response
 def get_projected_occupancy(property_id: str):
     """
     GET: Projected occupancy at 30, 60, and 90 days.
@@ -575,14 +579,13 @@ def get_projected_occupancy(property_id: str):
       - Unknown/MTM → projected as "will give notice" (projected_notices)
     - Fallback: unified_leases (no decision breakdown)
     """
-    import sqlite3
     
     normalized_id = property_id
     if property_id.startswith("kairoi-"):
         normalized_id = property_id.replace("kairoi-", "").replace("-", "_")
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         c = conn.cursor()
         
         # Get current occupancy
@@ -619,8 +622,6 @@ def get_projected_occupancy(property_id: str):
         data_source = "lease_expirations_report" if use_4156 else "unified_leases"
         
         if use_4156:
-            date_expr = "date(substr(lease_end_date,7,4)||'-'||substr(lease_end_date,1,2)||'-'||substr(lease_end_date,4,2))"
-            
             for days, label in [(30, '30'), (60, '60'), (90, '90')]:
                 c.execute(f"""
                     SELECT 
@@ -631,8 +632,7 @@ def get_projected_occupancy(property_id: str):
                         SUM(CASE WHEN decision = 'Moved out' THEN 1 ELSE 0 END) as moved_out
                     FROM unified_lease_expirations
                     WHERE (unified_property_id = ? OR unified_property_id = ?)
-                      AND lease_end_date IS NOT NULL AND lease_end_date != ''
-                      AND {date_expr} BETWEEN date('now') AND date('now', '+{days} days')
+                      AND lease_end_date_iso BETWEEN date('now') AND date('now', '+{days} days')
                 """, (property_id, normalized_id))
                 row = c.fetchone()
                 total_exp = row[0] or 0
@@ -662,8 +662,6 @@ def get_projected_occupancy(property_id: str):
                 })
         else:
             # Fallback: unified_leases (no decision breakdown)
-            date_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
-            
             for days, label in [(30, '30'), (60, '60'), (90, '90')]:
                 c.execute(f"""
                     SELECT COUNT(*) as expiring,
@@ -671,8 +669,7 @@ def get_projected_occupancy(property_id: str):
                     FROM unified_leases
                     WHERE (unified_property_id = ? OR unified_property_id = ?)
                       AND status IN ('Current', 'Current - Past')
-                      AND lease_end IS NOT NULL AND lease_end != ''
-                      AND {date_expr} BETWEEN date('now') AND date('now', '+{days} days')
+                      AND lease_end_iso BETWEEN date('now') AND date('now', '+{days} days')
                 """, (property_id, normalized_id))
                 row = c.fetchone()
                 expiring = row[0] or 0
@@ -716,6 +713,7 @@ def get_projected_occupancy(property_id: str):
 
 
 @router.get("/properties/{property_id}/availability")
+@cached_response
 def get_availability(property_id: str):
     """
     GET: Availability metrics per PHH feedback.
@@ -728,7 +726,6 @@ def get_availability(property_id: str):
     
     Sources: unified_occupancy_metrics, unified_units, unified_projected_occupancy
     """
-    import sqlite3
     from datetime import datetime, timedelta
     
     normalized_id = property_id
@@ -738,7 +735,7 @@ def get_availability(property_id: str):
     try:
         # --- Compute ALL availability data from unified_units (single source of truth) ---
         # This ensures ATR KPIs and buckets are always consistent.
-        uni_conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        uni_conn = get_unified_connection()
         uc = uni_conn.cursor()
         
         # Get total & occupied from occupancy_metrics (box score authority)
@@ -769,18 +766,15 @@ def get_availability(property_id: str):
                     THEN 1 ELSE 0 END) as bucket_vacant,
                 SUM(CASE WHEN occupancy_status = 'notice' 
                           AND (is_preleased IS NULL OR is_preleased != 1)
-                          AND lease_end IS NOT NULL AND lease_end != ''
-                          AND date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2)) <= date('now', '+30 days')
+                          AND lease_end_iso <= date('now', '+30 days')
                     THEN 1 ELSE 0 END) as notice_0_30,
                 SUM(CASE WHEN occupancy_status = 'notice'
                           AND (is_preleased IS NULL OR is_preleased != 1)
-                          AND lease_end IS NOT NULL AND lease_end != ''
-                          AND date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2)) BETWEEN date('now', '+31 days') AND date('now', '+60 days')
+                          AND lease_end_iso BETWEEN date('now', '+31 days') AND date('now', '+60 days')
                     THEN 1 ELSE 0 END) as notice_30_60,
                 SUM(CASE WHEN occupancy_status = 'notice'
                           AND (is_preleased IS NULL OR is_preleased != 1)
-                          AND (lease_end IS NULL OR lease_end = ''
-                               OR date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2)) > date('now', '+60 days'))
+                          AND (lease_end_iso IS NULL OR lease_end_iso > date('now', '+60 days'))
                     THEN 1 ELSE 0 END) as notice_60_plus,
                 SUM(CASE WHEN status = 'down' THEN 1 ELSE 0 END) as down_units
             FROM unified_units
@@ -857,7 +851,7 @@ def get_availability(property_id: str):
         })
         
         try:
-            pc = sqlite3.connect(str(UNIFIED_DB_PATH))
+            pc = get_unified_connection()
             pcc = pc.cursor()
             
             # Notice units with expected move-out dates (ALL notice, including preleased-notice)
@@ -983,7 +977,7 @@ def get_availability(property_id: str):
         prior_atr_pct = None
         prior_snapshot_date = None
         try:
-            pm_conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+            pm_conn = get_unified_connection()
             pm_c = pm_conn.cursor()
             pm_c.execute("""
                 SELECT snapshot_date, total_units, vacant_units,
@@ -1040,13 +1034,13 @@ def get_availability(property_id: str):
 
 
 @router.get("/properties/{property_id}/unit-status-breakdown")
+@cached_response
 def get_unit_status_breakdown(property_id: str):
     """Unit status breakdown with every status bucket and subtotals."""
-    import sqlite3
     normalized_id = property_id.replace("-", "_").lower()
 
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         c = conn.cursor()
 
         c.execute("""
@@ -1159,18 +1153,18 @@ def get_unit_status_breakdown(property_id: str):
 
 
 @router.get("/properties/{property_id}/occupancy-snapshots")
+@cached_response
 def get_occupancy_snapshots(property_id: str):
     """
     GET: Historical occupancy snapshots for week-over-week trend display.
     Returns all available box score snapshots ordered by date.
     """
-    import sqlite3
     normalized_id = property_id
     if property_id.startswith("kairoi-"):
         normalized_id = property_id.replace("kairoi-", "").replace("-", "_")
 
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         c = conn.cursor()
         c.execute("""
             SELECT snapshot_date, total_units, occupied_units, vacant_units,
@@ -1211,6 +1205,7 @@ def get_occupancy_snapshots(property_id: str):
 
 
 @router.get("/properties/{property_id}/expirations")
+@cached_response
 def get_expirations(property_id: str):
     """
     GET: Lease expiration and renewal metrics.
@@ -1224,6 +1219,7 @@ def get_expirations(property_id: str):
 
 
 @router.get("/properties/{property_id}/expirations/details")
+@cached_response
 def get_expiration_details(
     property_id: str,
     days: int = Query(90, description="Lookahead window in days (30, 60, or 90)"),
@@ -1278,7 +1274,7 @@ def get_expiration_details(
         date_end = None
 
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -1295,7 +1291,7 @@ def get_expiration_details(
 
         if use_4156:
             # Report 4156 data: decision-based filtering
-            date_expr = "date(substr(lease_end_date,7,4)||'-'||substr(lease_end_date,1,2)||'-'||substr(lease_end_date,4,2))"
+            date_expr = "lease_end_date_iso"
             decision_cond = ""
             if filter == "renewed":
                 decision_cond = "AND decision = 'Renewed'"
@@ -1364,13 +1360,13 @@ def get_expiration_details(
                 leases.append(lease_rec)
         else:
             # Fallback: unified_leases
-            status_cond = "AND status IN ('Current', 'Current - Future')"
+            status_cond = "AND l.status IN ('Current', 'Current - Future')"
             if filter == "renewed":
-                status_cond = "AND status = 'Current - Future'"
+                status_cond = "AND l.status = 'Current - Future'"
             elif filter == "expiring":
-                status_cond = "AND status = 'Current'"
+                status_cond = "AND l.status = 'Current'"
 
-            date_expr = "date(substr(l.lease_end,7,4)||'-'||substr(l.lease_end,1,2)||'-'||substr(l.lease_end,4,2))"
+            date_expr = "l.lease_end_iso"
             if date_start and date_end:
                 date_range_cond_fb = f"AND {date_expr} BETWEEN ? AND ?"
                 params_fb = (property_id, date_start, date_end)
@@ -1418,6 +1414,7 @@ def get_expiration_details(
 
 
 @router.get("/properties/{property_id}/occupancy-trend")
+@cached_response
 def get_occupancy_trend(
     property_id: str,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD). Defaults to 7 days ago."),
@@ -1436,6 +1433,7 @@ def get_occupancy_trend(
 
 
 @router.get("/properties/{property_id}/all-trends")
+@cached_response
 def get_all_trends(
     property_id: str,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD). Defaults to 7 days ago."),
@@ -1456,6 +1454,7 @@ def get_all_trends(
 
 
 @router.get("/properties/{property_id}/summary", response_model=DashboardSummary)
+@cached_response
 def get_summary(
     property_id: str,
     timeframe: Timeframe = Query(Timeframe.CM, description="Timeframe: cm, pm, or ytd"),
@@ -1497,6 +1496,7 @@ def get_summary(
 # ---- Drill-through endpoints ----
 
 @router.get("/properties/{property_id}/units/raw")
+@cached_response
 def get_units_raw(
     property_id: str,
     status: Optional[str] = Query(None, description="Filter by status: occupied, vacant, available, aged")
@@ -1528,6 +1528,7 @@ def get_units_raw(
 
 
 @router.get("/properties/{property_id}/residents/raw")
+@cached_response
 def get_residents_raw(
     property_id: str,
     status: str = Query("all", description="Status filter: all, Current, Notice, Past, Future"),
@@ -1550,6 +1551,7 @@ def get_residents_raw(
 
 
 @router.get("/properties/{property_id}/prospects/raw")
+@cached_response
 def get_prospects_raw(
     property_id: str,
     stage: Optional[str] = Query(None, description="Funnel stage: leads, tours, applications, lease_signs"),
@@ -1562,6 +1564,7 @@ def get_prospects_raw(
 # ---- Amenities/Rentable Items endpoints ----
 
 @router.get("/properties/{property_id}/amenities")
+@cached_response
 def get_amenities(
     property_id: str,
     item_type: Optional[str] = Query(None, description="Filter by type: carport, storage, etc.")
@@ -1578,6 +1581,7 @@ def get_amenities(
 
 
 @router.get("/properties/{property_id}/amenities/summary")
+@cached_response
 def get_amenities_summary(property_id: str):
     """
     GET: Summary of amenities by type with revenue potential.
@@ -1730,6 +1734,7 @@ async def search_market_comps(
 # =========================================================================
 
 @router.get("/properties/{property_id}/delinquency")
+@cached_response
 def get_delinquency(property_id: str):
     """
     GET: Delinquency, eviction, and collections data for a property.
@@ -1737,19 +1742,16 @@ def get_delinquency(property_id: str):
     Data source: unified_delinquency table (synced from RealPage reports).
     Returns: DelinquencyReport format for frontend consumption.
     """
-    import sqlite3
     from pathlib import Path
     from datetime import datetime
     
-    db_path = UNIFIED_DB_PATH
-    
     # Normalize property_id for legacy kairoi- format
     normalized_id = property_id
     if property_id.startswith("kairoi-"):
         normalized_id = property_id.replace("kairoi-", "").replace("-", "_")
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         # Get delinquency records for property with eviction columns
@@ -1945,6 +1947,7 @@ def get_delinquency(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/risk-scores")
+@cached_response
 def get_risk_scores(property_id: str):
     """
     GET: Resident risk scores for a property.
@@ -1958,10 +1961,8 @@ def get_risk_scores(property_id: str):
     import sqlite3
     from pathlib import Path
     
-    db_path = UNIFIED_DB_PATH
-    
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         cursor.execute("""
@@ -2018,6 +2019,7 @@ def get_risk_scores(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/availability-by-floorplan")
+@cached_response
 def get_availability_by_floorplan(property_id: str):
     """
     GET: Available units broken out by floorplan, showing vacant vs on-notice counts.
@@ -2025,10 +2027,9 @@ def get_availability_by_floorplan(property_id: str):
     Uses unified_units data grouped by floorplan.
     Returns: list of floorplan records with total, vacant, notice, leased counts.
     """
-    import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         # Aggregate unified_units by floorplan
@@ -2095,6 +2096,7 @@ def get_availability_by_floorplan(property_id: str):
 
 
 @router.get("/properties/{property_id}/consolidated-by-bedroom")
+@cached_response
 def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
     """
     GET: Dashboard Consolidation — aggregates occupancy, pricing, and availability
@@ -2106,10 +2108,9 @@ def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
     Combines unified_units (occupancy/availability) with rent data
     into a single consolidated view per bedroom count or per floorplan.
     """
-    import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         # Aggregate unified_units by floorplan (derive bedroom count later)
@@ -2212,7 +2213,7 @@ def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
             
             if use_4156:
                 # Report 4156: floorplan + decision per lease
-                date_expr = "date(substr(ule.lease_end_date,7,4)||'-'||substr(ule.lease_end_date,1,2)||'-'||substr(ule.lease_end_date,4,2))"
+                date_expr = "ule.lease_end_date_iso"
                 cursor.execute(f"""
                     SELECT COALESCE(NULLIF(uu.floorplan, ''), '_unknown_') as fp,
                            COUNT(*) as expiring,
@@ -2230,7 +2231,7 @@ def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
                     renewal_map[row[0]] = {"expiring": row[1] or 0, "renewed": min(row[2] or 0, row[1] or 0)}
             else:
                 # Fallback: unified_units for expirations, unified_leases for total renewed count
-                date_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
+                date_expr = "lease_end_iso"
                 cursor.execute(f"""
                     SELECT COALESCE(NULLIF(floorplan, ''), '_unknown_') as fp, COUNT(*) as expiring
                     FROM unified_units
@@ -2243,7 +2244,7 @@ def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
                 for row in cursor.fetchall():
                     renewal_map[row[0]] = {"expiring": row[1], "renewed": 0}
                 
-                le_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
+                le_expr = "lease_end_iso"
                 cursor.execute(f"""
                     SELECT COUNT(*) as total_exp,
                            SUM(CASE WHEN next_lease_id IS NOT NULL AND next_lease_id != '' THEN 1 ELSE 0 END) as renewed
@@ -2340,6 +2341,7 @@ def get_consolidated_by_bedroom(property_id: str, group_by: str = "bedroom"):
 
 
 @router.get("/properties/{property_id}/availability-by-floorplan/units")
+@cached_response
 def get_availability_units(property_id: str, floorplan: str = None, status: str = None, bucket: str = None):
     """
     GET: Unit-level drill-down for availability by floorplan.
@@ -2349,10 +2351,9 @@ def get_availability_units(property_id: str, floorplan: str = None, status: str
     - status: Filter to status (vacant, notice, occupied, preleased)
     - bucket: Filter by availability bucket (0_30, 30_60, 60_plus)
     """
-    import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         # Build WHERE clause for status filtering
@@ -2409,8 +2410,8 @@ def get_availability_units(property_id: str, floorplan: str = None, status: str
                 params.append(status)
         
         if bucket:
-            # Bucket by lease_end (MM/DD/YYYY → ISO date for comparison)
-            _le = "date(substr(u.lease_end,7,4)||'-'||substr(u.lease_end,1,2)||'-'||substr(u.lease_end,4,2))"
+            # Bucket by lease_end (sync-normalized YYYY-MM-DD column)
+            _le = "u.lease_end_iso"
             if bucket == '0_30':
                 # Vacant (non-preleased, non-down) + notice units with lease_end within 30 days
                 where_extra += f""" AND (u.status IS NULL OR u.status != 'down') AND (
@@ -2552,6 +2553,7 @@ def get_availability_units(property_id: str, floorplan: str = None, status: str
 
 
 @router.get("/properties/{property_id}/shows")
+@cached_response
 def get_shows(property_id: str, days: int = 7):
     """
     GET: Number of property shows/tours in the last N days.
@@ -2562,11 +2564,10 @@ def get_shows(property_id: str, days: int = 7):
     Query params:
     - days: Trailing window in days (default 7)
     """
-    import sqlite3
     from datetime import datetime, timedelta
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
@@ -2618,6 +2619,7 @@ def get_shows(property_id: str, days: int = 7):
 
 
 @router.get("/properties/{property_id}/occupancy-forecast")
+@cached_response
 def get_occupancy_forecast(property_id: str, weeks: int = 12):
     """
     GET: Weekly occupancy forecast showing projected move-ins and move-outs.
@@ -2627,11 +2629,10 @@ def get_occupancy_forecast(property_id: str, weeks: int = 12):
     
     Also returns notice_units and move_in_units from unified data for drill-down.
     """
-    import sqlite3
     from datetime import datetime, timedelta
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         cursor = conn.cursor()
         
         # Get current occupied and total from unified_occupancy_metrics
@@ -2956,21 +2957,15 @@ async def get_reputation(property_id: str):
 
 
 @router.get("/properties/{property_id}/image")
-async def get_property_image(property_id: str):
+@offload
+def get_property_image(property_id: str):
     """
     GET: Property image URL from Zembra/Google reviews cache.
     Returns the Google Maps profile image for the property.
     """
-    from app.services.google_reviews_service import _load_reviews_cache
-    cache = _load_reviews_cache()
-
-    # Try direct match, then known mappings
-    PROPERTY_MAP = {
-        "5536211": "parkside",
-        "5472172": "nexus_east",
-    }
-    cache_key = PROPERTY_MAP.get(property_id, property_id)
-    entry = cache.get(cache_key)
+    from app.services.google_reviews_service import get_cached_reviews_entry
+    # Direct match, then known site ID mappings
+    entry = get_cached_reviews_entry(property_id)
 
     if entry:
         data = entry.get("data", {})
@@ -2996,7 +2991,8 @@ async def get_reviews(property_id: str):
 
 
 @router.get("/properties/{property_id}/apartments-reviews")
-async def get_apartments_reviews_endpoint(property_id: str):
+@offload
+def get_apartments_reviews_endpoint(property_id: str):
     """
     GET: Apartments.com reviews for a property (via Zembra API cache).
     Run fetch_apartments_reviews.py to refresh the cache.
@@ -3008,6 +3004,386 @@ async def get_apartments_reviews_endpoint(property_id: str):
     return data
 
 
+# =========================================================================
+# AI Context Collectors (shared by ai-insights, chat and watchpoints)
+# =========================================================================
+# Each collector is one blocking read for a property. context_engine runs
+# them concurrently on a bounded thread pool with per-collector timeouts and
+# shares in-flight runs between concurrent requests. Collectors return
+# shared objects — consumers must copy before mutating.
+
+def _norm_property_id(property_id: str) -> str:
+    return property_id.replace("kairoi-", "").replace("-", "_")
+
+
+def _kairoi_norm(property_id: str) -> str:
+    return _norm_property_id(property_id) if property_id.startswith("kairoi-") else property_id
+
+
+def _dump_model(model) -> dict:
+    return model.model_dump() if hasattr(model, 'model_dump') else vars(model)
+
+
+@context_engine.collector("occupancy")
+def _collect_occupancy(property_id: str):
+    return occupancy_service.get_occupancy_metrics(property_id, Timeframe.CM)
+
+
+@context_engine.collector("exposure")
+def _collect_exposure(property_id: str):
+    return occupancy_service.get_exposure_metrics(property_id, Timeframe.CM)
+
+
+@context_engine.collector("funnel_cm")
+def _collect_funnel_cm(property_id: str):
+    return occupancy_service.get_leasing_funnel(property_id, Timeframe.CM)
+
+
+@context_engine.collector("pricing")
+def _collect_pricing(property_id: str):
+    return pricing_service.get_unit_pricing(property_id)
+
+
+@context_engine.collector("expirations")
+def _collect_expirations(property_id: str):
+    return occupancy_service.get_lease_expirations(property_id)
+
+
+@context_engine.collector("tradeouts")
+def _collect_tradeouts(property_id: str):
+    return pricing_service.get_lease_tradeouts(property_id)
+
+
+@context_engine.collector("renewals")
+def _collect_renewals(property_id: str):
+    return pricing_service.get_renewal_leases(property_id)
+
+
+@context_engine.collector("rent_averages")
+def _collect_rent_averages(property_id: str):
+    """Unit-weighted market vs in-place rent from unified_pricing_metrics."""
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT 
+                SUM(asking_rent * unit_count) / NULLIF(SUM(CASE WHEN asking_rent > 0 THEN unit_count ELSE 0 END), 0),
+                SUM(in_place_rent * unit_count) / NULLIF(SUM(CASE WHEN in_place_rent > 0 THEN unit_count ELSE 0 END), 0)
+            FROM unified_pricing_metrics
+            WHERE unified_property_id = ? OR unified_property_id = ?
+        """, (property_id, _norm_property_id(property_id)))
+        row = c.fetchone()
+    finally:
+        conn.close()
+    if not row or not row[0] or not row[1]:
+        return None
+    return {"avg_market_rent": row[0], "avg_actual_rent": row[1]}
+
+
+@context_engine.collector("raw_units")
+def _collect_raw_units(property_id: str):
+    return occupancy_service.get_raw_units(property_id)
+
+
+@context_engine.collector("raw_residents")
+def _collect_raw_residents(property_id: str):
+    return occupancy_service.get_raw_residents(property_id, "all", Timeframe.CM)
+
+
+@context_engine.collector("delinquency")
+def _collect_delinquency(property_id: str):
+    """Current-resident delinquency + aging (former residents are collections, not delinquency)."""
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT SUM(CASE WHEN total_delinquent > 0 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                            THEN total_delinquent ELSE 0 END),
+                   COUNT(CASE WHEN total_delinquent > 0 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                              THEN 1 END),
+                   SUM(CASE WHEN balance_0_30 > 0 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                            THEN balance_0_30 ELSE 0 END),
+                   SUM(CASE WHEN balance_31_60 > 0 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                            THEN balance_31_60 ELSE 0 END),
+                   SUM(CASE WHEN balance_over_90 > 0 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                            THEN balance_over_90 ELSE 0 END),
+                   SUM(CASE WHEN is_eviction = 1 AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+                            THEN 1 ELSE 0 END)
+            FROM unified_delinquency
+            WHERE unified_property_id = ? OR unified_property_id = ?
+        """, (property_id, _kairoi_norm(property_id)))
+        row = c.fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {
+        "current_total": row[0] or 0,
+        "current_units": row[1] or 0,
+        "over_30": row[2] or 0,
+        "over_60": row[3] or 0,
+        "over_90": row[4] or 0,
+        "eviction_count": row[5] or 0,
+    }
+
+
+@context_engine.collector("chat_delinquency")
+def _collect_chat_delinquency(property_id: str):
+    """Delinquency summary as the chat agent reports it (balances > 0, evictions across all residents)."""
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT COALESCE(SUM(CASE WHEN status NOT LIKE '%former%' THEN total_delinquent ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN status LIKE '%former%' THEN total_delinquent ELSE 0 END), 0),
+                   COUNT(CASE WHEN total_delinquent > 0 AND status NOT LIKE '%former%' THEN 1 END),
+                   COALESCE(SUM(CASE WHEN is_eviction = 1 THEN 1 ELSE 0 END), 0)
+            FROM unified_delinquency
+            WHERE (unified_property_id = ? OR unified_property_id = ?) AND total_delinquent > 0
+        """, (property_id, _norm_property_id(property_id)))
+        row = c.fetchone()
+    finally:
+        conn.close()
+    if not row or not (row[0] > 0 or row[1] > 0):
+        return None
+    return {
+        "current_resident_total": round(row[0], 2),
+        "former_resident_total": round(row[1], 2),
+        "delinquent_units": row[2],
+        "eviction_count": row[3],
+    }
+
+
+@context_engine.collector("risk_scores")
+def _collect_risk_scores(property_id: str):
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT * FROM unified_risk_scores WHERE unified_property_id = ?", (property_id,))
+        row = c.fetchone()
+        cols = [d[0] for d in c.description] if row else []
+    finally:
+        conn.close()
+    return dict(zip(cols, row)) if row else None
+
+
+@context_engine.collector("shows_7d")
+def _collect_shows_7d(property_id: str):
+    cutoff = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT COUNT(*) FROM unified_activity
+            WHERE unified_property_id = ?
+              AND activity_type IN ('Visit', 'Visit (return)', 'Videotelephony - Tour')
+              AND activity_date >= ?
+        """, (property_id, cutoff))
+        row = c.fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else 0
+
+
+@context_engine.collector("google_reviews")
+async def _collect_google_reviews(property_id: str):
+    from app.services.google_reviews_service import get_property_reviews
+    return await get_property_reviews(property_id)
+
+
+@context_engine.collector("apartments_reviews")
+def _collect_apartments_reviews(property_id: str):
+    from app.services.apartments_reviews_service import get_apartments_reviews
+    return get_apartments_reviews(property_id)
+
+
+@context_engine.collector("kpis")
+def _collect_kpis(property_id: str):
+    """Materialized watchable metrics (unified_property_kpis) for the property."""
+    for pid in dict.fromkeys([property_id, _kairoi_norm(property_id)]):
+        kpi = load_property_kpis([pid]).get(pid)
+        if kpi:
+            return kpi
+    return None
+
+
+@context_engine.collector("vacancy_aging")
+def _collect_vacancy_aging(property_id: str):
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT
+                COUNT(*) as total_vacant,
+                SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 1 AND 30 THEN 1 ELSE 0 END) as d1_30,
+                SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 31 AND 60 THEN 1 ELSE 0 END) as d31_60,
+                SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 61 AND 90 THEN 1 ELSE 0 END) as d61_90,
+                SUM(CASE WHEN CAST(days_vacant AS INTEGER) > 90 THEN 1 ELSE 0 END) as d90_plus,
+                MAX(CAST(days_vacant AS INTEGER)) as max_days,
+                ROUND(AVG(CAST(days_vacant AS INTEGER)), 1) as avg_days
+            FROM unified_units
+            WHERE unified_property_id = ?
+              AND status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
+              AND (is_preleased IS NULL OR is_preleased != 1)
+              AND days_vacant IS NOT NULL AND days_vacant != '' AND CAST(days_vacant AS INTEGER) > 0
+        """, (property_id,))
+        vr = c.fetchone()
+        # Also get the worst offenders (top 5 longest vacant)
+        c.execute("""
+            SELECT unit_number, CAST(days_vacant AS INTEGER) as dv, floorplan, market_rent
+            FROM unified_units
+            WHERE unified_property_id = ?
+              AND status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
+              AND (is_preleased IS NULL OR is_preleased != 1)
+              AND days_vacant IS NOT NULL AND days_vacant != '' AND CAST(days_vacant AS INTEGER) > 0
+            ORDER BY dv DESC LIMIT 5
+        """, (property_id,))
+        top = c.fetchall()
+    finally:
+        conn.close()
+    if not vr or not vr[0]:
+        return None
+    return {
+        "total_vacant_with_days": vr[0],
+        "aging_buckets": {
+            "1_to_30_days": vr[1] or 0,
+            "31_to_60_days": vr[2] or 0,
+            "61_to_90_days": vr[3] or 0,
+            "over_90_days": vr[4] or 0,
+        },
+        "max_days_vacant": vr[5] or 0,
+        "avg_days_vacant": vr[6] or 0,
+        "longest_vacant_units": [
+            {"unit": r[0], "days_vacant": r[1], "floorplan": r[2], "market_rent": r[3]}
+            for r in top
+        ],
+    }
+
+
+@context_engine.collector("move_out_reasons")
+def _collect_move_out_reasons(property_id: str):
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT category, SUM(category_count) as total
+            FROM unified_move_out_reasons
+            WHERE unified_property_id = ? AND resident_type = 'former'
+            GROUP BY category ORDER BY total DESC LIMIT 5
+        """, (property_id,))
+        rows = c.fetchall()
+    finally:
+        conn.close()
+    return [{"category": r[0], "count": r[1]} for r in rows] or None
+
+
+@context_engine.collector("lead_sources")
+def _collect_lead_sources(property_id: str):
+    """AI-1/AI-2: Lead sources from marketing data (YTD + MTD for MoM)."""
+    import sqlite3
+    conn = get_unified_connection()
+    conn.row_factory = sqlite3.Row
+    try:
+        c = conn.cursor()
+        lead_sources = {}
+        for tf in ['ytd', 'mtd']:
+            c.execute("""
+                SELECT source_name, new_prospects, visits, leases, net_leases,
+                       prospect_to_lease_pct, date_range
+                FROM unified_advertising_sources
+                WHERE unified_property_id = ? AND timeframe_tag = ?
+                ORDER BY new_prospects DESC
+            """, (property_id, tf))
+            rows = c.fetchall()
+            if rows:
+                lead_sources[tf] = [
+                    {"source": r["source_name"], "prospects": r["new_prospects"] or 0,
+                     "visits": r["visits"] or 0, "leases": r["leases"] or 0,
+                     "net_leases": r["net_leases"] or 0,
+                     "conversion": r["prospect_to_lease_pct"] or 0}
+                    for r in rows
+                ]
+                lead_sources[f"{tf}_date_range"] = rows[0]["date_range"]
+    finally:
+        conn.close()
+    return lead_sources or None
+
+
+@context_engine.collector("projected_occupancy")
+def _collect_projected_occupancy(property_id: str):
+    """AI-4: Occupancy forecast (12-week projection)."""
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT week_ending, occupied_begin, pct_occupied_begin,
+                   scheduled_move_ins, scheduled_move_outs,
+                   occupied_end, pct_occupied_end
+            FROM unified_projected_occupancy
+            WHERE unified_property_id = ? OR unified_property_id = ?
+            ORDER BY week_ending ASC LIMIT 12
+        """, (property_id, _norm_property_id(property_id)))
+        rows = c.fetchall()
+    finally:
+        conn.close()
+    return [
+        {"week_ending": r[0], "occupied_begin": r[1], "occ_pct_begin": r[2],
+         "move_ins": r[3], "move_outs": r[4],
+         "occupied_end": r[5], "occ_pct_end": r[6]}
+        for r in rows
+    ] or None
+
+
+@context_engine.collector("unit_breakdown")
+def _collect_unit_breakdown(property_id: str):
+    """AI-5: Unit breakdown by bedroom type (vacancy/demand analysis)."""
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT
+                CASE WHEN bedrooms IS NULL THEN 'Unknown'
+                     WHEN bedrooms = 0 THEN 'Studio'
+                     ELSE bedrooms || ' BR' END as bed_type,
+                COUNT(*) as total,
+                SUM(CASE WHEN status IN ('vacant','vacant_ready','vacant_not_ready') THEN 1 ELSE 0 END) as vacant,
+                SUM(CASE WHEN status = 'occupied' THEN 1 ELSE 0 END) as occupied,
+                SUM(CASE WHEN is_preleased = 1 THEN 1 ELSE 0 END) as preleased,
+                ROUND(AVG(CASE WHEN market_rent > 0 THEN market_rent END), 0) as avg_market,
+                ROUND(AVG(CASE WHEN in_place_rent > 0 THEN in_place_rent END), 0) as avg_in_place
+            FROM unified_units
+            WHERE unified_property_id = ? OR unified_property_id = ?
+            GROUP BY bed_type
+            ORDER BY bedrooms ASC
+        """, (property_id, _norm_property_id(property_id)))
+        rows = c.fetchall()
+    finally:
+        conn.close()
+    return [
+        {"type": r[0], "total": r[1], "vacant": r[2], "occupied": r[3],
+         "preleased": r[4], "avg_market_rent": r[5], "avg_in_place_rent": r[6]}
+        for r in rows
+    ] or None
+
+
+INSIGHTS_COLLECTORS = [
+    "occupancy", "pricing", "expirations", "tradeouts",
+    "delinquency", "risk_scores", "shows_7d", "google_reviews", "apartments_reviews",
+]
+
+CHAT_COLLECTORS = [
+    "occupancy", "exposure", "funnel_cm", "pricing", "raw_units", "raw_residents",
+    "renewals", "tradeouts", "expirations", "chat_delinquency", "rent_averages",
+    "google_reviews", "apartments_reviews", "vacancy_aging", "move_out_reasons",
+    "lead_sources", "projected_occupancy", "unit_breakdown",
+]
+
+# Chat has no useful context without these — a failure here fails the request
+CHAT_REQUIRED_COLLECTORS = ["occupancy", "exposure", "funnel_cm", "pricing", "raw_units", "raw_residents"]
+
+WATCHPOINT_COLLECTORS = ["kpis"]
+
+
 # =========================================================================
 # AI Insights (Auto-generated Red Flags & Q&A)
 # =========================================================================
@@ -3024,179 +3400,73 @@ async def get_ai_insights(property_id: str, refresh: int = 0):
         _cache.pop(property_id, None)
 
     try:
-        import asyncio
-
-        # Gather all available data for the property
+        # Gather all available data for the property (collectors run in parallel;
+        # watchpoint metrics reuse the same runs)
+        ctx = await context_engine.gather(property_id, INSIGHTS_COLLECTORS + WATCHPOINT_COLLECTORS)
         property_data: dict = {"property_id": property_id}
 
-        # Parallel async fetches (biggest speed win — these were sequential before)
-        async def _fetch_occ():
-            try:
-                occ = occupancy_service.get_occupancy_metrics(property_id, Timeframe.CM)
-                return ("occupancy", occ.model_dump() if hasattr(occ, 'model_dump') else {}, occ.property_name)
-            except Exception:
-                return None
-
-        async def _fetch_pricing():
-            try:
-                p = pricing_service.get_unit_pricing(property_id)
-                return ("pricing", p.model_dump() if hasattr(p, 'model_dump') else {})
-            except Exception:
-                return None
-
-        async def _fetch_funnel():
-            try:
-                f = get_leasing_funnel(property_id, Timeframe.L30)
-                return ("funnel", f.model_dump() if hasattr(f, 'model_dump') else {})
-            except Exception:
-                return None
-
-        async def _fetch_expirations():
-            try:
-                return ("expirations", occupancy_service.get_lease_expirations(property_id))
-            except Exception:
-                return None
-
-        async def _fetch_tradeouts():
-            try:
-                return ("tradeouts", pricing_service.get_lease_tradeouts(property_id))
-            except Exception:
-                return None
-
-        async def _fetch_ltl():
-            try:
-                return ("loss_to_lease", pricing_service.get_loss_to_lease(property_id))
-            except Exception:
-                return None
-
-        results = await asyncio.gather(
-            _fetch_occ(), _fetch_pricing(), _fetch_funnel(),
-            _fetch_expirations(), _fetch_tradeouts(), _fetch_ltl(),
-            return_exceptions=True
-        )
-
-        for r in results:
-            if r is None or isinstance(r, Exception):
-                continue
-            if r[0] == "occupancy":
-                property_data["occupancy"] = r[1]
-                property_data["property_name"] = r[2]
-            else:
-                property_data[r[0]] = r[1]
+        occ = ctx.get("occupancy")
+        if occ is not None:
+            property_data["occupancy"] = _dump_model(occ)
+            property_data["property_name"] = occ.property_name
+        if ctx.get("pricing") is not None:
+            property_data["pricing"] = _dump_model(ctx.get("pricing"))
+        for name in ("expirations", "tradeouts"):
+            if name in ctx.values:
+                property_data[name] = ctx.values[name]
 
         # Delinquency from unified DB (same source as the Delinquency tab)
-        try:
-            from app.db.schema import UNIFIED_DB_PATH
-            import sqlite3
-            
-            # Normalize property_id for unified DB lookup
-            norm_id = property_id
-            if property_id.startswith("kairoi-"):
-                norm_id = property_id.replace("kairoi-", "").replace("-", "_")
-            
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            c = conn.cursor()
-            c.execute("""
-                SELECT SUM(CASE WHEN total_delinquent > 0 THEN total_delinquent ELSE 0 END),
-                       COUNT(CASE WHEN total_delinquent > 0 THEN 1 END),
-                       SUM(CASE WHEN balance_0_30 > 0 THEN balance_0_30 ELSE 0 END),
-                       SUM(CASE WHEN balance_31_60 > 0 THEN balance_31_60 ELSE 0 END),
-                       SUM(CASE WHEN balance_over_90 > 0 THEN balance_over_90 ELSE 0 END),
-                       SUM(CASE WHEN is_eviction = 1 THEN 1 ELSE 0 END)
-                FROM unified_delinquency
-                WHERE (unified_property_id = ? OR unified_property_id = ?)
-                  AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
-            """, (property_id, norm_id))
-            row = c.fetchone()
-            conn.close()
-            if row and row[0]:
-                property_data["delinquency"] = {
-                    "total_delinquent": row[0] or 0,
-                    "delinquent_units": row[1] or 0,
-                    "over_30": row[2] or 0,
-                    "over_60": row[3] or 0,
-                    "over_90": row[4] or 0,
-                    "eviction_count": row[5] or 0,
-                }
-        except Exception:
-            pass
+        delinq = ctx.get("delinquency")
+        if delinq and delinq["current_total"]:
+            property_data["delinquency"] = {
+                "total_delinquent": delinq["current_total"],
+                "delinquent_units": delinq["current_units"],
+                "over_30": delinq["over_30"],
+                "over_60": delinq["over_60"],
+                "over_90": delinq["over_90"],
+                "eviction_count": delinq["eviction_count"],
+            }
 
-        # Risk scores
-        try:
-            from app.db.schema import UNIFIED_DB_PATH
-            import sqlite3
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            c = conn.cursor()
-            c.execute("SELECT * FROM unified_risk_scores WHERE unified_property_id = ?", (property_id,))
-            row = c.fetchone()
-            conn.close()
-            if row:
-                cols = [d[0] for d in c.description]
-                risk_dict = dict(zip(cols, row))
-                property_data["risk_scores"] = {
-                    "total_scored": risk_dict.get("total_scored", 0),
-                    "churn": {
-                        "high_risk": risk_dict.get("churn_high_risk", 0),
-                        "medium_risk": risk_dict.get("churn_medium_risk", 0),
-                        "low_risk": risk_dict.get("churn_low_risk", 0),
-                    },
-                    "delinquency": {
-                        "high_risk": risk_dict.get("delinq_high_risk", 0),
-                        "medium_risk": risk_dict.get("delinq_medium_risk", 0),
-                    },
-                }
-        except Exception:
-            pass
+        risk_dict = ctx.get("risk_scores")
+        if risk_dict:
+            property_data["risk_scores"] = {
+                "total_scored": risk_dict.get("total_scored", 0),
+                "churn": {
+                    "high_risk": risk_dict.get("churn_high_risk", 0),
+                    "medium_risk": risk_dict.get("churn_medium_risk", 0),
+                    "low_risk": risk_dict.get("churn_low_risk", 0),
+                },
+                "delinquency": {
+                    "high_risk": risk_dict.get("delinq_high_risk", 0),
+                    "medium_risk": risk_dict.get("delinq_medium_risk", 0),
+                },
+            }
 
-        # Shows
-        try:
-            import sqlite3
-            from datetime import datetime, timedelta
-            cutoff = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-            sconn = sqlite3.connect(str(UNIFIED_DB_PATH))
-            sc = sconn.cursor()
-            sc.execute("""
-                SELECT COUNT(*) FROM unified_activity
-                WHERE unified_property_id = ?
-                  AND activity_type IN ('Visit', 'Visit (return)', 'Videotelephony - Tour')
-                  AND activity_date >= ?
-            """, (property_id, cutoff))
-            row = sc.fetchone()
-            sconn.close()
-            property_data["shows"] = {"total_shows": row[0] if row else 0}
-        except Exception:
-            pass
+        if "shows_7d" in ctx.values:
+            property_data["shows"] = {"total_shows": ctx.values["shows_7d"]}
 
         # Reputation data (Google + Apartments.com)
-        try:
-            from app.services.google_reviews_service import get_property_reviews
-            google_rev = await get_property_reviews(property_id)
-            if google_rev and not google_rev.get("error"):
-                property_data["google_reviews"] = {
-                    "rating": google_rev.get("rating"),
-                    "review_count": google_rev.get("review_count", 0),
-                    "response_rate": google_rev.get("response_rate", 0),
-                    "needs_response": google_rev.get("needs_response", 0),
-                }
-        except Exception:
-            pass
-        try:
-            from app.services.apartments_reviews_service import get_apartments_reviews
-            apt_rev = get_apartments_reviews(property_id)
-            if apt_rev and apt_rev.get("rating"):
-                property_data["apartments_reviews"] = {
-                    "rating": apt_rev.get("rating"),
-                    "review_count": apt_rev.get("review_count", 0),
-                    "response_rate": apt_rev.get("response_rate", 0),
-                    "needs_response": apt_rev.get("needs_response", 0),
-                }
-        except Exception:
-            pass
+        google_rev = ctx.get("google_reviews")
+        if google_rev and not google_rev.get("error"):
+            property_data["google_reviews"] = {
+                "rating": google_rev.get("rating"),
+                "review_count": google_rev.get("review_count", 0),
+                "response_rate": google_rev.get("response_rate", 0),
+                "needs_response": google_rev.get("needs_response", 0),
+            }
+        apt_rev = ctx.get("apartments_reviews")
+        if apt_rev and apt_rev.get("rating"):
+            property_data["apartments_reviews"] = {
+                "rating": apt_rev.get("rating"),
+                "review_count": apt_rev.get("review_count", 0),
+                "response_rate": apt_rev.get("response_rate", 0),
+                "needs_response": apt_rev.get("needs_response", 0),
+            }
 
         # Inject custom watchpoints (WS8)
         try:
             from app.services.watchpoint_service import format_watchpoints_for_ai
-            current_metrics = _gather_current_metrics(property_id)
+            current_metrics = _watchpoint_metrics(ctx)
             wp_text = format_watchpoints_for_ai(property_id, current_metrics)
             if wp_text:
                 property_data["watchpoint_summary"] = wp_text
@@ -3249,290 +3519,86 @@ async def chat_with_ai(
     history = request.get("history", [])
     
     try:
-        # Gather property data for context (all reads from unified.db)
+        # Gather property data for context (all reads from unified.db, in parallel)
+        ctx = await context_engine.gather(property_id, CHAT_COLLECTORS)
+        missing = [n for n in CHAT_REQUIRED_COLLECTORS if n in ctx.errors]
+        if missing:
+            raise RuntimeError("; ".join(f"{n}: {ctx.errors[n]}" for n in missing))
+
         property_data = {"property_id": property_id, "property_name": property_id}
         
-        occupancy = occupancy_service.get_occupancy_metrics(property_id, Timeframe.CM)
+        occupancy = ctx.get("occupancy")
         property_data["property_name"] = occupancy.property_name
-        property_data["occupancy"] = occupancy.model_dump() if hasattr(occupancy, 'model_dump') else vars(occupancy)
-        
-        exposure = occupancy_service.get_exposure_metrics(property_id, Timeframe.CM)
-        property_data["exposure"] = exposure.model_dump() if hasattr(exposure, 'model_dump') else vars(exposure)
-        
-        funnel = occupancy_service.get_leasing_funnel(property_id, Timeframe.CM)
-        property_data["funnel"] = funnel.model_dump() if hasattr(funnel, 'model_dump') else vars(funnel)
-        
-        pricing = pricing_service.get_unit_pricing(property_id)
-        property_data["pricing"] = pricing.model_dump() if hasattr(pricing, 'model_dump') else vars(pricing)
-        
-        property_data["units"] = occupancy_service.get_raw_units(property_id)
-        property_data["residents"] = occupancy_service.get_raw_residents(property_id, "all", Timeframe.CM)
+        property_data["occupancy"] = _dump_model(occupancy)
+        property_data["exposure"] = _dump_model(ctx.get("exposure"))
+        property_data["funnel"] = _dump_model(ctx.get("funnel_cm"))
+        property_data["pricing"] = _dump_model(ctx.get("pricing"))
+        property_data["units"] = ctx.get("raw_units")
+        property_data["residents"] = ctx.get("raw_residents")
         
         # Renewals summary
-        try:
-            renewals = pricing_service.get_renewal_leases(property_id)
-            if renewals and renewals.get("summary"):
-                property_data["renewals"] = renewals["summary"]
-                property_data["renewals"]["count_detail"] = len(renewals.get("renewals", []))
-        except Exception:
-            pass
+        renewals = ctx.get("renewals")
+        if renewals and renewals.get("summary"):
+            property_data["renewals"] = dict(renewals["summary"])
+            property_data["renewals"]["count_detail"] = len(renewals.get("renewals", []))
         
         # Tradeouts summary
-        try:
-            tradeouts = pricing_service.get_lease_tradeouts(property_id)
-            if tradeouts and tradeouts.get("summary"):
-                property_data["tradeouts"] = tradeouts["summary"]
-        except Exception:
-            pass
+        tradeouts = ctx.get("tradeouts")
+        if tradeouts and tradeouts.get("summary"):
+            property_data["tradeouts"] = tradeouts["summary"]
         
         # Expirations
-        try:
-            expirations = occupancy_service.get_lease_expirations(property_id)
-            if expirations and expirations.get("periods"):
-                property_data["expirations"] = expirations["periods"]
-        except Exception:
-            pass
+        expirations = ctx.get("expirations")
+        if expirations and expirations.get("periods"):
+            property_data["expirations"] = expirations["periods"]
         
         # Delinquency summary
-        try:
-            import sqlite3 as _sqlite3
-            _conn = _sqlite3.connect(str(UNIFIED_DB_PATH))
-            _cur = _conn.cursor()
-            _norm = property_id.replace("kairoi-", "").replace("-", "_")
-            _cur.execute("""
-                SELECT COALESCE(SUM(CASE WHEN status NOT LIKE '%former%' THEN total_delinquent ELSE 0 END), 0),
-                       COALESCE(SUM(CASE WHEN status LIKE '%former%' THEN total_delinquent ELSE 0 END), 0),
-                       COUNT(CASE WHEN total_delinquent > 0 AND status NOT LIKE '%former%' THEN 1 END),
-                       COALESCE(SUM(CASE WHEN is_eviction = 1 THEN 1 ELSE 0 END), 0)
-                FROM unified_delinquency
-                WHERE (unified_property_id = ? OR unified_property_id = ?) AND total_delinquent > 0
-            """, (property_id, _norm))
-            _dr = _cur.fetchone()
-            _conn.close()
-            if _dr and (_dr[0] > 0 or _dr[1] > 0):
-                property_data["delinquency"] = {
-                    "current_resident_total": round(_dr[0], 2),
-                    "former_resident_total": round(_dr[1], 2),
-                    "delinquent_units": _dr[2],
-                    "eviction_count": _dr[3],
-                }
-        except Exception:
-            pass
+        if ctx.get("chat_delinquency"):
+            property_data["delinquency"] = ctx.get("chat_delinquency")
         
         # Loss-to-lease
-        try:
-            import sqlite3 as _sqlite3l
-            _connl = _sqlite3l.connect(str(UNIFIED_DB_PATH))
-            _curl = _connl.cursor()
-            _norml = property_id.replace("kairoi-", "").replace("-", "_")
-            _curl.execute("""
-                SELECT 
-                    SUM(asking_rent * unit_count) / NULLIF(SUM(CASE WHEN asking_rent > 0 THEN unit_count ELSE 0 END), 0),
-                    SUM(in_place_rent * unit_count) / NULLIF(SUM(CASE WHEN in_place_rent > 0 THEN unit_count ELSE 0 END), 0)
-                FROM unified_pricing_metrics
-                WHERE unified_property_id = ? OR unified_property_id = ?
-            """, (property_id, _norml))
-            _lr = _curl.fetchone()
-            _connl.close()
-            if _lr and _lr[0] and _lr[1]:
-                _occ_units = property_data.get("occupancy", {}).get("occupied_units", 0)
-                _lpu = round(_lr[0] - _lr[1], 2)
-                _total = round(_lpu * _occ_units, 2)
-                property_data["loss_to_lease"] = {
-                    "avg_market_rent": round(_lr[0], 2),
-                    "avg_actual_rent": round(_lr[1], 2),
-                    "loss_per_unit": _lpu,
-                    "total_monthly_loss": _total,
-                    "total_annual_loss": round(_total * 12, 2),
-                }
-        except Exception:
-            pass
+        rents = ctx.get("rent_averages")
+        if rents:
+            _occ_units = property_data.get("occupancy", {}).get("occupied_units", 0)
+            _lpu = round(rents["avg_market_rent"] - rents["avg_actual_rent"], 2)
+            _total = round(_lpu * _occ_units, 2)
+            property_data["loss_to_lease"] = {
+                "avg_market_rent": round(rents["avg_market_rent"], 2),
+                "avg_actual_rent": round(rents["avg_actual_rent"], 2),
+                "loss_per_unit": _lpu,
+                "total_monthly_loss": _total,
+                "total_annual_loss": round(_total * 12, 2),
+            }
         
         # Google Reviews
-        try:
-            from app.services.google_reviews_service import get_property_reviews
-            google_rev = await get_property_reviews(property_id)
-            if google_rev and not google_rev.get("error") and google_rev.get("rating"):
-                property_data["google_reviews"] = {
-                    "rating": google_rev.get("rating"),
-                    "review_count": google_rev.get("review_count", 0),
-                    "response_rate": google_rev.get("response_rate", 0),
-                    "needs_response": google_rev.get("needs_response", 0),
-                }
-        except Exception:
-            pass
+        google_rev = ctx.get("google_reviews")
+        if google_rev and not google_rev.get("error") and google_rev.get("rating"):
+            property_data["google_reviews"] = {
+                "rating": google_rev.get("rating"),
+                "review_count": google_rev.get("review_count", 0),
+                "response_rate": google_rev.get("response_rate", 0),
+                "needs_response": google_rev.get("needs_response", 0),
+            }
         
         # Apartments.com Reviews
-        try:
-            from app.services.apartments_reviews_service import get_apartments_reviews as _get_apt_rev
-            _apt = _get_apt_rev(property_id)
-            if _apt and _apt.get("rating"):
-                property_data["apartments_reviews"] = {
-                    "rating": _apt.get("rating"),
-                    "review_count": _apt.get("review_count", 0),
-                }
-        except Exception:
-            pass
-        
-        # Vacancy aging summary
-        try:
-            import sqlite3 as _sqlite3v
-            _connv = _sqlite3v.connect(str(UNIFIED_DB_PATH))
-            _curv = _connv.cursor()
-            _curv.execute("""
-                SELECT
-                    COUNT(*) as total_vacant,
-                    SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 1 AND 30 THEN 1 ELSE 0 END) as d1_30,
-                    SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 31 AND 60 THEN 1 ELSE 0 END) as d31_60,
-                    SUM(CASE WHEN CAST(days_vacant AS INTEGER) BETWEEN 61 AND 90 THEN 1 ELSE 0 END) as d61_90,
-                    SUM(CASE WHEN CAST(days_vacant AS INTEGER) > 90 THEN 1 ELSE 0 END) as d90_plus,
-                    MAX(CAST(days_vacant AS INTEGER)) as max_days,
-                    ROUND(AVG(CAST(days_vacant AS INTEGER)), 1) as avg_days
-                FROM unified_units
-                WHERE unified_property_id = ?
-                  AND status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-                  AND (is_preleased IS NULL OR is_preleased != 1)
-                  AND days_vacant IS NOT NULL AND days_vacant != '' AND CAST(days_vacant AS INTEGER) > 0
-            """, (property_id,))
-            _vr = _curv.fetchone()
-            # Also get the worst offenders (top 5 longest vacant)
-            _curv.execute("""
-                SELECT unit_number, CAST(days_vacant AS INTEGER) as dv, floorplan, market_rent
-                FROM unified_units
-                WHERE unified_property_id = ?
-                  AND status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-                  AND (is_preleased IS NULL OR is_preleased != 1)
-                  AND days_vacant IS NOT NULL AND days_vacant != '' AND CAST(days_vacant AS INTEGER) > 0
-                ORDER BY dv DESC LIMIT 5
-            """, (property_id,))
-            _top = _curv.fetchall()
-            _connv.close()
-            if _vr and _vr[0] > 0:
-                property_data["vacancy_aging"] = {
-                    "total_vacant_with_days": _vr[0],
-                    "aging_buckets": {
-                        "1_to_30_days": _vr[1] or 0,
-                        "31_to_60_days": _vr[2] or 0,
-                        "61_to_90_days": _vr[3] or 0,
-                        "over_90_days": _vr[4] or 0,
-                    },
-                    "max_days_vacant": _vr[5] or 0,
-                    "avg_days_vacant": _vr[6] or 0,
-                    "longest_vacant_units": [
-                        {"unit": r[0], "days_vacant": r[1], "floorplan": r[2], "market_rent": r[3]}
-                        for r in _top
-                    ],
-                }
-        except Exception:
-            pass
-
-        # Move-out reasons
-        try:
-            import sqlite3 as _sqlite3m
-            _connm = _sqlite3m.connect(str(UNIFIED_DB_PATH))
-            _curm = _connm.cursor()
-            _curm.execute("""
-                SELECT category, SUM(category_count) as total
-                FROM unified_move_out_reasons
-                WHERE unified_property_id = ? AND resident_type = 'former'
-                GROUP BY category ORDER BY total DESC LIMIT 5
-            """, (property_id,))
-            _mrows = _curm.fetchall()
-            _connm.close()
-            if _mrows:
-                property_data["move_out_reasons"] = [{"category": r[0], "count": r[1]} for r in _mrows]
-        except Exception:
-            pass
+        _apt = ctx.get("apartments_reviews")
+        if _apt and _apt.get("rating"):
+            property_data["apartments_reviews"] = {
+                "rating": _apt.get("rating"),
+                "review_count": _apt.get("review_count", 0),
+            }
         
-        # AI-1/AI-2: Lead sources from marketing endpoint (YTD + MTD for MoM)
-        try:
-            import sqlite3 as _sqlite3ls
-            _connls = _sqlite3ls.connect(str(UNIFIED_DB_PATH))
-            _connls.row_factory = _sqlite3ls.Row
-            _curls = _connls.cursor()
-            lead_sources = {}
-            for tf in ['ytd', 'mtd']:
-                _curls.execute("""
-                    SELECT source_name, new_prospects, visits, leases, net_leases,
-                           prospect_to_lease_pct, date_range
-                    FROM unified_advertising_sources
-                    WHERE unified_property_id = ? AND timeframe_tag = ?
-                    ORDER BY new_prospects DESC
-                """, (property_id, tf))
-                _ls_rows = _curls.fetchall()
-                if _ls_rows:
-                    lead_sources[tf] = [
-                        {"source": r["source_name"], "prospects": r["new_prospects"] or 0,
-                         "visits": r["visits"] or 0, "leases": r["leases"] or 0,
-                         "net_leases": r["net_leases"] or 0,
-                         "conversion": r["prospect_to_lease_pct"] or 0}
-                        for r in _ls_rows
-                    ]
-                    lead_sources[f"{tf}_date_range"] = _ls_rows[0]["date_range"] if _ls_rows else ""
-            _connls.close()
-            if lead_sources:
-                property_data["lead_sources"] = lead_sources
-        except Exception:
-            pass
-        
-        # AI-4: Occupancy forecast (12-week projection)
-        try:
-            import sqlite3 as _sqlite3fc
-            _connfc = _sqlite3fc.connect(str(UNIFIED_DB_PATH))
-            _curfc = _connfc.cursor()
-            _normfc = property_id.replace("kairoi-", "").replace("-", "_")
-            _curfc.execute("""
-                SELECT week_ending, occupied_begin, pct_occupied_begin,
-                       scheduled_move_ins, scheduled_move_outs,
-                       occupied_end, pct_occupied_end
-                FROM unified_projected_occupancy
-                WHERE unified_property_id = ? OR unified_property_id = ?
-                ORDER BY week_ending ASC LIMIT 12
-            """, (property_id, _normfc))
-            _fc_rows = _curfc.fetchall()
-            _connfc.close()
-            if _fc_rows:
-                property_data["forecast"] = [
-                    {"week_ending": r[0], "occupied_begin": r[1], "occ_pct_begin": r[2],
-                     "move_ins": r[3], "move_outs": r[4],
-                     "occupied_end": r[5], "occ_pct_end": r[6]}
-                    for r in _fc_rows
-                ]
-        except Exception:
-            pass
-        
-        # AI-5: Unit breakdown by bedroom type (vacancy/demand analysis)
-        try:
-            import sqlite3 as _sqlite3ub
-            _connub = _sqlite3ub.connect(str(UNIFIED_DB_PATH))
-            _curub = _connub.cursor()
-            _normub = property_id.replace("kairoi-", "").replace("-", "_")
-            _curub.execute("""
-                SELECT
-                    CASE WHEN bedrooms IS NULL THEN 'Unknown'
-                         WHEN bedrooms = 0 THEN 'Studio'
-                         ELSE bedrooms || ' BR' END as bed_type,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status IN ('vacant','vacant_ready','vacant_not_ready') THEN 1 ELSE 0 END) as vacant,
-                    SUM(CASE WHEN status = 'occupied' THEN 1 ELSE 0 END) as occupied,
-                    SUM(CASE WHEN is_preleased = 1 THEN 1 ELSE 0 END) as preleased,
-                    ROUND(AVG(CASE WHEN market_rent > 0 THEN market_rent END), 0) as avg_market,
-                    ROUND(AVG(CASE WHEN in_place_rent > 0 THEN in_place_rent END), 0) as avg_in_place
-                FROM unified_units
-                WHERE unified_property_id = ? OR unified_property_id = ?
-                GROUP BY bed_type
-                ORDER BY bedrooms ASC
-            """, (property_id, _normub))
-            _ub_rows = _curub.fetchall()
-            _connub.close()
-            if _ub_rows:
-                property_data["unit_breakdown"] = [
-                    {"type": r[0], "total": r[1], "vacant": r[2], "occupied": r[3],
-                     "preleased": r[4], "avg_market_rent": r[5], "avg_in_place_rent": r[6]}
-                    for r in _ub_rows
-                ]
-        except Exception:
-            pass
+        # Vacancy aging, move-out reasons, lead sources (AI-1/AI-2),
+        # occupancy forecast (AI-4), unit breakdown by bedroom type (AI-5)
+        for name, key in (
+            ("vacancy_aging", "vacancy_aging"),
+            ("move_out_reasons", "move_out_reasons"),
+            ("lead_sources", "lead_sources"),
+            ("projected_occupancy", "forecast"),
+            ("unit_breakdown", "unit_breakdown"),
+        ):
+            if ctx.get(name):
+                property_data[key] = ctx.get(name)
         
         response = await chat_service.chat(message, property_data, history)
         return {"response": response}
@@ -3550,17 +3616,12 @@ async def get_watchpoints(property_id: str):
     GET: User-defined metric watchpoints for a property.
     Returns watchpoints with their current evaluation status.
     """
-    from app.services.watchpoint_service import (
-        get_watchpoints as _get_wps,
-        evaluate_watchpoints,
-        AVAILABLE_METRICS,
-    )
+    from app.services.watchpoint_service import evaluate_watchpoints, AVAILABLE_METRICS
     
     # Gather current metrics for evaluation
-    current_metrics = _gather_current_metrics(property_id)
+    current_metrics = await _gather_current_metrics(property_id)
     
-    wps = _get_wps(property_id)
-    evaluated = evaluate_watchpoints(property_id, current_metrics)
+    evaluated = await run_blocking(evaluate_watchpoints, property_id, current_metrics)
     
     return {
         "property_id": property_id,
@@ -3571,7 +3632,8 @@ async def get_watchpoints(property_id: str):
 
 
 @router.post("/properties/{property_id}/watchpoints")
-async def create_watchpoint(property_id: str, body: dict):
+@offload
+def create_watchpoint(property_id: str, body: dict):
     """
     POST: Create a new watchpoint for a property.
     Body: { metric, operator, threshold, label? }
@@ -3594,7 +3656,8 @@ async def create_watchpoint(property_id: str, body: dict):
 
 
 @router.delete("/properties/{property_id}/watchpoints/{watchpoint_id}")
-async def delete_watchpoint(property_id: str, watchpoint_id: str):
+@offload
+def delete_watchpoint(property_id: str, watchpoint_id: str):
     """DELETE: Remove a watchpoint."""
     from app.services.watchpoint_service import remove_watchpoint
     
@@ -3605,7 +3668,8 @@ async def delete_watchpoint(property_id: str, watchpoint_id: str):
 
 
 @router.patch("/properties/{property_id}/watchpoints/{watchpoint_id}/toggle")
-async def toggle_watchpoint_endpoint(property_id: str, watchpoint_id: str):
+@offload
+def toggle_watchpoint_endpoint(property_id: str, watchpoint_id: str):
     """PATCH: Toggle a watchpoint's enabled/disabled state."""
     from app.services.watchpoint_service import toggle_watchpoint
     
@@ -3614,113 +3678,16 @@ async def toggle_watchpoint_endpoint(property_id: str, watchpoint_id: str):
         raise HTTPException(status_code=404, detail="Watchpoint not found")
     return wp
 
+def _watchpoint_metrics(ctx) -> dict:
+    """Current metric values for watchpoint evaluation, from gathered context."""
+    kpi = ctx.get("kpis")
+    return watchpoint_metrics(kpi) if kpi else {}
+
 
-def _gather_current_metrics(property_id: str) -> dict:
+async def _gather_current_metrics(property_id: str) -> dict:
     """Collect current metric values for watchpoint evaluation."""
-    metrics = {}
-    
-    try:
-        occ = occupancy_service.get_occupancy_metrics(property_id, Timeframe.CM)
-        if occ:
-            metrics["occupancy_pct"] = occ.physical_occupancy or 0
-            metrics["vacant_units"] = occ.vacant_units or 0
-            metrics["on_notice_units"] = occ.notice_break_units or 0
-            metrics["aged_vacancy_90"] = occ.aged_vacancy_90_plus or 0
-    except Exception:
-        pass
-    
-    try:
-        import sqlite3
-        from pathlib import Path
-        db_path = UNIFIED_DB_PATH
-        _norm_d = property_id.replace("kairoi-", "").replace("-", "_") if property_id.startswith("kairoi-") else property_id
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        # Current residents only (exclude former = collections)
-        c.execute("""
-            SELECT SUM(CASE WHEN total_delinquent > 0 THEN total_delinquent ELSE 0 END),
-                   COUNT(CASE WHEN total_delinquent > 0 THEN 1 END)
-            FROM unified_delinquency
-            WHERE (unified_property_id = ? OR unified_property_id = ?)
-              AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
-        """, (property_id, _norm_d))
-        row = c.fetchone()
-        if row:
-            metrics["delinquent_total"] = row[0] or 0
-            metrics["delinquent_units"] = row[1] or 0
-        conn.close()
-    except Exception:
-        pass
-    
-    try:
-        p = pricing_service.get_unit_pricing(property_id)
-        if p and p.floorplans:
-            total_rent = sum(f.in_place_rent * f.unit_count for f in p.floorplans if f.in_place_rent)
-            total_units = sum(f.unit_count for f in p.floorplans if f.in_place_rent)
-            metrics["avg_rent"] = round(total_rent / total_units, 0) if total_units > 0 else 0
-    except Exception:
-        pass
-    
-    try:
-        import sqlite3 as _sq
-        _conn = _sq.connect(UNIFIED_DB_PATH)
-        _c = _conn.cursor()
-        # ATR from unified_units (same source as availability endpoint)
-        _norm = property_id.replace("kairoi-", "").replace("-", "_") if property_id.startswith("kairoi-") else property_id
-        _c.execute("""
-            SELECT total_units, occupied_units FROM unified_occupancy_metrics
-            WHERE unified_property_id = ? OR unified_property_id = ?
-            ORDER BY snapshot_date DESC LIMIT 1
-        """, (property_id, _norm))
-        _occ = _c.fetchone()
-        total_u = (_occ[0] or 0) if _occ else 0
-        _c.execute("""
-            SELECT
-                SUM(CASE WHEN occupancy_status IN ('vacant','vacant_ready','vacant_not_ready') THEN 1 ELSE 0 END),
-                SUM(CASE WHEN occupancy_status = 'notice' THEN 1 ELSE 0 END),
-                SUM(CASE WHEN is_preleased = 1 THEN 1 ELSE 0 END),
-                SUM(CASE WHEN status = 'down' THEN 1 ELSE 0 END)
-            FROM unified_units
-            WHERE (unified_property_id = ? OR unified_property_id = ?)
-        """, (property_id, _norm))
-        _urow = _c.fetchone()
-        _conn.close()
-        if _urow:
-            vacant = _urow[0] or 0
-            on_notice = _urow[1] or 0
-            preleased = _urow[2] or 0
-            down = _urow[3] or 0
-            atr = max(0, vacant + on_notice - preleased - down)
-            metrics["atr"] = atr
-            metrics["atr_pct"] = round(atr / total_u * 100, 1) if total_u > 0 else 0
-    except Exception:
-        pass
-    
-    # Reviews: read from caches synchronously (Google + Apartments.com)
-    try:
-        ratings = []
-        # Google reviews cache
-        from app.services.google_reviews_service import _load_reviews_cache
-        g_cache = _load_reviews_cache()
-        g_entry = g_cache.get(property_id, {}).get("data", {})
-        g_rating = g_entry.get("rating")
-        if g_rating and g_rating > 0:
-            metrics["google_rating"] = round(g_rating, 1)
-            ratings.append(g_rating)
-        # Apartments.com cache
-        from app.services.apartments_reviews_service import get_apartments_reviews
-        apt_data = get_apartments_reviews(property_id)
-        if apt_data:
-            apt_rating = apt_data.get("rating")
-            if apt_rating and apt_rating > 0:
-                ratings.append(apt_rating)
-        # Overall = average of available sources
-        if ratings:
-            metrics["overall_rating"] = round(sum(ratings) / len(ratings), 1)
-    except Exception:
-        pass
-    
-    return metrics
+    ctx = await context_engine.gather(property_id, WATCHPOINT_COLLECTORS)
+    return _watchpoint_metrics(ctx)
 
 
 # =========================================================================
@@ -3728,7 +3695,9 @@ def _gather_current_metrics(property_id: str) -> dict:
 # =========================================================================
 
 @router.get("/properties/{property_id}/financials")
-async def get_financials(property_id: str):
+@cached_response
+@offload
+def get_financials(property_id: str):
     """
     GET: Financial summary and transaction detail for a property.
     
@@ -3740,7 +3709,7 @@ async def get_financials(property_id: str):
     import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -3952,7 +3921,9 @@ async def get_financials(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/marketing")
-async def get_marketing(property_id: str, timeframe: str = "ytd"):
+@cached_response
+@offload
+def get_marketing(property_id: str, timeframe: str = "ytd"):
     """Marketing funnel data from unified_advertising_sources.
     
     timeframe: ytd | mtd | l30 | l7 — matches leasing funnel timeframes.
@@ -3965,7 +3936,7 @@ async def get_marketing(property_id: str, timeframe: str = "ytd"):
     tf_tag = 'mtd' if timeframe == 'pm' else timeframe
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -4044,12 +4015,14 @@ async def get_marketing(property_id: str, timeframe: str = "ytd"):
 # =========================================================================
 
 @router.get("/properties/{property_id}/maintenance")
-async def get_maintenance(property_id: str):
+@cached_response
+@offload
+def get_maintenance(property_id: str):
     """Make-ready pipeline + closed turns from unified_maintenance."""
     import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -4132,7 +4105,9 @@ async def get_maintenance(property_id: str):
 
 
 @router.get("/properties/{property_id}/make-ready-status")
-async def get_make_ready_status(property_id: str):
+@cached_response
+@offload
+def get_make_ready_status(property_id: str):
     """Make-ready status: all vacant unrented units with pipeline join.
     
     Cross-references unified_units (not-ready / ready) with
@@ -4142,7 +4117,7 @@ async def get_make_ready_status(property_id: str):
     from datetime import datetime, date
 
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         today = date.today()
@@ -4250,12 +4225,14 @@ async def get_make_ready_status(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/lost-rent")
-async def get_lost_rent(property_id: str):
+@cached_response
+@offload
+def get_lost_rent(property_id: str):
     """Unit-level loss-to-lease data from unified_lost_rent."""
     import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -4324,7 +4301,9 @@ async def get_lost_rent(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/move-out-reasons")
-async def get_move_out_reasons(property_id: str):
+@cached_response
+@offload
+def get_move_out_reasons(property_id: str):
     """Move-out reasons from unified_move_out_reasons.
     
     Returns category/reason breakdown for both former residents and residents on notice.
@@ -4332,7 +4311,7 @@ async def get_move_out_reasons(property_id: str):
     import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -4403,7 +4382,9 @@ async def get_move_out_reasons(property_id: str):
 # =========================================================================
 
 @router.get("/properties/{property_id}/income-statement")
-async def get_income_statement(property_id: str):
+@cached_response
+@offload
+def get_income_statement(property_id: str):
     """Revenue-side P&L from unified_income_statement (report 3836).
     
     Returns GL-level detail grouped by section/category, plus key totals.
@@ -4411,7 +4392,7 @@ async def get_income_statement(property_id: str):
     import sqlite3
     
     try:
-        conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -4513,3 +4494,145 @@ async def get_income_statement(property_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get income statement: {str(e)}")
+
+
+# ---- Dashboard bundle ----
+
+# section name -> (handler, fixed kwargs). Handlers are called fully unwrapped
+# (bypassing the response cache and @offload) against the property snapshot.
+BUNDLE_SECTIONS = {
+    "occupancy": (get_occupancy, {"timeframe": Timeframe.CM}),
+    "exposure": (get_exposure, {"timeframe": Timeframe.CM}),
+    "funnel": (get_leasing_funnel, {"timeframe": Timeframe.CM, "start_date": None, "end_date": None}),
+    "pricing": (get_pricing, {}),
+    "tradeouts": (get_tradeouts, {"days": None}),
+    "renewals": (get_renewal_leases, {"days": None, "month": None}),
+    "availability": (get_availability, {}),
+    "unit_status": (get_unit_status_breakdown, {}),
+    "snapshots": (get_occupancy_snapshots, {}),
+    "expirations": (get_expirations, {}),
+    "forecast": (get_occupancy_forecast, {"weeks": 12}),
+    "consolidated": (get_consolidated_by_bedroom, {"group_by": "bedroom"}),
+    "availability_by_floorplan": (get_availability_by_floorplan, {}),
+    "loss_to_lease": (get_loss_to_lease, {}),
+    "projected_occupancy": (get_projected_occupancy, {}),
+    "turn_time": (get_turn_time, {}),
+    "shows": (get_shows, {"days": 7}),
+    "delinquency": (get_delinquency, {}),
+    "risk_scores": (get_risk_scores, {}),
+    "amenities": (get_amenities_summary, {}),
+    "reputation": (get_reputation, {}),
+    "financials": (get_financials, {}),
+    "marketing": (get_marketing, {"timeframe": "ytd"}),
+    "maintenance": (get_maintenance, {}),
+    "make_ready": (get_make_ready_status, {}),
+    "lost_rent": (get_lost_rent, {}),
+    "move_out_reasons": (get_move_out_reasons, {}),
+    "income_statement": (get_income_statement, {}),
+}
+
+DEFAULT_BUNDLE_SECTIONS = [
+    "occupancy", "exposure", "funnel", "pricing", "availability", "unit_status",
+    "expirations", "forecast", "consolidated", "delinquency", "tradeouts",
+    "renewals", "loss_to_lease", "risk_scores", "reputation",
+]
+
+
+def _run_bundle_section(handler, property_id: str, kwargs: dict):
+    """Run one section handler; returns (data, error, elapsed_ms)."""
+    start = time.perf_counter()
+    try:
+        return handler(property_id, **kwargs), None, _elapsed_ms(start)
+    except HTTPException as e:
+        return None, str(e.detail), _elapsed_ms(start)
+    except Exception as e:
+        return None, str(e), _elapsed_ms(start)
+
+
+async def _run_async_bundle_section(handler, property_id: str, kwargs: dict):
+    start = time.perf_counter()
+    try:
+        return await handler(property_id, **kwargs), None, _elapsed_ms(start)
+    except HTTPException as e:
+        return None, str(e.detail), _elapsed_ms(start)
+    except Exception as e:
+        return None, str(e), _elapsed_ms(start)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+@router.get("/properties/{property_id}/bundle")
+async def get_property_bundle(
+    property_id: str,
+    sections: Optional[str] = Query(None, description="Comma-separated section names. Defaults to the initial dashboard panels."),
+):
+    """
+    GET: Several dashboard panels for a property in one response.
+
+    Loads the property's rows from every unified table once into an in-memory
+    snapshot, then derives each requested section from it using the same
+    handlers as the individual endpoints. A failing section is reported under
+    `errors` without failing the whole bundle. Not response-cached: the
+    reputation section reads live review APIs and a section error must not
+    outlive the request.
+
+    Returns: sections (name -> payload), errors, timings_ms (per section plus
+    snapshot load and total), and snapshot_rows (rows copied per table).
+    """
+    requested = [s.strip() for s in sections.split(",") if s.strip()] if sections else DEFAULT_BUNDLE_SECTIONS
+    unknown = [s for s in requested if s not in BUNDLE_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {unknown}. Available: {sorted(BUNDLE_SECTIONS)}",
+        )
+
+    total_start = time.perf_counter()
+    snapshot = PropertySnapshot(property_id)
+    try:
+        await run_in_threadpool(snapshot.load)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load property snapshot: {e}")
+
+    results, errors, timings = {}, {}, {"snapshot_load": snapshot.load_ms}
+
+    def _run_sync_sections():
+        out = {}
+        with snapshot.active():
+            for name in requested:
+                handler, kwargs = BUNDLE_SECTIONS[name]
+                handler = inspect.unwrap(handler)
+                if not inspect.iscoroutinefunction(handler):
+                    out[name] = _run_bundle_section(handler, property_id, kwargs)
+        return out
+
+    try:
+        # All blocking sections run back-to-back on one worker thread
+        outcomes = await run_in_threadpool(_run_sync_sections)
+        with snapshot.active():
+            for name in requested:
+                handler, kwargs = BUNDLE_SECTIONS[name]
+                handler = inspect.unwrap(handler)
+                if inspect.iscoroutinefunction(handler):
+                    outcomes[name] = await _run_async_bundle_section(handler, property_id, kwargs)
+    finally:
+        snapshot.close()
+
+    for name in requested:
+        data, error, elapsed = outcomes[name]
+        timings[name] = elapsed
+        if error is None:
+            results[name] = data
+        else:
+            errors[name] = error
+    timings["total"] = _elapsed_ms(total_start)
+
+    return {
+        "property_id": property_id,
+        "sections": results,
+        "errors": errors,
+        "timings_ms": timings,
+        "snapshot_rows": snapshot.row_counts,
+    }
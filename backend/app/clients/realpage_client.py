@@ -5,10 +5,17 @@ Implements PMSInterface for RealPage RPX Gateway.
 This client only implements GET operations. No PUT, POST, or DELETE.
 """
 import httpx
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from xml.etree import ElementTree as ET
 from app.config import get_settings
 from app.clients.pms_interface import PMSInterface, PMSType
+from app.clients.soap_stream import aiter_soap_records, element_to_dict
+
+# Record elements streamed out of the large list responses (parent, record)
+UNIT_PATHS = [("UnitList", "Unit")]
+RESIDENT_PATHS = [("residentlist", "resident"), ("ResidentList", "Resident")]
+LEASE_PATHS = [("Leases", "Lease")]
+RENTABLE_ITEM_PATHS = [("Response", "RentableItem")]
 
 
 class RealPageClient(PMSInterface):
@@ -37,7 +44,8 @@ class RealPageClient(PMSInterface):
         url: Optional[str] = None,
         pmcid: Optional[str] = None,
         siteid: Optional[str] = None,
-        licensekey: Optional[str] = None
+        licensekey: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize RealPage client.
@@ -47,12 +55,15 @@ class RealPageClient(PMSInterface):
             pmcid: PMC ID (defaults to settings)
             siteid: Site ID (defaults to settings)
             licensekey: License key (defaults to settings)
+            http_client: Shared keep-alive client, owned by the caller. Without
+                one, every request opens (and closes) its own connection.
         """
         settings = get_settings()
         self.url = url or getattr(settings, 'realpage_url', None)
         self.pmcid = pmcid or getattr(settings, 'realpage_pmcid', None)
         self.siteid = siteid or getattr(settings, 'realpage_siteid', None)
         self.licensekey = licensekey or getattr(settings, 'realpage_licensekey', None)
+        self.http_client = http_client
         
         self.headers = {
             "Content-Type": "text/xml; charset=utf-8",
@@ -88,11 +99,40 @@ class RealPageClient(PMSInterface):
             "SOAPAction": soap_action
         }
         
+        if self.http_client is not None:
+            response = await self.http_client.post(self.url, headers=headers, content=body)
+            response.raise_for_status()
+            return self._parse_xml_response(response.text)
+        
         async with httpx.AsyncClient(timeout=30.0) as client:
             response = await client.post(self.url, headers=headers, content=body)
             response.raise_for_status()
             return self._parse_xml_response(response.text)
     
+    async def _stream_records(self, soap_action: str, body: str, paths) -> AsyncIterator[dict]:
+        """
+        Send a SOAP request and yield the matching record elements one at a time
+        as the response streams in (see app.clients.soap_stream), instead of
+        parsing the whole envelope into nested dicts first.
+        """
+        headers = {
+            **self.headers,
+            "SOAPAction": soap_action
+        }
+        
+        if self.http_client is not None:
+            async with self.http_client.stream("POST", self.url, headers=headers, content=body) as response:
+                response.raise_for_status()
+                async for record in aiter_soap_records(response.aiter_bytes(), paths):
+                    yield record
+            return
+        
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            async with client.stream("POST", self.url, headers=headers, content=body) as response:
+                response.raise_for_status()
+                async for record in aiter_soap_records(response.aiter_bytes(), paths):
+                    yield record
+    
     def _parse_xml_response(self, xml_text: str) -> dict:
         """Parse SOAP XML response into a dictionary."""
         try:
@@ -108,26 +148,7 @@ class RealPageClient(PMSInterface):
     
     def _element_to_dict(self, element: ET.Element) -> dict:
         """Recursively convert XML element to dictionary."""
-        result = {}
-        
-        if element.attrib:
-            result["@attributes"] = dict(element.attrib)
-        
-        for child in element:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            child_data = self._element_to_dict(child) if len(child) > 0 else child.text
-            
-            if tag in result:
-                if not isinstance(result[tag], list):
-                    result[tag] = [result[tag]]
-                result[tag].append(child_data)
-            else:
-                result[tag] = child_data
-        
-        if element.text and element.text.strip() and not result:
-            return element.text.strip()
-        
-        return result
+        return element_to_dict(element)
     
     async def get_properties(self) -> List[dict]:
         """
@@ -163,10 +184,9 @@ class RealPageClient(PMSInterface):
         
         return properties
     
-    async def get_units_raw(self, property_id: str) -> List[dict]:
+    async def iter_units_raw(self, property_id: str) -> AsyncIterator[dict]:
         """
-        GET operation: Retrieve raw unit data from RealPage API.
-        Returns the raw unit dictionaries without transformation.
+        GET operation: Stream raw unit dictionaries from RealPage API, one at a time.
         """
         soap_action = "http://tempuri.org/IRPXService/unitlist"
         
@@ -176,43 +196,25 @@ class RealPageClient(PMSInterface):
             </tem:unitlist>
         """)
         
-        result = await self._send_request(soap_action, body)
-        
-        unit_result = result.get("unitlistResult", result)
-        unit_list = unit_result.get("UnitList", {}) if isinstance(unit_result, dict) else {}
-        unit_data = unit_list.get("Unit", []) if isinstance(unit_list, dict) else []
-        if not isinstance(unit_data, list):
-            unit_data = [unit_data] if unit_data else []
-        
-        return [u for u in unit_data if isinstance(u, dict)]
+        async for unit in self._stream_records(soap_action, body, UNIT_PATHS):
+            yield unit
+    
+    async def get_units_raw(self, property_id: str) -> List[dict]:
+        """
+        GET operation: Retrieve raw unit data from RealPage API.
+        Returns the raw unit dictionaries without transformation.
+        """
+        return [u async for u in self.iter_units_raw(property_id)]
     
     async def get_units(self, property_id: str) -> List[dict]:
         """
         GET operation: Retrieve unit information for a property.
         Maps to getUnitList API (uses unitlist action).
         """
-        soap_action = "http://tempuri.org/IRPXService/unitlist"
-        
-        body = self._build_soap_envelope(f"""
-            <tem:unitlist>
-                {self._build_auth_block()}
-            </tem:unitlist>
-        """)
-        
-        result = await self._send_request(soap_action, body)
-        
         # Transform to unified format
         # Response structure: unitlistResponse > unitlistResult > UnitList > Unit
         units = []
-        unit_result = result.get("unitlistResult", result)
-        unit_list = unit_result.get("UnitList", {}) if isinstance(unit_result, dict) else {}
-        unit_data = unit_list.get("Unit", []) if isinstance(unit_list, dict) else []
-        if not isinstance(unit_data, list):
-            unit_data = [unit_data] if unit_data else []
-        
-        for unit in unit_data:
-            if not isinstance(unit, dict):
-                continue
+        async for unit in self.iter_units_raw(property_id):
             # Map Vacant field to status: F=occupied, T=vacant
             vacant_flag = unit.get("Vacant", "F")
             status = "vacant" if vacant_flag == "T" else "occupied"
@@ -264,6 +266,14 @@ class RealPageClient(PMSInterface):
             property_id: Property identifier (uses configured siteid)
             status: Filter by status (current, future, past, notice)
         """
+        return [r async for r in self.iter_residents(property_id, status)]
+    
+    async def iter_residents(
+        self, 
+        property_id: str, 
+        status: Optional[str] = None
+    ) -> AsyncIterator[dict]:
+        """GET operation: Stream residents for a property (see get_residents)."""
         soap_action = "http://tempuri.org/IRPXService/getresidentlistinfo"
         
         # Map status filter to RealPage format: P=Pending, C=Current, F=Former, ALL=all
@@ -287,24 +297,8 @@ class RealPageClient(PMSInterface):
             </tem:getresidentlistinfo>
         """)
         
-        result = await self._send_request(soap_action, body)
-        
-        # Transform to unified format
-        # Response structure varies - need to find the resident data
-        residents = []
-        
         # Response structure: getresidentlistinfoResult > residentlist > resident (lowercase)
-        res_result = result.get("getresidentlistinfoResult", result)
-        res_list = res_result.get("residentlist", res_result.get("ResidentList", {})) if isinstance(res_result, dict) else {}
-        
-        resident_data = res_list.get("resident", res_list.get("Resident", [])) if isinstance(res_list, dict) else []
-        if not isinstance(resident_data, list):
-            resident_data = [resident_data] if resident_data else []
-        
-        for res in resident_data:
-            if not isinstance(res, dict):
-                continue
-            
+        async for res in self._stream_records(soap_action, body, RESIDENT_PATHS):
             # Skip placeholder entries without unit info
             unit_id = res.get("unitid")
             if not unit_id:
@@ -314,17 +308,8 @@ class RealPageClient(PMSInterface):
             lease_status = res.get("leasestatus", "")
             mapped_status = self._map_lease_status_to_resident_status(lease_status)
             
-            # Filter by status if provided (after mapping, not before)
-            if status:
-                status_map = {
-                    "current": "C",
-                    "future": "P",
-                    "past": "F",
-                    "notice": "C",
-                }
-                # Don't filter here since we already filtered in the API call
-            
-            residents.append({
+            # No status filtering here: the API call already filtered
+            yield {
                 "resident_id": res.get("residentmemberid") or res.get("residentid") or "",
                 "unit_id": str(unit_id),
                 "unit_number": res.get("unitnumber") or "",
@@ -337,9 +322,7 @@ class RealPageClient(PMSInterface):
                 "move_in_date": res.get("moveindate"),
                 "move_out_date": res.get("moveoutdate"),
                 "notice_date": res.get("noticegivendate") or res.get("noticefordate"),
-            })
-        
-        return residents
+            }
     
     def _map_lease_status_to_resident_status(self, lease_status: str) -> str:
         """Map RealPage leasestatus to unified resident status."""
@@ -470,6 +453,10 @@ class RealPageClient(PMSInterface):
         Returns:
             List of rentable items with pricing and availability
         """
+        return [item async for item in self.iter_rentable_items(property_id, date_needed)]
+    
+    async def iter_rentable_items(self, property_id: str, date_needed: str = None) -> AsyncIterator[dict]:
+        """GET operation: Stream rentable items one at a time (see get_rentable_items)."""
         from datetime import datetime
         
         if not date_needed:
@@ -490,49 +477,37 @@ class RealPageClient(PMSInterface):
             </tem:getrentableitems>
         """)
         
-        result = await self._send_request(soap_action, body)
-        
-        # Navigate response structure
-        items = []
-        try:
-            response = result.get("getrentableitemsResult", {})
-            response = response.get("GetRentableItemsResponse", {})
-            response = response.get("Response", {})
-            item_list = response.get("RentableItem", [])
-            
-            if not isinstance(item_list, list):
-                item_list = [item_list] if item_list else []
-            
-            for item in item_list:
-                items.append({
-                    "rid_id": item.get("RidID"),
-                    "item_name": item.get("ItemName"),
-                    "item_type": item.get("ItemType"),
-                    "description": item.get("Description"),
-                    "billing_amount": self._safe_float(item.get("BillingAmount", 0)),
-                    "frequency": item.get("Frequency"),  # M=Monthly, O=One-time
-                    "transaction_code_id": item.get("TransactionCodeID"),
-                    "in_service": item.get("InService"),
-                    "serial_number": item.get("SerialNumber"),
-                    "status": item.get("Status"),
-                    "date_available": item.get("DateAvailable"),
-                    "unit_id": item.get("UnitID"),
-                    "lease_id": item.get("LeaseID"),
-                    "resh_id": item.get("ReshID"),
-                    "resident_member_id": item.get("ResidentMemberID"),
-                    "start_date": item.get("StartDate"),
-                    "end_date": item.get("EndDate"),
-                })
-        except Exception as e:
-            print(f"Error parsing rentable items: {e}")
-        
-        return items
+        # getrentableitemsResult > GetRentableItemsResponse > Response > RentableItem
+        async for item in self._stream_records(soap_action, body, RENTABLE_ITEM_PATHS):
+            yield {
+                "rid_id": item.get("RidID"),
+                "item_name": item.get("ItemName"),
+                "item_type": item.get("ItemType"),
+                "description": item.get("Description"),
+                "billing_amount": self._safe_float(item.get("BillingAmount", 0)),
+                "frequency": item.get("Frequency"),  # M=Monthly, O=One-time
+                "transaction_code_id": item.get("TransactionCodeID"),
+                "in_service": item.get("InService"),
+                "serial_number": item.get("SerialNumber"),
+                "status": item.get("Status"),
+                "date_available": item.get("DateAvailable"),
+                "unit_id": item.get("UnitID"),
+                "lease_id": item.get("LeaseID"),
+                "resh_id": item.get("ReshID"),
+                "resident_member_id": item.get("ResidentMemberID"),
+                "start_date": item.get("StartDate"),
+                "end_date": item.get("EndDate"),
+            }
     
     async def get_leases_raw(self, property_id: str) -> List[dict]:
         """
         GET operation: Retrieve raw lease data with all fields.
         Maps to getLeaseInfo API.
         """
+        return [lease async for lease in self.iter_leases_raw(property_id)]
+    
+    async def iter_leases_raw(self, property_id: str) -> AsyncIterator[dict]:
+        """GET operation: Stream raw leases one at a time (see get_leases_raw)."""
         soap_action = "http://tempuri.org/IRPXService/getleaseinfo"
         
         body = self._build_soap_envelope(f"""
@@ -545,57 +520,41 @@ class RealPageClient(PMSInterface):
             </tem:getleaseinfo>
         """)
         
-        result = await self._send_request(soap_action, body)
-        
-        # Navigate response structure: getleaseinfoResult -> GetLeaseInfo -> Leases -> Lease
-        leases = []
-        try:
-            lease_result = result.get("getleaseinfoResult", {})
-            get_lease_info = lease_result.get("GetLeaseInfo", {})
-            leases_container = get_lease_info.get("Leases", {})
-            lease_list = leases_container.get("Lease", [])
-            
-            if not isinstance(lease_list, list):
-                lease_list = [lease_list] if lease_list else []
-            
-            for lease in lease_list:
-                leases.append({
-                    "lease_id": lease.get("LeaseID"),
-                    "resh_id": lease.get("ReshID"),
-                    "site_id": lease.get("SiteID"),
-                    "unit_id": lease.get("UnitID"),
-                    "unit_designation": lease.get("UnitDesignation"),
-                    "lease_start_date": lease.get("LeaseBeginDate"),
-                    "lease_end_date": lease.get("LeaseEndDate"),
-                    "lease_term": self._safe_int(lease.get("LeaseTerm")),
-                    "lease_term_desc": lease.get("LeaseTermDesc"),
-                    "rent_amount": self._safe_float(lease.get("Rent", 0)),
-                    "next_lease_id": lease.get("NextLeaseID"),
-                    "prior_lease_id": lease.get("PriorLeaseID"),
-                    "status": lease.get("LeaseStatus"),
-                    "status_text": lease.get("LeaseStatusText"),
-                    "type_code": lease.get("Typecode"),
-                    "type_text": lease.get("TypeText"),
-                    "move_in_date": lease.get("MoveInDate"),
-                    "sched_move_in_date": lease.get("SchedMoveInDate"),
-                    "applied_date": lease.get("AppliedDate"),
-                    "active_date": lease.get("ActiveDate"),
-                    "inactive_date": lease.get("InactiveDate"),
-                    "last_renewal_date": lease.get("LastRenewalDate"),
-                    "initial_lease_date": lease.get("InitialLeaseDate"),
-                    "bill_date": lease.get("BillDate"),
-                    "payment_due_date": lease.get("PaymentDueDate"),
-                    "current_balance": self._safe_float(lease.get("CurBal", 0)),
-                    "total_paid": self._safe_float(lease.get("TotPaid", 0)),
-                    "late_day_of_month": self._safe_int(lease.get("LateDOM")),
-                    "late_charge_pct": self._safe_float(lease.get("LCPct", 0)),
-                    "evict": lease.get("Evict"),
-                    "head_of_household_name": lease.get("HeadofHouseholdName"),
-                })
-        except Exception as e:
-            print(f"Error parsing leases: {e}")
-        
-        return leases
+        # Response structure: getleaseinfoResult -> GetLeaseInfo -> Leases -> Lease
+        async for lease in self._stream_records(soap_action, body, LEASE_PATHS):
+            yield {
+                "lease_id": lease.get("LeaseID"),
+                "resh_id": lease.get("ReshID"),
+                "site_id": lease.get("SiteID"),
+                "unit_id": lease.get("UnitID"),
+                "unit_designation": lease.get("UnitDesignation"),
+                "lease_start_date": lease.get("LeaseBeginDate"),
+                "lease_end_date": lease.get("LeaseEndDate"),
+                "lease_term": self._safe_int(lease.get("LeaseTerm")),
+                "lease_term_desc": lease.get("LeaseTermDesc"),
+                "rent_amount": self._safe_float(lease.get("Rent", 0)),
+                "next_lease_id": lease.get("NextLeaseID"),
+                "prior_lease_id": lease.get("PriorLeaseID"),
+                "status": lease.get("LeaseStatus"),
+                "status_text": lease.get("LeaseStatusText"),
+                "type_code": lease.get("Typecode"),
+                "type_text": lease.get("TypeText"),
+                "move_in_date": lease.get("MoveInDate"),
+                "sched_move_in_date": lease.get("SchedMoveInDate"),
+                "applied_date": lease.get("AppliedDate"),
+                "active_date": lease.get("ActiveDate"),
+                "inactive_date": lease.get("InactiveDate"),
+                "last_renewal_date": lease.get("LastRenewalDate"),
+                "initial_lease_date": lease.get("InitialLeaseDate"),
+                "bill_date": lease.get("BillDate"),
+                "payment_due_date": lease.get("PaymentDueDate"),
+                "current_balance": self._safe_float(lease.get("CurBal", 0)),
+                "total_paid": self._safe_float(lease.get("TotPaid", 0)),
+                "late_day_of_month": self._safe_int(lease.get("LateDOM")),
+                "late_charge_pct": self._safe_float(lease.get("LCPct", 0)),
+                "evict": lease.get("Evict"),
+                "head_of_household_name": lease.get("HeadofHouseholdName"),
+            }
     
     def _map_unit_status(self, rp_status: str) -> str:
         """Map RealPage unit status to unified status."""
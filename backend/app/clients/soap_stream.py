@@ -0,0 +1,122 @@
+"""
+Incremental SOAP record streaming for the PMS clients.
+
+``_parse_xml_response`` reads the whole response text, builds the full
+ElementTree, then converts all of it to nested dicts before a caller picks out
+the units or leases -- three copies of a large response at once.
+SoapRecordParser instead feeds the response bytes into an XMLPullParser as
+they arrive and yields one record dict at a time (same shape as
+``_element_to_dict`` produces for that element); each record element is
+cleared and detached from the tree once converted.
+
+Records are selected by the local names (namespaces ignored) of the element
+and its parent, e.g. ``("UnitList", "Unit")``.
+"""
+from typing import AsyncIterator, Iterable, Iterator, Sequence, Tuple, Union
+from xml.etree import ElementTree as ET
+
+RecordPath = Tuple[str, ...]
+
+
+def local_name(tag: str) -> str:
+    return tag.split('}')[-1] if '}' in tag else tag
+
+
+def element_to_dict(element: ET.Element):
+    """Recursively convert an XML element to a dictionary (leaf children map to their text)."""
+    result = {}
+
+    if element.attrib:
+        result["@attributes"] = dict(element.attrib)
+
+    for child in element:
+        tag = local_name(child.tag)
+        child_data = element_to_dict(child) if len(child) > 0 else child.text
+
+        if tag in result:
+            if not isinstance(result[tag], list):
+                result[tag] = [result[tag]]
+            result[tag].append(child_data)
+        else:
+            result[tag] = child_data
+
+    if element.text and element.text.strip() and not result:
+        return element.text.strip()
+
+    return result
+
+
+class SoapRecordParser:
+    """
+    Push parser: feed() response chunks, get back the records completed so far.
+
+    ``paths`` lists the accepted (parent, ..., record) local-name suffixes;
+    records nested inside another matched record are left to their parent.
+    Elements that are not dicts once converted (text-only records) are skipped,
+    as the dict-walking callers did.
+    """
+
+    def __init__(self, paths: Sequence[RecordPath]):
+        self.paths = [tuple(p) for p in paths]
+        self._record_names = {p[-1] for p in self.paths}
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack = []  # (element, local name) from the root down
+        self._depth_in_record = 0
+
+    def _matches(self, name: str) -> bool:
+        if name not in self._record_names:
+            return False
+        names = [n for _, n in self._stack]
+        return any(tuple(names[-len(p):]) == p for p in self.paths if len(p) <= len(names))
+
+    def _drain(self) -> Iterator[dict]:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                name = local_name(elem.tag)
+                self._stack.append((elem, name))
+                if self._depth_in_record or self._matches(name):
+                    self._depth_in_record += 1
+                continue
+
+            # "end"
+            self._stack.pop()
+            if not self._depth_in_record:
+                continue
+            self._depth_in_record -= 1
+            if self._depth_in_record:
+                continue  # Inside a record: keep the subtree until the record ends
+            record = element_to_dict(elem)
+            elem.clear()
+            if self._stack:
+                self._stack[-1][0].remove(elem)
+            if isinstance(record, dict):
+                yield record
+
+    def feed(self, chunk: Union[bytes, str]) -> Iterator[dict]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[dict]:
+        self._parser.close()
+        return self._drain()
+
+
+def iter_soap_records(chunks: Union[bytes, str, Iterable[Union[bytes, str]]],
+                      paths: Sequence[RecordPath]) -> Iterator[dict]:
+    """Stream records out of a complete response (bytes/str) or an iterable of chunks."""
+    parser = SoapRecordParser(paths)
+    if isinstance(chunks, (bytes, str)):
+        chunks = (chunks,)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_soap_records(chunks: AsyncIterator[bytes], paths: Sequence[RecordPath]) -> AsyncIterator[dict]:
+    """Async variant for httpx ``response.aiter_bytes()``."""
+    parser = SoapRecordParser(paths)
+    async for chunk in chunks:
+        for record in parser.feed(chunk):
+            yield record
+    for record in parser.close():
+        yield record
@@ -5,10 +5,16 @@ Implements PMSInterface for Yardi Voyager.
 This client only implements GET operations. No PUT, POST, or DELETE.
 """
 import httpx
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from xml.etree import ElementTree as ET
 from app.config import get_settings
 from app.clients.pms_interface import PMSInterface, PMSType
+from app.clients.soap_stream import aiter_soap_records, element_to_dict
+
+# Record elements streamed out of the list responses (parent, record)
+UNIT_PATHS = [("UnitInformation", "Unit")]
+RESIDENT_PATHS = [("Residents", "Resident")]
+LEASE_CHARGE_PATHS = [("LeaseCharges", "Resident")]
 
 
 class YardiClient(PMSInterface):
@@ -69,6 +75,13 @@ class YardiClient(PMSInterface):
         GET operation: Retrieve unit information for a property.
         Used for: Occupancy, Vacancy, Unit Types, Square Footage.
         """
+        return await self._send_request(
+            self.settings.yardi_resident_url, 
+            *self._unit_information_request(property_id)
+        )
+    
+    def _unit_information_request(self, property_id: str) -> Tuple[str, str]:
+        """(SOAPAction, envelope) for GetUnitInformation."""
         soap_action = "http://tempuri.org/YSI.Interfaces.WebServices/ItfResidentData/GetUnitInformation"
         
         body = f"""<?xml version="1.0" encoding="utf-8"?>
@@ -80,12 +93,7 @@ class YardiClient(PMSInterface):
         </GetUnitInformation>
     </soap:Body>
 </soap:Envelope>"""
-        
-        return await self._send_request(
-            self.settings.yardi_resident_url, 
-            soap_action, 
-            body
-        )
+        return soap_action, body
     
     async def get_residents_by_status(
         self, 
@@ -98,6 +106,13 @@ class YardiClient(PMSInterface):
         Use ^ to separate multiple statuses.
         Used for: Move-ins, Move-outs, Exposure, Renewals.
         """
+        return await self._send_request(
+            self.settings.yardi_resident_url, 
+            *self._residents_by_status_request(property_id, status)
+        )
+    
+    def _residents_by_status_request(self, property_id: str, status: str) -> Tuple[str, str]:
+        """(SOAPAction, envelope) for GetResidentsByStatus."""
         soap_action = "http://tempuri.org/YSI.Interfaces.WebServices/ItfResidentData/GetResidentsByStatus"
         
         body = f"""<?xml version="1.0" encoding="utf-8"?>
@@ -111,18 +126,20 @@ class YardiClient(PMSInterface):
         </GetResidentsByStatus>
     </soap:Body>
 </soap:Envelope>"""
-        
-        return await self._send_request(
-            self.settings.yardi_resident_url, 
-            soap_action, 
-            body
-        )
+        return soap_action, body
     
     async def get_resident_lease_charges(self, property_id: str) -> dict:
         """
         GET operation: Retrieve lease charges for residents.
         Used for: In-Place Effective Rent, Lease Charges.
         """
+        return await self._send_request(
+            self.settings.yardi_resident_url, 
+            *self._lease_charges_request(property_id)
+        )
+    
+    def _lease_charges_request(self, property_id: str) -> Tuple[str, str]:
+        """(SOAPAction, envelope) for GetResidentLeaseCharges_Login."""
         soap_action = "http://tempuri.org/YSI.Interfaces.WebServices/ItfResidentData/GetResidentLeaseCharges_Login"
         
         body = f"""<?xml version="1.0" encoding="utf-8"?>
@@ -134,12 +151,7 @@ class YardiClient(PMSInterface):
         </GetResidentLeaseCharges_Login>
     </soap:Body>
 </soap:Envelope>"""
-        
-        return await self._send_request(
-            self.settings.yardi_resident_url, 
-            soap_action, 
-            body
-        )
+        return soap_action, body
     
     async def get_available_units(self, property_id: str) -> dict:
         """
@@ -213,6 +225,22 @@ class YardiClient(PMSInterface):
             
             return self._parse_xml_response(response.text)
     
+    async def _stream_records(self, url: str, soap_action: str, body: str, paths) -> AsyncIterator[dict]:
+        """
+        Send a SOAP request and yield the matching record elements one at a time
+        as the response streams in (see app.clients.soap_stream).
+        """
+        headers = {
+            **self.headers,
+            "SOAPAction": soap_action
+        }
+        
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            async with client.stream("POST", url, headers=headers, content=body) as response:
+                response.raise_for_status()
+                async for record in aiter_soap_records(response.aiter_bytes(), paths):
+                    yield record
+    
     def _parse_xml_response(self, xml_text: str) -> dict:
         """Parse SOAP XML response into a dictionary."""
         try:
@@ -234,26 +262,7 @@ class YardiClient(PMSInterface):
     
     def _element_to_dict(self, element: ET.Element) -> dict:
         """Recursively convert XML element to dictionary."""
-        result = {}
-        
-        if element.attrib:
-            result["@attributes"] = dict(element.attrib)
-        
-        for child in element:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            child_data = self._element_to_dict(child) if len(child) > 0 else child.text
-            
-            if tag in result:
-                if not isinstance(result[tag], list):
-                    result[tag] = [result[tag]]
-                result[tag].append(child_data)
-            else:
-                result[tag] = child_data
-        
-        if element.text and element.text.strip() and not result:
-            return element.text.strip()
-        
-        return result
+        return element_to_dict(element)
     
     # =========================================================================
     # PMSInterface Implementation Methods
@@ -285,14 +294,10 @@ class YardiClient(PMSInterface):
         GET operation: Retrieve unit information for a property.
         Maps to GetUnitInformation API.
         """
-        result = await self.get_unit_information(property_id)
-        
         units = []
-        unit_list = result.get("UnitInformation", {}).get("Unit", [])
-        if not isinstance(unit_list, list):
-            unit_list = [unit_list] if unit_list else []
-        
-        for unit in unit_list:
+        async for unit in self._stream_records(
+            self.settings.yardi_resident_url, *self._unit_information_request(property_id), UNIT_PATHS
+        ):
             status = self._map_unit_status(unit.get("UnitStatus", ""))
             units.append({
                 "unit_id": unit.get("UnitCode", ""),
@@ -320,14 +325,11 @@ class YardiClient(PMSInterface):
         """
         # Map unified status to Yardi status filter
         yardi_status = self._map_resident_status_filter(status)
-        result = await self.get_residents_by_status(property_id, yardi_status)
-        
         residents = []
-        res_list = result.get("Residents", {}).get("Resident", [])
-        if not isinstance(res_list, list):
-            res_list = [res_list] if res_list else []
-        
-        for res in res_list:
+        async for res in self._stream_records(
+            self.settings.yardi_resident_url, *self._residents_by_status_request(property_id, yardi_status),
+            RESIDENT_PATHS,
+        ):
             residents.append({
                 "resident_id": res.get("ResidentCode", ""),
                 "unit_id": res.get("UnitCode", ""),
@@ -375,14 +377,10 @@ class YardiClient(PMSInterface):
         GET operation: Retrieve lease/charge information.
         Maps to GetResidentLeaseCharges_Login API.
         """
-        result = await self.get_resident_lease_charges(property_id)
-        
         leases = []
-        lease_list = result.get("LeaseCharges", {}).get("Resident", [])
-        if not isinstance(lease_list, list):
-            lease_list = [lease_list] if lease_list else []
-        
-        for lease in lease_list:
+        async for lease in self._stream_records(
+            self.settings.yardi_resident_url, *self._lease_charges_request(property_id), LEASE_CHARGE_PATHS
+        ):
             leases.append({
                 "resident_id": lease.get("ResidentCode", ""),
                 "unit_id": lease.get("UnitCode", ""),
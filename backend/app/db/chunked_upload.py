@@ -0,0 +1,267 @@
+"""
+Chunked, compressed, resumable uploads for the admin ingestion API.
+
+A single multipart POST of a whole database means a flaky link during the
+GitHub Actions push re-sends everything. Uploads now go in three steps:
+
+1. POST /admin/uploads opens a session for (kind, name, size, sha256,
+   chunk_size). The session id is derived from those, so a re-run of the
+   push after a failure lands on the same session; the response lists the
+   chunk offsets already received.
+2. PUT /admin/uploads/{id}/chunks?offset=...&sha256=...&encoding=... sends
+   one chunk, compressed with zstd or gzip (or identity). The server
+   decompresses it (never past the chunk's expected length), checks the
+   chunk's SHA-256 and writes it at its offset in a staging file. Chunks may
+   arrive in any order and in parallel.
+3. POST /admin/uploads/{id}/complete checks that every chunk arrived and
+   that the staged file hashes to the session's SHA-256; admin.py then
+   verifies (PRAGMA integrity_check for databases) and swaps it in.
+
+Sessions live under DB_DIR/.uploads (the staged bytes plus an append-only
+log of received offsets), so they survive a server restart; sessions idle
+for SESSION_TTL_SECONDS are purged.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+from app.db import schema
+
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 8 * 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+SESSION_TTL_SECONDS = 24 * 3600
+
+ENCODINGS = ("zstd", "gzip", "identity") if zstandard else ("gzip", "identity")
+
+
+class UploadError(Exception):
+    """A request the upload protocol rejects; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+
+def decompress(payload: bytes, encoding: str, max_size: int) -> bytes:
+    """Decompress one chunk, refusing to produce more than ``max_size`` bytes."""
+    if encoding not in ENCODINGS:
+        raise UploadError(415, f"Unsupported encoding {encoding!r}. Use: {list(ENCODINGS)}")
+    try:
+        if encoding == "zstd":
+            # max_output_size only bounds frames without a content size (compress()
+            # always writes one), so check the declared size before allocating it
+            declared = zstandard.frame_content_size(payload)
+            if declared > max_size:
+                raise UploadError(400, f"Chunk decompresses past its expected {max_size} bytes")
+            data = zstandard.ZstdDecompressor().decompress(payload, max_output_size=max_size + 1)
+        elif encoding == "gzip":
+            d = zlib.decompressobj(wbits=31)
+            data = d.decompress(payload, max_size + 1)
+        else:
+            data = payload
+    except UploadError:
+        raise
+    except Exception as e:
+        raise UploadError(400, f"Corrupt {encoding} chunk: {e}")
+    if len(data) > max_size:
+        raise UploadError(400, f"Chunk decompresses past its expected {max_size} bytes")
+    return data
+
+
+def session_id(kind: str, name: str, size: int, sha256: str, chunk_size: int) -> str:
+    key = f"{kind}:{name}:{size}:{sha256}:{chunk_size}"
+    return hashlib.sha256(key.encode()).hexdigest()[:24]
+
+
+class UploadSession:
+    """One upload being assembled in ``<id>.part``; received offsets are logged in ``<id>.log``."""
+
+    def __init__(self, directory: Path, meta: dict):
+        self.meta = meta
+        self.id = meta["id"]
+        self.size = meta["size"]
+        self.chunk_size = meta["chunk_size"]
+        self.part_path = directory / f"{self.id}.part"
+        self.meta_path = directory / f"{self.id}.json"
+        self.log_path = directory / f"{self.id}.log"
+        self.received: Set[int] = set()
+        self.lock = threading.Lock()
+        if self.log_path.exists():
+            self.received = {int(line) for line in self.log_path.read_text().split()}
+
+    @property
+    def offsets(self) -> range:
+        return range(0, self.size, self.chunk_size) if self.size else range(0, 1)
+
+    def expected_length(self, offset: int) -> int:
+        if offset not in self.offsets:
+            raise UploadError(400, f"Offset {offset} is not a chunk boundary of this upload")
+        return min(self.chunk_size, self.size - offset)
+
+    def missing(self) -> list:
+        return [o for o in self.offsets if o not in self.received]
+
+    def touch(self):
+        os.utime(self.meta_path)
+
+
+class UploadSessions:
+    """Open, fill and finish upload sessions under one staging directory."""
+
+    def __init__(self, dir_getter: Callable[[], Path]):
+        self._dir_getter = dir_getter
+        self._sessions: Dict[str, UploadSession] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._dir_getter())
+
+    def open(self, kind: str, name: str, size: int, sha256: str, chunk_size: int = CHUNK_SIZE,
+             params: Optional[dict] = None) -> UploadSession:
+        """Start a session, or resume the one with the same kind/name/size/hash/chunk size."""
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise UploadError(400, f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+        if size < 0 or len(sha256) != 64:
+            raise UploadError(400, "size and a hex SHA-256 are required")
+        self.purge_stale()
+        sid = session_id(kind, name, size, sha256, chunk_size)
+        with self._lock:
+            session = self._load(sid)
+            if session is None:
+                directory = self.directory
+                directory.mkdir(parents=True, exist_ok=True)
+                meta = {
+                    "id": sid, "kind": kind, "name": name, "size": size, "sha256": sha256,
+                    "chunk_size": chunk_size, "params": params or {}, "created_at": time.time(),
+                }
+                session = UploadSession(directory, meta)
+                with open(session.part_path, "wb") as f:
+                    f.truncate(size)
+                session.meta_path.write_text(json.dumps(meta))
+                self._sessions[sid] = session
+            else:
+                # Params (e.g. a delta's base) may differ on a retry; the latest call wins
+                session.meta["params"] = params or {}
+                session.meta_path.write_text(json.dumps(session.meta))
+        return session
+
+    def get(self, sid: str) -> UploadSession:
+        with self._lock:
+            session = self._load(sid)
+        if session is None:
+            raise UploadError(404, f"Unknown upload {sid}")
+        return session
+
+    def write_chunk(self, sid: str, offset: int, payload: bytes, encoding: str, chunk_sha256: str) -> int:
+        """Verify and store one chunk; returns how many chunks are still missing."""
+        session = self.get(sid)
+        length = session.expected_length(offset)
+        data = decompress(payload, encoding, length)
+        if len(data) != length:
+            raise UploadError(400, f"Chunk at {offset} is {len(data)} bytes, expected {length}")
+        if hashlib.sha256(data).hexdigest() != chunk_sha256:
+            raise UploadError(422, f"Chunk at {offset} failed its SHA-256 check")
+        fd = os.open(session.part_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, data, offset)
+        finally:
+            os.close(fd)
+        with session.lock:
+            if offset not in session.received:
+                with open(session.log_path, "a") as log:
+                    log.write(f"{offset}\n")
+                session.received.add(offset)
+            missing = len(session.missing())
+        session.touch()
+        return missing
+
+    def finish(self, sid: str) -> UploadSession:
+        """Check completeness and the whole-file SHA-256; the staged file is ``session.part_path``."""
+        session = self.get(sid)
+        missing = session.missing()
+        if missing:
+            raise UploadError(409, f"{len(missing)} chunks missing (first at offset {missing[0]})")
+        digest = hashlib.sha256()
+        with open(session.part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        if digest.hexdigest() != session.meta["sha256"]:
+            # The staged bytes are unusable: start over on the next open()
+            self.discard(sid)
+            raise UploadError(422, "Assembled file failed its SHA-256 check; upload discarded")
+        return session
+
+    def discard(self, sid: str):
+        with self._lock:
+            session = self._sessions.pop(sid, None) or self._load(sid, cache=False)
+        if session is None:
+            return
+        for path in (session.part_path, session.meta_path, session.log_path):
+            if path.exists():
+                path.unlink()
+
+    def purge_stale(self, max_age: float = SESSION_TTL_SECONDS) -> int:
+        directory = self.directory
+        if not directory.exists():
+            return 0
+        cutoff = time.time() - max_age
+        purged = 0
+        for meta_path in directory.glob("*.json"):
+            if meta_path.stat().st_mtime < cutoff:
+                self.discard(meta_path.stem)
+                purged += 1
+        if purged:
+            logger.info(f"[UPLOADS] Purged {purged} stale upload sessions")
+        return purged
+
+    def stats(self) -> dict:
+        directory = self.directory
+        sessions = []
+        for meta_path in sorted(directory.glob("*.json")) if directory.exists() else []:
+            session = self._load(meta_path.stem, cache=False)
+            if session:
+                sessions.append({
+                    "id": session.id, "kind": session.meta["kind"], "name": session.meta["name"],
+                    "size": session.size, "received": len(session.received), "chunks": len(session.offsets),
+                })
+        return {"encodings": list(ENCODINGS), "sessions": sessions}
+
+    def _load(self, sid: str, cache: bool = True) -> Optional[UploadSession]:
+        """Session from memory, or from its files after a restart (call under self._lock)."""
+        session = self._sessions.get(sid)
+        if session is not None and session.meta_path.exists():
+            return session
+        self._sessions.pop(sid, None)
+        meta_path = self.directory / f"{sid}.json"
+        if not sid.isalnum() or not meta_path.exists():
+            return None
+        session = UploadSession(self.directory, json.loads(meta_path.read_text()))
+        if cache:
+            self._sessions[sid] = session
+        return session
+
+
+upload_sessions = UploadSessions(lambda: schema.DB_DIR / ".uploads")
@@ -0,0 +1,169 @@
+"""
+Page-level deltas for deploying SQLite files (push_to_deployed.py -> /admin).
+
+A SQLite file is an array of fixed-size pages, and an incremental sync (see
+incremental_sync.py) leaves most of them byte-identical from one run to the
+next. Instead of uploading the whole file every run:
+
+1. the server reports a manifest of the file it is serving: whole-file
+   SHA-256 (its content generation), page size and one hash per page
+   (GET /admin/db-manifest)
+2. the client hashes its own file the same way and sends only the pages
+   whose hash differs, plus the new page count (build_delta)
+3. the server checks that it still serves the manifest's generation, applies
+   the pages to a copy of the file, truncates it to the new length and
+   checks the result hashes to the client's whole-file SHA-256 before it is
+   swapped in (apply_delta) — a delta either reproduces the client's file
+   exactly or is rejected, and the live file is never written in place.
+
+Delta wire format: a sequence of records, each a 4-byte big-endian page
+number followed by page_size bytes of page content.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+PAGE_HASH_BYTES = 16
+_PAGE_NO = struct.Struct(">I")
+
+# Above this share of the file, send the whole file instead of a delta
+MAX_DELTA_RATIO = 0.6
+
+
+class DeltaError(Exception):
+    """The delta does not apply to this base, or does not reproduce the target."""
+
+
+def sqlite_page_size(path: Path) -> int:
+    """Page size from the SQLite header (offset 16, big-endian; 1 means 65536)."""
+    with open(path, "rb") as f:
+        header = f.read(100)
+    if not header.startswith(b"SQLite format 3\x00"):
+        raise DeltaError(f"{Path(path).name} is not a SQLite database")
+    size = struct.unpack(">H", header[16:18])[0]
+    return 65536 if size == 1 else size
+
+
+def checkpoint(path: Path):
+    """Fold a -wal file into the main file, so the file alone is the whole database."""
+    if Path(f"{path}-wal").exists():
+        conn = sqlite3.connect(str(path))
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+
+
+def file_manifest(path: Path) -> Dict:
+    """{"sha256", "size", "page_size", "page_count", "pages": [hex hash per page]} in one read."""
+    page_size = sqlite_page_size(path)
+    whole = hashlib.sha256()
+    pages: List[str] = []
+    with open(path, "rb") as f:
+        while True:
+            page = f.read(page_size)
+            if not page:
+                break
+            whole.update(page)
+            pages.append(hashlib.blake2b(page, digest_size=PAGE_HASH_BYTES).hexdigest())
+    return {
+        "sha256": whole.hexdigest(),
+        "size": os.path.getsize(path),
+        "page_size": page_size,
+        "page_count": len(pages),
+        "pages": pages,
+    }
+
+
+def build_delta(path: Path, remote: Dict, out: BinaryIO, local: Optional[Dict] = None) -> Tuple[Dict, int]:
+    """
+    Write the pages of ``path`` that differ from the ``remote`` manifest to ``out``.
+    Returns (local manifest, pages written). Raises DeltaError if the page sizes differ.
+    """
+    local = local or file_manifest(path)
+    if local["page_size"] != remote["page_size"]:
+        raise DeltaError(f"page size changed ({remote['page_size']} -> {local['page_size']})")
+    remote_pages = remote["pages"]
+    page_size = local["page_size"]
+    written = 0
+    with open(path, "rb") as f:
+        for page_no, digest in enumerate(local["pages"]):
+            if page_no < len(remote_pages) and remote_pages[page_no] == digest:
+                continue
+            f.seek(page_no * page_size)
+            out.write(_PAGE_NO.pack(page_no))
+            out.write(f.read(page_size))
+            written += 1
+    return local, written
+
+
+def apply_delta(
+    base_path: Path,
+    delta: BinaryIO,
+    out_path: Path,
+    page_size: int,
+    page_count: int,
+    expected_sha256: str,
+) -> int:
+    """
+    Copy ``base_path`` to ``out_path`` and apply ``delta`` to the copy.
+    Returns the pages applied; raises DeltaError (and removes out_path) unless
+    the result hashes to ``expected_sha256``.
+    """
+    if sqlite_page_size(base_path) != page_size:
+        raise DeltaError("page size does not match the served file")
+    shutil.copyfile(base_path, out_path)
+    applied = 0
+    try:
+        with open(out_path, "r+b") as f:
+            while True:
+                head = delta.read(_PAGE_NO.size)
+                if not head:
+                    break
+                page = delta.read(page_size)
+                if len(head) != _PAGE_NO.size or len(page) != page_size:
+                    raise DeltaError("truncated delta")
+                page_no = _PAGE_NO.unpack(head)[0]
+                if page_no >= page_count:
+                    raise DeltaError(f"page {page_no} is past the new end of file ({page_count} pages)")
+                f.seek(page_no * page_size)
+                f.write(page)
+                applied += 1
+            f.truncate(page_count * page_size)
+            f.flush()
+            os.fsync(f.fileno())
+        actual = file_sha256(out_path)
+        if actual != expected_sha256:
+            raise DeltaError(f"patched file hash {actual[:12]} does not match {expected_sha256[:12]}")
+    except BaseException:
+        if out_path.exists():
+            out_path.unlink()
+        raise
+    return applied
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_manifests: Dict[str, Tuple[tuple, Dict]] = {}
+
+
+def cached_manifest(path: Path) -> Dict:
+    """file_manifest(), recomputed only when the file's inode, mtime or size changes."""
+    st = os.stat(path)
+    signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _manifests.get(str(path))
+    if cached and cached[0] == signature:
+        return cached[1]
+    manifest = file_manifest(path)
+    _manifests[str(path)] = (signature, manifest)
+    return manifest
@@ -0,0 +1,127 @@
+"""
+Sized executor for blocking DB / file work called from async handlers.
+
+An ``async def`` route that runs sqlite3 queries or reads JSON caches inline
+blocks the event loop: while one slow watchlist query runs, no other
+request is served. Handlers that only do blocking work are written as plain
+functions and decorated with ``@offload``, which makes them awaitable and
+runs their body on ``db_executor``. Async handlers that mix awaits with
+blocking reads call ``await run_blocking(func, ...)`` for the blocking part.
+
+The executor is deliberately bounded (DB_EXECUTOR_WORKERS): each worker
+thread keeps its own pooled unified.db connections (see app.db.pool), so a
+fixed set of long-lived threads gets near-100% pool hits, and a burst of
+requests queues here instead of opening hundreds of SQLite connections.
+
+ContextVars are copied into the worker, so a property bundle's snapshot
+override (``override_unified_source``) still applies to offloaded work.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_EXECUTOR_WORKERS = int(os.environ.get("DB_EXECUTOR_WORKERS", "16"))
+
+
+class BlockingExecutor:
+    """Lazily created thread pool plus queue-wait / run-time counters."""
+
+    def __init__(self, max_workers: int = DB_EXECUTOR_WORKERS):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._active = 0
+        self._peak_active = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._run_ms_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="db"
+                    )
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` on the executor and await the result."""
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+
+        def _call():
+            started_at = time.perf_counter()
+            wait_ms = (started_at - submitted_at) * 1000
+            with self._lock:
+                self._active += 1
+                self._peak_active = max(self._peak_active, self._active)
+                self._wait_ms_total += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+            try:
+                return ctx.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._run_ms_total += (time.perf_counter() - started_at) * 1000
+
+        return await loop.run_in_executor(self._get_executor(), _call)
+
+    def reset_stats(self):
+        """Start the counters over; work still queued or running stays counted."""
+        with self._lock:
+            self._submitted -= self._completed
+            self._completed = 0
+            self._peak_active = self._active
+            self._wait_ms_total = self._wait_ms_max = self._run_ms_total = 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": done,
+                "active": self._active,
+                "queued": self._submitted - done - self._active,
+                "peak_active": self._peak_active,
+                "avg_wait_ms": round(self._wait_ms_total / done, 2) if done else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 2),
+                "avg_run_ms": round(self._run_ms_total / done, 2) if done else 0.0,
+            }
+
+
+db_executor = BlockingExecutor()
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """Await a blocking call without stalling the event loop."""
+    return await db_executor.run(func, *args, **kwargs)
+
+
+def offload(func):
+    """
+    Turn a blocking function into a coroutine function that runs on db_executor.
+
+    The signature is preserved (via ``__wrapped__``), so it works as a FastAPI
+    endpoint and composes with ``@cached_response`` — place ``@offload``
+    closest to the ``def`` so cache hits never touch the executor.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await db_executor.run(func, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,398 @@
+"""
+Incremental, change-detecting writes for the rebuilt unified tables.
+
+Most RealPage sync_* functions used to start with ``DELETE FROM unified_<table>``
+and re-insert every row, even when only a couple of properties received new
+reports. They now hand their rows to a UnifiedTableWriter instead:
+
+- Full mode (the default, and any standalone call): the table (or its scope,
+  e.g. ``pms_source = 'realpage'``) is replaced with one executemany, as before.
+- Incremental mode (``SyncRun(incremental=True)``): tables built only from
+  reports are rebuilt just for the properties that had one of their report
+  types imported since the last completed run (SyncRun.rebuild_scope(), from
+  realpage_report_import_log); the other properties' rows are neither read
+  nor written. Rebuilt rows are grouped per property and hashed (ignoring
+  VOLATILE_COLUMNS, which are stamped per run) as a second check: properties
+  whose hash matches unified_sync_state are not touched at all; for the rest,
+  the stored rows are diffed against the new ones as multisets and only the
+  missing rows are inserted / the stale rows deleted, so unchanged rows keep
+  their ids.
+
+Every run is recorded in unified_sync_runs, and every (table, property) it
+changed in unified_sync_manifest, together with the realpage_report_import_log
+file IDs imported for that property since the previous run. The manifest
+travels inside unified.db, so downstream consumers (deploy, caches) can
+invalidate exactly what changed: see load_sync_manifest().
+"""
+import hashlib
+import json
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.db.iso_dates import DATE_COLUMNS, ensure_iso_date_columns, iso_column, to_iso_date
+
+STATE_TABLE = "unified_sync_state"
+RUNS_TABLE = "unified_sync_runs"
+MANIFEST_TABLE = "unified_sync_manifest"
+
+# Stamped with the run time on every write; excluded from change detection
+VOLATILE_COLUMNS = frozenset({"synced_at", "snapshot_date"})
+
+# Runs whose manifest is retained
+MANIFEST_KEEP_RUNS = 30
+
+SYNC_TABLES_SQL = f"""
+CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+    table_name TEXT NOT NULL,
+    unified_property_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    sync_id TEXT,
+    PRIMARY KEY (table_name, unified_property_id)
+);
+CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+    sync_id TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    import_log_id INTEGER,
+    started_at TEXT,
+    completed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sync_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    unified_property_id TEXT NOT NULL,
+    rows_inserted INTEGER NOT NULL,
+    rows_deleted INTEGER NOT NULL,
+    file_ids TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_{MANIFEST_TABLE}_sync ON {MANIFEST_TABLE}(sync_id);
+"""
+
+
+def ensure_sync_tables(conn: sqlite3.Connection):
+    """Create the sync state / run / manifest tables if missing (without committing)."""
+    for statement in SYNC_TABLES_SQL.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def content_hash(rows: Iterable[tuple]) -> str:
+    """Order-insensitive digest of a property's rows."""
+    digest = hashlib.sha256()
+    for line in sorted(repr(r) for r in rows):
+        digest.update(line.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass
+class SyncRun:
+    """
+    One sync pass: mode, id, and the import-log file IDs it covers.
+
+    ``file_ids`` maps unified_property_id -> report file IDs logged in
+    realpage_report_import_log since the previous run (see begin()), and
+    ``report_types`` the report types those files were imported as.
+    """
+    incremental: bool = False
+    sync_id: str = field(default_factory=lambda: datetime.now().isoformat())
+    import_log_id: Optional[int] = None
+    file_ids: Dict[str, List[str]] = field(default_factory=dict)
+    report_types: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def begin(self, uni_conn: sqlite3.Connection, rp_conn: sqlite3.Connection, site_to_unified: Dict[str, str]):
+        """Record the run and collect file IDs imported since the last completed run."""
+        ensure_sync_tables(uni_conn)
+        row = uni_conn.execute(
+            f"SELECT MAX(import_log_id) FROM {RUNS_TABLE} WHERE completed_at IS NOT NULL"
+        ).fetchone()
+        since = row[0] or 0
+        try:
+            logged = rp_conn.execute("""
+                SELECT property_id, file_id, report_type FROM realpage_report_import_log
+                WHERE id > ? AND file_id IS NOT NULL
+                ORDER BY id
+            """, (since,)).fetchall()
+            self.import_log_id = rp_conn.execute(
+                "SELECT MAX(id) FROM realpage_report_import_log"
+            ).fetchone()[0] or since
+        except sqlite3.Error:
+            logged = []
+            self.import_log_id = since
+        for site_id, file_id, report_type in logged:
+            unified_id = site_to_unified.get(site_id)
+            if not unified_id:
+                continue
+            if file_id not in self.file_ids.get(unified_id, ()):
+                self.file_ids.setdefault(unified_id, []).append(file_id)
+            # Timeframe variants are logged as "<report_type>:<tag>"
+            self.report_types.setdefault(unified_id, set()).add((report_type or "").split(":")[0])
+        uni_conn.execute(
+            f"INSERT OR REPLACE INTO {RUNS_TABLE} (sync_id, mode, import_log_id, started_at) VALUES (?, ?, ?, ?)",
+            (self.sync_id, "incremental" if self.incremental else "full", self.import_log_id, self.sync_id),
+        )
+        uni_conn.commit()
+
+    def rebuild_scope(self, uni_conn: sqlite3.Connection, table: str,
+                      report_types: Iterable[str]) -> Optional[Set[str]]:
+        """
+        Properties whose ``table`` rows must be rebuilt, for a table built only
+        from ``report_types``; None means every property.
+
+        Full runs, and tables with no recorded state yet, rebuild everything.
+        Otherwise only properties with a file of one of ``report_types``
+        imported since the last completed run are rebuilt.
+        """
+        if not self.incremental:
+            return None
+        ensure_sync_tables(uni_conn)
+        if uni_conn.execute(f"SELECT 1 FROM {STATE_TABLE} WHERE table_name = ? LIMIT 1", (table,)).fetchone() is None:
+            return None
+        wanted = set(report_types)
+        return {pid for pid, types in self.report_types.items() if types & wanted}
+
+    def complete(self, uni_conn: sqlite3.Connection):
+        """Mark the run completed and prune manifests beyond MANIFEST_KEEP_RUNS."""
+        uni_conn.execute(
+            f"UPDATE {RUNS_TABLE} SET completed_at = ? WHERE sync_id = ?",
+            (datetime.now().isoformat(), self.sync_id),
+        )
+        keep = f"SELECT sync_id FROM {RUNS_TABLE} ORDER BY started_at DESC LIMIT {MANIFEST_KEEP_RUNS}"
+        uni_conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE sync_id NOT IN ({keep})")
+        uni_conn.execute(f"DELETE FROM {RUNS_TABLE} WHERE sync_id NOT IN ({keep})")
+        uni_conn.commit()
+
+
+@dataclass
+class WriteResult:
+    inserted: int = 0
+    deleted: int = 0
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> str:
+        return (f"{len(self.changed)} properties changed (+{self.inserted}/-{self.deleted} rows), "
+                f"{self.unchanged} unchanged")
+
+
+class UnifiedTableWriter:
+    """
+    Collects a sync function's rows for one unified table and writes them on finish().
+
+    ``columns`` is the insert column list and must include unified_property_id;
+    ``scope`` is an optional extra WHERE clause limiting which existing rows the
+    writer owns (e.g. ``"pms_source = 'realpage'"`` where Yardi shares the table).
+    ``properties`` (see SyncRun.rebuild_scope()) limits the write to those
+    properties: rows for others are ignored and their stored rows kept.
+    Raw date columns listed in iso_dates.DATE_COLUMNS get their ``<col>_iso``
+    sibling appended to every row.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: Sequence[str],
+        run: Optional[SyncRun] = None,
+        scope: str = "",
+        properties: Optional[Set[str]] = None,
+    ):
+        self.conn = conn
+        self.table = table
+        self.properties = properties
+        self._iso_index = [i for i, c in enumerate(columns) if c in DATE_COLUMNS.get(table, ())]
+        self.columns = list(columns) + [iso_column(columns[i]) for i in self._iso_index]
+        self.run = run or SyncRun()
+        self.scope = f" AND ({scope})" if scope else ""
+        self._pid_index = self.columns.index("unified_property_id")
+        self._content_index = [i for i, c in enumerate(self.columns) if c not in VOLATILE_COLUMNS]
+        self._rows: Dict[str, List[tuple]] = defaultdict(list)
+        self._order: List[tuple] = []
+
+    def add(self, row: Sequence):
+        row = tuple(row) + tuple(to_iso_date(row[i]) for i in self._iso_index)
+        if self.properties is not None and row[self._pid_index] not in self.properties:
+            return
+        self._rows[row[self._pid_index]].append(row)
+        self._order.append(row)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _content(self, row: tuple) -> tuple:
+        return tuple(row[i] for i in self._content_index)
+
+    def _insert_sql(self) -> str:
+        return (f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+                f"VALUES ({', '.join('?' * len(self.columns))})")
+
+    def finish(self) -> WriteResult:
+        ensure_sync_tables(self.conn)
+        if self._iso_index:
+            ensure_iso_date_columns(self.conn)
+        hashes = {pid: content_hash(map(self._content, rows)) for pid, rows in self._rows.items()}
+        if self.run.incremental:
+            result = self._write_incremental(hashes)
+        else:
+            result = self._write_full()
+        self._record(hashes, result)
+        return result
+
+    # ---- Full rebuild ----
+
+    def _write_full(self) -> WriteResult:
+        previous = dict(self.conn.execute(
+            f"SELECT unified_property_id, COUNT(*) FROM {self.table} WHERE 1=1{self.scope} "
+            f"GROUP BY unified_property_id"
+        ).fetchall())
+        if self.properties is None:
+            self.conn.execute(f"DELETE FROM {self.table} WHERE 1=1{self.scope}")
+        else:
+            previous = {pid: n for pid, n in previous.items() if pid in self.properties}
+            self.conn.executemany(
+                f"DELETE FROM {self.table} WHERE unified_property_id = ?{self.scope}",
+                [(pid,) for pid in previous],
+            )
+        self.conn.executemany(self._insert_sql(), self._order)
+        result = WriteResult(inserted=len(self._order), deleted=sum(previous.values()))
+        result.changed = sorted(set(previous) | set(self._rows))
+        self._deltas = {
+            pid: (len(self._rows.get(pid, ())), previous.get(pid, 0)) for pid in result.changed
+        }
+        return result
+
+    # ---- Incremental diff ----
+
+    def _write_incremental(self, hashes: Dict[str, str]) -> WriteResult:
+        stored = dict(self.conn.execute(
+            f"SELECT unified_property_id, content_hash FROM {STATE_TABLE} WHERE table_name = ?",
+            (self.table,),
+        ).fetchall())
+        present = {r[0] for r in self.conn.execute(
+            f"SELECT DISTINCT unified_property_id FROM {self.table} WHERE 1=1{self.scope}"
+        )}
+        result = WriteResult()
+        self._deltas = {}
+        candidates = set(hashes) | set(stored) | present
+        if self.properties is not None:
+            # Properties outside the rebuild scope were not read: keep them as stored
+            result.unchanged = len(candidates - self.properties)
+            candidates &= self.properties
+        for pid in sorted(candidates):
+            new_hash = hashes.get(pid, content_hash(()))
+            if stored.get(pid) == new_hash and (pid in present) == (pid in hashes):
+                result.unchanged += 1
+                continue
+            inserted, deleted = self._apply_diff(pid, self._rows.get(pid, []))
+            if inserted or deleted:
+                result.changed.append(pid)
+                result.inserted += inserted
+                result.deleted += deleted
+                self._deltas[pid] = (inserted, deleted)
+            else:
+                result.unchanged += 1
+        return result
+
+    def _apply_diff(self, pid: str, rows: List[tuple]) -> Tuple[int, int]:
+        """Make the stored rows of one property equal (as a multiset) to ``rows``."""
+        content_cols = [self.columns[i] for i in self._content_index]
+        # Stage the new rows in a temp table with the target's column affinities,
+        # so they compare exactly as they will read back once inserted.
+        self.conn.execute("DROP TABLE IF EXISTS temp.sync_stage")
+        self.conn.execute(
+            f"CREATE TEMP TABLE sync_stage AS SELECT {', '.join(self.columns)} FROM {self.table} WHERE 0"
+        )
+        self.conn.executemany(
+            f"INSERT INTO temp.sync_stage VALUES ({', '.join('?' * len(self.columns))})", rows
+        )
+        existing: Dict[tuple, List[int]] = defaultdict(list)
+        for row_id, *content in self.conn.execute(
+            f"SELECT id, {', '.join(content_cols)} FROM {self.table} "
+            f"WHERE unified_property_id = ?{self.scope} ORDER BY id",
+            (pid,),
+        ):
+            existing[tuple(content)].append(row_id)
+
+        to_insert = []
+        for rowid, *content in self.conn.execute(
+            f"SELECT rowid, {', '.join(content_cols)} FROM temp.sync_stage ORDER BY rowid"
+        ):
+            ids = existing.get(tuple(content))
+            if ids:
+                ids.pop(0)
+            else:
+                to_insert.append(rowid)
+        to_delete = [row_id for ids in existing.values() for row_id in ids]
+
+        self.conn.executemany(f"DELETE FROM {self.table} WHERE id = ?", [(i,) for i in to_delete])
+        if to_insert:
+            self.conn.executemany(
+                f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+                f"SELECT {', '.join(self.columns)} FROM temp.sync_stage WHERE rowid = ?",
+                [(r,) for r in to_insert],
+            )
+        self.conn.execute("DROP TABLE temp.sync_stage")
+        return len(to_insert), len(to_delete)
+
+    # ---- Bookkeeping ----
+
+    def _record(self, hashes: Dict[str, str], result: WriteResult):
+        if self.properties is None:
+            self.conn.execute(f"DELETE FROM {STATE_TABLE} WHERE table_name = ?", (self.table,))
+        else:
+            self.conn.executemany(
+                f"DELETE FROM {STATE_TABLE} WHERE table_name = ? AND unified_property_id = ?",
+                [(self.table, pid) for pid in self.properties],
+            )
+        self.conn.executemany(
+            f"INSERT INTO {STATE_TABLE} (table_name, unified_property_id, content_hash, row_count, sync_id) "
+            f"VALUES (?, ?, ?, ?, ?)",
+            [(self.table, pid, h, len(self._rows[pid]), self.run.sync_id) for pid, h in hashes.items()],
+        )
+        self.conn.executemany(
+            f"INSERT INTO {MANIFEST_TABLE} "
+            f"(sync_id, table_name, unified_property_id, rows_inserted, rows_deleted, file_ids) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (self.run.sync_id, self.table, pid, ins, dele,
+                 json.dumps(self.run.file_ids.get(pid, [])))
+                for pid, (ins, dele) in self._deltas.items()
+            ],
+        )
+
+
+def load_sync_manifest(conn: sqlite3.Connection, sync_id: Optional[str] = None) -> Dict:
+    """
+    Changes made by one sync run (default: the latest completed run).
+
+    Returns {"sync_id", "mode", "tables": {table: [unified_property_id, ...]},
+    "file_ids": {unified_property_id: [...]}}; empty tables if no run is recorded.
+    """
+    try:
+        if sync_id is None:
+            row = conn.execute(
+                f"SELECT sync_id, mode FROM {RUNS_TABLE} WHERE completed_at IS NOT NULL "
+                f"ORDER BY completed_at DESC LIMIT 1"
+            ).fetchone()
+        else:
+            row = conn.execute(f"SELECT sync_id, mode FROM {RUNS_TABLE} WHERE sync_id = ?", (sync_id,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is None:
+        return {"sync_id": sync_id, "mode": None, "tables": {}, "file_ids": {}}
+
+    tables: Dict[str, List[str]] = defaultdict(list)
+    file_ids: Dict[str, List[str]] = {}
+    for table, pid, ids in conn.execute(
+        f"SELECT table_name, unified_property_id, file_ids FROM {MANIFEST_TABLE} "
+        f"WHERE sync_id = ? ORDER BY table_name, unified_property_id",
+        (row[0],),
+    ):
+        tables[table].append(pid)
+        if ids and ids != "[]":
+            file_ids[pid] = json.loads(ids)
+    return {"sync_id": row[0], "mode": row[1], "tables": dict(tables), "file_ids": file_ids}
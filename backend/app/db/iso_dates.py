@@ -0,0 +1,149 @@
+"""
+Canonical ISO date columns for the unified lease/unit/resident tables.
+
+PMS dates land in unified.db as text in whatever format the source used
+(RealPage: ``MM/DD/YYYY``; Yardi: ``YYYY-MM-DD`` or ``YYYY-MM-DDTHH:MM:SS``).
+Range predicates used to rebuild them per row with
+``substr(col,7,4)||'-'||substr(col,1,2)||...``, which defeats every index and
+silently mis-parses ISO-formatted Yardi values.
+
+The sync now writes a sibling ``<col>_iso`` column (``YYYY-MM-DD`` or NULL)
+for each date column in DATE_COLUMNS together with the row (UnifiedTableWriter
+adds them to the rows it is given), plus composite indexes on
+``(unified_property_id, <col>_iso)`` for the columns read paths filter on.
+Read paths compare ``<col>_iso`` directly against ``date('now', ...)`` or ISO
+parameters. The raw text columns are kept unchanged for display.
+
+backfill_iso_dates() only fills siblings that are still NULL, for databases
+written before the columns existed and for writers that do not compute them.
+migrate_db_file() runs it on a unified.db file: on every /admin/upload-db
+before the swap, and at API startup before the read-only pool opens the
+served file (a unified.db deployed or synced before the columns existed).
+"""
+import logging
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# table -> raw text date columns that get an <col>_iso sibling
+DATE_COLUMNS: Dict[str, List[str]] = {
+    "unified_units": [
+        "available_date", "on_notice_date", "made_ready_date",
+        "lease_start", "lease_end", "move_in_date",
+    ],
+    "unified_residents": [
+        "lease_start", "lease_end", "move_in_date", "move_out_date", "notice_date",
+    ],
+    "unified_leases": [
+        "lease_start", "lease_end", "move_in_date", "move_out_date",
+    ],
+    "unified_lease_expirations": [
+        "lease_end_date", "new_lease_start",
+    ],
+}
+
+# table -> <col>_iso columns that get a (unified_property_id, <col>_iso) index
+INDEXED_COLUMNS: Dict[str, List[str]] = {
+    "unified_units": ["lease_end_iso"],
+    "unified_residents": ["move_in_date_iso", "move_out_date_iso", "lease_end_iso"],
+    "unified_leases": ["lease_start_iso", "lease_end_iso", "move_in_date_iso"],
+    "unified_lease_expirations": ["lease_end_date_iso", "new_lease_start_iso"],
+}
+
+
+def iso_column(column: str) -> str:
+    """Name of the ISO sibling of a raw date column."""
+    return f"{column}_iso"
+
+
+def to_iso_date(value) -> Optional[str]:
+    """
+    Normalize a PMS date string to ``YYYY-MM-DD``; None if empty or unparseable.
+
+    Accepts ``MM/DD/YYYY`` (also ``M/D/YYYY`` and two-digit years) and
+    ``YYYY-MM-DD`` with an optional time suffix.
+    """
+    if value is None:
+        return None
+    s = str(value).strip()
+    if not s:
+        return None
+    try:
+        if "/" in s:
+            month, day, year = (int(p) for p in s.split(" ")[0].split("/"))
+            if year < 100:
+                year += 2000
+            return date(year, month, day).isoformat()
+        return date.fromisoformat(s[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def register_iso_date(conn: sqlite3.Connection):
+    """Expose to_iso_date() to SQL as ``iso_date(text)``."""
+    conn.create_function("iso_date", 1, to_iso_date, deterministic=True)
+
+
+def _existing_columns(conn: sqlite3.Connection, table: str) -> set:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def ensure_iso_date_columns(conn: sqlite3.Connection) -> int:
+    """
+    Add missing ``<col>_iso`` columns and their composite indexes.
+
+    Tables that do not exist yet are skipped. Returns the number of columns added.
+    """
+    added = 0
+    for table, columns in DATE_COLUMNS.items():
+        existing = _existing_columns(conn, table)
+        if not existing:
+            continue
+        for col in columns:
+            if iso_column(col) not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {iso_column(col)} TEXT")
+                added += 1
+        for col in INDEXED_COLUMNS.get(table, []):
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_prop_{col} "
+                f"ON {table}(unified_property_id, {col})"
+            )
+    return added
+
+
+def backfill_iso_dates(conn: sqlite3.Connection, tables: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Fill ``<col>_iso`` siblings that are NULL while their raw column has a date.
+
+    Rows that already carry their ISO values are not rewritten. Returns
+    {table: values filled}.
+    """
+    ensure_iso_date_columns(conn)
+    register_iso_date(conn)
+    counts = {}
+    for table in tables or list(DATE_COLUMNS):
+        if not _existing_columns(conn, table):
+            continue
+        counts[table] = 0
+        for col in DATE_COLUMNS[table]:
+            cur = conn.execute(
+                f"UPDATE {table} SET {iso_column(col)} = iso_date({col}) "
+                f"WHERE {iso_column(col)} IS NULL AND {col} IS NOT NULL AND iso_date({col}) IS NOT NULL"
+            )
+            counts[table] += cur.rowcount
+        logger.debug(f"[ISO_DATES] {table}: {counts[table]} values")
+    return counts
+
+
+def migrate_db_file(db_path: Path) -> Dict[str, int]:
+    """Add and fill missing ``<col>_iso`` columns in a unified.db file (needs write access)."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        counts = backfill_iso_dates(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
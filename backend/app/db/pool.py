@@ -0,0 +1,325 @@
+"""
+Shared read-only connection pool for unified.db.
+
+Every dashboard endpoint and service reads unified.db through this module
+instead of calling sqlite3.connect() directly. Connections are:
+
+- read-only (``mode=ro`` URI + ``PRAGMA query_only``), so a reader can never
+  take a write lock on the database the sync pipeline produces
+- tuned for read-heavy access (larger page cache, memory-mapped I/O)
+- kept per thread, because sqlite3 connections are not shareable across
+  threads by default and FastAPI runs sync handlers in a worker pool
+
+Callers keep the existing ``conn = ...; ...; conn.close()`` pattern:
+``close()`` on a pooled connection hands it back to the calling thread's
+free list instead of closing it. Nested checkouts on the same thread get
+distinct connections, so a helper that opens its own connection never
+disturbs its caller's row_factory or cursors.
+
+When /admin/upload-db installs a new file it calls ``unified_pool.swap()``,
+which renames the file into place and bumps the pool generation under one
+lock: every checkout after that opens the new file, while connections already
+checked out keep reading the old inode until their request finishes. Idle
+connections of the old generation are closed on every thread right away;
+checked-out ones are closed when they are released. The pool counts open
+connections per generation, and once the last one to an old generation is
+closed its file is gone for good (the rename already unlinked it, so the
+filesystem frees it with the last descriptor). ``invalidate()`` does the
+same for a file replaced out of band.
+
+``override_unified_source()`` temporarily points get_unified_connection() at
+another SQLite URI for the current context — used by the property bundle
+endpoint to run every section against one in-memory property snapshot.
+
+``open_unified_stream()`` hands out a dedicated, thread-agnostic read-only
+connection for responses that stream rows straight from a cursor.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.db import schema
+
+logger = logging.getLogger(__name__)
+
+# Per-connection tuning (negative cache_size = KiB)
+CACHE_SIZE_KB = 32 * 1024
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+# Idle connections retained per thread; extras are really closed on release
+MAX_IDLE_PER_THREAD = 4
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to the owning pool."""
+
+    _pool: Optional["ReadOnlyConnectionPool"] = None
+    _generation: int = 0
+    _checked_out: bool = False
+    _thread_id: int = 0
+    _dedicated: bool = False
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+        elif self._dedicated:
+            self._close_for_real()
+        elif self._checked_out:
+            self._checked_out = False
+            self._pool._release(self)
+        # else: already back in the free list; a second close() is a no-op
+
+    def _close_for_real(self):
+        pool, self._pool = self._pool, None
+        super().close()
+        if pool is not None:
+            pool._forget(self)
+
+
+class ReadOnlyConnectionPool:
+    """Per-thread pool of read-only SQLite connections to a single DB file."""
+
+    def __init__(self, path_getter):
+        # path_getter is called on every open so patched/relocated paths
+        # (tests, Railway volume) are always honoured.
+        self._path_getter = path_getter
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._file_id = None
+        # Every thread's free list, so a swap can close idle stale connections everywhere
+        self._free_lists: Dict[int, List[PooledConnection]] = {}
+        # generation -> connections open on it (idle, checked out or streaming)
+        self._open_counts: Dict[int, int] = {}
+        self._stats = {
+            "hits": 0, "misses": 0, "reopens": 0, "releases": 0, "discards": 0,
+            "generations_released": 0,
+        }
+
+    # ---- Public API ----
+
+    @property
+    def path(self) -> Path:
+        return Path(self._path_getter())
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def current_generation(self) -> int:
+        """Generation of the file on disk right now (detects out-of-band swaps)."""
+        self._check_file_identity()
+        return self._generation
+
+    def connect(self) -> sqlite3.Connection:
+        """Check out a read-only connection for the current thread."""
+        self._check_file_identity()
+        free = self._free_list()
+        while True:
+            with self._lock:
+                conn = free.pop() if free else None
+            if conn is None:
+                break
+            if conn._generation == self._generation:
+                self._count("hits")
+                conn._checked_out = True
+                return conn
+            self._count("reopens")
+            conn._close_for_real()
+        self._count("misses")
+        return self._open()
+
+    def swap(self, new_path: Path) -> int:
+        """
+        Atomically rename ``new_path`` over the pool's file and start a new
+        generation. Checkouts from here on open the new file; connections
+        checked out before keep the old one until they are released.
+        """
+        with self._lock:
+            os.replace(new_path, self.path)
+            generation = self._bump()
+        self._close_idle_stale()
+        logger.info(f"[DB_POOL] Swapped in new {self.path.name}, generation={generation}")
+        return generation
+
+    def invalidate(self) -> int:
+        """Mark every pooled connection stale (e.g. after the DB file is replaced)."""
+        with self._lock:
+            generation = self._bump()
+        self._close_idle_stale()
+        logger.info(f"[DB_POOL] Invalidated {self.path.name}, generation={generation}")
+        return generation
+
+    def open_stream(self) -> sqlite3.Connection:
+        """A connection outside the free lists (see open_unified_stream); close() really closes it."""
+        conn = self._open()
+        conn._dedicated = True
+        return conn
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["generation"] = self._generation
+        with self._lock:
+            stats["open_by_generation"] = {str(g): n for g, n in sorted(self._open_counts.items())}
+        stats["path"] = str(self.path)
+        return stats
+
+    # ---- Internals ----
+
+    def _free_list(self) -> list:
+        free = getattr(self._local, "free", None)
+        if free is None:
+            free = []
+            self._local.free = free
+            with self._lock:
+                # A reused thread id: the dead thread's idle connections are orphaned
+                orphaned = self._free_lists.get(threading.get_ident(), [])
+                self._free_lists[threading.get_ident()] = free
+            for conn in orphaned:
+                conn._close_for_real()
+        return free
+
+    def _bump(self) -> int:
+        """Start a new generation (call under self._lock)."""
+        self._generation += 1
+        self._file_id = self._stat_file_id()
+        # Old generations nothing is reading are already released
+        for generation in [g for g, n in self._open_counts.items() if n == 0]:
+            del self._open_counts[generation]
+        return self._generation
+
+    def _close_idle_stale(self):
+        """Close idle connections of older generations on every thread."""
+        with self._lock:
+            stale = []
+            for free in self._free_lists.values():
+                stale.extend(c for c in free if c._generation != self._generation)
+                free[:] = [c for c in free if c._generation == self._generation]
+        for conn in stale:
+            self._count("discards")
+            conn._close_for_real()
+
+    def _forget(self, conn: PooledConnection):
+        """Account for a really closed connection; logs when an old generation has no readers left."""
+        generation = conn._generation
+        with self._lock:
+            remaining = self._open_counts.get(generation, 1) - 1
+            if remaining or generation == self._generation:
+                self._open_counts[generation] = remaining
+                return
+            self._open_counts.pop(generation, None)
+            self._stats["generations_released"] += 1
+        logger.info(f"[DB_POOL] Generation {generation} of {self.path.name} released by its last reader")
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _stat_file_id(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def _check_file_identity(self):
+        """Bump the generation if the file was swapped underneath us."""
+        file_id = self._stat_file_id()
+        if file_id is None or file_id == self._file_id:
+            return
+        swapped = False
+        with self._lock:
+            if file_id != self._file_id:
+                if self._file_id is not None:
+                    self._bump()
+                    swapped = True
+                self._file_id = file_id
+        if swapped:
+            self._close_idle_stale()
+
+    def _open(self) -> sqlite3.Connection:
+        # Read the generation before opening: a swap in between leaves a new
+        # file tagged with the old generation (discarded on release), never
+        # the old file tagged with the new one.
+        generation = self._generation
+        uri = f"{self.path.resolve().as_uri()}?mode=ro"
+        # Still used by one thread at a time; cross-thread is only for closing idle stale connections
+        conn = sqlite3.connect(uri, uri=True, factory=PooledConnection, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        with self._lock:
+            self._open_counts[generation] = self._open_counts.get(generation, 0) + 1
+        conn._pool = self
+        conn._generation = generation
+        conn._checked_out = True
+        conn._thread_id = threading.get_ident()
+        return conn
+
+    def _release(self, conn: PooledConnection):
+        # Reset per-checkout state so the next borrower gets a clean connection
+        conn.row_factory = None
+        if conn.in_transaction:
+            conn.rollback()
+        free = self._free_list()
+        # Checked under the lock so a concurrent swap cannot miss this connection
+        with self._lock:
+            keep = (
+                conn._generation == self._generation
+                and conn._thread_id == threading.get_ident()
+                and len(free) < MAX_IDLE_PER_THREAD
+            )
+            if keep:
+                free.append(conn)
+            self._stats["releases" if keep else "discards"] += 1
+        if not keep:
+            conn._close_for_real()
+
+
+unified_pool = ReadOnlyConnectionPool(lambda: schema.UNIFIED_DB_PATH)
+
+_source_override: ContextVar[Optional[str]] = ContextVar("unified_source_override", default=None)
+
+
+@contextmanager
+def override_unified_source(uri: str):
+    """Serve get_unified_connection() from ``uri`` inside this context."""
+    token = _source_override.set(uri)
+    try:
+        yield
+    finally:
+        _source_override.reset(token)
+
+
+def get_unified_connection() -> sqlite3.Connection:
+    """Read-only pooled connection to unified.db. Call close() to return it."""
+    uri = _source_override.get()
+    if uri is not None:
+        conn = sqlite3.connect(uri, uri=True)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+    return unified_pool.connect()
+
+
+def open_unified_stream() -> sqlite3.Connection:
+    """
+    Dedicated (non-pooled) read-only connection for streaming responses.
+
+    A StreamingResponse pulls its sync generator on arbitrary threadpool
+    threads, so the cursor's connection cannot be a per-thread pooled one.
+    The caller owns it and must close() it when the stream ends.
+    """
+    uri = _source_override.get()
+    if uri is None:
+        # Tracked by the pool, so a swap waits for open streams before releasing the old file
+        return unified_pool.open_stream()
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
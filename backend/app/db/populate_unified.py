@@ -17,6 +17,7 @@ from app.db.schema import (
     YARDI_DB_PATH, REALPAGE_DB_PATH, UNIFIED_DB_PATH,
     UNIFIED_SCHEMA, init_database
 )
+from app.db.iso_dates import backfill_iso_dates
 
 
 def populate_unified_from_realpage():
@@ -666,6 +667,11 @@ def populate_unified_database():
     rp_records = populate_unified_from_realpage()
     yardi_records = populate_unified_from_yardi()
     
+    conn = sqlite3.connect(UNIFIED_DB_PATH)
+    backfill_iso_dates(conn)
+    conn.commit()
+    conn.close()
+    
     # Calculate metrics
     calculate_occupancy_metrics()
     calculate_pricing_metrics()
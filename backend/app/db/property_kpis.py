@@ -0,0 +1,358 @@
+"""
+Per-property KPI materialization (unified_property_kpis).
+
+The watchlist, portfolio watchpoints and per-property watchpoints used to
+recompute occupancy, ATR, delinquency, average rent and renewal rate with
+ad-hoc aggregate SQL on every request. The sync pipeline now ends by writing
+one unified_property_kpis row per property and snapshot date holding every
+watchable metric (AVAILABLE_METRICS, which watchpoint_service validates
+watchpoints against) plus the few raw counts needed to roll properties up
+into portfolio totals.
+
+compute_property_kpis() is the single definition of those metrics. It runs
+set-based (one GROUP BY per source table for all properties) and is used by
+the writer at sync time; readers call load_property_kpis(), which does an
+indexed lookup of the latest row per property and only falls back to
+computing live for properties with no materialized row (e.g. a unified.db
+produced before this table existed).
+"""
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from app.db.pool import get_unified_connection
+
+logger = logging.getLogger(__name__)
+
+KPI_TABLE = "unified_property_kpis"
+
+# Metrics a watchpoint can watch
+AVAILABLE_METRICS = {
+    "occupancy_pct": {"label": "Occupancy %", "unit": "%", "direction": "higher_better"},
+    "vacant_units": {"label": "Vacant Units", "unit": "units", "direction": "lower_better"},
+    "delinquent_total": {"label": "Total Delinquent $", "unit": "$", "direction": "lower_better"},
+    "delinquent_units": {"label": "Delinquent Units", "unit": "units", "direction": "lower_better"},
+    "renewal_rate": {"label": "Renewal Rate %", "unit": "%", "direction": "higher_better"},
+    "avg_rent": {"label": "Avg In-Place Rent", "unit": "$", "direction": "higher_better"},
+    "loss_to_lease_pct": {"label": "Loss-to-Lease %", "unit": "%", "direction": "lower_better"},
+    "atr": {"label": "ATR (Units)", "unit": "units", "direction": "lower_better"},
+    "atr_pct": {"label": "ATR %", "unit": "%", "direction": "lower_better"},
+    "aged_vacancy_90": {"label": "Aged Vacancy 90+ Days", "unit": "units", "direction": "lower_better"},
+    "response_rate": {"label": "Review Response Rate %", "unit": "%", "direction": "higher_better"},
+    "overall_rating": {"label": "Overall Rating", "unit": "stars", "direction": "higher_better"},
+    "google_rating": {"label": "Google Rating", "unit": "stars", "direction": "higher_better"},
+    "on_notice_units": {"label": "Units on Notice", "unit": "units", "direction": "lower_better"},
+    "lead_to_lease": {"label": "Lead-to-Lease %", "unit": "%", "direction": "higher_better"},
+}
+
+# Every watchable metric gets a column
+METRIC_COLUMNS: List[str] = list(AVAILABLE_METRICS)
+
+# Raw counts kept alongside the metrics so portfolio roll-ups can weight correctly
+SUPPORT_COLUMNS: List[str] = [
+    "total_units",
+    "occupied_units",
+    "notice_units",
+    "preleased_vacant",
+    "rent_unit_count",
+    "renewal_expiring_90d",
+    "renewal_renewed_90d",
+]
+
+KPI_COLUMNS: List[str] = SUPPORT_COLUMNS + METRIC_COLUMNS
+
+# Unit counts are stored as INTEGER so they read back as ints; everything else is REAL
+INTEGER_COLUMNS = set(SUPPORT_COLUMNS) | {
+    "vacant_units", "delinquent_units", "atr", "aged_vacancy_90", "on_notice_units",
+}
+
+
+def _column_type(col: str) -> str:
+    return "INTEGER" if col in INTEGER_COLUMNS else "REAL"
+
+# Review metrics come from the Google / Apartments.com JSON caches, which are
+# refreshed independently of the sync; readers overlay the live cache values.
+REVIEW_METRICS = ("google_rating", "overall_rating", "response_rate")
+
+VACANT_STATUSES = "('vacant', 'vacant_ready', 'vacant_not_ready')"
+
+
+def create_kpi_table(conn: sqlite3.Connection):
+    """Create unified_property_kpis, adding columns for newly watchable metrics."""
+    cols = ",\n            ".join(f"{c} {_column_type(c)}" for c in KPI_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {KPI_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            unified_property_id TEXT NOT NULL,
+            snapshot_date TEXT NOT NULL,
+            {cols},
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(unified_property_id, snapshot_date)
+        )
+    """)
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{KPI_TABLE}_property_date "
+        f"ON {KPI_TABLE}(unified_property_id, snapshot_date)"
+    )
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({KPI_TABLE})").fetchall()}
+    for col in KPI_COLUMNS:
+        if col not in existing:
+            conn.execute(f"ALTER TABLE {KPI_TABLE} ADD COLUMN {col} {_column_type(col)}")
+
+
+def _rows(cursor: sqlite3.Cursor, sql: str, params: Iterable = ()) -> list:
+    """Run one aggregate; a missing optional table just yields no rows."""
+    try:
+        cursor.execute(sql, tuple(params))
+        return cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        logger.debug(f"[KPI] Skipping aggregate: {e}")
+        return []
+
+
+def _scope(property_ids: Optional[List[str]], column: str = "unified_property_id"):
+    """(SQL fragment, params) restricting a query to property_ids (or all)."""
+    if not property_ids:
+        return "1 = 1", []
+    return f"{column} IN ({','.join('?' * len(property_ids))})", list(property_ids)
+
+
+def compute_property_kpis(conn: sqlite3.Connection, property_ids: Optional[List[str]] = None,
+                          as_of: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Compute every KPI for the given properties (default: all) from unified tables.
+
+    Definitions match what the watchlist / watchpoint endpoints computed inline.
+    Date windows (renewal rate's next 90 days) start at ``as_of`` (YYYY-MM-DD,
+    default today), the snapshot date the row is written under.
+    Returns {property_id: {column: value}}; metrics with no source data are None.
+    """
+    as_of = as_of or datetime.now().strftime("%Y-%m-%d")
+    c = conn.cursor()
+    where, params = _scope(property_ids)
+
+    ids = [r[0] for r in _rows(c, f"SELECT unified_property_id FROM unified_properties WHERE {where}", params)]
+    kpis: Dict[str, dict] = {pid: dict.fromkeys(KPI_COLUMNS) for pid in ids}
+
+    def _get(pid):
+        return kpis.setdefault(pid, dict.fromkeys(KPI_COLUMNS))
+
+    # Occupancy: latest unified_occupancy_metrics row per property
+    for pid, total, occupied, vacant, notice, notice_break, preleased, occ_pct in _rows(c, f"""
+        SELECT o.unified_property_id, o.total_units, o.occupied_units, o.vacant_units,
+               o.notice_units, o.notice_break_units, o.preleased_vacant, o.physical_occupancy
+        FROM unified_occupancy_metrics o
+        JOIN (
+            SELECT unified_property_id, MAX(snapshot_date) AS md
+            FROM unified_occupancy_metrics WHERE {where}
+            GROUP BY unified_property_id
+        ) latest ON o.unified_property_id = latest.unified_property_id AND o.snapshot_date = latest.md
+    """, params):
+        k = _get(pid)
+        k.update(
+            total_units=total or 0, occupied_units=occupied or 0, notice_units=notice or 0,
+            preleased_vacant=preleased or 0, occupancy_pct=occ_pct or 0,
+            vacant_units=vacant or 0, on_notice_units=notice_break or 0,
+        )
+
+    # ATR + aged vacancy from unified_units (same source as availability endpoint)
+    for pid, vacant, on_notice, preleased, down, aged_90 in _rows(c, f"""
+        SELECT unified_property_id,
+               SUM(CASE WHEN occupancy_status IN {VACANT_STATUSES} THEN 1 ELSE 0 END),
+               SUM(CASE WHEN occupancy_status = 'notice' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN is_preleased = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'down' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status IN {VACANT_STATUSES}
+                         AND (is_preleased IS NULL OR is_preleased != 1)
+                         AND days_vacant IS NOT NULL AND days_vacant != ''
+                         AND CAST(days_vacant AS INTEGER) > 90 THEN 1 ELSE 0 END)
+        FROM unified_units WHERE {where}
+        GROUP BY unified_property_id
+    """, params):
+        k = _get(pid)
+        atr = max(0, (vacant or 0) + (on_notice or 0) - (preleased or 0) - (down or 0))
+        total_u = k["total_units"] or 0
+        k["atr"] = atr
+        k["atr_pct"] = round(atr / total_u * 100, 1) if total_u > 0 else 0
+        k["aged_vacancy_90"] = aged_90 or 0
+
+    # Delinquency: current residents only (former = collections)
+    for pid, total, units in _rows(c, f"""
+        SELECT unified_property_id,
+               SUM(CASE WHEN total_delinquent > 0 THEN total_delinquent ELSE 0 END),
+               COUNT(CASE WHEN total_delinquent > 0 THEN 1 END)
+        FROM unified_delinquency
+        WHERE {where} AND (status IS NULL OR LOWER(status) NOT LIKE '%former%')
+        GROUP BY unified_property_id
+    """, params):
+        k = _get(pid)
+        k["delinquent_total"] = total or 0
+        k["delinquent_units"] = units or 0
+    if _rows(c, "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'unified_delinquency'"):
+        for k in kpis.values():
+            if k["delinquent_total"] is None:
+                k["delinquent_total"] = k["delinquent_units"] = 0
+
+    # Avg in-place rent + loss-to-lease: latest unified_pricing_metrics snapshot
+    for pid, rent_units, avg_rent, avg_asking in _rows(c, f"""
+        SELECT p.unified_property_id,
+               SUM(CASE WHEN p.in_place_rent > 0 THEN p.unit_count ELSE 0 END),
+               SUM(CASE WHEN p.in_place_rent > 0 THEN p.in_place_rent * p.unit_count END)
+                   / NULLIF(SUM(CASE WHEN p.in_place_rent > 0 THEN p.unit_count ELSE 0 END), 0),
+               SUM(CASE WHEN p.asking_rent > 0 THEN p.asking_rent * p.unit_count END)
+                   / NULLIF(SUM(CASE WHEN p.asking_rent > 0 THEN p.unit_count ELSE 0 END), 0)
+        FROM unified_pricing_metrics p
+        JOIN (
+            SELECT unified_property_id, MAX(snapshot_date) AS md
+            FROM unified_pricing_metrics WHERE {where}
+            GROUP BY unified_property_id
+        ) latest ON p.unified_property_id = latest.unified_property_id AND p.snapshot_date = latest.md
+        GROUP BY p.unified_property_id
+    """, params):
+        k = _get(pid)
+        k["rent_unit_count"] = rent_units or 0
+        k["avg_rent"] = round(avg_rent, 0) if avg_rent else 0
+        if avg_rent and avg_asking:
+            k["loss_to_lease_pct"] = round((avg_asking - avg_rent) / avg_asking * 100, 1)
+
+    # Renewal rate (leases ending in the next 90 days): report 4156 when present,
+    # otherwise Current - Future leases in unified_leases
+    with_4156 = set()
+    le_date = "lease_end_date_iso"
+    for pid, total, renewed in _rows(c, f"""
+        SELECT unified_property_id, COUNT(*),
+               SUM(CASE WHEN decision = 'Renewed' THEN 1 ELSE 0 END)
+        FROM unified_lease_expirations
+        WHERE {where}
+          AND lease_end_date IS NOT NULL AND lease_end_date != ''
+          AND {le_date} BETWEEN ? AND date(?, '+90 days')
+        GROUP BY unified_property_id
+    """, params + [as_of, as_of]):
+        with_4156.add(pid)
+        k = _get(pid)
+        k["renewal_expiring_90d"] = total
+        k["renewal_renewed_90d"] = renewed or 0
+        k["renewal_rate"] = round((renewed or 0) / total * 100, 1) if total else None
+    # Properties with any 4156 rows never fall back, even if none expire in 90 days
+    with_4156.update(r[0] for r in _rows(
+        c, f"SELECT DISTINCT unified_property_id FROM unified_lease_expirations WHERE {where}", params
+    ))
+    lease_date = "lease_end_iso"
+    for pid, total, renewed in _rows(c, f"""
+        SELECT unified_property_id, COUNT(*),
+               SUM(CASE WHEN status = 'Current - Future' THEN 1 ELSE 0 END)
+        FROM unified_leases
+        WHERE {where}
+          AND status IN ('Current', 'Current - Future')
+          AND lease_end IS NOT NULL AND lease_end != ''
+          AND {lease_date} BETWEEN ? AND date(?, '+90 days')
+        GROUP BY unified_property_id
+    """, params + [as_of, as_of]):
+        if pid in with_4156 or not total:
+            continue
+        k = _get(pid)
+        k["renewal_expiring_90d"] = total
+        k["renewal_renewed_90d"] = renewed or 0
+        k["renewal_rate"] = round((renewed or 0) / total * 100, 1)
+
+    # Lead-to-lease: current month leasing funnel
+    for pid, leads, signs in _rows(c, f"""
+        SELECT l.unified_property_id, l.leads, l.lease_signs
+        FROM unified_leasing_metrics l
+        JOIN (
+            SELECT unified_property_id, MAX(snapshot_date) AS md
+            FROM unified_leasing_metrics WHERE {where} AND period = 'current_month'
+            GROUP BY unified_property_id
+        ) latest ON l.unified_property_id = latest.unified_property_id AND l.snapshot_date = latest.md
+        WHERE l.period = 'current_month'
+    """, params):
+        if leads:
+            _get(pid)["lead_to_lease"] = round((signs or 0) / leads * 100, 1)
+
+    for pid, reviews in review_kpis(list(kpis)).items():
+        kpis[pid].update(reviews)
+    return kpis
+
+
+def review_kpis(property_ids: List[str]) -> Dict[str, dict]:
+    """Google / Apartments.com metrics from the review caches (never calls an API)."""
+    from app.services.google_reviews_service import get_cached_reviews_entries
+    from app.services.apartments_reviews_service import get_apartments_reviews
+
+    g_cache = get_cached_reviews_entries(property_ids)
+    result = {}
+    for pid in property_ids:
+        out = {}
+        ratings = []
+        g_data = g_cache.get(pid, {}).get("data", {})
+        g_rating = g_data.get("rating")
+        if g_rating and g_rating > 0:
+            out["google_rating"] = round(g_rating, 1)
+            ratings.append(g_rating)
+        if g_data.get("response_rate") is not None:
+            out["response_rate"] = g_data["response_rate"]
+        apt_data = get_apartments_reviews(pid)
+        if apt_data and apt_data.get("rating") and apt_data["rating"] > 0:
+            ratings.append(apt_data["rating"])
+        if ratings:
+            out["overall_rating"] = round(sum(ratings) / len(ratings), 1)
+        result[pid] = out
+    return result
+
+
+def write_property_kpis(conn: sqlite3.Connection, snapshot_date: Optional[str] = None) -> int:
+    """Materialize KPIs for every property into unified_property_kpis (one row per property/date)."""
+    snapshot_date = snapshot_date or datetime.now().strftime("%Y-%m-%d")
+    create_kpi_table(conn)
+    kpis = compute_property_kpis(conn, as_of=snapshot_date)
+    cols = ", ".join(KPI_COLUMNS)
+    placeholders = ", ".join("?" * len(KPI_COLUMNS))
+    conn.executemany(
+        f"""
+        INSERT OR REPLACE INTO {KPI_TABLE}
+            (unified_property_id, snapshot_date, {cols})
+        VALUES (?, ?, {placeholders})
+        """,
+        [(pid, snapshot_date, *(k.get(c) for c in KPI_COLUMNS)) for pid, k in kpis.items()],
+    )
+    return len(kpis)
+
+
+def load_property_kpis(property_ids: Optional[List[str]] = None, live_reviews: bool = True) -> Dict[str, dict]:
+    """
+    Latest KPI row per property (indexed lookup); computes live for any property
+    without a materialized row. With live_reviews, review metrics are re-read
+    from the review caches, which refresh independently of the sync.
+    """
+    conn = get_unified_connection()
+    try:
+        c = conn.cursor()
+        where, params = _scope(property_ids, "k.unified_property_id")
+        result: Dict[str, dict] = {}
+        for row in _rows(c, f"""
+            SELECT k.unified_property_id, k.snapshot_date, {', '.join('k.' + col for col in KPI_COLUMNS)}
+            FROM {KPI_TABLE} k
+            WHERE {where}
+              AND k.snapshot_date = (
+                  SELECT MAX(snapshot_date) FROM {KPI_TABLE} WHERE unified_property_id = k.unified_property_id
+              )
+        """, params):
+            result[row[0]] = dict(zip(KPI_COLUMNS, row[2:]), snapshot_date=row[1])
+
+        missing = [p for p in property_ids if p not in result] if property_ids else None
+        if missing or (property_ids is None and not result):
+            live = compute_property_kpis(conn, missing)
+            result.update({pid: dict(k, snapshot_date=None) for pid, k in live.items()})
+    finally:
+        conn.close()
+
+    if live_reviews:
+        for pid, reviews in review_kpis(list(result)).items():
+            result[pid].update(dict.fromkeys(REVIEW_METRICS), **reviews)
+    return result
+
+
+def watchpoint_metrics(kpi: dict) -> dict:
+    """The AVAILABLE_METRICS subset of a KPI row, dropping metrics with no data."""
+    return {m: kpi[m] for m in METRIC_COLUMNS if kpi.get(m) is not None}
@@ -581,7 +581,8 @@ CREATE TABLE IF NOT EXISTS realpage_report_import_log (
     import_started_at TIMESTAMP,
     import_completed_at TIMESTAMP,
     status TEXT,
-    error_message TEXT
+    error_message TEXT,
+    content_sha256 TEXT
 );
 
 -- Indexes for report tables
@@ -647,6 +648,13 @@ CREATE TABLE IF NOT EXISTS unified_units (
     lease_end TEXT,
     move_in_date TEXT,
     sqft INTEGER,
+    -- YYYY-MM-DD copies of the date columns above (app.db.iso_dates)
+    available_date_iso TEXT,
+    on_notice_date_iso TEXT,
+    made_ready_date_iso TEXT,
+    lease_start_iso TEXT,
+    lease_end_iso TEXT,
+    move_in_date_iso TEXT,
     synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(unified_property_id, pms_unit_id),
     FOREIGN KEY (unified_property_id) REFERENCES unified_properties(unified_property_id)
@@ -674,6 +682,12 @@ CREATE TABLE IF NOT EXISTS unified_residents (
     current_rent REAL,
     balance REAL,
     is_head_of_household INTEGER DEFAULT 1,
+    -- YYYY-MM-DD copies of the date columns above (app.db.iso_dates)
+    lease_start_iso TEXT,
+    lease_end_iso TEXT,
+    move_in_date_iso TEXT,
+    move_out_date_iso TEXT,
+    notice_date_iso TEXT,
     synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (unified_property_id) REFERENCES unified_properties(unified_property_id)
 );
@@ -700,6 +714,11 @@ CREATE TABLE IF NOT EXISTS unified_leases (
     floorplan TEXT,
     sqft INTEGER,
     is_renewal INTEGER DEFAULT 0,
+    -- YYYY-MM-DD copies of the date columns above (app.db.iso_dates)
+    lease_start_iso TEXT,
+    lease_end_iso TEXT,
+    move_in_date_iso TEXT,
+    move_out_date_iso TEXT,
     synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (unified_property_id) REFERENCES unified_properties(unified_property_id)
 );
@@ -997,7 +1016,10 @@ CREATE TABLE IF NOT EXISTS unified_lease_expirations (
     new_lease_start TEXT,
     new_lease_term INTEGER,
     sqft INTEGER,
-    report_date TEXT NOT NULL
+    report_date TEXT NOT NULL,
+    -- YYYY-MM-DD copies of the date columns above (app.db.iso_dates)
+    lease_end_date_iso TEXT,
+    new_lease_start_iso TEXT
 );
 CREATE INDEX IF NOT EXISTS idx_unified_lease_exp_prop ON unified_lease_expirations(unified_property_id);
 
@@ -0,0 +1,242 @@
+"""
+Read/write side database for the small stores the API keeps itself.
+
+Google reviews, Google Places lookups and watchpoints used to be JSON
+documents (google_reviews_cache.json, google_places_cache.json,
+watchpoints.json) re-serialized in full, with indent=2, for every
+single-entry change — toggling one watchpoint rewrote all of them, and two
+writers could overwrite each other's update. They are now tables in
+DB_DIR/app_state.db:
+
+- one row per property / search query / watchpoint, written with per-key
+  upserts, so a write costs the same however many properties are stored
+- WAL journal: readers never wait for a writer, and concurrent writers
+  queue on SQLite's lock (busy_timeout) instead of clobbering a file
+- indexed by property
+
+It is a separate file from unified.db, which /admin/upload-db replaces
+wholesale (that would wipe user-created watchpoints).
+
+The JSON files stay the interchange format of the offline scrapers and
+push_to_deployed.py. Each service registers its file with
+``register_json_source()``; the file's entries are upserted into the tables
+once per version of the file — on first use (the one-time migration), after
+a local scrape, or when /admin/upload-file drops a new version. Imports are
+recorded in json_imports by content hash, so every process and restart
+agrees on what has already been imported.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+from app.db import schema
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_MS = 10_000
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS google_reviews (
+    property_id TEXT PRIMARY KEY,
+    fetched_at REAL,
+    source TEXT,
+    review_count INTEGER,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS google_places (
+    query TEXT PRIMARY KEY,
+    property_id TEXT,
+    place_id TEXT,
+    cached_at REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_google_places_property ON google_places(property_id);
+
+CREATE TABLE IF NOT EXISTS watchpoints (
+    id TEXT PRIMARY KEY,
+    property_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    operator TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    label TEXT,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_watchpoints_property ON watchpoints(property_id, seq);
+
+-- One row per JSON source: the content hash last imported
+CREATE TABLE IF NOT EXISTS json_imports (
+    source TEXT PRIMARY KEY,
+    filename TEXT,
+    sha256 TEXT,
+    entries INTEGER,
+    imported_at TEXT
+);
+
+-- Bumped with every write to a table, for callers that memoize derived data
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+# import_fn(conn, parsed_json) -> entries written
+JsonImporter = Callable[[sqlite3.Connection, dict], int]
+
+
+class JsonSource:
+    """A legacy JSON file feeding one table."""
+
+    def __init__(self, name: str, path_getter: Callable[[], Path], import_fn: JsonImporter):
+        self.name = name
+        self._path_getter = path_getter
+        self.import_fn = import_fn
+        self.seen = None  # (db path, inode, mtime_ns, size) last checked by this process
+
+    @property
+    def path(self) -> Path:
+        return Path(self._path_getter())
+
+
+class StateStore:
+    """Per-thread read/write connections to app_state.db, plus the JSON importers."""
+
+    def __init__(self, path_getter: Callable[[], Path]):
+        # Resolved on every connect so a patched DB_DIR (tests, Railway volume) is honoured
+        self._path_getter = path_getter
+        self._local = threading.local()
+        self._sources: Dict[str, JsonSource] = {}
+        self._stats = {"connects": 0, "writes": 0, "imports": 0, "import_errors": 0}
+
+    @property
+    def path(self) -> Path:
+        return Path(self._path_getter())
+
+    # ---- Connections ----
+
+    def connect(self) -> sqlite3.Connection:
+        """This thread's connection (reopened if the DB path changed). Do not close it."""
+        path = self.path
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.path == path:
+            return conn
+        if conn is not None:
+            conn.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are explicit (see transaction())
+        conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.executescript(STATE_SCHEMA)
+        self._local.conn, self._local.path = conn, path
+        self._stats["connects"] += 1
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT: take the write lock up front so read-modify-write is safe."""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._stats["writes"] += 1
+
+    def bump_version(self, conn: sqlite3.Connection, table: str):
+        """Call inside a write transaction that changed ``table``."""
+        conn.execute(
+            "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (table,),
+        )
+
+    def version(self, table: str) -> int:
+        row = self.connect().execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+    # ---- JSON sources ----
+
+    def register_json_source(self, name: str, path_getter: Callable[[], Path], import_fn: JsonImporter):
+        self._sources[name] = JsonSource(name, path_getter, import_fn)
+
+    def sync_json(self, name: str) -> int:
+        """
+        Import source ``name`` if its file changed since the last import.
+        One os.stat() when nothing changed; returns the entries written.
+        """
+        source = self._sources[name]
+        try:
+            st = os.stat(source.path)
+        except OSError:
+            return 0
+        seen = (str(self.path), st.st_ino, st.st_mtime_ns, st.st_size)
+        if seen == source.seen:
+            return 0
+        try:
+            content = source.path.read_bytes()
+            sha256 = hashlib.sha256(content).hexdigest()
+            with self.transaction() as conn:
+                row = conn.execute("SELECT sha256 FROM json_imports WHERE source = ?", (name,)).fetchone()
+                entries = 0
+                if not row or row[0] != sha256:
+                    data = json.loads(content) if content.strip() else {}
+                    entries = source.import_fn(conn, data)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO json_imports (source, filename, sha256, entries, imported_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (name, source.path.name, sha256, entries, time.strftime("%Y-%m-%dT%H:%M:%S")),
+                    )
+                    self._stats["imports"] += 1
+                    logger.info(f"[STATE_STORE] Imported {entries} entries from {source.path.name}")
+        except Exception as e:
+            # A half-written file: leave `seen` alone so the next read retries
+            self._stats["import_errors"] += 1
+            logger.warning(f"[STATE_STORE] Failed to import {source.path.name}: {e}")
+            return 0
+        source.seen = seen
+        return entries
+
+    def sync_file(self, path: Path) -> bool:
+        """Import whichever source reads ``path`` (after /admin/upload-file); False if none does."""
+        path = Path(path).resolve()
+        for name, source in self._sources.items():
+            if source.path.resolve() == path:
+                self.sync_json(name)
+                return True
+        return False
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["path"] = str(self.path)
+        try:
+            conn = self.connect()
+            stats["tables"] = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("google_reviews", "google_places", "watchpoints")
+            }
+            stats["json_imports"] = {
+                source: {"sha256": sha[:12], "entries": entries, "imported_at": at}
+                for source, sha, entries, at in conn.execute(
+                    "SELECT source, sha256, entries, imported_at FROM json_imports"
+                )
+            }
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
+
+
+state_store = StateStore(lambda: schema.DB_DIR / "app_state.db")
+
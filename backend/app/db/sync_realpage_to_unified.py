@@ -5,10 +5,15 @@ This script reads from realpage_raw.db (box_score, rent_roll, delinquency tables
 and populates the unified.db tables for dashboard display.
 """
 import sqlite3
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from app.db.schema import REALPAGE_DB_PATH, UNIFIED_DB_PATH
+from app.db.incremental_sync import SyncRun, UnifiedTableWriter
+from app.db.iso_dates import backfill_iso_dates, ensure_iso_date_columns, register_iso_date, to_iso_date
+from app.db.property_kpis import write_property_kpis
 
 # Property mapping: RealPage property_id -> unified_property_id
 # All Kairoi properties (PMC ID: 4248314)
@@ -96,6 +101,52 @@ def get_unified_conn():
     return sqlite3.connect(UNIFIED_DB_PATH)
 
 
+# Unified tables built only from reports -> the import-log report types they
+# read. In incremental runs these are rebuilt just for properties that had
+# one of those reports imported (tables that also read the SOAP API tables,
+# which are not in the import log, are always rebuilt).
+REPORT_SOURCES = {
+    "unified_financial_summary": ("monthly_transaction_summary",),
+    "unified_financial_detail": ("monthly_transaction_summary",),
+    "unified_lease_expirations": ("lease_expiration_renewal",),
+    "unified_activity": ("activity_report", "activity"),
+    "unified_projected_occupancy": ("projected_occupancy",),
+    "unified_maintenance": ("make_ready_summary", "closed_make_ready"),
+    "unified_move_out_reasons": ("move_out_reasons",),
+    "unified_advertising_sources": ("advertising_source",),
+    "unified_lost_rent": ("lost_rent_summary",),
+    "unified_income_statement": ("income_statement",),
+}
+
+
+def _rebuild_scope(run: Optional[SyncRun], uni_conn, table: str):
+    """Properties to rebuild ``table`` for this run (None: all), see SyncRun.rebuild_scope()."""
+    if run is None:
+        return None
+    scope = run.rebuild_scope(uni_conn, table, REPORT_SOURCES[table])
+    if scope is not None:
+        print(f"     {table}: new reports for {len(scope)} properties")
+    return scope
+
+
+def _site_filter(scope, column: str = "property_id") -> str:
+    """SQL condition limiting a raw report query to the sites of ``scope`` (all sites for None)."""
+    if scope is None:
+        return ""
+    sites = [site_id for site_id, m in PROPERTY_MAPPING.items() if m["unified_id"] in scope]
+    if not sites:
+        return " AND 0"
+    return f" AND {column} IN ({', '.join(repr(site_id) for site_id in sites)})"
+
+
+def _finish_table(writer: UnifiedTableWriter):
+    """Write a table's collected rows (full or incremental) and report what changed."""
+    result = writer.finish()
+    if writer.run.incremental:
+        print(f"     {writer.table}: {result.summary()}")
+    return result
+
+
 def _parse_bedbath_from_code(floorplan: str):
     """Fallback: parse bed/bath from floorplan code when box_score group is missing.
     
@@ -578,592 +629,308 @@ def sync_pricing_metrics():
     return count
 
 
+# Vacant-unit predicates shared by the enrichment stages below
+_VACANT_UNIT_SQL = "u.occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')"
+_MISSING_LEASE_START_SQL = f"""
+    u.is_preleased = 1 AND {_VACANT_UNIT_SQL}
+    AND (u.lease_start IS NULL OR u.lease_start = '')"""
+_MISSING_DAYS_VACANT_SQL = f"{_VACANT_UNIT_SQL} AND u.days_vacant IS NULL"
+
+
+def _days_since_sql(column: str) -> str:
+    """SQL for whole days from ``column`` (any PMS date format) to :today, floored at 0."""
+    return f"MAX(0, CAST(julianday(:today) - julianday(iso_date({column})) AS INTEGER))"
+
+
+def _rent_roll_unit_status(status_raw: str):
+    """Map a rent roll unit/lease status to (status, is_preleased); None for junk rows."""
+    # Skip junk rows: header rows ("unit/lease status") and empty/null statuses
+    if not status_raw or "unit/lease" in status_raw or "status" in status_raw:
+        return None
+    
+    # Order matters: check NTV before occupied, vacant-leased before vacant
+    if "ntvl" in status_raw:
+        return "notice", 1  # On notice but already re-leased
+    if "ntv" in status_raw:
+        return "notice", 0
+    if "occupied" in status_raw:
+        return "occupied", 0
+    if "vacant-leased" in status_raw or "vacant leased" in status_raw:
+        return "vacant", 1
+    if "vacant" in status_raw:
+        return "vacant", 0
+    if "model" in status_raw:
+        return "model", 0
+    if "down" in status_raw or "admin" in status_raw:
+        return "down", 0
+    return None  # Skip any other unrecognized status
+
+
+def _run_unit_stage(uni_conn, label: str, sql: str, params=None) -> int:
+    """Run one set-based enrichment UPDATE; print its row count and timing."""
+    start = time.perf_counter()
+    try:
+        count = uni_conn.execute(sql, params or {}).rowcount
+    except sqlite3.Error as e:
+        print(f"  ⚠️  {label}: {e}")
+        return 0
+    print(f"     {label}: {count} units ({time.perf_counter() - start:.2f}s)")
+    return count
+
+
 def sync_units_from_rent_roll():
-    """Sync unit-level data from rent_roll to unified_units."""
+    """
+    Sync unit-level data from rent_roll to unified_units.
+    
+    Runs as staged bulk operations: realpage_raw.db is ATTACHed to the
+    unified connection, the RealPage -> unified property mapping is staged in
+    a temp table, the latest rent roll row per unit is written with one
+    executemany, and each enrichment (API fields, bed/bath, in-place rent,
+    incoming lease_start, days_vacant fallbacks) is a single UPDATE ... FROM
+    join instead of one UPDATE per unit.
+    """
     print("\n🏠 Syncing units from rent roll...")
     
-    rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
-    
-    rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
-    
-    # Get latest rent roll data
-    rp_cursor.execute("""
-        SELECT 
-            property_id,
-            report_date,
-            unit_number,
-            floorplan,
-            sqft,
-            market_rent,
-            actual_rent,
-            status,
-            resident_name,
-            lease_start,
-            lease_end,
-            move_in_date
-        FROM realpage_rent_roll
-        WHERE property_id IS NOT NULL
-        ORDER BY property_id, report_date DESC
-    """)
-    
-    count = 0
-    seen = set()
-    
-    for row in rp_cursor.fetchall():
-        property_id = row[0]
-        unit_number = row[2]
-        
-        key = (property_id, unit_number)
-        if key in seen:
-            continue
-        seen.add(key)
-        
-        if property_id not in PROPERTY_MAPPING:
-            continue
-        
-        unified_id = PROPERTY_MAPPING[property_id]["unified_id"]
-        
-        floorplan = row[3]
-        sqft = row[4] or 0
-        market_rent = row[5] or 0
-        actual_rent = row[6] or 0
-        status_raw = (row[7] or "").lower().strip()
-        lease_start = row[9] or ''
-        lease_end = row[10] or ''
-        move_in_date = row[11] or ''
-        
-        # Skip junk rows: header rows ("unit/lease status") and empty/null statuses
-        if not status_raw or "unit/lease" in status_raw or "status" in status_raw:
+    uni_conn.execute("ATTACH DATABASE ? AS rp", (str(REALPAGE_DB_PATH),))
+    register_iso_date(uni_conn)
+    ensure_iso_date_columns(uni_conn)
+    today = {"today": datetime.now().date().isoformat()}
+    
+    uni_conn.execute("DROP TABLE IF EXISTS temp.rp_property_map")
+    uni_conn.execute("CREATE TEMP TABLE rp_property_map (site_id TEXT PRIMARY KEY, unified_id TEXT NOT NULL)")
+    uni_conn.executemany(
+        "INSERT INTO temp.rp_property_map VALUES (?, ?)",
+        [(site_id, m["unified_id"]) for site_id, m in PROPERTY_MAPPING.items()],
+    )
+    
+    # --- Latest rent roll row per unit (report_date is unique per unit) ---
+    start = time.perf_counter()
+    rows = uni_conn.execute("""
+        SELECT m.unified_id, r.unit_number, r.floorplan, r.sqft, r.market_rent,
+               r.actual_rent, r.status, r.lease_start, r.lease_end, r.move_in_date
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY property_id, unit_number ORDER BY report_date DESC
+            ) AS rn
+            FROM rp.realpage_rent_roll
+            WHERE property_id IS NOT NULL
+        ) r
+        JOIN temp.rp_property_map m ON m.site_id = r.property_id
+        WHERE r.rn = 1
+    """).fetchall()
+    
+    synced_at = datetime.now().isoformat()
+    unit_rows = []
+    for (unified_id, unit_number, floorplan, sqft, market_rent, actual_rent,
+         status_raw, lease_start, lease_end, move_in_date) in rows:
+        mapped = _rent_roll_unit_status((status_raw or "").lower().strip())
+        if mapped is None:
             continue
-        
-        # Map status from rent_roll status field
-        # Order matters: check NTV before occupied, vacant-leased before vacant
-        is_preleased = 0
-        if "ntvl" in status_raw:
-            status = "notice"
-            is_preleased = 1  # On notice but already re-leased
-        elif "ntv" in status_raw:
-            status = "notice"
-        elif "occupied" in status_raw:
-            status = "occupied"
-        elif "vacant-leased" in status_raw or "vacant leased" in status_raw:
-            status = "vacant"
-            is_preleased = 1
-        elif "vacant" in status_raw:
-            status = "vacant"
-        elif "model" in status_raw:
-            status = "model"
-        elif "down" in status_raw or "admin" in status_raw:
-            status = "down"
-        else:
-            continue  # Skip any other unrecognized status
-        
+        status, is_preleased = mapped
         # Set occupancy_status from status (API enrichment may override for vacant)
         # Down units are physically vacant (not ready) — status tracks them separately
         occupancy_status = "vacant_not_ready" if status == "down" else status
-        
-        uni_cursor.execute("""
-            INSERT OR REPLACE INTO unified_units
-            (unified_property_id, pms_source, pms_unit_id, unit_number,
-             floorplan, square_feet, market_rent, status, occupancy_status,
-             in_place_rent, sqft, lease_start, lease_end, move_in_date, is_preleased,
-             synced_at)
-            VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        unit_rows.append((
             unified_id, unit_number, unit_number,
-            floorplan, sqft, market_rent, status, occupancy_status,
-            actual_rent, sqft, lease_start, lease_end, move_in_date, is_preleased,
-            datetime.now().isoformat()
+            floorplan, sqft or 0, market_rent or 0, status, occupancy_status,
+            actual_rent or 0, sqft or 0, lease_start or '', lease_end or '', move_in_date or '',
+            to_iso_date(lease_start), to_iso_date(lease_end), to_iso_date(move_in_date),
+            is_preleased, synced_at,
         ))
-        count += 1
-    
-    uni_conn.commit()
+    uni_conn.executemany("""
+        INSERT OR REPLACE INTO unified_units
+        (unified_property_id, pms_source, pms_unit_id, unit_number,
+         floorplan, square_feet, market_rent, status, occupancy_status,
+         in_place_rent, sqft, lease_start, lease_end, move_in_date,
+         lease_start_iso, lease_end_iso, move_in_date_iso, is_preleased,
+         synced_at)
+        VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, unit_rows)
+    count = len(unit_rows)
+    print(f"     Rent roll: {count} units from {len(rows)} latest rows ({time.perf_counter() - start:.2f}s)")
     
     # --- Enrich unified_units with API data (made_ready_date, available_date, available) ---
-    # The rent roll report doesn't include these fields, but realpage_units (API) does
+    # The rent roll report doesn't include these fields, but realpage_units (API) does.
+    # available = 'T' means "vacant + ready to lease" in RealPage; API market_rent
+    # is authoritative (matches Venn UI / Snowflake ASKED_RENT).
     print("  📡 Enriching units with API data (market_rent, made_ready_date, available)...")
-    enriched = 0
-    
-    # Build lookup: (property_id, unit_number) -> API fields
-    rp_cursor.execute("""
-        SELECT site_id, unit_number, made_ready_date, available_date, available, 
-               on_notice_date, vacant, exclude_from_occupancy, market_rent
-        FROM realpage_units
-        WHERE site_id IS NOT NULL
+    enriched = _run_unit_stage(uni_conn, "API fields", """
+        UPDATE unified_units AS u
+        SET made_ready_date = NULLIF(a.made_ready_date, ''),
+            made_ready_date_iso = iso_date(a.made_ready_date),
+            available_date = NULLIF(a.available_date, ''),
+            available_date_iso = iso_date(a.available_date),
+            on_notice_date = NULLIF(a.on_notice_date, ''),
+            on_notice_date_iso = iso_date(a.on_notice_date),
+            excluded_from_occupancy = CASE WHEN a.exclude_from_occupancy IN (1, '1', 'True') THEN 1 ELSE 0 END,
+            occupancy_status = COALESCE(
+                CASE WHEN a.vacant = 'T' THEN
+                    CASE WHEN a.available = 'T' THEN 'vacant_ready' ELSE 'vacant_not_ready' END
+                END,
+                u.occupancy_status),
+            market_rent = COALESCE(a.market_rent, u.market_rent)
+        FROM rp.realpage_units a
+        JOIN temp.rp_property_map m ON m.site_id = a.site_id
+        WHERE u.unified_property_id = m.unified_id
+          AND u.pms_unit_id = a.unit_number
+          AND a.id IN (SELECT MAX(id) FROM rp.realpage_units GROUP BY site_id, unit_number)
     """)
-    api_lookup = {}
-    for arow in rp_cursor.fetchall():
-        site_id = arow[0]
-        unit_num = arow[1]
-        api_lookup[(site_id, unit_num)] = {
-            "made_ready_date": arow[2],
-            "available_date": arow[3],
-            "available": arow[4],  # 'T' or 'F'
-            "on_notice_date": arow[5],
-            "vacant": arow[6],  # 'T' or 'F'
-            "excluded": arow[7],
-            "market_rent": arow[8],  # API market_rent = Venn UI price
-        }
-    
-    uni_cursor_r = uni_conn.cursor()
-    for property_id, mapping in PROPERTY_MAPPING.items():
-        unified_id = mapping["unified_id"]
-        # Get all units for this property in unified_units
-        uni_cursor_r.execute(
-            "SELECT pms_unit_id FROM unified_units WHERE unified_property_id = ?",
-            (unified_id,)
-        )
-        for (unit_num,) in uni_cursor_r.fetchall():
-            api_data = api_lookup.get((property_id, unit_num))
-            if api_data:
-                made_ready = api_data["made_ready_date"] or None
-                avail_date = api_data["available_date"] or None
-                on_notice = api_data["on_notice_date"] or None
-                # available = 'T' means vacant + ready (can be shown/leased)
-                is_available = 1 if api_data["available"] == "T" else 0
-                is_excluded = 1 if api_data.get("excluded") in (1, "1", "True", True) else 0
-                
-                # Set occupancy_status based on API available flag for vacant units
-                # available = 'T' means "vacant + ready to lease" in RealPage
-                occupancy_status = None
-                if api_data["vacant"] == "T":
-                    occupancy_status = "vacant_ready" if api_data["available"] == "T" else "vacant_not_ready"
-                
-                # API market_rent is authoritative (matches Venn UI / Snowflake ASKED_RENT)
-                api_market_rent = api_data.get("market_rent")
-                uni_cursor.execute("""
-                    UPDATE unified_units 
-                    SET made_ready_date = ?, available_date = ?, on_notice_date = ?,
-                        excluded_from_occupancy = ?,
-                        occupancy_status = COALESCE(?, occupancy_status),
-                        market_rent = COALESCE(?, market_rent)
-                    WHERE unified_property_id = ? AND pms_unit_id = ?
-                """, (made_ready, avail_date, on_notice, is_excluded, occupancy_status, api_market_rent, unified_id, unit_num))
-                if uni_cursor.rowcount > 0:
-                    enriched += 1
     
     # --- Enrich bedrooms/bathrooms from realpage_floorplan_bedrooms (raw layer) ---
     print("  🛏️  Enriching units with bed/bath from floorplan lookup...")
-    bedbath_enriched = 0
-    try:
-        rp_cursor.execute("""
-            SELECT property_id, floorplan, bedrooms, bathrooms
-            FROM realpage_floorplan_bedrooms
-        """)
-        fp_lookup = {}  # (property_id, floorplan) -> (beds, baths)
-        for r in rp_cursor.fetchall():
-            fp_lookup[(r[0], r[1])] = (r[2], r[3])
-        
-        for property_id, mapping in PROPERTY_MAPPING.items():
-            unified_id = mapping["unified_id"]
-            uni_cursor_r.execute(
-                "SELECT pms_unit_id, floorplan FROM unified_units WHERE unified_property_id = ?",
-                (unified_id,)
-            )
-            for unit_num, floorplan in uni_cursor_r.fetchall():
-                bedbath = fp_lookup.get((property_id, floorplan))
-                if bedbath:
-                    beds, baths = bedbath
-                    uni_cursor.execute("""
-                        UPDATE unified_units SET bedrooms = ?, bathrooms = ?
-                        WHERE unified_property_id = ? AND pms_unit_id = ?
-                    """, (beds, baths, unified_id, unit_num))
-                    if uni_cursor.rowcount > 0:
-                        bedbath_enriched += 1
-        
-        uni_conn.commit()
-    except Exception as e:
-        print(f"  ⚠️  Bed/bath enrichment: {e}")
+    bedbath_enriched = _run_unit_stage(uni_conn, "Bed/bath", """
+        UPDATE unified_units AS u
+        SET bedrooms = f.bedrooms, bathrooms = f.bathrooms
+        FROM rp.realpage_floorplan_bedrooms f
+        JOIN temp.rp_property_map m ON m.site_id = f.property_id
+        WHERE u.unified_property_id = m.unified_id AND u.floorplan = f.floorplan
+    """)
     print(f"  ✅ Enriched {bedbath_enriched} units with bed/bath")
     
     # --- Enrich in_place_rent from lease data ---
-    # Leases use API unit_id as pms_unit_id; need realpage_units to map unit_id → unit_number
+    # Leases use API unit_id; realpage_units maps unit_id → unit_number.
+    # The last Current lease per unit wins.
     print("  💰 Enriching units with in-place rent from leases...")
-    rent_enriched = 0
-    try:
-        rp_cursor.execute("""
-            SELECT site_id, unit_id, unit_number FROM realpage_units WHERE site_id IS NOT NULL
-        """)
-        uid_to_unum = {}  # (site_id, api_unit_id) -> unit_number
-        for r in rp_cursor.fetchall():
-            uid_to_unum[(r[0], r[1])] = r[2]
-        
-        rp_cursor.execute("""
-            SELECT site_id, unit_id, rent_amount
-            FROM realpage_leases
-            WHERE status_text = 'Current' AND rent_amount > 0
-        """)
-        # Build (unified_id, unit_number) -> rent mapping
-        rent_map = {}
-        for r in rp_cursor.fetchall():
-            site_id, api_uid, rent = r
-            if site_id not in PROPERTY_MAPPING:
-                continue
-            unified_id = PROPERTY_MAPPING[site_id]["unified_id"]
-            unit_num = uid_to_unum.get((site_id, str(api_uid)))
-            if unit_num:
-                rent_map[(unified_id, unit_num)] = rent
-        
-        for (uid, unum), rent in rent_map.items():
-            uni_cursor.execute("""
-                UPDATE unified_units SET in_place_rent = ?
-                WHERE unified_property_id = ? AND unit_number = ?
-            """, (rent, uid, unum))
-            if uni_cursor.rowcount > 0:
-                rent_enriched += 1
-    except Exception as e:
-        print(f"  ⚠️  Rent enrichment: {e}")
+    rent_enriched = _run_unit_stage(uni_conn, "In-place rent", """
+        UPDATE unified_units AS u
+        SET in_place_rent = r.rent_amount
+        FROM (
+            SELECT m.unified_id, ru.unit_number, l.rent_amount,
+                   ROW_NUMBER() OVER (PARTITION BY m.unified_id, ru.unit_number ORDER BY l.id DESC) AS rn
+            FROM rp.realpage_leases l
+            JOIN temp.rp_property_map m ON m.site_id = l.site_id
+            JOIN rp.realpage_units ru ON ru.site_id = l.site_id AND ru.unit_id = l.unit_id
+            WHERE l.status_text = 'Current' AND l.rent_amount > 0
+              AND ru.unit_number IS NOT NULL AND ru.unit_number != ''
+        ) r
+        WHERE r.rn = 1 AND u.unified_property_id = r.unified_id AND u.unit_number = r.unit_number
+    """)
     
     # --- Enrich Vacant-Leased units with incoming lease_start ---
-    # RealPage residents with lease_status='Future' have move_in_date for incoming tenants
+    # First unified_leases Applicant rows, then RealPage residents
+    # (lease_status='Future' carries the incoming tenant's move_in_date).
     print("  📅 Enriching Vacant-Leased units with incoming lease_start...")
-    lease_start_enriched = 0
-    try:
-        # Get all Vacant-Leased units missing lease_start
-        uni_cursor_r2 = uni_conn.cursor()
-        uni_cursor_r2.execute("""
-            SELECT unified_property_id, unit_number FROM unified_units
-            WHERE is_preleased = 1
-              AND occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-              AND (lease_start IS NULL OR lease_start = '')
-        """)
-        preleased_missing = uni_cursor_r2.fetchall()
-        
-        if preleased_missing:
-            # First try unified_leases Applicant
-            for unified_id, unit_num in preleased_missing:
-                uni_cursor_r2.execute("""
-                    SELECT lease_start FROM unified_leases
-                    WHERE unified_property_id = ? AND unit_number = ?
-                      AND status = 'Applicant'
-                      AND lease_start IS NOT NULL AND lease_start != ''
-                    LIMIT 1
-                """, (unified_id, unit_num))
-                r = uni_cursor_r2.fetchone()
-                if r:
-                    uni_cursor.execute("""
-                        UPDATE unified_units SET lease_start = ?
-                        WHERE unified_property_id = ? AND unit_number = ?
-                    """, (r[0], unified_id, unit_num))
-                    if uni_cursor.rowcount > 0:
-                        lease_start_enriched += 1
-            
-            # Then try realpage_residents Future move_in_date for remaining
-            still_missing = []
-            uni_cursor_r2.execute("""
-                SELECT unified_property_id, unit_number FROM unified_units
-                WHERE is_preleased = 1
-                  AND occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-                  AND (lease_start IS NULL OR lease_start = '')
-            """)
-            still_missing = uni_cursor_r2.fetchall()
-            
-            if still_missing:
-                # Group by property for efficient lookup
-                by_prop = {}
-                for uid, unum in still_missing:
-                    by_prop.setdefault(uid, []).append(unum)
-                
-                # Reverse map: unified_id -> site_id
-                uid_to_site = {v["unified_id"]: k for k, v in PROPERTY_MAPPING.items()}
-                
-                for uid, unit_nums in by_prop.items():
-                    site_id = uid_to_site.get(uid)
-                    if not site_id:
-                        continue
-                    ph = ','.join('?' * len(unit_nums))
-                    rp_cursor.execute(f"""
-                        SELECT unit_number, move_in_date
-                        FROM realpage_residents
-                        WHERE site_id = ?
-                          AND unit_number IN ({ph})
-                          AND lease_status IN ('Future', 'Current')
-                          AND move_in_date IS NOT NULL AND move_in_date != ''
-                    """, [site_id] + unit_nums)
-                    for r in rp_cursor.fetchall():
-                        uni_cursor.execute("""
-                            UPDATE unified_units SET lease_start = ?
-                            WHERE unified_property_id = ? AND unit_number = ?
-                        """, (r[1], uid, r[0]))
-                        if uni_cursor.rowcount > 0:
-                            lease_start_enriched += 1
-    except Exception as e:
-        print(f"  ⚠️  Lease start enrichment: {e}")
+    lease_start_enriched = _run_unit_stage(uni_conn, "lease_start from Applicant leases", f"""
+        UPDATE unified_units AS u
+        SET lease_start = l.lease_start, lease_start_iso = iso_date(l.lease_start)
+        FROM (
+            SELECT unified_property_id, unit_number, lease_start,
+                   ROW_NUMBER() OVER (PARTITION BY unified_property_id, unit_number ORDER BY id) AS rn
+            FROM unified_leases
+            WHERE status = 'Applicant' AND lease_start IS NOT NULL AND lease_start != ''
+        ) l
+        WHERE l.rn = 1
+          AND u.unified_property_id = l.unified_property_id AND u.unit_number = l.unit_number
+          AND {_MISSING_LEASE_START_SQL}
+    """)
+    lease_start_enriched += _run_unit_stage(uni_conn, "lease_start from residents", f"""
+        UPDATE unified_units AS u
+        SET lease_start = r.move_in_date, lease_start_iso = iso_date(r.move_in_date)
+        FROM (
+            SELECT m.unified_id, r.unit_number, r.move_in_date,
+                   ROW_NUMBER() OVER (PARTITION BY r.site_id, r.unit_number ORDER BY r.id DESC) AS rn
+            FROM rp.realpage_residents r
+            JOIN temp.rp_property_map m ON m.site_id = r.site_id
+            WHERE r.lease_status IN ('Future', 'Current')
+              AND r.move_in_date IS NOT NULL AND r.move_in_date != ''
+        ) r
+        WHERE r.rn = 1
+          AND u.unified_property_id = r.unified_id AND u.unit_number = r.unit_number
+          AND {_MISSING_LEASE_START_SQL}
+    """)
     
     # --- Enrich lease_start from realpage_lease_details report ---
-    # For Vacant-Leased units still missing lease_start, match Applicant leases
-    # in lease_details by property + floorplan (direct match, no join chain).
-    # Applicant leases in the report are often too new for the Leases API.
+    # For Vacant-Leased units still missing lease_start, match the earliest
+    # Applicant lease in lease_details by property + floorplan code
+    # ("1D - 1D" → "1D"). Applicant leases in the report are often too new
+    # for the Leases API.
     print("  📋 Enriching lease_start from lease_details report...")
-    lease_details_enriched = 0
-    try:
-        uni_cursor_ld = uni_conn.cursor()
-        uni_cursor_ld.execute("""
-            SELECT unified_property_id, unit_number, floorplan FROM unified_units
-            WHERE is_preleased = 1
-              AND occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-              AND (lease_start IS NULL OR lease_start = '')
-              AND floorplan IS NOT NULL AND floorplan != ''
-        """)
-        still_missing = uni_cursor_ld.fetchall()
-        
-        if still_missing:
-            uid_to_site_ld = {v["unified_id"]: k for k, v in PROPERTY_MAPPING.items()}
-            
-            # Pre-load all Applicant leases from lease_details per property
-            # keyed by (site_id, floorplan_code) → earliest lease_start_date
-            applicant_cache = {}
-            site_ids = set()
-            for uid, unum, fp in still_missing:
-                sid = uid_to_site_ld.get(uid)
-                if sid:
-                    site_ids.add(sid)
-            
-            for sid in site_ids:
-                rp_cursor.execute("""
-                    SELECT floorplan, lease_start_date FROM realpage_lease_details
-                    WHERE property_id = ? AND occupancy_status = 'Applicant'
-                      AND lease_start_date IS NOT NULL AND lease_start_date != ''
-                    ORDER BY lease_start_date ASC
-                """, (sid,))
-                for fp_full, start in rp_cursor.fetchall():
-                    # Extract floorplan code: "1D - 1D" → "1D"
-                    fp_code = fp_full.split(' - ')[0].strip() if fp_full else ''
-                    cache_key = (sid, fp_code)
-                    if cache_key not in applicant_cache:
-                        applicant_cache[cache_key] = start  # first = earliest
-            
-            for uid, unum, fp in still_missing:
-                site_id = uid_to_site_ld.get(uid)
-                if not site_id:
-                    continue
-                start = applicant_cache.get((site_id, fp))
-                if start:
-                    uni_cursor.execute("""
-                        UPDATE unified_units SET lease_start = ?
-                        WHERE unified_property_id = ? AND unit_number = ?
-                          AND (lease_start IS NULL OR lease_start = '')
-                    """, (start, uid, unum))
-                    if uni_cursor.rowcount > 0:
-                        lease_details_enriched += 1
-    except Exception as e:
-        print(f"  ⚠️  Lease details enrichment: {e}")
+    lease_details_enriched = _run_unit_stage(uni_conn, "lease_start from lease_details", f"""
+        UPDATE unified_units AS u
+        SET lease_start = d.lease_start, lease_start_iso = iso_date(d.lease_start)
+        FROM (
+            SELECT m.unified_id,
+                   TRIM(CASE WHEN INSTR(d.floorplan, ' - ') > 0
+                             THEN SUBSTR(d.floorplan, 1, INSTR(d.floorplan, ' - ') - 1)
+                             ELSE d.floorplan END) AS fp_code,
+                   MIN(d.lease_start_date) AS lease_start
+            FROM rp.realpage_lease_details d
+            JOIN temp.rp_property_map m ON m.site_id = d.property_id
+            WHERE d.occupancy_status = 'Applicant'
+              AND d.lease_start_date IS NOT NULL AND d.lease_start_date != ''
+            GROUP BY m.unified_id, fp_code
+        ) d
+        WHERE u.unified_property_id = d.unified_id AND u.floorplan = d.fp_code
+          AND u.floorplan != ''
+          AND {_MISSING_LEASE_START_SQL}
+    """)
     
-    # --- Compute days_vacant from realpage_residents move_out_date ---
-    # For vacant units where days_vacant is NULL, compute from last move_out
+    # --- Compute days_vacant for vacant units where it is NULL ---
+    # Vacancy start, in order of preference: last move-out in unified_leases,
+    # last Past/Former resident move-out, the lease_details report (often ahead
+    # of the Leases/Residents APIs), then available_date for never-leased
+    # units (lease-up properties).
     print("  📊 Computing days_vacant from move_out dates...")
-    days_vacant_enriched = 0
-    try:
-        uni_cursor_r3 = uni_conn.cursor()
-        uni_cursor_r3.execute("""
-            SELECT unified_property_id, unit_number FROM unified_units
-            WHERE occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-              AND (days_vacant IS NULL)
-        """)
-        vacant_missing_dv = uni_cursor_r3.fetchall()
-        
-        if vacant_missing_dv:
-            # First try unified_leases move_out_date
-            for uid, unum in vacant_missing_dv:
-                uni_cursor_r3.execute("""
-                    SELECT MAX(move_out_date) FROM unified_leases
-                    WHERE unified_property_id = ? AND unit_number = ?
-                      AND move_out_date IS NOT NULL AND move_out_date != ''
-                """, (uid, unum))
-                r = uni_cursor_r3.fetchone()
-                if r and r[0]:
-                    mo_str = r[0]
-                    try:
-                        for fmt in ('%Y-%m-%d', '%m/%d/%Y'):
-                            try:
-                                mo_date = datetime.strptime(mo_str, fmt).date()
-                                dv = (datetime.now().date() - mo_date).days
-                                if dv < 0:
-                                    dv = 0
-                                uni_cursor.execute("""
-                                    UPDATE unified_units SET days_vacant = ?
-                                    WHERE unified_property_id = ? AND unit_number = ?
-                                """, (dv, uid, unum))
-                                if uni_cursor.rowcount > 0:
-                                    days_vacant_enriched += 1
-                                break
-                            except ValueError:
-                                continue
-                    except Exception:
-                        pass
-            
-            # Then try realpage_residents Past/Former for remaining
-            uni_cursor_r3.execute("""
-                SELECT unified_property_id, unit_number FROM unified_units
-                WHERE occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-                  AND (days_vacant IS NULL)
-            """)
-            still_missing_dv = uni_cursor_r3.fetchall()
-            
-            if still_missing_dv:
-                by_prop_dv = {}
-                for uid, unum in still_missing_dv:
-                    by_prop_dv.setdefault(uid, []).append(unum)
-                
-                uid_to_site = {v["unified_id"]: k for k, v in PROPERTY_MAPPING.items()}
-                
-                for uid, unit_nums in by_prop_dv.items():
-                    site_id = uid_to_site.get(uid)
-                    if not site_id:
-                        continue
-                    ph = ','.join('?' * len(unit_nums))
-                    rp_cursor.execute(f"""
-                        SELECT unit_number, MAX(move_out_date) as last_mo
-                        FROM realpage_residents
-                        WHERE site_id = ?
-                          AND unit_number IN ({ph})
-                          AND move_out_date IS NOT NULL AND move_out_date != ''
-                          AND lease_status IN ('Past', 'Former')
-                        GROUP BY unit_number
-                    """, [site_id] + unit_nums)
-                    for r in rp_cursor.fetchall():
-                        mo_str = r[1]
-                        try:
-                            for fmt in ('%Y-%m-%d', '%m/%d/%Y'):
-                                try:
-                                    mo_date = datetime.strptime(mo_str, fmt).date()
-                                    dv = (datetime.now().date() - mo_date).days
-                                    if dv < 0:
-                                        dv = 0
-                                    uni_cursor.execute("""
-                                        UPDATE unified_units SET days_vacant = ?
-                                        WHERE unified_property_id = ? AND unit_number = ?
-                                    """, (dv, uid, r[0]))
-                                    if uni_cursor.rowcount > 0:
-                                        days_vacant_enriched += 1
-                                    break
-                                except ValueError:
-                                    continue
-                        except Exception:
-                            pass
-    except Exception as e:
-        print(f"  ⚠️  Days vacant enrichment: {e}")
-    
-    # --- Enrich days_vacant from realpage_lease_details move_out_date ---
-    # For vacant units still missing days_vacant, try the lease_details report
-    # which often has move_out_date before the Leases/Residents APIs catch up.
-    lease_details_dv_enriched = 0
-    try:
-        uni_cursor_dv2 = uni_conn.cursor()
-        uni_cursor_dv2.execute("""
-            SELECT unified_property_id, unit_number FROM unified_units
-            WHERE occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-              AND (days_vacant IS NULL)
-        """)
-        still_missing_dv = uni_cursor_dv2.fetchall()
-        
-        if still_missing_dv:
-            uid_to_site_dv = {v["unified_id"]: k for k, v in PROPERTY_MAPPING.items()}
-            by_prop_dv2 = {}
-            for uid, unum in still_missing_dv:
-                by_prop_dv2.setdefault(uid, []).append(unum)
-            
-            for uid, unit_nums in by_prop_dv2.items():
-                site_id = uid_to_site_dv.get(uid)
-                if not site_id:
-                    continue
-                
-                # Get unit_number → unit_id mapping
-                ph = ','.join('?' * len(unit_nums))
-                rp_cursor.execute(f"""
-                    SELECT unit_number, unit_id FROM realpage_units
-                    WHERE site_id = ? AND unit_number IN ({ph})
-                """, [site_id] + unit_nums)
-                unum_to_uid = {r[0]: str(r[1]) for r in rp_cursor.fetchall()}
-                
-                # Get unit_id → lease_id mapping (any lease for the unit)
-                for unum in unit_nums:
-                    api_uid = unum_to_uid.get(unum)
-                    if not api_uid:
-                        continue
-                    # Find lease_ids for this unit from realpage_leases
-                    rp_cursor.execute("""
-                        SELECT lease_id FROM realpage_leases
-                        WHERE site_id = ? AND unit_id = ?
-                    """, (site_id, api_uid))
-                    lease_ids = [str(r[0]) for r in rp_cursor.fetchall()]
-                    if not lease_ids:
-                        continue
-                    
-                    ph2 = ','.join('?' * len(lease_ids))
-                    rp_cursor.execute(f"""
-                        SELECT MAX(move_out_date) FROM realpage_lease_details
-                        WHERE property_id = ? AND lease_id IN ({ph2})
-                          AND move_out_date IS NOT NULL AND move_out_date != ''
-                    """, [site_id] + lease_ids)
-                    r = rp_cursor.fetchone()
-                    if r and r[0]:
-                        mo_str = r[0]
-                        for fmt in ('%m/%d/%Y', '%Y-%m-%d'):
-                            try:
-                                mo_date = datetime.strptime(mo_str, fmt).date()
-                                dv = (datetime.now().date() - mo_date).days
-                                if dv < 0:
-                                    dv = 0
-                                uni_cursor.execute("""
-                                    UPDATE unified_units SET days_vacant = ?
-                                    WHERE unified_property_id = ? AND unit_number = ?
-                                      AND (days_vacant IS NULL)
-                                """, (dv, uid, unum))
-                                if uni_cursor.rowcount > 0:
-                                    lease_details_dv_enriched += 1
-                                break
-                            except ValueError:
-                                continue
-    except Exception as e:
-        print(f"  ⚠️  Lease details days_vacant enrichment: {e}")
-    
-    # --- Final fallback: compute days_vacant from available_date ---
-    # For never-leased units (lease-up properties) with no move_out anywhere,
-    # use the available_date already in unified_units as the vacancy start.
-    avail_date_dv_enriched = 0
-    try:
-        uni_cursor_dv3 = uni_conn.cursor()
-        uni_cursor_dv3.execute("""
-            SELECT unified_property_id, unit_number, available_date FROM unified_units
-            WHERE occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-              AND (days_vacant IS NULL)
-              AND available_date IS NOT NULL AND available_date != ''
-        """)
-        for uid, unum, avail_str in uni_cursor_dv3.fetchall():
-            try:
-                for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y'):
-                    try:
-                        avail_date = datetime.strptime(avail_str, fmt).date()
-                        dv = (datetime.now().date() - avail_date).days
-                        if dv < 0:
-                            dv = 0
-                        uni_cursor.execute("""
-                            UPDATE unified_units SET days_vacant = ?
-                            WHERE unified_property_id = ? AND unit_number = ?
-                              AND (days_vacant IS NULL)
-                        """, (dv, uid, unum))
-                        if uni_cursor.rowcount > 0:
-                            avail_date_dv_enriched += 1
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
-    except Exception as e:
-        print(f"  ⚠️  Available date days_vacant fallback: {e}")
+    days_vacant_enriched = _run_unit_stage(uni_conn, "days_vacant from leases", f"""
+        UPDATE unified_units AS u
+        SET days_vacant = {_days_since_sql("l.last_move_out")}
+        FROM (
+            SELECT unified_property_id, unit_number, MAX(move_out_date) AS last_move_out
+            FROM unified_leases
+            WHERE move_out_date IS NOT NULL AND move_out_date != ''
+            GROUP BY unified_property_id, unit_number
+        ) l
+        WHERE u.unified_property_id = l.unified_property_id AND u.unit_number = l.unit_number
+          AND iso_date(l.last_move_out) IS NOT NULL
+          AND {_MISSING_DAYS_VACANT_SQL}
+    """, today)
+    days_vacant_enriched += _run_unit_stage(uni_conn, "days_vacant from residents", f"""
+        UPDATE unified_units AS u
+        SET days_vacant = {_days_since_sql("r.last_move_out")}
+        FROM (
+            SELECT m.unified_id, r.unit_number, MAX(r.move_out_date) AS last_move_out
+            FROM rp.realpage_residents r
+            JOIN temp.rp_property_map m ON m.site_id = r.site_id
+            WHERE r.move_out_date IS NOT NULL AND r.move_out_date != ''
+              AND r.lease_status IN ('Past', 'Former')
+            GROUP BY m.unified_id, r.unit_number
+        ) r
+        WHERE u.unified_property_id = r.unified_id AND u.unit_number = r.unit_number
+          AND iso_date(r.last_move_out) IS NOT NULL
+          AND {_MISSING_DAYS_VACANT_SQL}
+    """, today)
+    lease_details_dv_enriched = _run_unit_stage(uni_conn, "days_vacant from lease_details", f"""
+        UPDATE unified_units AS u
+        SET days_vacant = {_days_since_sql("d.last_move_out")}
+        FROM (
+            SELECT m.unified_id, ru.unit_number, MAX(d.move_out_date) AS last_move_out
+            FROM rp.realpage_units ru
+            JOIN temp.rp_property_map m ON m.site_id = ru.site_id
+            JOIN rp.realpage_leases l ON l.site_id = ru.site_id AND l.unit_id = ru.unit_id
+            JOIN rp.realpage_lease_details d ON d.property_id = ru.site_id AND d.lease_id = l.lease_id
+            WHERE d.move_out_date IS NOT NULL AND d.move_out_date != ''
+            GROUP BY m.unified_id, ru.unit_number
+        ) d
+        WHERE u.unified_property_id = d.unified_id AND u.unit_number = d.unit_number
+          AND iso_date(d.last_move_out) IS NOT NULL
+          AND {_MISSING_DAYS_VACANT_SQL}
+    """, today)
+    avail_date_dv_enriched = _run_unit_stage(uni_conn, "days_vacant from available_date", f"""
+        UPDATE unified_units AS u
+        SET days_vacant = {_days_since_sql("u.available_date")}
+        WHERE iso_date(u.available_date) IS NOT NULL
+          AND {_MISSING_DAYS_VACANT_SQL}
+    """, today)
     
     uni_conn.commit()
-    rp_conn.close()
     uni_conn.close()
     
     print(f"  ✅ Synced {count} units, enriched {enriched} with API data, {rent_enriched} with lease rent, {lease_start_enriched} with incoming lease_start, {lease_details_enriched} from lease_details report, {days_vacant_enriched}+{lease_details_dv_enriched}+{avail_date_dv_enriched} with days_vacant")
     return count
 
 
-def sync_residents_from_rent_roll():
+def sync_residents_from_rent_roll(run: SyncRun = None):
     """Sync resident data from rent_roll to unified_residents."""
     print("\n👥 Syncing residents from rent roll...")
     
@@ -1173,8 +940,12 @@ def sync_residents_from_rent_roll():
     rp_cursor = rp_conn.cursor()
     uni_cursor = uni_conn.cursor()
     
-    # Clear existing residents (we'll repopulate from latest data)
-    uni_cursor.execute("DELETE FROM unified_residents WHERE pms_source = 'realpage'")
+    # Replaces the RealPage residents (Yardi rows share the table)
+    writer = UnifiedTableWriter(uni_conn, "unified_residents", (
+        "unified_property_id", "pms_source", "pms_resident_id", "pms_unit_id", "unit_number",
+        "first_name", "last_name", "full_name", "status", "lease_start", "lease_end",
+        "move_in_date", "move_out_date", "current_rent", "balance", "synced_at",
+    ), run, scope="pms_source = 'realpage'")
     
     # Get latest rent roll data - include occupied units even without names
     rp_cursor.execute("""
@@ -1238,14 +1009,8 @@ def sync_residents_from_rent_roll():
         
         resident_id = f"{property_id}_{unit_number}"
         
-        uni_cursor.execute("""
-            INSERT INTO unified_residents
-            (unified_property_id, pms_source, pms_resident_id, pms_unit_id, unit_number,
-             first_name, last_name, full_name, status, lease_start, lease_end,
-             move_in_date, move_out_date, current_rent, balance, synced_at)
-            VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            unified_id, resident_id, unit_number, unit_number,
+        writer.add((
+            unified_id, 'realpage', resident_id, unit_number, unit_number,
             first_name, last_name, full_name, status, lease_start, lease_end,
             move_in, move_out, current_rent, balance,
             datetime.now().isoformat()
@@ -1271,14 +1036,10 @@ def sync_residents_from_rent_roll():
             continue  # Already have rent_roll data
         
         key_fb = f"fallback_{uid}_{unit_num}"
-        uni_cursor.execute("""
-            INSERT OR IGNORE INTO unified_residents
-            (unified_property_id, pms_source, pms_resident_id, pms_unit_id, unit_number,
-             first_name, last_name, full_name, status, current_rent, synced_at)
-            VALUES (?, 'realpage', ?, ?, ?, '', '', ?, 'current', ?, ?)
-        """, (
-            uid, key_fb, unit_num, unit_num,
-            f"Unit {unit_num} Resident", rent or 0,
+        writer.add((
+            uid, 'realpage', key_fb, unit_num, unit_num,
+            '', '', f"Unit {unit_num} Resident", 'current', None, None,
+            None, None, rent or 0, None,
             datetime.now().isoformat()
         ))
         fallback_count += 1
@@ -1286,6 +1047,7 @@ def sync_residents_from_rent_roll():
     if fallback_count > 0:
         print(f"  ℹ️  Added {fallback_count} residents from unified_units fallback")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1294,7 +1056,7 @@ def sync_residents_from_rent_roll():
     return count + fallback_count
 
 
-def sync_delinquency():
+def sync_delinquency(run: SyncRun = None):
     """Sync delinquency data from realpage_delinquency to unified.
     Cross-references realpage_leases evict flag for eviction status."""
     print("\n💸 Syncing delinquency data...")
@@ -1339,8 +1101,12 @@ def sync_delinquency():
         except Exception:
             pass
     
-    # Clear existing delinquency data
-    uni_cursor.execute("DELETE FROM unified_delinquency")
+    writer = UnifiedTableWriter(uni_conn, "unified_delinquency", (
+        "unified_property_id", "report_date", "unit_number", "resident_name", "status",
+        "current_balance", "balance_0_30", "balance_31_60", "balance_61_90",
+        "balance_over_90", "prepaid", "net_balance", "total_delinquent",
+        "is_eviction", "eviction_balance", "synced_at",
+    ), run)
     
     # Build eviction lookup from realpage_leases (RPX SOAP API getLeaseInfo → Evict flag)
     # Leases have unit_id but empty unit_number, so we map via realpage_units
@@ -1421,14 +1187,7 @@ def sync_delinquency():
         if is_eviction:
             eviction_count += 1
         
-        uni_cursor.execute("""
-            INSERT INTO unified_delinquency
-            (unified_property_id, report_date, unit_number, resident_name, status,
-             current_balance, balance_0_30, balance_31_60, balance_61_90,
-             balance_over_90, prepaid, net_balance, total_delinquent,
-             is_eviction, eviction_balance, synced_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        writer.add((
             unified_id, row[1], row[2], row[3], row[4] or '',
             row[5] or 0, row[6] or 0, row[7] or 0, row[8] or 0,
             row[9] or 0, row[10] or 0, row[11] or 0, row[12] or 0,
@@ -1437,6 +1196,7 @@ def sync_delinquency():
         ))
         count += 1
     
+    _finish_table(writer)
     uni_conn.commit()
     
     # Summary by property
@@ -1460,7 +1220,7 @@ def sync_delinquency():
     return count
 
 
-def sync_leases():
+def sync_leases(run: SyncRun = None):
     """Sync leases from realpage_leases (SOAP API data) to unified_leases."""
     print("\n📜 Syncing leases...")
     
@@ -1488,7 +1248,12 @@ def sync_leases():
     except Exception:
         pass
     
-    uni_cursor.execute("DELETE FROM unified_leases")
+    writer = UnifiedTableWriter(uni_conn, "unified_leases", (
+        "unified_property_id", "pms_source", "pms_lease_id", "pms_resident_id", "pms_unit_id",
+        "unit_number", "resident_name", "status", "lease_type", "rent_amount",
+        "lease_start", "lease_end", "move_in_date", "move_out_date",
+        "lease_term_months", "next_lease_id", "floorplan", "sqft", "synced_at",
+    ), run)
     
     rp_cursor.execute("""
         SELECT site_id, lease_id, resident_id, unit_id, unit_number,
@@ -1520,15 +1285,8 @@ def sync_leases():
             floorplan = lu[1]
             sqft = lu[2]
         
-        uni_cursor.execute("""
-            INSERT OR IGNORE INTO unified_leases
-            (unified_property_id, pms_source, pms_lease_id, pms_resident_id, pms_unit_id,
-             unit_number, resident_name, status, lease_type, rent_amount,
-             lease_start, lease_end, move_in_date, move_out_date,
-             lease_term_months, next_lease_id, floorplan, sqft, synced_at)
-            VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            unified_id, row[1], row[2], unit_id, unit_number,
+        writer.add((
+            unified_id, 'realpage', row[1], row[2], unit_id, unit_number,
             row[14] or '', row[5] or '', row[6] or '', row[7] or 0,
             row[8] or '', row[9] or '', row[10] or '', row[11] or '',
             row[12] or '', row[13] or '', floorplan, sqft,
@@ -1536,6 +1294,7 @@ def sync_leases():
         ))
         count += 1
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1544,22 +1303,31 @@ def sync_leases():
     return count
 
 
-def sync_financials():
+def sync_financials(run: SyncRun = None):
     """Sync financial summary + detail from realpage_monthly_transaction tables."""
     print("\n💰 Syncing financials...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
     
     # -- Summary --
-    uni_cursor.execute("DELETE FROM unified_financial_summary")
+    summary_scope = _rebuild_scope(run, uni_conn, "unified_financial_summary")
+    summary = UnifiedTableWriter(uni_conn, "unified_financial_summary", (
+        "unified_property_id", "pms_source", "report_date", "fiscal_period",
+        "gross_market_rent", "gain_to_lease", "loss_to_lease", "gross_potential",
+        "total_other_charges", "total_possible_collections",
+        "total_collection_losses", "total_adjustments",
+        "past_due_end_prior", "prepaid_end_prior",
+        "past_due_end_current", "prepaid_end_current",
+        "net_change_past_due_prepaid", "total_losses_and_adjustments",
+        "current_monthly_collections", "total_monthly_collections", "snapshot_date",
+    ), run, properties=summary_scope)
     summary_count = 0
     try:
-        rp_cursor.execute("""
+        rp_cursor.execute(f"""
             SELECT property_id, report_date, fiscal_period,
                    gross_market_rent, gain_to_lease, loss_to_lease, gross_potential,
                    total_other_charges, total_possible_collections,
@@ -1569,56 +1337,46 @@ def sync_financials():
                    net_change_past_due_prepaid, total_losses_and_adjustments,
                    current_monthly_collections, total_monthly_collections
             FROM realpage_monthly_transaction_summary
-            WHERE property_id IS NOT NULL
+            WHERE property_id IS NOT NULL{_site_filter(summary_scope)}
         """)
         for row in rp_cursor.fetchall():
             if row[0] not in PROPERTY_MAPPING:
                 continue
             unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-            uni_cursor.execute("""
-                INSERT INTO unified_financial_summary
-                (unified_property_id, pms_source, report_date, fiscal_period,
-                 gross_market_rent, gain_to_lease, loss_to_lease, gross_potential,
-                 total_other_charges, total_possible_collections,
-                 total_collection_losses, total_adjustments,
-                 past_due_end_prior, prepaid_end_prior,
-                 past_due_end_current, prepaid_end_current,
-                 net_change_past_due_prepaid, total_losses_and_adjustments,
-                 current_monthly_collections, total_monthly_collections, snapshot_date)
-                VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (unified_id, row[1], row[2], row[3], row[4], row[5], row[6],
-                  row[7], row[8], row[9], row[10], row[11], row[12], row[13],
-                  row[14], row[15], row[16], row[17], row[18], now_iso))
+            summary.add((unified_id, 'realpage', row[1], row[2], row[3], row[4], row[5], row[6],
+                         row[7], row[8], row[9], row[10], row[11], row[12], row[13],
+                         row[14], row[15], row[16], row[17], row[18], now_iso))
             summary_count += 1
     except Exception as e:
         print(f"  ⚠️  Financial summary: {e}")
+    _finish_table(summary)
     
     # -- Detail --
-    uni_cursor.execute("DELETE FROM unified_financial_detail")
+    detail_scope = _rebuild_scope(run, uni_conn, "unified_financial_detail")
+    detail = UnifiedTableWriter(uni_conn, "unified_financial_detail", (
+        "unified_property_id", "pms_source", "fiscal_period", "transaction_group",
+        "transaction_code", "description", "ytd_last_month", "this_month",
+        "ytd_through_month", "snapshot_date",
+    ), run, properties=detail_scope)
     detail_count = 0
     try:
-        rp_cursor.execute("""
+        rp_cursor.execute(f"""
             SELECT property_id, fiscal_period, transaction_group, transaction_code,
                    description, ytd_last_month, this_month, ytd_through_month
             FROM realpage_monthly_transaction_detail
-            WHERE property_id IS NOT NULL
+            WHERE property_id IS NOT NULL{_site_filter(detail_scope)}
         """)
         for row in rp_cursor.fetchall():
             if row[0] not in PROPERTY_MAPPING:
                 continue
             unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-            uni_cursor.execute("""
-                INSERT INTO unified_financial_detail
-                (unified_property_id, pms_source, fiscal_period, transaction_group,
-                 transaction_code, description, ytd_last_month, this_month,
-                 ytd_through_month, snapshot_date)
-                VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (unified_id, row[1], row[2] or '', row[3] or '',
-                  row[4] or '', row[5] or 0, row[6] or 0, row[7] or 0,
-                  now_iso))
+            detail.add((unified_id, 'realpage', row[1], row[2] or '', row[3] or '',
+                        row[4] or '', row[5] or 0, row[6] or 0, row[7] or 0,
+                        now_iso))
             detail_count += 1
     except Exception as e:
         print(f"  ⚠️  Financial detail: {e}")
+    _finish_table(detail)
     
     uni_conn.commit()
     rp_conn.close()
@@ -1628,46 +1386,45 @@ def sync_financials():
     return summary_count + detail_count
 
 
-def sync_lease_expirations():
+def sync_lease_expirations(run: SyncRun = None):
     """Sync lease expiration/renewal data from report 4156."""
     print("\n📅 Syncing lease expirations...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
-    uni_cursor.execute("DELETE FROM unified_lease_expirations")
+    scope = _rebuild_scope(run, uni_conn, "unified_lease_expirations")
+    writer = UnifiedTableWriter(uni_conn, "unified_lease_expirations", (
+        "unified_property_id", "pms_source", "unit_number", "floorplan", "resident_name",
+        "lease_end_date", "decision", "actual_rent", "new_rent",
+        "new_lease_start", "new_lease_term", "sqft", "report_date",
+    ), run, properties=scope)
     
     count = 0
     try:
         # Deduplicate: pick latest report_date per unit, breaking ties arbitrarily
-        rp_cursor.execute("""
+        rp_cursor.execute(f"""
             SELECT property_id, MAX(report_date) as report_date, unit_number, floorplan,
                    actual_rent, lease_end_date, decision,
                    new_rent, new_lease_start, new_lease_term,
                    move_in_date, market_rent
             FROM realpage_lease_expiration_renewal
-            WHERE property_id IS NOT NULL
+            WHERE property_id IS NOT NULL{_site_filter(scope)}
             GROUP BY property_id, unit_number, lease_end_date
         """)
         for row in rp_cursor.fetchall():
             if row[0] not in PROPERTY_MAPPING:
                 continue
             unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-            uni_cursor.execute("""
-                INSERT INTO unified_lease_expirations
-                (unified_property_id, pms_source, unit_number, floorplan, resident_name,
-                 lease_end_date, decision, actual_rent, new_rent,
-                 new_lease_start, new_lease_term, sqft, report_date)
-                VALUES (?, 'realpage', ?, ?, '', ?, ?, ?, ?, ?, ?, 0, ?)
-            """, (unified_id, row[2] or '', row[3] or '',
-                  row[5] or '', row[6] or '', row[4] or 0, row[7] or 0,
-                  row[8] or '', row[9] or 0, row[1] or ''))
+            writer.add((unified_id, 'realpage', row[2] or '', row[3] or '', '',
+                        row[5] or '', row[6] or '', row[4] or 0, row[7] or 0,
+                        row[8] or '', row[9] or 0, 0, row[1] or ''))
             count += 1
     except Exception as e:
         print(f"  ⚠️  Lease expirations: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1676,24 +1433,27 @@ def sync_lease_expirations():
     return count
 
 
-def sync_activity():
+def sync_activity(run: SyncRun = None):
     """Sync leasing activity from realpage_activity (Excel report data)."""
     print("\n📋 Syncing activity...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_activity")
+    scope = _rebuild_scope(run, uni_conn, "unified_activity")
+    writer = UnifiedTableWriter(uni_conn, "unified_activity", (
+        "unified_property_id", "pms_source", "resident_name", "activity_type",
+        "activity_type_raw", "activity_date", "leasing_agent", "source", "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
-        rp_cursor.execute("""
+        rp_cursor.execute(f"""
             SELECT property_id, resident_name, activity_type, activity_date
             FROM realpage_activity
-            WHERE property_id IS NOT NULL
+            WHERE property_id IS NOT NULL{_site_filter(scope)}
         """)
         for row in rp_cursor.fetchall():
             if row[0] not in PROPERTY_MAPPING:
@@ -1708,17 +1468,13 @@ def sync_activity():
                 if len(parts) == 3:
                     iso_date = f"{parts[2]}-{parts[0].zfill(2)}-{parts[1].zfill(2)}"
             
-            uni_cursor.execute("""
-                INSERT INTO unified_activity
-                (unified_property_id, pms_source, resident_name, activity_type,
-                 activity_type_raw, activity_date, leasing_agent, source, snapshot_date)
-                VALUES (?, 'realpage', ?, ?, ?, ?, '', '', ?)
-            """, (unified_id, row[1] or '', row[2] or '', row[2] or '',
-                  iso_date, now_iso))
+            writer.add((unified_id, 'realpage', row[1] or '', row[2] or '', row[2] or '',
+                        iso_date, '', '', now_iso))
             count += 1
     except Exception as e:
         print(f"  ⚠️  Activity: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1727,44 +1483,43 @@ def sync_activity():
     return count
 
 
-def sync_projected_occupancy():
+def sync_projected_occupancy(run: SyncRun = None):
     """Sync projected occupancy from report 3842."""
     print("\n📈 Syncing projected occupancy...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_projected_occupancy")
+    scope = _rebuild_scope(run, uni_conn, "unified_projected_occupancy")
+    writer = UnifiedTableWriter(uni_conn, "unified_projected_occupancy", (
+        "unified_property_id", "pms_source", "week_ending", "total_units",
+        "occupied_begin", "pct_occupied_begin", "scheduled_move_ins",
+        "scheduled_move_outs", "occupied_end", "pct_occupied_end", "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
-        rp_cursor.execute("""
+        rp_cursor.execute(f"""
             SELECT property_id, week_ending, total_units, occupied_begin,
                    pct_occupied_begin, scheduled_move_ins, scheduled_move_outs,
                    occupied_end, pct_occupied_end
             FROM realpage_projected_occupancy
-            WHERE property_id IS NOT NULL
+            WHERE property_id IS NOT NULL{_site_filter(scope)}
         """)
         for row in rp_cursor.fetchall():
             if row[0] not in PROPERTY_MAPPING:
                 continue
             unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-            uni_cursor.execute("""
-                INSERT INTO unified_projected_occupancy
-                (unified_property_id, pms_source, week_ending, total_units,
-                 occupied_begin, pct_occupied_begin, scheduled_move_ins,
-                 scheduled_move_outs, occupied_end, pct_occupied_end, snapshot_date)
-                VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (unified_id, row[1] or '', row[2] or 0, row[3] or 0,
-                  row[4] or 0, row[5] or 0, row[6] or 0,
-                  row[7] or 0, row[8] or 0, now_iso))
+            writer.add((unified_id, 'realpage', row[1] or '', row[2] or 0, row[3] or 0,
+                        row[4] or 0, row[5] or 0, row[6] or 0,
+                        row[7] or 0, row[8] or 0, now_iso))
             count += 1
     except Exception as e:
         print(f"  ⚠️  Projected occupancy: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1773,17 +1528,22 @@ def sync_projected_occupancy():
     return count
 
 
-def sync_maintenance():
+def sync_maintenance(run: SyncRun = None):
     """Sync make-ready pipeline (open + closed) from realpage_make_ready + realpage_closed_make_ready."""
     print("\n🔧 Syncing maintenance...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_maintenance")
+    # Open and closed rows share the table (record_type)
+    scope = _rebuild_scope(run, uni_conn, "unified_maintenance")
+    writer = UnifiedTableWriter(uni_conn, "unified_maintenance", (
+        "unified_property_id", "pms_source", "record_type", "unit", "sqft", "days_vacant",
+        "date_vacated", "date_due", "num_work_orders", "date_closed", "amount_charged",
+        "snapshot_date",
+    ), run, properties=scope)
     
     open_count = 0
     closed_count = 0
@@ -1792,23 +1552,18 @@ def sync_maintenance():
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_make_ready'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, unit, sqft, days_vacant, date_vacated,
                        date_due, num_work_orders
                 FROM realpage_make_ready
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_maintenance
-                    (unified_property_id, pms_source, record_type, unit, sqft, days_vacant,
-                     date_vacated, date_due, num_work_orders, snapshot_date)
-                    VALUES (?, 'realpage', 'open', ?, ?, ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or 0, row[3] or 0,
-                      row[4] or '', row[5] or '', row[6] or 0, now_iso))
+                writer.add((unified_id, 'realpage', 'open', row[1] or '', row[2] or 0, row[3] or 0,
+                            row[4] or '', row[5] or '', row[6] or 0, None, None, now_iso))
                 open_count += 1
     except Exception as e:
         print(f"  ⚠️  Maintenance (open): {e}")
@@ -1817,26 +1572,22 @@ def sync_maintenance():
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_closed_make_ready'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, unit, num_work_orders, date_closed, amount_charged
                 FROM realpage_closed_make_ready
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_maintenance
-                    (unified_property_id, pms_source, record_type, unit, num_work_orders,
-                     date_closed, amount_charged, snapshot_date)
-                    VALUES (?, 'realpage', 'closed', ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or 0,
-                      row[3] or '', row[4] or 0, now_iso))
+                writer.add((unified_id, 'realpage', 'closed', row[1] or '', None, None,
+                            None, None, row[2] or 0, row[3] or '', row[4] or 0, now_iso))
                 closed_count += 1
     except Exception as e:
         print(f"  ⚠️  Maintenance (closed): {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1846,44 +1597,43 @@ def sync_maintenance():
     return count
 
 
-def sync_move_out_reasons():
+def sync_move_out_reasons(run: SyncRun = None):
     """Sync move-out reasons from report 3879."""
     print("\n🚪 Syncing move-out reasons...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_move_out_reasons")
+    scope = _rebuild_scope(run, uni_conn, "unified_move_out_reasons")
+    writer = UnifiedTableWriter(uni_conn, "unified_move_out_reasons", (
+        "unified_property_id", "pms_source", "resident_type", "category", "category_count",
+        "category_pct", "reason", "reason_count", "reason_pct", "date_range", "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_move_out_reasons'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, resident_type, category, category_count, category_pct,
                        reason, reason_count, reason_pct, date_range
                 FROM realpage_move_out_reasons
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_move_out_reasons
-                    (unified_property_id, pms_source, resident_type, category, category_count,
-                     category_pct, reason, reason_count, reason_pct, date_range, snapshot_date)
-                    VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or '', row[3] or 0,
-                      row[4] or 0, row[5] or '', row[6] or 0, row[7] or 0,
-                      row[8] or '', now_iso))
+                writer.add((unified_id, 'realpage', row[1] or '', row[2] or '', row[3] or 0,
+                            row[4] or 0, row[5] or '', row[6] or 0, row[7] or 0,
+                            row[8] or '', now_iso))
                 count += 1
     except Exception as e:
         print(f"  ⚠️  Move-out reasons: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1892,48 +1642,47 @@ def sync_move_out_reasons():
     return count
 
 
-def sync_advertising_sources():
+def sync_advertising_sources(run: SyncRun = None):
     """Sync advertising source data."""
     print("\n📢 Syncing advertising sources...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_advertising_sources")
+    scope = _rebuild_scope(run, uni_conn, "unified_advertising_sources")
+    writer = UnifiedTableWriter(uni_conn, "unified_advertising_sources", (
+        "unified_property_id", "pms_source", "source_name", "new_prospects", "visits",
+        "leases", "net_leases", "cancelled_denied", "prospect_to_lease_pct",
+        "visit_to_lease_pct", "date_range", "timeframe_tag", "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_advertising_source'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, source, new_prospects, visits,
                        leases, net_leases, cancelled_denied,
                        prospect_to_lease_pct, visit_to_lease_pct, date_range,
                        COALESCE(timeframe_tag, '') as timeframe_tag
                 FROM realpage_advertising_source
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_advertising_sources
-                    (unified_property_id, pms_source, source_name, new_prospects, visits,
-                     leases, net_leases, cancelled_denied, prospect_to_lease_pct,
-                     visit_to_lease_pct, date_range, timeframe_tag, snapshot_date)
-                    VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or 0, row[3] or 0,
-                      row[4] or 0, row[5] or 0, row[6] or 0,
-                      row[7] or 0, row[8] or 0, row[9] or '', row[10] or '',
-                      now_iso))
+                writer.add((unified_id, 'realpage', row[1] or '', row[2] or 0, row[3] or 0,
+                            row[4] or 0, row[5] or 0, row[6] or 0,
+                            row[7] or 0, row[8] or 0, row[9] or '', row[10] or '',
+                            now_iso))
                 count += 1
     except Exception as e:
         print(f"  ⚠️  Advertising sources: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1942,48 +1691,47 @@ def sync_advertising_sources():
     return count
 
 
-def sync_lost_rent():
+def sync_lost_rent(run: SyncRun = None):
     """Sync lost rent summary from report 4279."""
     print("\n💸 Syncing lost rent...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_lost_rent")
+    scope = _rebuild_scope(run, uni_conn, "unified_lost_rent")
+    writer = UnifiedTableWriter(uni_conn, "unified_lost_rent", (
+        "unified_property_id", "pms_source", "unit_number", "market_rent", "lease_rent",
+        "rent_charged", "loss_to_rent", "gain_to_rent", "vacancy_current",
+        "lost_rent_not_charged", "move_in_date", "move_out_date", "fiscal_period",
+        "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_lost_rent_summary'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, unit, market_rent, lease_rent, rent_charged,
                        loss_to_rent, gain_to_rent, vacancy_current,
                        lost_rent_not_charged, move_in_date, move_out_date, fiscal_period
                 FROM realpage_lost_rent_summary
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_lost_rent
-                    (unified_property_id, pms_source, unit_number, market_rent, lease_rent,
-                     rent_charged, loss_to_rent, gain_to_rent, vacancy_current,
-                     lost_rent_not_charged, move_in_date, move_out_date, fiscal_period,
-                     snapshot_date)
-                    VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or 0, row[3] or 0,
-                      row[4] or 0, row[5] or 0, row[6] or 0, row[7] or 0,
-                      row[8] or 0, row[9] or '', row[10] or '', row[11] or '',
-                      now_iso))
+                writer.add((unified_id, 'realpage', row[1] or '', row[2] or 0, row[3] or 0,
+                            row[4] or 0, row[5] or 0, row[6] or 0, row[7] or 0,
+                            row[8] or 0, row[9] or '', row[10] or '', row[11] or '',
+                            now_iso))
                 count += 1
     except Exception as e:
         print(f"  ⚠️  Lost rent: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -1992,17 +1740,19 @@ def sync_lost_rent():
     return count
 
 
-def sync_amenities():
+def sync_amenities(run: SyncRun = None):
     """Sync rentable items from realpage_rentable_items (SOAP API data)."""
     print("\n🏊 Syncing amenities...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_amenities")
+    writer = UnifiedTableWriter(uni_conn, "unified_amenities", (
+        "unified_property_id", "pms_source", "item_type", "item_description",
+        "monthly_charge", "status", "unit_number", "resident_name", "lease_id", "snapshot_date",
+    ), run)
     
     count = 0
     rented = 0
@@ -2022,19 +1772,15 @@ def sync_amenities():
             # Determine rented status: lease_id present means assigned to a resident
             is_rented = raw_lease_id not in ('', '0', 'None')
             computed_status = 'Rented' if is_rented else 'Available'
-            uni_cursor.execute("""
-                INSERT INTO unified_amenities
-                (unified_property_id, pms_source, item_type, item_description,
-                 monthly_charge, status, unit_number, resident_name, lease_id, snapshot_date)
-                VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (unified_id, row[1] or '', row[2] or '', row[3] or 0,
-                  computed_status, unit_id, row[6] or '', raw_lease_id, now_iso))
+            writer.add((unified_id, 'realpage', row[1] or '', row[2] or '', row[3] or 0,
+                        computed_status, unit_id, row[6] or '', raw_lease_id, now_iso))
             count += 1
             if is_rented:
                 rented += 1
     except Exception as e:
         print(f"  ⚠️  Amenities: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -2065,44 +1811,43 @@ def log_sync(property_count, occupancy_count, pricing_count, unit_count, residen
     uni_conn.close()
 
 
-def sync_income_statement():
+def sync_income_statement(run: SyncRun = None):
     """Sync income statement from report 3836."""
     print("\n📊 Syncing income statement...")
     
     rp_conn = get_realpage_conn()
     uni_conn = get_unified_conn()
     rp_cursor = rp_conn.cursor()
-    uni_cursor = uni_conn.cursor()
     
     now_iso = datetime.now().isoformat()
-    uni_cursor.execute("DELETE FROM unified_income_statement")
+    scope = _rebuild_scope(run, uni_conn, "unified_income_statement")
+    writer = UnifiedTableWriter(uni_conn, "unified_income_statement", (
+        "unified_property_id", "pms_source", "fiscal_period", "section", "category",
+        "gl_account_code", "gl_account_name", "sign", "amount", "line_type", "snapshot_date",
+    ), run, properties=scope)
     
     count = 0
     try:
         rp_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='realpage_income_statement'")
         if rp_cursor.fetchone():
-            rp_cursor.execute("""
+            rp_cursor.execute(f"""
                 SELECT property_id, fiscal_period, section, category,
                        gl_account_code, gl_account_name, sign, amount, line_type
                 FROM realpage_income_statement
-                WHERE property_id IS NOT NULL
+                WHERE property_id IS NOT NULL{_site_filter(scope)}
             """)
             for row in rp_cursor.fetchall():
                 if row[0] not in PROPERTY_MAPPING:
                     continue
                 unified_id = PROPERTY_MAPPING[row[0]]["unified_id"]
-                uni_cursor.execute("""
-                    INSERT INTO unified_income_statement
-                    (unified_property_id, pms_source, fiscal_period, section, category,
-                     gl_account_code, gl_account_name, sign, amount, line_type, snapshot_date)
-                    VALUES (?, 'realpage', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (unified_id, row[1] or '', row[2] or '', row[3] or '',
-                      row[4] or '', row[5] or '', row[6] or '', row[7] or 0,
-                      row[8] or '', now_iso))
+                writer.add((unified_id, 'realpage', row[1] or '', row[2] or '', row[3] or '',
+                            row[4] or '', row[5] or '', row[6] or '', row[7] or 0,
+                            row[8] or '', now_iso))
                 count += 1
     except Exception as e:
         print(f"  ⚠️  Income statement: {e}")
     
+    _finish_table(writer)
     uni_conn.commit()
     rp_conn.close()
     uni_conn.close()
@@ -2111,13 +1856,67 @@ def sync_income_statement():
     return count
 
 
-def run_full_sync():
-    """Run full sync from RealPage to Unified."""
+def sync_iso_dates():
+    """
+    Fill <col>_iso siblings still NULL after the sync (see app.db.iso_dates).
+
+    The RealPage writers compute them with each row; this only covers rows
+    written without them (e.g. by Yardi or before the columns existed).
+    """
+    print("\n📅 Filling missing ISO dates...")
+    
+    uni_conn = get_unified_conn()
+    try:
+        count = sum(backfill_iso_dates(uni_conn).values())
+        uni_conn.commit()
+    finally:
+        uni_conn.close()
+    
+    print(f"  ✅ Filled {count} missing ISO dates")
+    return count
+
+
+def sync_property_kpis():
+    """Materialize per-property KPIs (unified_property_kpis) from the freshly synced tables."""
+    print("\n📈 Materializing property KPIs...")
+    
+    uni_conn = get_unified_conn()
+    count = 0
+    try:
+        count = write_property_kpis(uni_conn)
+        uni_conn.commit()
+    except Exception as e:
+        print(f"  ⚠️  Property KPIs: {e}")
+    finally:
+        uni_conn.close()
+    
+    print(f"  ✅ Materialized KPIs for {count} properties")
+    return count
+
+
+def run_full_sync(incremental: bool = False):
+    """
+    Run full sync from RealPage to Unified.
+    
+    With ``incremental=True`` the rebuilt report tables are only rewritten for
+    properties whose rows changed (see app.db.incremental_sync); the changes are
+    recorded in unified_sync_manifest.
+    """
     print("=" * 60)
-    print("RealPage → Unified Database Sync")
+    print(f"RealPage → Unified Database Sync ({'incremental' if incremental else 'full'})")
     print("=" * 60)
     print(f"Started at: {datetime.now().isoformat()}")
     
+    run = SyncRun(incremental=incremental)
+    rp_conn, uni_conn = get_realpage_conn(), get_unified_conn()
+    try:
+        run.begin(uni_conn, rp_conn, {site: m["unified_id"] for site, m in PROPERTY_MAPPING.items()})
+    finally:
+        rp_conn.close()
+        uni_conn.close()
+    if run.file_ids:
+        print(f"  {sum(map(len, run.file_ids.values()))} report files imported since the last sync")
+    
     # Raw layer derivations (realpage_raw.db → realpage_raw.db)
     bedbath_count = derive_floorplan_bedrooms()
     
@@ -2126,23 +1925,32 @@ def run_full_sync():
     occupancy_count = sync_occupancy_metrics()
     pricing_count = sync_pricing_metrics()
     unit_count = sync_units_from_rent_roll()
-    resident_count = sync_residents_from_rent_roll()
-    delinquency_count = sync_delinquency()
+    resident_count = sync_residents_from_rent_roll(run)
+    delinquency_count = sync_delinquency(run)
     
     # Report data (new — full unified layer)
-    lease_count = sync_leases()
-    financial_count = sync_financials()
-    lease_exp_count = sync_lease_expirations()
-    activity_count = sync_activity()
-    proj_occ_count = sync_projected_occupancy()
-    maintenance_count = sync_maintenance()
-    move_out_count = sync_move_out_reasons()
-    ad_source_count = sync_advertising_sources()
-    lost_rent_count = sync_lost_rent()
-    amenity_count = sync_amenities()
-    income_stmt_count = sync_income_statement()
+    lease_count = sync_leases(run)
+    financial_count = sync_financials(run)
+    lease_exp_count = sync_lease_expirations(run)
+    activity_count = sync_activity(run)
+    proj_occ_count = sync_projected_occupancy(run)
+    maintenance_count = sync_maintenance(run)
+    move_out_count = sync_move_out_reasons(run)
+    ad_source_count = sync_advertising_sources(run)
+    lost_rent_count = sync_lost_rent(run)
+    amenity_count = sync_amenities(run)
+    income_stmt_count = sync_income_statement(run)
+    
+    # Materialization (reads everything above — must run last)
+    iso_count = sync_iso_dates()
+    kpi_count = sync_property_kpis()
     
     log_sync(property_count, occupancy_count, pricing_count, unit_count, resident_count, delinquency_count)
+    uni_conn = get_unified_conn()
+    try:
+        run.complete(uni_conn)
+    finally:
+        uni_conn.close()
     
     print("\n" + "=" * 60)
     print("SYNC COMPLETE")
@@ -2164,8 +1972,16 @@ def run_full_sync():
     print(f"  Lost Rent:         {lost_rent_count}")
     print(f"  Amenities:         {amenity_count}")
     print(f"  Income Statement:  {income_stmt_count}")
+    print(f"  ISO Dates:         {iso_count}")
+    print(f"  Property KPIs:     {kpi_count}")
     print(f"\nCompleted at: {datetime.now().isoformat()}")
 
 
 if __name__ == "__main__":
-    run_full_sync()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sync realpage_raw.db into unified.db")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only rewrite properties whose report rows changed since the last sync")
+    args = parser.parse_args()
+    run_full_sync(incremental=args.incremental)
@@ -15,6 +15,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.clients.yardi_client import YardiClient
 from app.config import get_settings
+from app.db.iso_dates import ensure_iso_date_columns, to_iso_date
+from app.db.property_kpis import write_property_kpis
 
 # Database path
 DB_DIR = Path(__file__).parent / "data"
@@ -323,6 +325,7 @@ async def sync_residents(client: YardiClient):
     print("\n👥 Syncing Yardi residents...")
     
     uni_conn = get_unified_conn()
+    ensure_iso_date_columns(uni_conn)
     uni_cursor = uni_conn.cursor()
     
     # Get Yardi properties from unified
@@ -344,8 +347,9 @@ async def sync_residents(client: YardiClient):
                 uni_cursor.execute("""
                     INSERT OR REPLACE INTO unified_residents
                     (unified_property_id, unit_number, resident_name, status,
-                     current_rent, lease_start, lease_end, move_in_date, move_out_date, synced_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     current_rent, lease_start, lease_end, move_in_date, move_out_date,
+                     lease_start_iso, lease_end_iso, move_in_date_iso, move_out_date_iso, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     unified_id,
                     res.get("unit_number", ""),
@@ -356,6 +360,10 @@ async def sync_residents(client: YardiClient):
                     res.get("lease_end"),
                     res.get("move_in_date"),
                     res.get("move_out_date"),
+                    to_iso_date(res.get("lease_start")),
+                    to_iso_date(res.get("lease_end")),
+                    to_iso_date(res.get("move_in_date")),
+                    to_iso_date(res.get("move_out_date")),
                     datetime.now().isoformat()
                 ))
                 count += 1
@@ -415,6 +423,14 @@ async def run_full_sync():
     # Log sync
     log_sync(property_count, occupancy_count, pricing_count, unit_count, resident_count)
     
+    # Refresh materialized KPIs for the properties just synced
+    uni_conn = get_unified_conn()
+    try:
+        kpi_count = write_property_kpis(uni_conn)
+        uni_conn.commit()
+    finally:
+        uni_conn.close()
+    
     print("\n" + "=" * 60)
     print("✅ SYNC COMPLETE")
     print("=" * 60)
@@ -423,6 +439,7 @@ async def run_full_sync():
     print(f"Pricing records: {pricing_count}")
     print(f"Units: {unit_count}")
     print(f"Residents: {resident_count}")
+    print(f"Property KPIs: {kpi_count}")
     print(f"Completed at: {datetime.now().isoformat()}")
 
 
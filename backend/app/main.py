@@ -15,7 +15,9 @@ Timeframe Logic (per spec Section 2):
 - PM (Previous Month): Full previous month (static benchmark)
 - YTD (Year-to-Date): Jan 1st to now
 """
+import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
@@ -24,6 +26,37 @@ from app.api.imports import router as imports_router
 from app.api.auth import router as auth_router
 from app.api.admin import router as admin_router
 from app.config import get_settings
+from app.db.iso_dates import migrate_db_file
+from app.db.pool import unified_pool
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_unified_db():
+    """
+    Add the <col>_iso date columns to the served unified.db if it predates them.
+
+    Read paths filter on those columns and the pool opens the file read-only,
+    so this runs once at startup, before the first request opens the pool.
+    Uploads are migrated by /admin/upload-db before they are swapped in.
+    """
+    path = unified_pool.path
+    if not path.exists():
+        return
+    try:
+        counts = migrate_db_file(path)
+    except Exception as e:
+        logger.error(f"[STARTUP] ISO date migration of {path.name} failed: {e}")
+        return
+    if any(counts.values()):
+        logger.info(f"[STARTUP] Filled ISO date columns in {path.name}: {counts}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    migrate_unified_db()
+    yield
+
 
 app = FastAPI(
     title="Owner Dashboard V2 API",
@@ -50,7 +83,8 @@ app = FastAPI(
     """,
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -64,6 +98,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],  # POST needed for file imports
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # portfolio drill-through pagination
 )
 
 app.include_router(auth_router, prefix="/api", tags=["Auth"])
@@ -2,7 +2,6 @@
 Apartments.com Reviews Service — reads from Zembra API cache.
 Cache is populated by running: python3 fetch_apartments_reviews.py
 """
-import json
 import logging
 from pathlib import Path
 from typing import Optional
@@ -10,6 +9,7 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 from app.db.schema import DB_DIR
+from app.services.cache_files import cache_files
 CACHE_PATH = DB_DIR / "apartments_reviews_cache.json"
 
 # Map unified property_id → apartments cache key
@@ -21,19 +21,8 @@ PROPERTY_MAP = {
 }
 
 
-def _load_cache() -> dict:
-    if CACHE_PATH.exists():
-        try:
-            return json.loads(CACHE_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
-
-
-def get_apartments_reviews(property_id: str) -> Optional[dict]:
-    """Get Apartments.com reviews for a property from the Zembra cache."""
-    cache = _load_cache()
-    
+def _resolve(cache: dict, property_id: str) -> Optional[dict]:
+    """Reviews data for a property: mapped key, then case-insensitive / partial key match."""
     # Try direct match first, then mapped key
     cache_key = PROPERTY_MAP.get(property_id, property_id)
     entry = cache.get(cache_key)
@@ -54,3 +43,29 @@ def get_apartments_reviews(property_id: str) -> Optional[dict]:
         return None
     
     return data
+
+
+def _reviews_by_property(cache: dict) -> dict:
+    """Resolved data for every known property id, mapped ID and cache key."""
+    from app.property_config.properties import ALL_PROPERTIES
+
+    return {pid: _resolve(cache, pid) for pid in {*ALL_PROPERTIES, *PROPERTY_MAP, *cache}}
+
+
+_cache_file = cache_files.register(CACHE_PATH)
+_cache_file.add_index("by_property", _reviews_by_property)
+
+
+def _load_cache() -> dict:
+    """The parsed cache (shared: do not mutate)."""
+    return _cache_file.data()
+
+
+def get_apartments_reviews(property_id: str) -> Optional[dict]:
+    """Get Apartments.com reviews for a property from the Zembra cache."""
+    snapshot = _cache_file.snapshot()
+    index = snapshot.index("by_property")
+    if property_id in index:
+        return index[property_id]
+    # Unknown IDs (not memoized: they come straight from request paths)
+    return _resolve(snapshot.data, property_id)
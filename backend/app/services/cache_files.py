@@ -0,0 +1,194 @@
+"""
+Cache Files - Parse-once store for the JSON cache files in DB_DIR.
+
+Read-only JSON caches (apartments_reviews_cache.json) used to be
+json.loads-ed from disk on every call, several times per request. The
+caches the API writes itself live in app_state.db instead (see
+app/db/state_store.py). A CacheFile parses its file once and keeps the result until the file changes:
+each access is one os.stat() compared against the (inode, mtime, size) the
+snapshot was read with, so a new version is picked up whether a scraper
+rewrote it in place or /admin/upload-file swapped a new file in.
+
+A reload parses the file and builds its indexes off to the side, then swaps
+one CacheSnapshot reference: readers see the old version or the new one,
+never a mix. Snapshots are shared between threads and requests — callers
+must not mutate them; writers build a new dict and hand it to write().
+
+Services register per-file indexes (e.g. property id -> entry, with alias
+and fuzzy name matching resolved at load time). Values that also depend on
+something outside the file go through CacheSnapshot.memo() and are dropped
+with the snapshot.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Signature = Optional[Tuple[int, int, int]]  # (inode, mtime_ns, size); None = no file
+
+
+def _signature(st: os.stat_result) -> Signature:
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class CacheSnapshot:
+    """One parsed version of a cache file, with its indexes."""
+
+    __slots__ = ("data", "indexes", "signature", "loaded_at", "_memo")
+
+    def __init__(self, data: dict, indexes: Dict[str, Any], signature: Signature):
+        self.data = data
+        self.indexes = indexes
+        self.signature = signature
+        self.loaded_at = time.time()
+        self._memo: Dict[Any, Any] = {}
+
+    def index(self, name: str) -> Any:
+        return self.indexes[name]
+
+    def memo(self, key: Any, compute: Callable[["CacheSnapshot"], Any]) -> Any:
+        """compute(snapshot) once per snapshot and key (a race may compute twice; both results are equal)."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute(self)
+            return value
+
+
+class CacheFile:
+    """A JSON cache file, re-read only when its inode, mtime or size changes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._indexes: Dict[str, Callable[[dict], Any]] = {}
+        self._snapshot: Optional[CacheSnapshot] = None
+        self._lock = threading.Lock()
+        self._stats = {"loads": 0, "hits": 0, "errors": 0, "writes": 0}
+
+    def add_index(self, name: str, build: Callable[[dict], Any]):
+        """Build ``name`` from the parsed data on every (re)load."""
+        with self._lock:
+            self._indexes[name] = build
+            self._snapshot = None
+
+    def _disk_signature(self) -> Signature:
+        try:
+            return _signature(os.stat(self.path))
+        except OSError:
+            return None
+
+    def snapshot(self) -> CacheSnapshot:
+        """The current version (reloaded first if the file changed on disk)."""
+        snap = self._snapshot
+        if snap is not None and snap.signature == self._disk_signature():
+            self._stats["hits"] += 1
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is None or snap.signature != self._disk_signature():
+                snap = self._snapshot = self._load()
+        return snap
+
+    def data(self) -> dict:
+        return self.snapshot().data
+
+    def index(self, name: str) -> Any:
+        return self.snapshot().index(name)
+
+    def _load(self) -> CacheSnapshot:
+        data, signature = {}, None
+        try:
+            with open(self.path, "rb") as f:
+                # Signature of the file actually read (the path may be swapped meanwhile)
+                signature = _signature(os.fstat(f.fileno()))
+                data = json.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # A half-written file: stay empty until its mtime/size moves on
+            self._stats["errors"] += 1
+            logger.warning(f"[CACHE_FILES] Failed to load {self.path.name}: {e}")
+            data = {}
+        self._stats["loads"] += 1
+        return CacheSnapshot(data, self._build_indexes(data), signature)
+
+    def _build_indexes(self, data: dict) -> Dict[str, Any]:
+        indexes = {}
+        for name, build in self._indexes.items():
+            try:
+                indexes[name] = build(data)
+            except Exception as e:
+                logger.warning(f"[CACHE_FILES] Index {name} failed for {self.path.name}: {e}")
+                indexes[name] = {}
+        return indexes
+
+    def write(self, data: dict, indent: int = 2):
+        """Atomically replace the file with ``data`` and make it the current snapshot."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=indent)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            self._snapshot = CacheSnapshot(data, self._build_indexes(data), self._disk_signature())
+            self._stats["writes"] += 1
+
+    def reload(self) -> CacheSnapshot:
+        """Drop the current snapshot and parse the file now."""
+        with self._lock:
+            self._snapshot = self._load()
+            return self._snapshot
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            **self._stats,
+            "entries": len(snap.data) if snap else None,
+            "size_kb": round(snap.signature[2] / 1024, 1) if snap and snap.signature else None,
+            "loaded_at": snap.loaded_at if snap else None,
+        }
+
+
+class CacheFileStore:
+    """Process-wide registry: one CacheFile per path, shared by every service that reads it."""
+
+    def __init__(self):
+        self._files: Dict[Path, CacheFile] = {}
+        self._lock = threading.Lock()
+
+    def register(self, path: Path) -> CacheFile:
+        key = Path(path).resolve()
+        with self._lock:
+            if key not in self._files:
+                self._files[key] = CacheFile(path)
+            return self._files[key]
+
+    def get(self, path: Path) -> Optional[CacheFile]:
+        return self._files.get(Path(path).resolve())
+
+    def reload(self, path: Path) -> bool:
+        """Re-read a registered file now (after /admin/upload-file); False if nothing reads it."""
+        cache_file = self.get(path)
+        if cache_file is None:
+            return False
+        cache_file.reload()
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            files = list(self._files.values())
+        return {f.path.name: f.stats() for f in files}
+
+
+cache_files = CacheFileStore()
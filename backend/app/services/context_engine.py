@@ -0,0 +1,226 @@
+"""
+Context Engine - Parallel, bounded data gathering for AI insights, chat and watchpoints.
+
+The AI endpoints assemble a "property context" from a dozen independent
+reads (occupancy, pricing, delinquency, reviews, ...). Those reads are
+blocking sqlite3/JSON calls, so running them inline in an async handler
+serializes them and stalls the event loop for every other request.
+
+Collectors are registered once by name and shared by every consumer.
+gather() runs the requested collectors concurrently:
+
+- blocking collectors on a bounded thread pool (CONTEXT_MAX_WORKERS)
+- async collectors directly on the event loop
+- each with its own timeout; a timed-out or failing collector is reported
+  in ``errors`` and simply left out of ``values``
+- a timeout only stops the wait: the worker thread keeps running the slow
+  read, so until it finishes that (collector, property) is skipped (reported
+  in ``errors``) instead of piling more stuck runs onto the pool
+- concurrent requests for the same (collector, property) share one
+  in-flight run, so insights + chat + watchpoints don't repeat work
+
+Per-collector timings are kept; collectors slower than CONTEXT_SLOW_MS are
+logged and counted so the slow ones are visible via /admin/context-stats.
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_MAX_WORKERS = int(os.environ.get("CONTEXT_MAX_WORKERS", "8"))
+CONTEXT_TIMEOUT_S = float(os.environ.get("CONTEXT_TIMEOUT_S", "10"))
+CONTEXT_SLOW_MS = float(os.environ.get("CONTEXT_SLOW_MS", "500"))
+
+
+class _StillRunning(Exception):
+    """A previous (timed-out) run of the collector is still occupying a worker."""
+
+
+@dataclass
+class Collector:
+    name: str
+    func: Callable[[str], Any]
+    timeout: float
+    is_async: bool
+
+
+@dataclass
+class CollectedContext:
+    """Result of one gather(): values by collector name, plus diagnostics."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    slow: List[str] = field(default_factory=list)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = self.values.get(name)
+        return default if value is None else value
+
+
+class ContextEngine:
+    """Registry + executor for property-context collectors."""
+
+    def __init__(self, max_workers: int = CONTEXT_MAX_WORKERS,
+                 default_timeout: float = CONTEXT_TIMEOUT_S,
+                 slow_ms: float = CONTEXT_SLOW_MS):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.slow_ms = slow_ms
+        self._collectors: Dict[str, Collector] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._running: Dict[tuple, Future] = {}  # executor runs, kept past their timeout
+        self._lock = threading.Lock()
+        self._stats: Dict[str, dict] = {}
+
+    # ---- Registration ----
+
+    def collector(self, name: str, timeout: Optional[float] = None):
+        """Decorator: register ``func(property_id)`` as collector ``name``."""
+        def decorator(func):
+            self._collectors[name] = Collector(
+                name=name,
+                func=func,
+                timeout=timeout if timeout is not None else self.default_timeout,
+                is_async=asyncio.iscoroutinefunction(func),
+            )
+            return func
+        return decorator
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._collectors)
+
+    # ---- Execution ----
+
+    async def gather(self, property_id: str, names: Iterable[str]) -> CollectedContext:
+        """Run the named collectors for one property concurrently."""
+        ordered = list(dict.fromkeys(names))  # dedupe, keep order
+        unknown = [n for n in ordered if n not in self._collectors]
+        if unknown:
+            raise KeyError(f"Unknown context collectors: {unknown}")
+
+        outcomes = await asyncio.gather(*(self._shared_run(n, property_id) for n in ordered))
+
+        ctx = CollectedContext()
+        for name, (value, error, elapsed_ms) in zip(ordered, outcomes):
+            ctx.timings_ms[name] = elapsed_ms
+            if elapsed_ms >= self.slow_ms:
+                ctx.slow.append(name)
+            if error is None:
+                ctx.values[name] = value
+            else:
+                ctx.errors[name] = error
+        if ctx.slow:
+            logger.warning(
+                f"[CONTEXT] Slow collectors for {property_id}: "
+                + ", ".join(f"{n}={ctx.timings_ms[n]:.0f}ms" for n in ctx.slow)
+            )
+        return ctx
+
+    async def _shared_run(self, name: str, property_id: str):
+        """Join an identical in-flight run instead of starting a second one."""
+        key = (name, property_id)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(self._collectors[name], property_id))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f, _k=key: self._inflight.pop(_k, None))
+        else:
+            self._record(name, shared=True)
+        return await asyncio.shield(future)
+
+    async def _run(self, collector: Collector, property_id: str):
+        start = time.perf_counter()
+        error = None
+        value = None
+        try:
+            if collector.is_async:
+                value = await asyncio.wait_for(collector.func(property_id), collector.timeout)
+            else:
+                value = await asyncio.wait_for(
+                    asyncio.wrap_future(self._submit(collector, property_id)), collector.timeout
+                )
+        except _StillRunning:
+            error = "skipped: previous run still in flight"
+        except asyncio.TimeoutError:
+            error = f"timed out after {collector.timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        self._record(collector.name, elapsed_ms=elapsed_ms, error=error)
+        return value, error, elapsed_ms
+
+    def _submit(self, collector: Collector, property_id: str) -> Future:
+        """Start a blocking collector on the pool, unless its last run has not finished yet."""
+        key = (collector.name, property_id)
+        executor = self._get_executor()
+        with self._lock:
+            running = self._running.get(key)
+            if running is not None and not running.done():
+                raise _StillRunning()
+            ctx = contextvars.copy_context()
+            future = executor.submit(ctx.run, collector.func, property_id)
+            self._running[key] = future
+        future.add_done_callback(lambda f, _k=key: self._forget(_k, f))
+        return future
+
+    def _forget(self, key: tuple, future: Future):
+        with self._lock:
+            if self._running.get(key) is future:
+                del self._running[key]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="context"
+                    )
+        return self._executor
+
+    # ---- Stats ----
+
+    def _record(self, name: str, elapsed_ms: float = 0.0, error: Optional[str] = None, shared: bool = False):
+        with self._lock:
+            s = self._stats.setdefault(name, {
+                "runs": 0, "shared": 0, "errors": 0, "timeouts": 0, "slow": 0,
+                "total_ms": 0.0, "max_ms": 0.0,
+            })
+            if shared:
+                s["shared"] += 1
+                return
+            s["runs"] += 1
+            s["total_ms"] += elapsed_ms
+            s["max_ms"] = max(s["max_ms"], elapsed_ms)
+            if elapsed_ms >= self.slow_ms:
+                s["slow"] += 1
+            if error is not None:
+                s["errors"] += 1
+                if error.startswith("timed out"):
+                    s["timeouts"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            collectors = {k: dict(v) for k, v in self._stats.items()}
+        for s in collectors.values():
+            s["avg_ms"] = round(s["total_ms"] / s["runs"], 1) if s["runs"] else 0.0
+            s["total_ms"] = round(s["total_ms"], 1)
+        slowest = sorted(collectors, key=lambda n: collectors[n]["avg_ms"], reverse=True)
+        return {
+            "max_workers": self.max_workers,
+            "default_timeout_s": self.default_timeout,
+            "slow_threshold_ms": self.slow_ms,
+            "slowest": slowest[:5],
+            "collectors": dict(sorted(collectors.items())),
+        }
+
+
+context_engine = ContextEngine()
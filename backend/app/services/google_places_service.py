@@ -5,6 +5,7 @@ READ-ONLY: Only fetches public data from Google.
 """
 import json
 import logging
+import sqlite3
 import time
 from pathlib import Path
 from typing import Optional
@@ -15,29 +16,87 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-# Cache file — ratings don't change often, cache for 24h
-from app.db.schema import DB_DIR, UNIFIED_DB_PATH
-CACHE_PATH = DB_DIR / "google_places_cache.json"
+# Lookups are cached in app_state.db (google_places) — ratings don't change often, cache for 24h
+from app.db import schema
+from app.db.pool import get_unified_connection, unified_pool
+from app.db.state_store import state_store
+CACHE_FILENAME = "google_places_cache.json"  # Legacy JSON cache, imported into google_places
 CACHE_TTL_SECONDS = 86400  # 24 hours
 
 
-def _load_cache() -> dict:
-    if CACHE_PATH.exists():
-        try:
-            return json.loads(CACHE_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
+def _query_property_id(query: str) -> Optional[str]:
+    """The configured property whose name appears in a search query (longest name wins)."""
+    from app.property_config.properties import ALL_PROPERTIES
+
+    matches = [(len(prop.name), prop_id) for prop_id, prop in ALL_PROPERTIES.items() if prop.name.lower() in query]
+    return max(matches)[1] if matches else None
+
+
+_UPSERT_PLACE = """
+    INSERT INTO google_places (query, property_id, place_id, cached_at, data)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(query) DO UPDATE SET
+        property_id = excluded.property_id, place_id = excluded.place_id,
+        cached_at = excluded.cached_at, data = excluded.data
+    WHERE cached_at IS NOT excluded.cached_at OR data IS NOT excluded.data
+        OR property_id IS NOT excluded.property_id
+"""
+
+
+def _place_row(cache_key: str, entry: dict) -> tuple:
+    data = entry.get("data")
+    return (
+        cache_key, _query_property_id(cache_key), data.get("place_id") if data else None,
+        entry.get("cached_at"), json.dumps(data) if data is not None else None,
+    )
 
 
-def _save_cache(cache: dict):
+def _import_places_json(conn: sqlite3.Connection, cache: dict) -> int:
+    """google_places_cache.json ({query: {"cached_at", "data"}}) -> google_places rows."""
+    before = conn.total_changes
+    conn.executemany(_UPSERT_PLACE, [_place_row(key, entry) for key, entry in cache.items()])
+    written = conn.total_changes - before
+    if written:
+        state_store.bump_version(conn, "google_places")
+    return written
+
+
+state_store.register_json_source(
+    "google_places", lambda: schema.DB_DIR / CACHE_FILENAME, _import_places_json,
+)
+
+
+def _get_cache_entry(cache_key: str) -> Optional[dict]:
+    """{"cached_at", "data"} for one search query, or None."""
+    state_store.sync_json("google_places")
+    row = state_store.connect().execute(
+        "SELECT cached_at, data FROM google_places WHERE query = ?", (cache_key,)
+    ).fetchone()
+    if row is None:
+        return None
+    return {"cached_at": row[0], "data": json.loads(row[1]) if row[1] is not None else None}
+
+
+def _save_cache_entry(cache_key: str, data: Optional[dict]):
+    """Upsert one search result (None caches a miss)."""
     try:
-        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        CACHE_PATH.write_text(json.dumps(cache, indent=2))
+        with state_store.transaction() as conn:
+            conn.execute(_UPSERT_PLACE, _place_row(cache_key, {"cached_at": time.time(), "data": data}))
+            state_store.bump_version(conn, "google_places")
     except Exception as e:
         logger.warning(f"[GOOGLE] Failed to save cache: {e}")
 
 
+def get_cached_place_id(property_id: str) -> Optional[str]:
+    """Google place_id for a configured property, from the places cache (no API call)."""
+    state_store.sync_json("google_places")
+    row = state_store.connect().execute(
+        "SELECT place_id FROM google_places WHERE property_id = ? AND place_id IS NOT NULL ORDER BY rowid LIMIT 1",
+        (property_id,),
+    ).fetchone()
+    return row[0] if row else None
+
+
 async def lookup_property_rating(
     property_name: str,
     city: str = "",
@@ -60,13 +119,11 @@ async def lookup_property_rating(
         query += f" {state}"
 
     # Check cache
-    cache = _load_cache()
     cache_key = query.lower().strip()
-    if cache_key in cache:
-        entry = cache[cache_key]
-        if time.time() - entry.get("cached_at", 0) < CACHE_TTL_SECONDS:
-            logger.debug(f"[GOOGLE] Cache hit for '{property_name}'")
-            return entry.get("data")
+    entry = _get_cache_entry(cache_key)
+    if entry and time.time() - (entry["cached_at"] or 0) < CACHE_TTL_SECONDS:
+        logger.debug(f"[GOOGLE] Cache hit for '{property_name}'")
+        return entry["data"]
 
     # Call Google Places API (New) — Text Search
     url = "https://places.googleapis.com/v1/places:searchText"
@@ -90,8 +147,7 @@ async def lookup_property_rating(
         if not places:
             logger.info(f"[GOOGLE] No results for '{query}'")
             # Cache the miss too
-            cache[cache_key] = {"cached_at": time.time(), "data": None}
-            _save_cache(cache)
+            _save_cache_entry(cache_key, None)
             return None
 
         place = places[0]
@@ -103,8 +159,7 @@ async def lookup_property_rating(
         }
 
         # Cache it
-        cache[cache_key] = {"cached_at": time.time(), "data": result}
-        _save_cache(cache)
+        _save_cache_entry(cache_key, result)
 
         logger.info(f"[GOOGLE] Found '{property_name}': rating={result['rating']}, reviews={result['review_count']}")
         return result
@@ -119,18 +174,28 @@ def get_all_property_ratings_cached() -> dict[str, dict]:
     Return cached Google ratings for all properties (no API calls).
     Used by get_property_list() to avoid blocking the event loop.
     Cache is populated by lookup_property_rating() or scrape_reviews.py.
+
+    Computed once per google_places version and unified.db generation (the
+    cache keys include each property's city/state).
     """
-    from app.property_config.properties import ALL_PROPERTIES
-    import sqlite3
+    global _ratings_memo
+    state_store.sync_json("google_places")
+    key = (state_store.path, state_store.version("google_places"), unified_pool.current_generation())
+    if _ratings_memo is None or _ratings_memo[0] != key:
+        _ratings_memo = (key, _ratings_from_cache())
+    return dict(_ratings_memo[1])
+
 
-    cache = _load_cache()
-    if not cache:
-        return {}
+_ratings_memo: Optional[tuple] = None
+
+
+def _ratings_from_cache() -> dict[str, dict]:
+    from app.property_config.properties import ALL_PROPERTIES
 
     # Get city/state for cache key construction
     prop_locations = {}
     try:
-        conn = sqlite3.connect(UNIFIED_DB_PATH)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT unified_property_id, city, state FROM unified_properties")
         for row in cursor.fetchall():
@@ -139,7 +204,7 @@ def get_all_property_ratings_cached() -> dict[str, dict]:
     except Exception:
         pass
 
-    results = {}
+    cache_keys = {}
     for prop_id, prop in ALL_PROPERTIES.items():
         loc = prop_locations.get(prop_id, {})
         query = f"{prop.name} apartments"
@@ -147,10 +212,18 @@ def get_all_property_ratings_cached() -> dict[str, dict]:
             query += f" {loc['city']}"
         if loc.get("state"):
             query += f" {loc['state']}"
-        cache_key = query.lower().strip()
-        entry = cache.get(cache_key)
-        if entry and entry.get("data") and entry["data"].get("rating"):
-            results[prop_id] = entry["data"]
+        cache_keys[query.lower().strip()] = prop_id
+
+    placeholders = ", ".join("?" * len(cache_keys))
+    rows = state_store.connect().execute(
+        f"SELECT query, data FROM google_places WHERE query IN ({placeholders}) AND data IS NOT NULL",
+        list(cache_keys),
+    ).fetchall()
+    results = {}
+    for cache_key, data in rows:
+        data = json.loads(data)
+        if data.get("rating"):
+            results[cache_keys[cache_key]] = data
 
     return results
 
@@ -162,12 +235,11 @@ async def get_all_property_ratings() -> dict[str, dict]:
     Returns: {property_id: {"rating": float, "review_count": int, ...}}
     """
     from app.property_config.properties import ALL_PROPERTIES
-    import sqlite3
 
     # Get city/state from unified.db for better search accuracy
     prop_locations = {}
     try:
-        conn = sqlite3.connect(UNIFIED_DB_PATH)
+        conn = get_unified_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT unified_property_id, city, state FROM unified_properties")
         for row in cursor.fetchall():
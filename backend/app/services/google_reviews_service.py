@@ -5,10 +5,11 @@ READ-ONLY.
 """
 import json
 import logging
+import sqlite3
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 import httpx
 
@@ -16,47 +17,84 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-from app.db.schema import DB_DIR
-CACHE_PATH = DB_DIR / "google_places_cache.json"
-REVIEWS_CACHE_PATH = DB_DIR / "google_reviews_cache.json"
+# Reviews are cached per property in app_state.db (google_reviews)
+from app.db import schema
+from app.db.state_store import state_store
+REVIEWS_CACHE_FILENAME = "google_reviews_cache.json"  # Written by scrape_reviews.py, imported into google_reviews
 REVIEWS_CACHE_TTL = 43200  # 12 hours
 MAX_SERPAPI_PAGES = 5  # Up to ~40 reviews (8 first page + 10-20 per page after)
 
+# RealPage site IDs -> reviews cache key (the cache is keyed by unified property id)
+PROPERTY_MAP = {
+    "5536211": "parkside",
+    "5472172": "nexus_east",
+}
+
+_UPSERT_REVIEWS = """
+    INSERT INTO google_reviews (property_id, fetched_at, source, review_count, data)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(property_id) DO UPDATE SET
+        fetched_at = excluded.fetched_at, source = excluded.source,
+        review_count = excluded.review_count, data = excluded.data
+    WHERE fetched_at IS NOT excluded.fetched_at OR data IS NOT excluded.data
+"""
+
+
+def _reviews_row(property_id: str, entry: dict) -> tuple:
+    data = entry.get("data") or {}
+    return (property_id, entry.get("ts"), data.get("source"), data.get("review_count"), json.dumps(data))
+
+
+def _import_reviews_json(conn: sqlite3.Connection, cache: dict) -> int:
+    """google_reviews_cache.json ({property_id: {"ts", "data"}}) -> google_reviews rows."""
+    before = conn.total_changes
+    conn.executemany(_UPSERT_REVIEWS, [_reviews_row(pid, entry) for pid, entry in cache.items()])
+    written = conn.total_changes - before
+    if written:
+        state_store.bump_version(conn, "google_reviews")
+    return written
+
 
-def _load_reviews_cache() -> dict:
-    if REVIEWS_CACHE_PATH.exists():
-        try:
-            return json.loads(REVIEWS_CACHE_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
+state_store.register_json_source(
+    "google_reviews", lambda: schema.DB_DIR / REVIEWS_CACHE_FILENAME, _import_reviews_json,
+)
 
 
-def _save_reviews_cache(cache: dict):
+def get_cached_reviews_entries(property_ids: List[str]) -> Dict[str, dict]:
+    """{property_id: {"ts", "data"}} for the given ids that have cached reviews (one query)."""
+    state_store.sync_json("google_reviews")
+    ids = list(dict.fromkeys(property_ids))
+    if not ids:
+        return {}
+    placeholders = ", ".join("?" * len(ids))
+    rows = state_store.connect().execute(
+        f"SELECT property_id, fetched_at, data FROM google_reviews WHERE property_id IN ({placeholders})", ids,
+    )
+    return {pid: {"ts": ts, "data": json.loads(data)} for pid, ts, data in rows}
+
+
+def get_cached_reviews_entry(property_id: str) -> Optional[dict]:
+    """Reviews cache entry ({"ts", "data"}) for a property id or mapped site ID."""
+    mapped = PROPERTY_MAP.get(property_id)
+    entries = get_cached_reviews_entries([property_id, mapped] if mapped else [property_id])
+    return entries.get(property_id) or entries.get(mapped)
+
+
+def _save_reviews_entry(property_id: str, data: dict):
+    """Upsert one property's reviews (the other properties' rows are untouched)."""
     try:
-        REVIEWS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        REVIEWS_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+        with state_store.transaction() as conn:
+            conn.execute(_UPSERT_REVIEWS, _reviews_row(property_id, {"ts": time.time(), "data": data}))
+            state_store.bump_version(conn, "google_reviews")
     except Exception as e:
         logger.warning(f"[REVIEWS] Failed to save cache: {e}")
 
 
 def _get_place_id(property_id: str) -> Optional[str]:
     """Get cached place_id for a property from the places cache."""
-    if not CACHE_PATH.exists():
-        return None
+    from app.services.google_places_service import get_cached_place_id
     try:
-        cache = json.loads(CACHE_PATH.read_text())
-        from app.property_config.properties import ALL_PROPERTIES
-        prop = ALL_PROPERTIES.get(property_id)
-        if not prop:
-            return None
-        for key, entry in cache.items():
-            data = entry.get("data")
-            if not data:
-                continue
-            if prop.name.lower() in key.lower():
-                return data.get("place_id")
-        return None
+        return get_cached_place_id(property_id)
     except Exception:
         return None
 
@@ -71,8 +109,7 @@ async def get_property_reviews(property_id: str) -> dict:
     Playwright data is authoritative — never overwrite it with degraded API data.
     Expired Playwright data is still returned (stale > empty).
     """
-    cache = _load_reviews_cache()
-    existing_entry = cache.get(property_id)
+    existing_entry = get_cached_reviews_entries([property_id]).get(property_id)
     existing_data = existing_entry.get("data", {}) if existing_entry else {}
     existing_source = existing_data.get("source", "")
     existing_review_count = existing_data.get("review_count", 0)
@@ -103,8 +140,7 @@ async def get_property_reviews(property_id: str) -> dict:
             new_count = result.get("review_count", 0)
             # Only save if it has more data than existing cache
             if new_count >= existing_review_count:
-                cache[property_id] = {"ts": time.time(), "data": result}
-                _save_reviews_cache(cache)
+                _save_reviews_entry(property_id, result)
             return result
 
     # Fallback: Google Places API (5 reviews, no replies)
@@ -113,8 +149,7 @@ async def get_property_reviews(property_id: str) -> dict:
         if result:
             new_count = result.get("review_count", 0)
             if new_count >= existing_review_count:
-                cache[property_id] = {"ts": time.time(), "data": result}
-                _save_reviews_cache(cache)
+                _save_reviews_entry(property_id, result)
             return result
 
     # Nothing worked — return stale cache if available
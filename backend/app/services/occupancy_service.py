@@ -11,7 +11,8 @@ from app.models import (
     Timeframe, OccupancyMetrics, ExposureMetrics, LeasingFunnelMetrics,
     UnitRaw, ResidentRaw, ProspectRaw, PropertyInfo
 )
-from app.db.schema import UNIFIED_DB_PATH
+from app.db.pool import get_unified_connection
+from app.services.occupancy_history import OccupancyHistory
 from app.services.timeframe import (
     get_date_range, format_date_iso, format_date_yardi,
     parse_yardi_date, days_between, is_within_days, is_in_period
@@ -20,6 +21,23 @@ from app.services.timeframe import (
 logger = logging.getLogger(__name__)
 
 
+def _iso_field(record: dict, field: str) -> Optional[str]:
+    """
+    YYYY-MM-DD value of a unified date field.
+
+    Rows read from unified.db carry the sync-normalized ``<field>_iso`` column;
+    anything else (API payloads, pre-ISO databases) is parsed from the raw text.
+    """
+    iso = record.get(f"{field}_iso")
+    if iso:
+        return iso
+    raw = record.get(field)
+    if not raw:
+        return None
+    parsed = parse_yardi_date(raw)
+    return parsed.isoformat() if parsed else None
+
+
 class OccupancyService:
     """Service for occupancy and leasing metrics. Reads from unified.db ONLY."""
     
@@ -31,7 +49,7 @@ class OccupancyService:
     def _get_db_units(self, property_id: str) -> List[dict]:
         """Read units from unified.db."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM unified_units WHERE unified_property_id = ?", (property_id,))
@@ -52,7 +70,7 @@ class OccupancyService:
     def _get_db_residents(self, property_id: str, status: Optional[str] = None) -> List[dict]:
         """Read residents from unified.db."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             if status and status.lower() != "all":
@@ -75,10 +93,31 @@ class OccupancyService:
             logger.warning(f"[OCCUPANCY] Failed to read residents from DB for {property_id}: {e}")
             return []
     
+    def _get_occupancy_history(self, property_id: str) -> OccupancyHistory:
+        """Load the property's resident move-in/move-out intervals once (see occupancy_history)."""
+        try:
+            conn = get_unified_connection()
+            try:
+                rows = conn.execute(
+                    "SELECT unit_number, move_in_date_iso, move_out_date_iso "
+                    "FROM unified_residents WHERE unified_property_id = ?",
+                    (property_id,)
+                ).fetchall()
+            finally:
+                conn.close()
+            units, move_ins, move_outs = zip(*rows) if rows else ((), (), ())
+        except sqlite3.OperationalError:
+            # unified.db synced before the ISO date columns existed
+            residents = self._get_db_residents(property_id)
+            units = [r.get("unit") for r in residents]
+            move_ins = [_iso_field(r, "move_in_date") for r in residents]
+            move_outs = [_iso_field(r, "move_out_date") for r in residents]
+        return OccupancyHistory.from_intervals(units, move_ins, move_outs)
+    
     def _get_property_name(self, property_id: str) -> str:
         """Get property name from unified.db."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM unified_properties WHERE unified_property_id = ?", (property_id,))
             row = cursor.fetchone()
@@ -92,7 +131,7 @@ class OccupancyService:
         properties = []
         
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT unified_property_id, name, city, state, address
@@ -174,7 +213,7 @@ class OccupancyService:
         period_start, period_end = get_date_range(timeframe)
         
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             
             # Get property name
@@ -206,7 +245,7 @@ class OccupancyService:
                 vacant_ready = 0
                 vacant_not_ready = 0
                 try:
-                    conn2 = sqlite3.connect(str(UNIFIED_DB_PATH))
+                    conn2 = get_unified_connection()
                     c2 = conn2.cursor()
                     c2.execute("""
                         SELECT
@@ -370,7 +409,7 @@ class OccupancyService:
     ) -> Optional[LeasingFunnelMetrics]:
         """Build funnel from granular unified_activity records (date-filtered)."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
 
             # Build set of possible IDs for this property (API key, unified_id, kairoi- variants)
@@ -497,7 +536,7 @@ class OccupancyService:
         """Get imported leasing activity data from database."""
         
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -725,7 +764,7 @@ class OccupancyService:
         logger.info(f"[TREND] Prior: {prior_start} to {prior_end}")
         
         # Get all data from unified DB
-        residents = self._get_db_residents(property_id)
+        history = self._get_occupancy_history(property_id)
         units = self._get_db_units(property_id)
         
         total_units = len(units)
@@ -736,11 +775,11 @@ class OccupancyService:
             current_occupied = sum(1 for u in units if u.get("occupancy_status") == "occupied")
         else:
             # Reconstruct for historical end_date
-            current_occupied = self._calculate_occupied_at_date(residents, end_date)
+            current_occupied = history.occupied_at(end_date)
         current_occupancy = round(current_occupied / total_units * 100, 1) if total_units > 0 else 0
         
         # Prior period occupancy (at prior_end)
-        prior_occupied = self._calculate_occupied_at_date(residents, prior_end)
+        prior_occupied = history.occupied_at(prior_end)
         prior_occupancy = round(prior_occupied / total_units * 100, 1) if total_units > 0 else 0
         
         # Calculate change
@@ -812,32 +851,33 @@ class OccupancyService:
         logger.info(f"[ALL_TRENDS] Prior: {prior_start} to {prior_end}")
         
         # Get all data from unified DB
-        residents = self._get_db_residents(property_id)
+        history = self._get_occupancy_history(property_id)
         units = self._get_db_units(property_id)
         
         total_units = len(units)
         
         # === OCCUPANCY TRENDS ===
+        # Historical end dates are reconstructed in one sweep
+        hist_current, prior_occupied = (int(n) for n in history.occupied_on([end_date, prior_end]))
+        
         # Current period occupancy (at end_date)
         if end_date == today:
             current_occupied = sum(1 for u in units if u.get("occupancy_status") == "occupied")
             current_vacant = total_units - current_occupied
         else:
-            current_occupied = self._calculate_occupied_at_date(residents, end_date)
+            current_occupied = hist_current
             current_vacant = total_units - current_occupied
         
         # Prior period occupancy (at prior_end)
-        prior_occupied = self._calculate_occupied_at_date(residents, prior_end)
         prior_vacant = total_units - prior_occupied
         
         current_occupancy = round(current_occupied / total_units * 100, 1) if total_units > 0 else 0
         prior_occupancy = round(prior_occupied / total_units * 100, 1) if total_units > 0 else 0
         
         # === EXPOSURE TRENDS (Move-ins, Move-outs) ===
-        current_move_ins = self._count_moves_in_period(residents, "move_in_date", start_date, end_date)
-        current_move_outs = self._count_moves_in_period(residents, "move_out_date", start_date, end_date)
-        prior_move_ins = self._count_moves_in_period(residents, "move_in_date", prior_start, prior_end)
-        prior_move_outs = self._count_moves_in_period(residents, "move_out_date", prior_start, prior_end)
+        move_ins, move_outs = history.move_counts([(start_date, end_date), (prior_start, prior_end)])
+        current_move_ins, prior_move_ins = (int(n) for n in move_ins)
+        current_move_outs, prior_move_outs = (int(n) for n in move_outs)
         
         current_net_absorption = current_move_ins - current_move_outs
         prior_net_absorption = prior_move_ins - prior_move_outs
@@ -906,14 +946,17 @@ class OccupancyService:
         period_start: date, 
         period_end: date
     ) -> int:
-        """Count residents with a move date within the specified period."""
+        """
+        Count residents with a move date within the specified period.
+        
+        Per-resident reference loop; trends use OccupancyHistory.move_counts.
+        """
+        start_iso, end_iso = period_start.isoformat(), period_end.isoformat()
         count = 0
         for res in residents:
-            date_str = res.get(date_field, "")
-            if date_str:
-                move_date = parse_yardi_date(date_str)
-                if move_date and period_start <= move_date <= period_end:
-                    count += 1
+            move_date = _iso_field(res, date_field)
+            if move_date and start_iso <= move_date <= end_iso:
+                count += 1
         return count
     
     def _get_funnel_counts(
@@ -949,23 +992,24 @@ class OccupancyService:
         Calculate how many units were occupied on a specific date.
         
         A unit is occupied if: move_in_date <= target_date AND (move_out_date is null OR move_out_date > target_date)
+        
+        Per-resident reference loop; trends use OccupancyHistory.occupied_on.
         """
         occupied_units = set()
+        target_iso = target_date.isoformat()
         
         for res in residents:
             unit_id = res.get("unit") or res.get("unit_id") or res.get("unit_number")
             if not unit_id:
                 continue
             
-            move_in_str = res.get("move_in_date", "")
-            move_out_str = res.get("move_out_date", "")
-            
-            move_in = parse_yardi_date(move_in_str) if move_in_str else None
-            move_out = parse_yardi_date(move_out_str) if move_out_str else None
+            # YYYY-MM-DD strings compare in date order
+            move_in = _iso_field(res, "move_in_date")
+            move_out = _iso_field(res, "move_out_date")
             
             # Unit is occupied if resident had moved in and not yet moved out
-            if move_in and move_in <= target_date:
-                if move_out is None or move_out > target_date:
+            if move_in and move_in <= target_iso:
+                if move_out is None or move_out > target_iso:
                     occupied_units.add(str(unit_id))
         
         return len(occupied_units)
@@ -1020,7 +1064,7 @@ class OccupancyService:
         Reads from unified_amenities in unified.db.
         """
         try:
-            conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+            conn = get_unified_connection()
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -1115,11 +1159,9 @@ class OccupancyService:
         
         READ-ONLY operation.
         """
-        import sqlite3
-        from app.db.schema import UNIFIED_DB_PATH
         
         try:
-            conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+            conn = get_unified_connection()
             cursor = conn.cursor()
             
             # Try report 4156 data first (has richer decision statuses)
@@ -1156,8 +1198,8 @@ class OccupancyService:
                 month_ranges.append((month_label, m_start.isoformat(), m_end.isoformat()))
             
             if use_4156:
-                # Report 4156: lease_end_date is in MM/DD/YYYY format
-                date_expr = "date(substr(lease_end_date,7,4)||'-'||substr(lease_end_date,1,2)||'-'||substr(lease_end_date,4,2))"
+                # Report 4156: lease_end_date_iso is the sync-normalized YYYY-MM-DD date
+                date_expr = "lease_end_date_iso"
                 
                 # --- Rolling day periods (30d/60d/90d) ---
                 for days, label in [(30, "30d"), (60, "60d"), (90, "90d")]:
@@ -1201,7 +1243,7 @@ class OccupancyService:
                 # --- Monthly periods ---
                 # Use 4156 when it has data; fall back to unified_leases
                 # for months beyond the report's coverage window.
-                lease_date_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
+                lease_date_expr = "lease_end_iso"
                 for m_label, m_start, m_end in month_ranges:
                     cursor.execute(f"""
                         SELECT 
@@ -1258,7 +1300,7 @@ class OccupancyService:
                     })
             else:
                 # Fallback: unified_leases (no decision breakdown)
-                date_expr = "date(substr(lease_end,7,4)||'-'||substr(lease_end,1,2)||'-'||substr(lease_end,4,2))"
+                date_expr = "lease_end_iso"
                 for days, label in [(30, "30d"), (60, "60d"), (90, "90d")]:
                     cursor.execute(f"""
                         SELECT 
@@ -4,22 +4,156 @@ Supports two aggregation modes: weighted average and row metrics.
 
 READ-ONLY OPERATIONS ONLY.
 """
+import base64
 import sqlite3
-from typing import List, Dict, Optional
-from app.db.schema import UNIFIED_DB_PATH
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from app.db.pool import get_unified_connection, open_unified_stream
 from app.models.unified import (
     AggregationMode,
     PMSSource,
     PMSConfig,
-    UnifiedUnit,
-    UnifiedResident,
     UnifiedOccupancy,
-    UnifiedPricing,
     PortfolioOccupancy,
     PortfolioPricing,
     PortfolioSummary,
 )
 
+# Drill-through rows are read as tuples in this column order and mapped
+# straight to response dicts; building a UnifiedUnit / UnifiedResident per
+# row (then dumping it again for the response) dominated portfolio loads.
+UNIT_COLUMNS = (
+    "unified_property_id", "unit_number", "floorplan", "floorplan_name",
+    "bedrooms", "bathrooms", "square_feet", "market_rent", "status",
+    "occupancy_status", "building", "floor", "days_vacant",
+    "available_date_iso", "on_notice_date",
+)
+RESIDENT_COLUMNS = (
+    "unified_property_id", "pms_resident_id", "unit_number", "first_name",
+    "last_name", "status", "lease_start", "lease_end", "move_in_date",
+    "move_out_date", "notice_date", "current_rent",
+)
+
+_UNIT_STATUSES = ("occupied", "vacant", "down", "notice", "model")
+_VACANT_STATUSES = ("vacant", "vacant_ready", "vacant_not_ready")
+
+# SQL twins of the status derivation in unit_row_to_dict / resident_row_to_dict,
+# so status filters run in the WHERE clause instead of after materializing rows.
+_UNIT_STATUS_SQL = """
+    CASE
+        WHEN status IN ('occupied', 'vacant', 'down', 'notice', 'model') THEN status
+        WHEN occupancy_status IN ('vacant_ready', 'vacant_not_ready') THEN 'vacant'
+        ELSE COALESCE(NULLIF(occupancy_status, ''), NULLIF(status, ''), 'unknown')
+    END"""
+_RESIDENT_STATUS_SQL = """
+    CASE
+        WHEN status = 'Current' AND notice_date IS NOT NULL AND notice_date != '' THEN 'Notice'
+        ELSE COALESCE(NULLIF(status, ''), 'unknown')
+    END"""
+
+# Drill-through pagination
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+STREAM_BATCH_SIZE = 1000
+
+
+def unit_row_to_dict(row: tuple, property_id: str, pms_source: str) -> Dict:
+    """Map a UNIT_COLUMNS row to the UnifiedUnit response shape."""
+    (_, unit_number, floorplan, floorplan_name, bedrooms, bathrooms, square_feet,
+     market_rent, status, occ_status, building, floor, days_vacant,
+     available_date, on_notice_date, *_) = row
+    
+    status = status or "unknown"
+    is_vacant = occ_status in _VACANT_STATUSES or status == "vacant"
+    # Ready status from occupancy_status in enriched unified_units data
+    if occ_status == "vacant_ready":
+        ready_status = "ready"
+    elif is_vacant:
+        ready_status = "not_ready"
+    else:
+        ready_status = None
+    if status not in _UNIT_STATUSES:
+        status = "vacant" if occ_status in ("vacant_ready", "vacant_not_ready") else (occ_status or status)
+    
+    return {
+        "unit_id": unit_number or "",
+        "property_id": property_id,
+        "pms_source": pms_source,
+        "unit_number": unit_number or "",
+        "floorplan": floorplan or "",
+        "floorplan_name": floorplan_name,
+        "bedrooms": int(bedrooms or 0),
+        "bathrooms": float(bathrooms or 0),
+        "square_feet": int(square_feet or 0),
+        "market_rent": float(market_rent or 0),
+        "status": status,
+        "building": building,
+        "floor": floor,
+        "ready_status": ready_status,
+        "available": is_vacant and ready_status == "ready",
+        "days_vacant": int(days_vacant) if days_vacant is not None else None,
+        "available_date": available_date,
+        "on_notice_date": on_notice_date,
+    }
+
+
+def resident_row_to_dict(row: tuple, property_id: str, pms_source: str) -> Dict:
+    """Map a RESIDENT_COLUMNS row to the UnifiedResident response shape."""
+    (_, resident_id, unit_number, first_name, last_name, status, lease_start,
+     lease_end, move_in_date, move_out_date, notice_date, current_rent, *_) = row
+    
+    # Re-categorize Current residents with notice_date to "Notice" status
+    # (RealPage doesn't have Notice status - they're still Current with notice_date)
+    status = status or "unknown"
+    if status == "Current" and notice_date:
+        status = "Notice"
+    
+    return {
+        "resident_id": resident_id or "",
+        "property_id": property_id,
+        "pms_source": pms_source,
+        "unit_id": "",
+        "unit_number": unit_number,
+        "first_name": first_name or "",
+        "last_name": last_name or "",
+        "current_rent": float(current_rent or 0),
+        "status": status,
+        "lease_start": lease_start,
+        "lease_end": lease_end,
+        "move_in_date": move_in_date,
+        "move_out_date": move_out_date,
+        "notice_date": notice_date,
+    }
+
+
+# kind -> (table, columns, row mapper, derived-status SQL, case-insensitive status match)
+_DRILL_THROUGH: Dict[str, Tuple[str, tuple, Callable, str, bool]] = {
+    "units": ("unified_units", UNIT_COLUMNS, unit_row_to_dict, _UNIT_STATUS_SQL, False),
+    "residents": ("unified_residents", RESIDENT_COLUMNS, resident_row_to_dict, _RESIDENT_STATUS_SQL, True),
+}
+
+
+def encode_cursor(kind: str, last_id: int) -> str:
+    """Opaque keyset cursor for the row after ``last_id`` in a drill-through list."""
+    raw = f"{kind[0]}:{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(kind: str, cursor: str) -> int:
+    """Inverse of encode_cursor; raises ValueError for malformed or foreign cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, last_id = raw.split(":", 1)
+        if prefix != kind[0]:
+            raise ValueError
+        return int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid {kind} cursor") from None
+
+
+def _is_missing_table(error: sqlite3.OperationalError) -> bool:
+    """True for "no such table" (a unified.db older than the table); other errors must surface."""
+    return "no such table" in str(error)
+
 
 class PortfolioService:
     """
@@ -33,116 +167,100 @@ class PortfolioService:
     def __init__(self):
         pass
     
-    def _get_units_from_db(self, property_id: str) -> Optional[List[Dict]]:
-        """Get units from unified.db for a property."""
-        try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT unit_number, floorplan, square_feet, market_rent, status,
-                       occupancy_status, available_date, on_notice_date, days_vacant,
-                       made_ready_date, excluded_from_occupancy, floorplan_name,
-                       bedrooms, bathrooms, building, floor
-                FROM unified_units
-                WHERE unified_property_id = ?
-            """, (property_id,))
-            rows = cursor.fetchall()
-            conn.close()
-            
-            if rows:
-                return [dict(row) for row in rows]
-        except Exception:
-            pass
-        return None
+    # ---- Batched reads: one query per table for every requested property ----
     
-    def _get_residents_from_db(self, property_id: str) -> Optional[List[Dict]]:
-        """Get residents from unified.db for a property."""
+    def _query_by_property(self, sql: str, property_ids: List[str], params: tuple = ()) -> Dict[str, List[tuple]]:
+        """
+        Run ``sql`` (containing ``{ids}`` for the IN list) and group rows by their first column.
+        
+        A table missing from an older unified.db yields no rows, matching the
+        per-property helpers this replaced; any other database error propagates.
+        """
+        grouped: Dict[str, List[tuple]] = {}
+        ids = list(dict.fromkeys(property_ids))
+        if not ids:
+            return grouped
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT pms_resident_id, unit_number, first_name, last_name, full_name,
-                       status, lease_start, lease_end, move_in_date, move_out_date,
-                       current_rent, balance
-                FROM unified_residents
-                WHERE unified_property_id = ?
-            """, (property_id,))
-            rows = cursor.fetchall()
-            conn.close()
-            
-            if rows:
-                return [dict(row) for row in rows]
-        except Exception:
-            pass
-        return None
+            conn = get_unified_connection()
+            try:
+                cursor = conn.execute(sql.format(ids=",".join("?" * len(ids))), (*ids, *params))
+                for row in cursor.fetchall():
+                    grouped.setdefault(row[0], []).append(row)
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            if not _is_missing_table(e):
+                raise
+        return grouped
     
-    def _get_occupancy_from_db(self, property_id: str) -> Optional[Dict]:
-        """Get occupancy from unified.db for a property."""
-        try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT total_units, occupied_units, vacant_units, leased_units,
-                       preleased_vacant, physical_occupancy, leased_percentage,
-                       exposure_30_days, exposure_60_days,
-                       COALESCE(vacant_ready, 0), COALESCE(vacant_not_ready, 0),
-                       COALESCE(notice_break_units, 0), COALESCE(notice_units, 0)
+    def _count_by_property(self, table: str, property_ids: List[str]) -> Dict[str, int]:
+        """Row count per property in a unified table."""
+        rows = self._query_by_property(f"""
+            SELECT unified_property_id, COUNT(*) FROM {table}
+            WHERE unified_property_id IN ({{ids}})
+            GROUP BY unified_property_id
+        """, property_ids)
+        return {pid: r[0][1] for pid, r in rows.items()}
+    
+    def _get_occupancy_by_property(self, property_ids: List[str]) -> Dict[str, Dict]:
+        """Latest occupancy snapshot per property (two queries for all properties)."""
+        latest = self._query_by_property("""
+            SELECT unified_property_id, total_units, occupied_units, vacant_units, leased_units,
+                   preleased_vacant, physical_occupancy, leased_percentage,
+                   exposure_30_days, exposure_60_days,
+                   COALESCE(vacant_ready, 0), COALESCE(vacant_not_ready, 0),
+                   COALESCE(notice_break_units, 0), COALESCE(notice_units, 0)
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY unified_property_id ORDER BY snapshot_date DESC
+                ) AS rn
                 FROM unified_occupancy_metrics
-                WHERE unified_property_id = ?
-                ORDER BY snapshot_date DESC
-                LIMIT 1
-            """, (property_id,))
-            row = cursor.fetchone()
-            conn.close()
+                WHERE unified_property_id IN ({ids})
+            )
+            WHERE rn = 1
+        """, property_ids)
+        # Vacant count from unified_units for consistency with
+        # ATR, bedroom table, and KPI card (all read from unified_units)
+        unit_vacant = self._query_by_property("""
+            SELECT unified_property_id, COUNT(*) FROM unified_units
+            WHERE unified_property_id IN ({ids})
+              AND occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
+            GROUP BY unified_property_id
+        """, property_ids)
+        
+        metrics = {}
+        for pid, rows in latest.items():
+            row = rows[0][1:]
+            vacant_units = row[2] or 0
+            vacant_ready = row[9] or 0
+            vacant_not_ready = row[10] or 0
+            notice_break = row[11] or 0
+            notice_units = row[12] or 0
+            
+            uu_vacant = unit_vacant.get(pid, [(pid, 0)])[0][1]
+            if uu_vacant > 0:
+                vacant_units = uu_vacant
             
-            if row:
-                vacant_units = row[2] or 0
-                vacant_ready = row[9] or 0
-                vacant_not_ready = row[10] or 0
-                notice_break = row[11] or 0
-                notice_units = row[12] or 0
-                
-                # Override vacant from unified_units for consistency with
-                # ATR, bedroom table, and KPI card (all read from unified_units)
-                try:
-                    conn2 = sqlite3.connect(UNIFIED_DB_PATH)
-                    c2 = conn2.cursor()
-                    c2.execute("""
-                        SELECT COUNT(*) FROM unified_units
-                        WHERE unified_property_id = ?
-                          AND occupancy_status IN ('vacant', 'vacant_ready', 'vacant_not_ready')
-                    """, (property_id,))
-                    uu_row = c2.fetchone()
-                    conn2.close()
-                    if uu_row and uu_row[0] > 0:
-                        vacant_units = uu_row[0]
-                except Exception:
-                    pass
-                
-                # Fallback: if no vacant_ready data, use total vacant
-                if vacant_ready == 0 and vacant_not_ready == 0 and vacant_units > 0:
-                    vacant_ready = vacant_units
-                return {
-                    "total_units": row[0] or 0,
-                    "occupied_units": row[1] or 0,
-                    "vacant_units": vacant_units,
-                    "leased_units": row[3] or 0,
-                    "preleased_vacant": row[4] or 0,
-                    "available_units": vacant_ready if vacant_ready > 0 else vacant_units,
-                    "vacant_ready": vacant_ready,
-                    "vacant_not_ready": vacant_not_ready,
-                    "notice_units": notice_units,
-                    "notice_break_units": notice_break,
-                    "physical_occupancy": row[5] or 0,
-                    "leased_percentage": row[6] or 0,
-                    "exposure_30_days": row[7] or 0,
-                    "exposure_60_days": row[8] or 0,
-                }
-        except Exception:
-            pass
-        return None
+            # Fallback: if no vacant_ready data, use total vacant
+            if vacant_ready == 0 and vacant_not_ready == 0 and vacant_units > 0:
+                vacant_ready = vacant_units
+            metrics[pid] = {
+                "total_units": row[0] or 0,
+                "occupied_units": row[1] or 0,
+                "vacant_units": vacant_units,
+                "leased_units": row[3] or 0,
+                "preleased_vacant": row[4] or 0,
+                "available_units": vacant_ready if vacant_ready > 0 else vacant_units,
+                "vacant_ready": vacant_ready,
+                "vacant_not_ready": vacant_not_ready,
+                "notice_units": notice_units,
+                "notice_break_units": notice_break,
+                "physical_occupancy": row[5] or 0,
+                "leased_percentage": row[6] or 0,
+                "exposure_30_days": row[7] or 0,
+                "exposure_60_days": row[8] or 0,
+            }
+        return metrics
     
     def get_portfolio_occupancy(
         self,
@@ -166,15 +284,12 @@ class PortfolioService:
         else:
             return self._occupancy_weighted_average(configs)
     
-    def _occupancy_weighted_average(
-        self, 
-        configs: List[PMSConfig]
-    ) -> PortfolioOccupancy:
-        """Calculate occupancy using weighted average of per-property metrics."""
+    def _property_occupancy(self, configs: List[PMSConfig]) -> List[UnifiedOccupancy]:
+        """Per-property occupancy breakdown (configs without a snapshot are skipped)."""
+        metrics_by_id = self._get_occupancy_by_property([c.property_id for c in configs])
         property_metrics: List[UnifiedOccupancy] = []
-        
         for config in configs:
-            metrics = self._get_occupancy_from_db(config.property_id)
+            metrics = metrics_by_id.get(config.property_id)
             if not metrics:
                 continue
             
@@ -192,6 +307,14 @@ class PortfolioService:
                 physical_occupancy=metrics["physical_occupancy"],
                 leased_percentage=metrics["leased_percentage"],
             ))
+        return property_metrics
+    
+    def _occupancy_weighted_average(
+        self, 
+        configs: List[PMSConfig]
+    ) -> PortfolioOccupancy:
+        """Calculate occupancy using weighted average of per-property metrics."""
+        property_metrics = self._property_occupancy(configs)
         
         # Calculate weighted averages
         total_units = sum(m.total_units for m in property_metrics)
@@ -235,47 +358,19 @@ class PortfolioService:
         self, 
         configs: List[PMSConfig]
     ) -> PortfolioOccupancy:
-        """Calculate occupancy from combined raw unit data."""
-        all_units: List[dict] = []
-        property_metrics: List[UnifiedOccupancy] = []
-        
-        for config in configs:
-            db_metrics = self._get_occupancy_from_db(config.property_id)
-            if not db_metrics:
-                continue
-            
-            property_metrics.append(UnifiedOccupancy(
-                property_id=config.property_id,
-                pms_source=PMSSource(config.pms_type),
-                total_units=db_metrics["total_units"],
-                occupied_units=db_metrics["occupied_units"],
-                vacant_units=db_metrics["vacant_units"],
-                leased_units=db_metrics["leased_units"],
-                preleased_vacant=db_metrics.get("preleased_vacant", 0),
-                available_units=db_metrics.get("available_units", 0),
-                vacant_ready=db_metrics.get("vacant_ready", 0),
-                vacant_not_ready=db_metrics.get("vacant_not_ready", 0),
-                physical_occupancy=db_metrics["physical_occupancy"],
-                leased_percentage=db_metrics["leased_percentage"],
-            ))
-            for _ in range(db_metrics["occupied_units"]):
-                all_units.append({"status": "occupied", "_property_id": config.property_id})
-            for _ in range(db_metrics["vacant_units"]):
-                all_units.append({"status": "vacant", "_property_id": config.property_id})
+        """
+        Calculate occupancy from the combined unit pool.
         
-        # Calculate from combined raw data
-        total_units = len(all_units)
-        occupied_units = len([u for u in all_units if u.get("status") == "occupied"])
-        vacant_units = len([u for u in all_units if u.get("status") == "vacant"])
-        notice_units = len([u for u in all_units if u.get("status") == "notice"])
-        available_units = len([u for u in all_units if u.get("available", False)])
-        leased_units = occupied_units + notice_units
+        Each property contributes its occupied and vacant units to one pool
+        (no notice / ready detail at the snapshot level), so the pooled
+        counts are plain sums rather than per-unit records.
+        """
+        property_metrics = self._property_occupancy(configs)
         
-        # Vacant ready/not ready breakdown
-        vacant_ready = len([u for u in all_units 
-                          if u.get("status") == "vacant" 
-                          and u.get("ready_status") == "ready"])
-        vacant_not_ready = vacant_units - vacant_ready
+        occupied_units = sum(m.occupied_units for m in property_metrics)
+        vacant_units = sum(m.vacant_units for m in property_metrics)
+        total_units = occupied_units + vacant_units
+        leased_units = occupied_units
         
         physical_occupancy = (occupied_units / total_units * 100) if total_units > 0 else 0
         leased_percentage = (leased_units / total_units * 100) if total_units > 0 else 0
@@ -288,9 +383,9 @@ class PortfolioService:
             vacant_units=vacant_units,
             leased_units=leased_units,
             preleased_vacant=0,
-            available_units=available_units,
-            vacant_ready=vacant_ready,
-            vacant_not_ready=vacant_not_ready,
+            available_units=0,
+            vacant_ready=0,
+            vacant_not_ready=vacant_units,
             physical_occupancy=round(physical_occupancy, 2),
             leased_percentage=round(leased_percentage, 2),
             property_breakdown=property_metrics,
@@ -316,32 +411,28 @@ class PortfolioService:
         else:
             return self._pricing_weighted_average(configs)
     
-    def _get_pricing_from_db(self, property_id: str) -> Optional[Dict]:
-        """Get pricing from unified.db for a property."""
-        try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT floorplan, unit_count, avg_square_feet,
-                       in_place_rent, asking_rent
+    def _get_pricing_by_property(self, property_ids: List[str]) -> Dict[str, Dict]:
+        """Unit-weighted pricing of each property's latest snapshot, one GROUP BY for all."""
+        rows = self._query_by_property("""
+            SELECT p.unified_property_id,
+                   SUM(COALESCE(p.unit_count, 0)),
+                   SUM(COALESCE(p.unit_count, 0) * COALESCE(p.avg_square_feet, 0)),
+                   SUM(COALESCE(p.unit_count, 0) * COALESCE(p.in_place_rent, 0)),
+                   SUM(COALESCE(p.unit_count, 0) * COALESCE(p.asking_rent, 0))
+            FROM unified_pricing_metrics p
+            JOIN (
+                SELECT unified_property_id, MAX(snapshot_date) AS snapshot_date
                 FROM unified_pricing_metrics
-                WHERE unified_property_id = ?
-                AND snapshot_date = (
-                    SELECT MAX(snapshot_date) FROM unified_pricing_metrics
-                    WHERE unified_property_id = ?
-                )
-            """, (property_id, property_id))
-            rows = cursor.fetchall()
-            conn.close()
-            
-            if not rows:
-                return None
-            
-            total_units = sum(r[1] or 0 for r in rows)
-            total_sf = sum((r[1] or 0) * (r[2] or 0) for r in rows)
-            total_ip = sum((r[1] or 0) * (r[3] or 0) for r in rows)
-            total_ask = sum((r[1] or 0) * (r[4] or 0) for r in rows)
-            
+                WHERE unified_property_id IN ({ids})
+                GROUP BY unified_property_id
+            ) latest
+              ON latest.unified_property_id = p.unified_property_id
+             AND latest.snapshot_date = p.snapshot_date
+            GROUP BY p.unified_property_id
+        """, property_ids)
+        
+        pricing = {}
+        for pid, ((_, total_units, total_sf, total_ip, total_ask),) in rows.items():
             if total_units > 0:
                 avg_sf = total_sf / total_units
                 avg_ip = total_ip / total_units
@@ -349,7 +440,7 @@ class PortfolioService:
             else:
                 avg_sf = avg_ip = avg_ask = 0
             
-            return {
+            pricing[pid] = {
                 "in_place_rent": avg_ip,
                 "asking_rent": avg_ask,
                 "in_place_per_sf": avg_ip / avg_sf if avg_sf > 0 else 0,
@@ -357,8 +448,7 @@ class PortfolioService:
                 "rent_growth": ((avg_ask / avg_ip) - 1) * 100 if avg_ip > 0 else 0,
                 "total_units": total_units,
             }
-        except Exception:
-            return None
+        return pricing
     
     def _pricing_weighted_average(
         self, 
@@ -366,6 +456,7 @@ class PortfolioService:
     ) -> PortfolioPricing:
         """Calculate pricing using weighted average from unified.db."""
         property_ids = [c.property_id for c in configs]
+        pricing_by_id = self._get_pricing_by_property(property_ids)
         total_units = 0
         weighted_ip = 0
         weighted_ask = 0
@@ -373,7 +464,7 @@ class PortfolioService:
         weighted_ask_sf = 0
         
         for config in configs:
-            pricing = self._get_pricing_from_db(config.property_id)
+            pricing = pricing_by_id.get(config.property_id)
             if not pricing or pricing["total_units"] == 0:
                 continue
             n = pricing["total_units"]
@@ -409,102 +500,174 @@ class PortfolioService:
         """Calculate pricing from combined unified.db data (same as weighted avg for DB source)."""
         return self._pricing_weighted_average(configs)
     
+    def _get_drill_through(
+        self,
+        kind: str,
+        configs: List[PMSConfig],
+        status: Optional[str],
+        floorplan: Optional[str],
+    ) -> List[Dict]:
+        """Whole filtered list, grouped in config order (one query for all properties)."""
+        mapper = _DRILL_THROUGH[kind][2]
+        sources = {c.property_id: PMSSource(c.pms_type).value for c in configs}
+        sql, params = self._drill_through_query(kind, list(sources), status, floorplan, 0)
+        by_property: Dict[str, List[tuple]] = {}
+        try:
+            conn = get_unified_connection()
+            try:
+                for row in conn.execute(sql, params).fetchall():
+                    by_property.setdefault(row[0], []).append(row)
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            # An older unified.db without the table has nothing to list
+            if not _is_missing_table(e):
+                raise
+        return [
+            mapper(row, pid, pms_source)
+            for pid, pms_source in sources.items()
+            for row in by_property.get(pid, ())
+        ]
+    
     def get_all_units(
         self,
-        configs: List[PMSConfig]
-    ) -> List[UnifiedUnit]:
+        configs: List[PMSConfig],
+        status: Optional[str] = None,
+        floorplan: Optional[str] = None,
+    ) -> List[Dict]:
         """
         Get combined unit list from all properties (for drill-through).
-        """
-        all_units: List[UnifiedUnit] = []
         
-        for config in configs:
-            units = self._get_units_from_db(config.property_id)
-            if not units:
-                continue
-            
-            for unit in units:
-                # Determine ready_status and available from unit data
-                status = unit.get("status", "unknown")
-                occ_status = unit.get("occupancy_status")
-                is_vacant = occ_status == "vacant" or status == "vacant" or occ_status in ("vacant_ready", "vacant_not_ready")
-                ready_status = unit.get("ready_status")
-                if not ready_status:
-                    # Use occupancy_status from enriched unified_units data
-                    if occ_status == "vacant_ready":
-                        ready_status = "ready"
-                    elif occ_status == "vacant_not_ready":
-                        ready_status = "not_ready"
-                    elif is_vacant:
-                        ready_status = "not_ready"
-                is_available = unit.get("available", is_vacant and ready_status == "ready")
-                
-                all_units.append(UnifiedUnit(
-                    unit_id=unit.get("unit_id") or unit.get("unit_number") or "",
-                    property_id=config.property_id,
-                    pms_source=PMSSource(config.pms_type),
-                    unit_number=unit.get("unit_number") or "",
-                    floorplan=unit.get("floorplan") or "",
-                    floorplan_name=unit.get("floorplan_name"),
-                    bedrooms=unit.get("bedrooms") or 0,
-                    bathrooms=unit.get("bathrooms") or 0,
-                    square_feet=unit.get("square_feet") or 0,
-                    market_rent=unit.get("market_rent") or 0,
-                    status=status if status in ("occupied", "vacant", "down", "notice", "model") else (
-                        "vacant" if occ_status in ("vacant_ready", "vacant_not_ready") else (occ_status or status)
-                    ),
-                    building=unit.get("building"),
-                    floor=unit.get("floor"),
-                    ready_status=ready_status,
-                    available=is_available,
-                    days_vacant=unit.get("days_vacant"),
-                    available_date=unit.get("available_date"),
-                    on_notice_date=unit.get("on_notice_date"),
-                ))
-        
-        return all_units
+        Returns plain dicts shaped like UnifiedUnit (see unit_row_to_dict).
+        """
+        return self._get_drill_through("units", configs, status, floorplan)
     
     def get_all_residents(
         self,
         configs: List[PMSConfig],
-        status: Optional[str] = None
-    ) -> List[UnifiedResident]:
+        status: Optional[str] = None,
+        floorplan: Optional[str] = None,
+    ) -> List[Dict]:
         """
         Get combined resident list from all properties (for drill-through).
+        
+        Returns plain dicts shaped like UnifiedResident (see resident_row_to_dict).
         """
-        all_residents: List[UnifiedResident] = []
+        return self._get_drill_through("residents", configs, status, floorplan)
+    
+    # ---- Keyset-paginated / streamed drill-through ----
+    
+    def _drill_through_query(
+        self,
+        kind: str,
+        property_ids: List[str],
+        status: Optional[str],
+        floorplan: Optional[str],
+        after_id: int,
+    ) -> Tuple[str, list]:
+        """
+        SELECT for one drill-through list, filtered server-side and ordered by id.
         
-        for config in configs:
-            residents = self._get_residents_from_db(config.property_id)
-            if not residents:
-                continue
-            
-            for res in residents:
-                # Re-categorize Current residents with notice_date to "Notice" status
-                # (RealPage doesn't have Notice status - they're still Current with notice_date)
-                notice_date = res.get("notice_date")
-                res_status = res.get("status", "unknown")
-                if res_status == "Current" and notice_date:
-                    res_status = "Notice"
-                
-                all_residents.append(UnifiedResident(
-                    resident_id=res.get("resident_id", ""),
-                    property_id=config.property_id,
-                    pms_source=PMSSource(config.pms_type),
-                    unit_id=res.get("unit_id", ""),
-                    unit_number=res.get("unit_number"),
-                    first_name=res.get("first_name", ""),
-                    last_name=res.get("last_name", ""),
-                    current_rent=res.get("current_rent", 0),
-                    status=res_status,
-                    lease_start=res.get("lease_start"),
-                    lease_end=res.get("lease_end"),
-                    move_in_date=res.get("move_in_date"),
-                    move_out_date=res.get("move_out_date"),
-                    notice_date=notice_date,
-                ))
+        Ordering by the rowid makes ``id > after_id`` a stable keyset cursor:
+        pages never skip or repeat rows, however deep the client walks.
+        """
+        table, columns, _, status_sql, nocase = _DRILL_THROUGH[kind]
+        ids = list(dict.fromkeys(property_ids))
+        where = [f"unified_property_id IN ({','.join('?' * len(ids))})", "id > ?"]
+        params: list = [*ids, after_id]
+        if status:
+            if nocase:
+                where.append(f"LOWER({status_sql}) = ?")
+            else:
+                where.append(f"{status_sql} = ?")
+            params.append(status.lower())
+        if floorplan:
+            if kind == "units":
+                where.append("floorplan = ?")
+            else:
+                # Residents carry no floorplan; match through their unit
+                where.append("""EXISTS (
+                    SELECT 1 FROM unified_units u
+                    WHERE u.unified_property_id = unified_residents.unified_property_id
+                      AND u.unit_number = unified_residents.unit_number
+                      AND u.floorplan = ?
+                )""")
+            params.append(floorplan)
+        sql = f"""
+            SELECT {", ".join(columns)}, id
+            FROM {table}
+            WHERE {" AND ".join(where)}
+            ORDER BY id
+        """
+        return sql, params
+    
+    def get_drill_through_page(
+        self,
+        kind: str,
+        configs: List[PMSConfig],
+        status: Optional[str] = None,
+        floorplan: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of units or residents plus the cursor for the next page (None at the end).
+        
+        Raises ValueError for a cursor that does not belong to this list.
+        """
+        after_id = decode_cursor(kind, cursor) if cursor else 0
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        mapper = _DRILL_THROUGH[kind][2]
+        sources = {c.property_id: PMSSource(c.pms_type).value for c in configs}
+        sql, params = self._drill_through_query(kind, list(sources), status, floorplan, after_id)
+        
+        conn = get_unified_connection()
+        try:
+            rows = conn.execute(f"{sql} LIMIT ?", (*params, limit + 1)).fetchall()
+        except sqlite3.OperationalError as e:
+            if not _is_missing_table(e):
+                raise
+            rows = []
+        finally:
+            conn.close()
         
-        return all_residents
+        next_cursor = encode_cursor(kind, rows[limit - 1][-1]) if len(rows) > limit else None
+        return [mapper(row, row[0], sources[row[0]]) for row in rows[:limit]], next_cursor
+    
+    def iter_drill_through(
+        self,
+        kind: str,
+        configs: List[PMSConfig],
+        status: Optional[str] = None,
+        floorplan: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield every matching unit or resident straight off the SQLite cursor.
+        
+        Rows are fetched STREAM_BATCH_SIZE at a time on a dedicated connection,
+        so exporting a large owner group never holds the full list in memory.
+        Raises ValueError (before the first row) for an invalid cursor.
+        """
+        after_id = decode_cursor(kind, cursor) if cursor else 0
+        mapper = _DRILL_THROUGH[kind][2]
+        sources = {c.property_id: PMSSource(c.pms_type).value for c in configs}
+        sql, params = self._drill_through_query(kind, list(sources), status, floorplan, after_id)
+        return self._stream_rows(sql, params, mapper, sources)
+    
+    @staticmethod
+    def _stream_rows(sql: str, params: list, mapper: Callable, sources: Dict[str, str]) -> Iterator[Dict]:
+        conn = open_unified_stream()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not batch:
+                    break
+                for row in batch:
+                    yield mapper(row, row[0], sources[row[0]])
+        finally:
+            conn.close()
     
     def get_portfolio_summary(
         self,
@@ -517,29 +680,27 @@ class PortfolioService:
         occupancy = self.get_portfolio_occupancy(configs, mode)
         pricing = self.get_portfolio_pricing(configs, mode)
         
-        # Get counts
-        all_units = self.get_all_units(configs)
-        all_residents = self.get_all_residents(configs, status="current")
+        # Counts only — no need to materialize the drill-through rows
+        property_ids = [c.property_id for c in configs]
+        unit_counts = self._count_by_property("unified_units", property_ids)
+        resident_counts = self._count_by_property("unified_residents", property_ids)
         
         # Get property names from unified.db
-        property_names = []
-        try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
-            cursor = conn.cursor()
-            for config in configs:
-                cursor.execute("SELECT name FROM unified_properties WHERE unified_property_id = ?", (config.property_id,))
-                row = cursor.fetchone()
-                property_names.append(row[0] if row else config.property_id)
-            conn.close()
-        except Exception:
-            property_names = [c.property_id for c in configs]
+        names = self._query_by_property("""
+            SELECT unified_property_id, name FROM unified_properties
+            WHERE unified_property_id IN ({ids})
+        """, property_ids)
+        property_names = [
+            names[pid][0][1] if pid in names else pid
+            for pid in property_ids
+        ]
         
         return PortfolioSummary(
-            property_ids=[c.property_id for c in configs],
+            property_ids=property_ids,
             property_names=property_names,
             aggregation_mode=mode,
             occupancy=occupancy,
             pricing=pricing,
-            total_unit_count=len(all_units),
-            total_resident_count=len(all_residents),
+            total_unit_count=sum(unit_counts.get(pid, 0) for pid in property_ids),
+            total_resident_count=sum(resident_counts.get(pid, 0) for pid in property_ids),
         )
@@ -4,10 +4,9 @@ Implements Unit Data specifications from spec.
 READ-ONLY: Only retrieves and transforms data, no modifications.
 """
 import logging
-import sqlite3
 from typing import List, Dict
 from app.models import UnitPricingMetrics, FloorplanPricing
-from app.db.schema import UNIFIED_DB_PATH
+from app.db.pool import get_unified_connection
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +27,7 @@ class PricingService:
     def _get_site_id(self, property_id: str) -> str:
         """Look up RealPage site_id from unified_properties."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT pms_property_id FROM unified_properties WHERE unified_property_id = ? AND pms_source = 'realpage'",
@@ -43,7 +42,7 @@ class PricingService:
     def _get_property_name(self, property_id: str) -> str:
         """Get property name from unified.db."""
         try:
-            conn = sqlite3.connect(UNIFIED_DB_PATH)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM unified_properties WHERE unified_property_id = ?", (property_id,))
             row = cursor.fetchone()
@@ -77,9 +76,8 @@ class PricingService:
     
     def _get_pricing_from_db(self, property_id: str, property_name: str):
         """Build pricing from unified_units and unified_pricing_metrics."""
-        db_path = UNIFIED_DB_PATH
         try:
-            conn = sqlite3.connect(db_path)
+            conn = get_unified_connection()
             cursor = conn.cursor()
             
             # Try unified_pricing_metrics first (from box_score / rent_roll)
@@ -179,10 +177,9 @@ class PricingService:
             days: Optional trailing window filter (e.g. 7, 30). Filters by move_in_date.
         """
         from datetime import datetime, timedelta
-        from app.db.schema import UNIFIED_DB_PATH
         
         try:
-            conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+            conn = get_unified_connection()
             cursor = conn.cursor()
             
             # Get trade-outs: match Current First(Lease) with the most recent
@@ -283,10 +280,9 @@ class PricingService:
         
         READ-ONLY operation.
         """
-        from app.db.schema import UNIFIED_DB_PATH
         
         try:
-            conn = sqlite3.connect(str(UNIFIED_DB_PATH))
+            conn = get_unified_connection()
             cursor = conn.cursor()
             
             # Check if report 4156 data is available
@@ -304,13 +300,13 @@ class PricingService:
             
             if use_4156:
                 # Report 4156: actual_rent = prior rent, new_rent = renewal rent
-                date_expr = "date(substr(new_lease_start,7,4)||'-'||substr(new_lease_start,1,2)||'-'||substr(new_lease_start,4,2))"
+                date_expr = "new_lease_start_iso"
                 date_filter = ""
                 params = [property_id]
                 
                 if month:
-                    date_filter = f"AND substr(new_lease_start,7,4) || '-' || substr(new_lease_start,1,2) = ?"
-                    params.append(month)
+                    date_filter = f"AND {date_expr} >= ? AND {date_expr} < date(?, '+1 month')"
+                    params.extend([f"{month}-01", f"{month}-01"])
                 elif days:
                     date_filter = f"AND {date_expr} >= date('now', ?)"
                     params.append(f'-{days} days')
@@ -352,13 +348,12 @@ class PricingService:
                 
                 if month:
                     date_filter = """
-                      AND substr(c.lease_start,7,4) || '-' || substr(c.lease_start,1,2) = ?
+                      AND c.lease_start_iso >= ? AND c.lease_start_iso < date(?, '+1 month')
                     """
-                    params.append(month)
+                    params.extend([f"{month}-01", f"{month}-01"])
                 elif days:
                     date_filter = """
-                      AND date(substr(c.lease_start,7,4) || '-' || substr(c.lease_start,1,2) || '-' || substr(c.lease_start,4,2))
-                          >= date('now', ?)
+                      AND c.lease_start_iso >= date('now', ?)
                     """
                     params.append(f'-{days} days')
                 
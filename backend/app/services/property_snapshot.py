@@ -0,0 +1,96 @@
+"""
+Property Snapshot - One-pass, in-memory copy of a single property's data.
+
+Used by the /properties/{id}/bundle endpoint. Instead of every dashboard
+panel reopening unified.db and re-scanning unified_units, unified_residents,
+unified_leases and the metrics tables for the same property, the snapshot
+copies that property's rows from every unified table exactly once into a
+shared-cache in-memory SQLite database. While the snapshot is active,
+get_unified_connection() hands out connections to it, so the existing
+section handlers and services run unchanged against a few hundred rows in
+memory.
+
+READ-ONLY: the source DB is attached read-only and snapshot connections are
+query_only.
+"""
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app.db.pool import unified_pool, override_unified_source
+
+logger = logging.getLogger(__name__)
+
+PROPERTY_COLUMN = "unified_property_id"
+
+
+def property_id_variants(property_id: str) -> list:
+    """All spellings the handlers use to look a property up (kairoi-, dashes)."""
+    variants = {property_id, property_id.replace("-", "_").lower()}
+    if property_id.startswith("kairoi-"):
+        variants.add(property_id.replace("kairoi-", "").replace("-", "_"))
+    return sorted(variants)
+
+
+class PropertySnapshot:
+    """In-memory copy of every unified_* row belonging to one property."""
+
+    def __init__(self, property_id: str):
+        self.property_id = property_id
+        self.uri = f"file:property_snapshot_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.row_counts: Dict[str, int] = {}
+        self.load_ms: float = 0.0
+        self._holder: Optional[sqlite3.Connection] = None
+
+    def load(self) -> "PropertySnapshot":
+        """Copy the property's rows from unified.db (one indexed scan per table)."""
+        start = time.perf_counter()
+        # The holder connection keeps the shared in-memory DB alive until close()
+        holder = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        source_uri = f"{unified_pool.path.resolve().as_uri()}?mode=ro"
+        try:
+            holder.execute("ATTACH DATABASE ? AS src", (source_uri,))
+            tables = [
+                r[0] for r in holder.execute(
+                    "SELECT name FROM src.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                ).fetchall()
+            ]
+            variants = property_id_variants(self.property_id)
+            placeholders = ",".join("?" * len(variants))
+            for table in tables:
+                columns = {r[1] for r in holder.execute(f'PRAGMA src.table_info("{table}")').fetchall()}
+                if PROPERTY_COLUMN not in columns:
+                    continue  # not property-scoped; dashboard sections don't read these
+                holder.execute(
+                    f'CREATE TABLE main."{table}" AS SELECT * FROM src."{table}" '
+                    f"WHERE {PROPERTY_COLUMN} IN ({placeholders})",
+                    variants,
+                )
+                self.row_counts[table] = holder.execute(f'SELECT COUNT(*) FROM main."{table}"').fetchone()[0]
+            holder.commit()
+            holder.execute("DETACH DATABASE src")
+        except Exception:
+            # Closing the only connection also frees the half-built in-memory DB
+            holder.close()
+            raise
+        self._holder = holder
+        self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(
+            f"[BUNDLE] Snapshot for {self.property_id}: {sum(self.row_counts.values())} rows "
+            f"from {len(self.row_counts)} tables in {self.load_ms}ms"
+        )
+        return self
+
+    @contextmanager
+    def active(self):
+        """Route get_unified_connection() to this snapshot inside the block."""
+        with override_unified_source(self.uri):
+            yield self
+
+    def close(self):
+        if self._holder is not None:
+            self._holder.close()
+            self._holder = None
@@ -0,0 +1,209 @@
+"""
+Response Cache - Snapshot-versioned cache for read-only dashboard endpoints.
+
+unified.db only changes when the pipeline pushes a new file through
+/admin/upload-db, so a GET handler's result is fully determined by:
+
+    (endpoint, query/path params, owner group, DB generation, calendar day)
+
+The DB generation comes from the unified.db connection pool and is bumped
+atomically when upload-db swaps the file, so entries computed against the
+old snapshot simply stop matching. The calendar day is part of the key
+because many handlers compute windows relative to date.today().
+
+Entries live in a process-local LRU bounded by RESPONSE_CACHE_MAX_ENTRIES.
+Services catch their own read errors and return empty lists/dicts, so an
+empty result may just mean a failed read: those are kept for only
+RESPONSE_CACHE_EMPTY_TTL_S seconds instead of the rest of the generation.
+READ-ONLY: never wraps handlers that mutate state.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from enum import Enum
+from typing import Any, Optional
+
+from fastapi import Request
+
+from app.db.pool import unified_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "4096"))
+EMPTY_TTL_S = float(os.environ.get("RESPONSE_CACHE_EMPTY_TTL_S", "60"))
+
+_REQUEST_PARAM = "cache_request"
+
+
+def _freeze(value: Any) -> Any:
+    """Make a handler argument hashable and stable for use in a cache key."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    """None, an empty container, or a dict of nothing but empty values (e.g. {"periods": []})."""
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return all(_is_empty(v) for v in value.values())
+    if isinstance(value, (list, tuple, set, str)):
+        return len(value) == 0
+    return False
+
+
+def _owner_group(request: Optional[Request]) -> Optional[str]:
+    """Owner group from the JWT, or None for unauthenticated/invalid tokens."""
+    if request is None:
+        return None
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    from app.services.auth_service import verify_token
+    token = authorization[7:] if authorization.startswith("Bearer ") else authorization
+    payload = verify_token(token)
+    return payload.get("group") if payload else None
+
+
+class ResponseCache:
+    """Thread-safe LRU of endpoint results keyed by DB generation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._stats: dict = {}
+        self._evictions = 0
+
+    def make_key(self, endpoint: str, params: dict, owner_group: Optional[str]) -> tuple:
+        frozen = tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+        return (
+            endpoint,
+            frozen,
+            owner_group,
+            unified_pool.current_generation(),
+            date.today().isoformat(),
+        )
+
+    def get(self, key: tuple):
+        """Return (hit, value)."""
+        endpoint = key[0]
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return True, value
+                del self._entries[key]
+            stats["misses"] += 1
+            return False, None
+
+    def put(self, key: tuple, value: Any, ttl: Optional[float] = None):
+        """Store ``value``; with ``ttl`` it expires after that many seconds, otherwise with its generation."""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def purge_stale(self) -> int:
+        """Drop entries from older DB generations (called after upload-db)."""
+        generation = unified_pool.current_generation()
+        with self._lock:
+            stale = [k for k in self._entries if k[3] != generation]
+            for k in stale:
+                del self._entries[k]
+        if stale:
+            logger.info(f"[RESPONSE_CACHE] Purged {len(stale)} entries from old DB generations")
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            self._evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            endpoints = {k: dict(v) for k, v in self._stats.items()}
+            entries = len(self._entries)
+            evictions = self._evictions
+        hits = sum(s["hits"] for s in endpoints.values())
+        misses = sum(s["misses"] for s in endpoints.values())
+        for s in endpoints.values():
+            total = s["hits"] + s["misses"]
+            s["hit_rate"] = round(s["hits"] / total, 4) if total else 0.0
+        return {
+            "generation": unified_pool.generation,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "evictions": evictions,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "endpoints": dict(sorted(endpoints.items())),
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(func):
+    """
+    Cache a read-only FastAPI GET handler in response_cache.
+
+    Works for both sync and async handlers. The wrapper advertises an extra
+    Request parameter to FastAPI (to read the owner group from the JWT) and
+    strips it before calling the handler. Exceptions are never cached; empty
+    results are cached for EMPTY_TTL_S only, as they may hide a failed read.
+    """
+    endpoint = func.__name__
+    sig = inspect.signature(func)
+    params = list(sig.parameters.values()) + [
+        inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+    ]
+
+    def _key(args, kwargs):
+        request = kwargs.pop(_REQUEST_PARAM, None)
+        bound = sig.bind_partial(*args, **kwargs)
+        return response_cache.make_key(endpoint, dict(bound.arguments), _owner_group(request))
+
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _key(args, kwargs)
+            hit, value = response_cache.get(key)
+            if hit:
+                return value
+            value = await func(*args, **kwargs)
+            response_cache.put(key, value, EMPTY_TTL_S if _is_empty(value) else None)
+            return value
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _key(args, kwargs)
+            hit, value = response_cache.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            response_cache.put(key, value, EMPTY_TTL_S if _is_empty(value) else None)
+            return value
+
+    wrapper.__signature__ = sig.replace(parameters=params)
+    return wrapper
@@ -7,19 +7,18 @@ import logging
 import sqlite3
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from pathlib import Path
 
-logger = logging.getLogger(__name__)
+from app.db.pool import get_unified_connection
 
-DB_PATH = Path(__file__).parent.parent / "db" / "unified.db"
+logger = logging.getLogger(__name__)
 
 
 class UnitQueryService:
     """Service to query unit-level data for AI insights."""
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(str(DB_PATH))
+        """Get a pooled read-only unified.db connection."""
+        conn = get_unified_connection()
         conn.row_factory = sqlite3.Row
         return conn
     
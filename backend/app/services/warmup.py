@@ -0,0 +1,144 @@
+"""
+Warmup - pre-run the dashboard's hottest reads after unified.db is swapped.
+
+After /admin/upload-db installs a new unified.db (unified_pool.swap), the
+first dashboard loads would pay for a cold OS page cache, freshly opened pool
+connections and a response cache with nothing for the new generation.
+warmup.start() requests, in the background and in-process, the same GET
+endpoints smoke_test.py exercises: the portfolio ones, then the per-property
+ones for every property /api/portfolio/properties lists. cached_response keys
+include the caller's owner group and the frontend always sends its JWT, so
+the requests are made once per owner group a dashboard user can log in with,
+each carrying a token minted for that group. The responses are thrown away;
+what stays hot is the SQLite pages, the pooled connections and the
+cached_response entries users of the new generation will look up.
+
+Requests run WARMUP_CONCURRENCY at a time to leave room for live traffic, and
+a warmup stops as soon as a newer generation is swapped in.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+import httpx
+
+from app.db.pool import unified_pool
+from app.services.auth_service import USERS, create_token
+
+logger = logging.getLogger(__name__)
+
+WARMUP_CONCURRENCY = 4
+WARMUP_TIMEOUT = 60  # seconds per request
+
+# The GET endpoints smoke_test.py checks (tests/test_warmup.py keeps the two in sync)
+PORTFOLIO_ENDPOINTS = [
+    "/api/portfolio/properties",
+    "/api/portfolio/owner-groups",
+    "/api/portfolio/watchlist",
+]
+PROPERTY_ENDPOINTS = [
+    "/api/v2/properties/{property_id}/availability",
+    "/api/v2/properties/{property_id}/occupancy",
+    "/api/v2/properties/{property_id}/occupancy-forecast",
+    "/api/v2/properties/{property_id}/delinquency",
+    "/api/v2/properties/{property_id}/expirations",
+    "/api/v2/properties/{property_id}/risk-scores",
+    "/api/v2/properties/{property_id}/watchpoints",
+    "/api/v2/properties/{property_id}/pricing",
+    "/api/portfolio/units?property_ids={property_id}",
+]
+# Smoke-tested but not warmed: no unified.db reads worth warming, or a paid call
+# (AI insights: LLM; reputation: uncached, may call SerpAPI/Places)
+SKIPPED_ENDPOINTS = [
+    "/api/v2/health",
+    "/api/v2/chat/status",
+    "/api/auth/login",
+    "/api/admin/db-status",
+    "/api/v2/properties/{property_id}/ai-insights",
+    "/api/v2/properties/{property_id}/reputation",
+]
+
+
+def owner_groups() -> List[str]:
+    """Owner groups of the dashboard logins: the groups response_cache keys will carry."""
+    return sorted({user["owner_group"] for user in USERS.values()})
+
+
+def _service_headers(group: str) -> dict:
+    token = create_token({"username": "warmup", "owner_group": group, "display_name": "Warmup"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class Warmup:
+    """Runs one warmup at a time; a new swap cancels the previous run."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._last: dict = {}
+
+    def start(self, generation: int) -> asyncio.Task:
+        """Schedule a warmup of ``generation`` on the running event loop."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = asyncio.create_task(self.run(generation))
+        return self._task
+
+    async def run(self, generation: int) -> dict:
+        # Imported here: app.main imports the admin router, which imports this module
+        from app.main import app
+
+        start = time.perf_counter()
+        summary = {"generation": generation, "status": "running", "groups": 0, "properties": 0,
+                   "requests": 0, "errors": 0}
+        self._last = summary
+        semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup", timeout=WARMUP_TIMEOUT) as client:
+            async def fetch(path: str, headers: dict) -> Optional[httpx.Response]:
+                async with semaphore:
+                    if unified_pool.generation != generation:
+                        return None
+                    try:
+                        resp = await client.get(path, headers=headers)
+                    except httpx.HTTPError as e:
+                        logger.warning(f"[WARMUP] {path}: {e}")
+                        summary["errors"] += 1
+                        return None
+                summary["requests"] += 1
+                if resp.status_code >= 500:
+                    summary["errors"] += 1
+                return resp
+
+            async def warm_group(group: str):
+                headers = _service_headers(group)
+                responses = await asyncio.gather(*(fetch(path, headers) for path in PORTFOLIO_ENDPOINTS))
+                properties = responses[0]
+                ids = [p["id"] for p in properties.json()] if properties and properties.status_code == 200 else []
+                summary["groups"] += 1
+                summary["properties"] += len(ids)
+                await asyncio.gather(*(
+                    fetch(path.format(property_id=pid), headers) for pid in ids for path in PROPERTY_ENDPOINTS
+                ))
+
+            try:
+                await asyncio.gather(*(warm_group(group) for group in owner_groups()))
+            except asyncio.CancelledError:
+                summary["status"] = "cancelled"
+                raise
+
+        summary["status"] = "done" if unified_pool.generation == generation else "superseded"
+        summary["seconds"] = round(time.perf_counter() - start, 2)
+        logger.info(
+            f"[WARMUP] Generation {generation} {summary['status']}: {summary['requests']} requests "
+            f"for {summary['properties']} properties across {summary['groups']} owner groups "
+            f"in {summary['seconds']}s, {summary['errors']} errors"
+        )
+        return summary
+
+    def stats(self) -> dict:
+        return dict(self._last)
+
+
+warmup = Warmup()
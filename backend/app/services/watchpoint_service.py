@@ -1,6 +1,6 @@
 """
 Watchpoint Service - User-defined metric watchpoints for AI monitoring.
-Stores watchpoints in a JSON file per property. READ/WRITE.
+Stores watchpoints in app_state.db, one row per watchpoint. READ/WRITE.
 
 Watchpoint structure:
 {
@@ -13,35 +13,20 @@ Watchpoint structure:
     "created_at": "2026-02-14T12:00:00"
 }
 """
-import json
 import logging
+import sqlite3
 import uuid
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional
 
+from app.db import schema
+from app.db.property_kpis import AVAILABLE_METRICS
+from app.db.state_store import state_store
+
 logger = logging.getLogger(__name__)
 
-WATCHPOINTS_PATH = Path(__file__).parent.parent / "db" / "data" / "watchpoints.json"
-
-# Available metrics that can be watched
-AVAILABLE_METRICS = {
-    "occupancy_pct": {"label": "Occupancy %", "unit": "%", "direction": "higher_better"},
-    "vacant_units": {"label": "Vacant Units", "unit": "units", "direction": "lower_better"},
-    "delinquent_total": {"label": "Total Delinquent $", "unit": "$", "direction": "lower_better"},
-    "delinquent_units": {"label": "Delinquent Units", "unit": "units", "direction": "lower_better"},
-    "renewal_rate": {"label": "Renewal Rate %", "unit": "%", "direction": "higher_better"},
-    "avg_rent": {"label": "Avg In-Place Rent", "unit": "$", "direction": "higher_better"},
-    "loss_to_lease_pct": {"label": "Loss-to-Lease %", "unit": "%", "direction": "lower_better"},
-    "atr": {"label": "ATR (Units)", "unit": "units", "direction": "lower_better"},
-    "atr_pct": {"label": "ATR %", "unit": "%", "direction": "lower_better"},
-    "aged_vacancy_90": {"label": "Aged Vacancy 90+ Days", "unit": "units", "direction": "lower_better"},
-    "response_rate": {"label": "Review Response Rate %", "unit": "%", "direction": "higher_better"},
-    "overall_rating": {"label": "Overall Rating", "unit": "stars", "direction": "higher_better"},
-    "google_rating": {"label": "Google Rating", "unit": "stars", "direction": "higher_better"},
-    "on_notice_units": {"label": "Units on Notice", "unit": "units", "direction": "lower_better"},
-    "lead_to_lease": {"label": "Lead-to-Lease %", "unit": "%", "direction": "higher_better"},
-}
+# Legacy store ({property_id: [watchpoint, ...]}), imported once into the watchpoints table
+WATCHPOINTS_FILENAME = "watchpoints.json"
 
 OPERATORS = {
     "lt": "<",
@@ -52,29 +37,60 @@ OPERATORS = {
 }
 
 
-def _load_watchpoints() -> Dict[str, List[dict]]:
-    """Load all watchpoints keyed by property_id."""
-    if WATCHPOINTS_PATH.exists():
-        try:
-            return json.loads(WATCHPOINTS_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
+_COLUMNS = "id, metric, operator, threshold, label, enabled, created_at"
+
+
+def _row_to_watchpoint(row: tuple) -> dict:
+    wp_id, metric, operator, threshold, label, enabled, created_at = row
+    return {
+        "id": wp_id,
+        "metric": metric,
+        "operator": operator,
+        "threshold": threshold,
+        "label": label,
+        "enabled": bool(enabled),
+        "created_at": created_at,
+    }
+
+
+def _insert(conn: sqlite3.Connection, property_id: str, wp: dict, verb: str = "INSERT"):
+    conn.execute(
+        f"""
+        {verb} INTO watchpoints
+            (id, property_id, metric, operator, threshold, label, enabled, created_at, seq)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM watchpoints))
+        """,
+        (wp["id"], property_id, wp["metric"], wp["operator"], wp["threshold"],
+         wp.get("label"), int(wp.get("enabled", True)), wp.get("created_at")),
+    )
+
+
+def _import_watchpoints_json(conn: sqlite3.Connection, data: Dict[str, List[dict]]) -> int:
+    """watchpoints.json -> watchpoints rows. Existing ids are kept as they are (edits since win)."""
+    before = conn.total_changes
+    for property_id, wps in data.items():
+        for wp in wps:
+            _insert(conn, property_id, wp, verb="INSERT OR IGNORE")
+    return conn.total_changes - before
+
+
+state_store.register_json_source(
+    "watchpoints", lambda: schema.DB_DIR / WATCHPOINTS_FILENAME, _import_watchpoints_json,
+)
 
 
-def _save_watchpoints(data: Dict[str, List[dict]]):
-    """Save watchpoints to disk."""
-    try:
-        WATCHPOINTS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        WATCHPOINTS_PATH.write_text(json.dumps(data, indent=2))
-    except Exception as e:
-        logger.error(f"[WATCHPOINTS] Failed to save: {e}")
+def _sync():
+    """Import watchpoints.json first if it is new (the one-time migration)."""
+    state_store.sync_json("watchpoints")
 
 
 def get_watchpoints(property_id: str) -> List[dict]:
     """Get all watchpoints for a property."""
-    data = _load_watchpoints()
-    return data.get(property_id, [])
+    _sync()
+    rows = state_store.connect().execute(
+        f"SELECT {_COLUMNS} FROM watchpoints WHERE property_id = ? ORDER BY seq", (property_id,)
+    ).fetchall()
+    return [_row_to_watchpoint(r) for r in rows]
 
 
 def add_watchpoint(property_id: str, metric: str, operator: str, threshold: float, label: Optional[str] = None) -> dict:
@@ -98,33 +114,34 @@ def add_watchpoint(property_id: str, metric: str, operator: str, threshold: floa
         "created_at": datetime.now().isoformat(),
     }
 
-    data = _load_watchpoints()
-    data.setdefault(property_id, []).append(wp)
-    _save_watchpoints(data)
+    _sync()
+    with state_store.transaction() as conn:
+        _insert(conn, property_id, wp)
     return wp
 
 
 def remove_watchpoint(property_id: str, watchpoint_id: str) -> bool:
     """Remove a watchpoint by ID."""
-    data = _load_watchpoints()
-    wps = data.get(property_id, [])
-    before = len(wps)
-    data[property_id] = [w for w in wps if w["id"] != watchpoint_id]
-    if len(data[property_id]) < before:
-        _save_watchpoints(data)
-        return True
-    return False
+    _sync()
+    with state_store.transaction() as conn:
+        cursor = conn.execute(
+            "DELETE FROM watchpoints WHERE property_id = ? AND id = ?", (property_id, watchpoint_id)
+        )
+    return cursor.rowcount > 0
 
 
 def toggle_watchpoint(property_id: str, watchpoint_id: str) -> Optional[dict]:
     """Toggle a watchpoint's enabled state."""
-    data = _load_watchpoints()
-    for wp in data.get(property_id, []):
-        if wp["id"] == watchpoint_id:
-            wp["enabled"] = not wp["enabled"]
-            _save_watchpoints(data)
-            return wp
-    return None
+    _sync()
+    with state_store.transaction() as conn:
+        conn.execute(
+            "UPDATE watchpoints SET enabled = NOT enabled WHERE property_id = ? AND id = ?",
+            (property_id, watchpoint_id),
+        )
+        row = conn.execute(
+            f"SELECT {_COLUMNS} FROM watchpoints WHERE property_id = ? AND id = ?", (property_id, watchpoint_id)
+        ).fetchone()
+    return _row_to_watchpoint(row) if row else None
 
 
 def evaluate_watchpoints(property_id: str, current_metrics: Dict[str, float]) -> List[dict]:
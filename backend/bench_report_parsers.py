@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+OwnerDashV2 — Report Parser Benchmark
+=====================================
+Parse time and peak RSS per report file, reading the workbook the old way
+(pd.read_excel into DataFrames) and through the row reader (report_rows:
+openpyxl read_only / xlrd into plain row lists).
+
+Each run happens in a fresh subprocess so peak RSS (ru_maxrss) belongs to that
+one parse; "+RSS" is the growth over the interpreter with everything imported.
+The pandas run hands its DataFrames to the same parsers as row lists, so it
+slightly flatters the old path (the old parsers also paid for df.iloc per row).
+
+Usage:
+    python bench_report_parsers.py                       # samples/, sample_*.xls, downloads/*/
+    python bench_report_parsers.py downloads/4156/*.xls
+    python bench_report_parsers.py --repeat 5
+"""
+
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+import warnings
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND = Path(__file__).parent
+sys.path.insert(0, str(BACKEND))
+
+MODES = ("pandas", "rows")
+
+
+def default_files() -> list:
+    files = sorted(BACKEND.glob("samples/*.xls*")) + sorted(BACKEND.glob("sample_*.xls*"))
+    return files + sorted(BACKEND.glob("downloads/*/*.xls*"))
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def child(mode: str, path: str, repeat: int):
+    """One file, one reader; prints a JSON result line for the parent."""
+    warnings.filterwarnings("ignore")
+    import pandas as pd
+    import report_parsers
+    from report_rows import Sheet
+
+    def read_with_pandas(source):
+        frames = pd.read_excel(io.BytesIO(source), sheet_name=None, header=None)
+        return {name: Sheet(name, df.astype(object).values.tolist()) for name, df in frames.items()}
+
+    if mode == "pandas":
+        report_parsers.read_workbook = lambda source, first_only=False: read_with_pandas(source)
+
+    content = Path(path).read_bytes()
+    base = _rss_mb()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = report_parsers.parse_report(content)
+        times.append(time.perf_counter() - start)
+    print(json.dumps({
+        "report_type": result.get("report_type"), "records": len(result["records"]),
+        "error": result.get("error"), "seconds": min(times), "rss_mb": _rss_mb(), "rss_delta_mb": _rss_mb() - base,
+    }))
+
+
+def run(mode: str, path: Path, repeat: int) -> dict:
+    out = subprocess.run([sys.executable, __file__, "--child", mode, str(path), "--repeat", str(repeat)],
+                         capture_output=True, text=True, cwd=BACKEND)
+    lines = out.stdout.strip().splitlines()
+    if out.returncode or not lines:
+        return {"error": (out.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pd.read_excel vs the row reader for report parsing")
+    parser.add_argument("files", nargs="*", type=Path, help="Report files (default: the bundled samples)")
+    parser.add_argument("--repeat", type=int, default=3, help="Parses per run; the fastest is reported")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.repeat)
+        return
+
+    print("=" * 70)
+    print("  REPORT PARSER BENCHMARK")
+    print("=" * 70)
+    by_type = defaultdict(lambda: {m: {"seconds": 0.0, "rss_mb": 0.0, "rss_delta_mb": 0.0, "files": 0} for m in MODES})
+    for path in args.files or default_files():
+        results = {mode: run(mode, path, args.repeat) for mode in MODES}
+        if any(r.get("error") for r in results.values()):
+            print(f"  ⏭️  {path.name}: {results['rows'].get('error') or results['pandas'].get('error')}")
+            continue
+        if results["pandas"]["records"] != results["rows"]["records"]:
+            print(f"  ⚠️  {path.name}: record counts differ "
+                  f"({results['pandas']['records']} vs {results['rows']['records']})")
+        report_type = results["rows"]["report_type"] or "undetected"
+        print(f"  {path.name:<48s} {report_type} ({results['rows']['records']} records)")
+        for mode, r in results.items():
+            print(f"      {mode:<8s} {r['seconds'] * 1000:>8.0f} ms   peak RSS {r['rss_mb']:>6.0f} MB"
+                  f"   +RSS {r['rss_delta_mb']:>5.1f} MB")
+            totals = by_type[report_type][mode]
+            totals["seconds"] += r["seconds"]
+            totals["rss_mb"] = max(totals["rss_mb"], r["rss_mb"])
+            totals["rss_delta_mb"] = max(totals["rss_delta_mb"], r["rss_delta_mb"])
+            totals["files"] += 1
+
+    print("\n" + "-" * 70)
+    print("  Per report type: total parse time, worst peak RSS (+growth over imports)")
+    print(f"  {'Report type':<28s} {'Files':>5s} {'pandas':>9s} {'rows':>9s} {'pandas RSS':>17s} {'rows RSS':>17s}")
+    for report_type, totals in sorted(by_type.items()):
+        pd_, rows = totals["pandas"], totals["rows"]
+        print(f"  {report_type:<28s} {rows['files']:>5d} {pd_['seconds'] * 1000:>6.0f} ms {rows['seconds'] * 1000:>6.0f} ms"
+              f" {pd_['rss_mb']:>5.0f} MB (+{pd_['rss_delta_mb']:.1f})"
+              f" {rows['rss_mb']:>5.0f} MB (+{rows['rss_delta_mb']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
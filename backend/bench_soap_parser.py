@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+OwnerDashV2 — SOAP Parser Benchmark
+===================================
+Compares the whole-envelope parse (ET.fromstring + _element_to_dict, then walk
+to the record list) against the streaming record parser (app.clients.soap_stream)
+on peak memory (tracemalloc) and parse time.
+
+By default it benchmarks synthetic RealPage unitlist envelopes of increasing
+size; pass recorded envelopes (e.g. saved from the RPX gateway) to benchmark
+those instead, with the record path they contain.
+
+Usage:
+    python bench_soap_parser.py                          # Synthetic 1k / 10k / 50k units
+    python bench_soap_parser.py --units 2000 20000
+    python bench_soap_parser.py responses/unitlist.xml --path UnitList Unit
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.clients.soap_stream import element_to_dict, iter_soap_records, local_name
+
+CHUNK_SIZE = 64 * 1024  # Roughly what httpx hands over per aiter_bytes() chunk
+
+
+def synthetic_unitlist(n_units: int) -> bytes:
+    """A unitlist envelope shaped like the RPX gateway's, with n_units units."""
+    unit = """<Unit><UnitID>{n}</UnitID><UnitNumber>{n}</UnitNumber><FloorplanID>FP{f}</FloorplanID>
+<FloorplanName>B{f}</FloorplanName><Bedrooms>2</Bedrooms><Bathrooms>2</Bathrooms><RentSqFt>1050</RentSqFt>
+<MarketRent>1875.00</MarketRent><Vacant>F</Vacant><UnitMadeReadyDate>2025-01-15</UnitMadeReadyDate>
+<Address><Line1>{n} Main St</Line1><City>Austin</City><State>TX</State><Zip>78701</Zip></Address></Unit>"""
+    units = "".join(unit.format(n=n, f=n % 12) for n in range(n_units))
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>
+<unitlistResponse xmlns="http://tempuri.org/"><unitlistResult><UnitList>{units}</UnitList>
+</unitlistResult></unitlistResponse></s:Body></s:Envelope>""".encode()
+
+
+def parse_whole(payload: bytes, path: tuple) -> int:
+    """The pre-streaming path: decode, build the tree, convert all of it, then find the records."""
+    root = ET.fromstring(payload.decode())
+    parent_name, record_name = path[-2], path[-1]
+    for elem in root.iter():
+        if local_name(elem.tag) == parent_name:
+            records = element_to_dict(elem).get(record_name, [])
+            return len(records) if isinstance(records, list) else 1
+    return 0
+
+
+def parse_streaming(payload: bytes, path: tuple) -> int:
+    chunks = (payload[i:i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE))
+    return sum(1 for _ in iter_soap_records(chunks, [path]))
+
+
+def measure(fn, payload: bytes, path: tuple) -> dict:
+    """Time a clean run, then a separate traced run for peak memory (tracemalloc slows parsing down)."""
+    start = time.perf_counter()
+    count = fn(payload, path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(payload, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"records": count, "seconds": elapsed, "peak_mb": peak / 1024 / 1024}
+
+
+def report(name: str, payload: bytes, path: tuple):
+    whole = measure(parse_whole, payload, path)
+    stream = measure(parse_streaming, payload, path)
+    if whole["records"] != stream["records"]:
+        print(f"  ⚠️  {name}: record counts differ ({whole['records']} vs {stream['records']})")
+    print(f"  {name:<24s} {len(payload) / 1024 / 1024:>7.1f} MB  {stream['records']:>7d} records")
+    for label, r in (("whole envelope", whole), ("streaming", stream)):
+        print(f"      {label:<16s} {r['seconds'] * 1000:>8.0f} ms   peak {r['peak_mb']:>8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark whole-envelope vs streaming SOAP parsing")
+    parser.add_argument("files", nargs="*", type=Path, help="Recorded SOAP response envelopes")
+    parser.add_argument("--path", nargs="+", default=["UnitList", "Unit"],
+                        help="Record path (parent, record) for recorded envelopes (default UnitList Unit)")
+    parser.add_argument("--units", nargs="+", type=int, default=[1000, 10000, 50000],
+                        help="Synthetic envelope sizes, in units")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  SOAP PARSER BENCHMARK")
+    print("=" * 70)
+    if args.files:
+        for f in args.files:
+            report(f.name, f.read_bytes(), tuple(args.path))
+    else:
+        for n in args.units:
+            report(f"synthetic {n} units", synthetic_unitlist(n), ("UnitList", "Unit"))
+
+
+if __name__ == "__main__":
+    main()
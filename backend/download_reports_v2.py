@@ -1,24 +1,39 @@
 #!/usr/bin/env python3
 """Download RealPage reports for all properties.
 
-Flow:
+Flow (pipelined, see report_pipeline.py):
 1. Create report instances for all property/report combos
 2. Poll /v1/my/report-instances to get fileIds when reports are ready
 3. Download files using fileIds
-4. Import to realpage_raw.db and sync to unified.db
+4. Import to realpage_raw.db
+Each report moves through these as soon as it can, so downloads and imports
+start while other instances are still being created. Once every report is
+imported, realpage_raw.db is synced to unified.db (unless --skip-sync).
+
+Downloads are archived by content hash (report_archive.py); a report identical
+to the last one imported for its property and type is skipped (--reimport
+imports everything).
 """
 
 import json
-import time
 import io
+import multiprocessing
+import os
 import httpx
 import sqlite3
 import sys
 import warnings
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, List
+
+from report_archive import ARCHIVE_RETENTION_DAYS, archive_report, latest_imports, prune_archive
+from report_pipeline import (
+    AdaptiveThrottle, InstancePoller, ReportPipeline,
+    DEFAULT_CREATE_WORKERS, DEFAULT_DOWNLOAD_WORKERS, MIN_POLL_INTERVAL, POLL_INTERVAL, POLL_TIMEOUT,
+)
 
 warnings.filterwarnings("ignore")
 
@@ -26,8 +41,7 @@ SCRIPT_DIR = Path(__file__).parent
 DB_PATH = SCRIPT_DIR / "app/db/data/realpage_raw.db"
 BASE_URL = "https://reportingapi.realpage.com/v1"
 MAX_DATE_RETRIES = 3
-POLL_INTERVAL = 15      # seconds between polls
-POLL_MAX_ATTEMPTS = 20   # max polls (~5 minutes total)
+MAX_BOX_SCORE_OFFSET = MAX_DATE_RETRIES + 4  # box score date fallback goes back up to a week
 
 # Load token
 with open(SCRIPT_DIR / "realpage_token.json") as f:
@@ -52,6 +66,29 @@ HEADERS = {
 
 CLIENT = httpx.Client(timeout=60, verify=False)
 
+# Per-phase request pacing; starts at the old fixed sleeps and adapts to 429s/latency
+THROTTLES = {
+    "create": AdaptiveThrottle("create", initial_delay=0.5),
+    "poll": AdaptiveThrottle("poll", initial_delay=1.0),
+    "download": AdaptiveThrottle("download", initial_delay=0.3),
+}
+
+
+def _post(phase: str, url: str, payload: dict) -> httpx.Response:
+    """POST to the reporting API, paced by the phase's throttle."""
+    return THROTTLES[phase].request(lambda: CLIENT.post(url, headers=HEADERS, json=payload))
+
+CREATE_WORKERS = DEFAULT_CREATE_WORKERS
+DOWNLOAD_WORKERS = DEFAULT_DOWNLOAD_WORKERS
+# Report parsing is CPU-bound: one process per core, leaving one for the pipeline
+DEFAULT_PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PARSE_WORKERS = DEFAULT_PARSE_WORKERS
+# Import reports even when their content matches the last import (--reimport)
+REIMPORT = False
+STATS_FILE = None  # --stats-file
+# Leave the unified sync to the caller (--skip-sync; refresh_all.py runs it as its own step)
+SKIP_SYNC = False
+
 # Report types (only status=complete)
 REPORT_TYPES = {}
 for rkey, rdef in DEFINITIONS["reports"].items():
@@ -69,74 +106,36 @@ for key, prop in DEFINITIONS["properties"].items():
 
 
 # ── Poll for file IDs ────────────────────────────────────────
-def poll_my_instances(instance_ids: set, start_date: str) -> Dict[str, str]:
-    """Poll /v1/my/report-instances to get fileIds for created instances.
-    
-    Uses large pageSize and paginates to find all instances.
-    Returns dict: {instanceId -> reportFileId}
+def fetch_instances_page(start_date: str, page: int, page_size: int):
+    """One page of /v1/my/report-instances (newest first) since start_date.
+
+    Returns (items, totalCount, response bytes), or None on an API error.
+    InstancePoller decides which pages to ask for.
     """
     url = f"{BASE_URL}/my/report-instances"
-    PAGE_SIZE = 100000  # Request large page to get all instances at once
-
-    found = {}
-    for attempt in range(POLL_MAX_ATTEMPTS):
-        # Paginate through all pages each poll attempt
-        page = 1
-        seen_this_attempt = 0
-        while True:
-            body = {
-                "pageSize": PAGE_SIZE,
-                "pageNumber": page,
-                "searchText": "",
-                "reportProductList": [],
-                "reportAreaList": [],
-                "startDate": start_date,
-                "endDate": datetime.utcnow().strftime("%Y-%m-%dT23:59:59.999Z"),
-                "favorite": False,
-                "PropertiesList": [],
-                "OrderBy": "CreatedDate",
-                "OrderByDesc": True,
-            }
-            try:
-                resp = CLIENT.post(url, headers=HEADERS, json=body)
-                if resp.status_code != 200:
-                    print(f"  Poll error (page {page}): {resp.status_code} {resp.text[:200]}")
-                    break
-
-                data = resp.json()
-                items = data.get("data", [])
-                total_count = data.get("totalCount", 0)
-
-                for item in items:
-                    src_id = item.get("sourceReportInstanceId", "")
-                    file_id = item.get("reportFileId", "")
-                    status = item.get("status", 0)
-                    if src_id in instance_ids and file_id and status == 3:
-                        found[src_id] = file_id
-
-                seen_this_attempt += len(items)
-
-                # If we've seen all items or this page was short, stop paging
-                if len(items) == 0 or seen_this_attempt >= total_count or len(items) < PAGE_SIZE:
-                    break
-                page += 1
-
-            except Exception as e:
-                print(f"\n  Poll exception (page {page}): {e}")
-                break
-
-        remaining = len(instance_ids) - len(found)
-        sys.stdout.write(f"\r  Poll {attempt + 1}/{POLL_MAX_ATTEMPTS}: {len(found)}/{len(instance_ids)} ready, {remaining} pending (scanned {seen_this_attempt}/{total_count} across {page} pg)...")
-        sys.stdout.flush()
-
-        if len(found) >= len(instance_ids):
-            print(f"\r  All {len(found)} reports ready!                                        ")
-            return found
-
-        time.sleep(POLL_INTERVAL)
-
-    print(f"\n  Poll complete: {len(found)}/{len(instance_ids)} found after {POLL_MAX_ATTEMPTS} attempts")
-    return found
+    body = {
+        "pageSize": page_size,
+        "pageNumber": page,
+        "searchText": "",
+        "reportProductList": [],
+        "reportAreaList": [],
+        "startDate": start_date,
+        "endDate": datetime.utcnow().strftime("%Y-%m-%dT23:59:59.999Z"),
+        "favorite": False,
+        "PropertiesList": [],
+        "OrderBy": "CreatedDate",
+        "OrderByDesc": True,
+    }
+    try:
+        resp = _post("poll", url, body)
+        if resp.status_code != 200:
+            print(f"  Poll error (page {page}): {resp.status_code} {resp.text[:200]}")
+            return None
+        data = resp.json()
+        return data.get("data", []), data.get("totalCount", 0), len(resp.content)
+    except Exception as e:
+        print(f"  Poll exception (page {page}): {e}")
+        return None
 
 
 def download_file(file_id: str, instance_id: str, report_def: dict, property_name: str) -> Optional[bytes]:
@@ -149,7 +148,7 @@ def download_file(file_id: str, instance_id: str, report_def: dict, property_nam
         "propertyName": property_name,
     }
     try:
-        resp = CLIENT.post(url, headers=HEADERS, json=payload)
+        resp = _post("download", url, payload)
         if resp.status_code == 200 and len(resp.content) > 500:
             return resp.content
         else:
@@ -261,7 +260,7 @@ def create_instance(report_def, property_detail, date_offset=0, verbose=False, t
     payload = build_payload(report_def, property_detail, date_offset=date_offset, timeframe_tag=timeframe_tag, run_report_for=run_report_for)
 
     try:
-        resp = CLIENT.post(url, headers=HEADERS, json=payload)
+        resp = _post("create", url, payload)
         if resp.status_code in (200, 201):
             data = resp.json()
             if verbose:
@@ -277,9 +276,8 @@ def create_instance(report_def, property_detail, date_offset=0, verbose=False, t
 
 
 # ── Import ───────────────────────────────────────────────────
-def import_downloaded(downloads):
-    """Import downloaded reports into realpage_raw.db."""
-    from report_parsers import parse_report
+def load_importers() -> dict:
+    """report type -> import_reports importer."""
     from import_reports import (
         import_box_score, import_delinquency, import_rent_roll,
         import_monthly_summary, import_lease_expiration, import_activity,
@@ -290,13 +288,9 @@ def import_downloaded(downloads):
         import_move_out_reasons,
         import_lease_details,
         import_income_statement,
-        init_report_tables,
     )
 
-    conn = sqlite3.connect(DB_PATH)
-    init_report_tables(conn)
-
-    IMPORTERS = {
+    return {
         "box_score": import_box_score,
         "delinquency": import_delinquency,
         "delinquency_prepaid": import_delinquency,
@@ -317,101 +311,162 @@ def import_downloaded(downloads):
         "income_statement": import_income_statement,
     }
 
+
+def open_import_conn(check_same_thread: bool = True) -> sqlite3.Connection:
+    from import_reports import init_report_tables
+
+    # The SOAP API pull may be writing realpage_raw.db at the same time (refresh_all.py)
+    conn = sqlite3.connect(DB_PATH, timeout=60, check_same_thread=check_same_thread)
+    init_report_tables(conn)
+    return conn
+
+
+def parse_pool(workers: int = None) -> ProcessPoolExecutor:
+    """Process pool for report parsing. Spawned, not forked: the pipeline's HTTP threads are running."""
+    return ProcessPoolExecutor(max_workers=workers or PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def submit_parse(pool: ProcessPoolExecutor, dl: dict):
+    """Parse a downloaded report from memory in a worker process (only the bytes are sent over)."""
+    from report_parsers import parse_report
+    return pool.submit(parse_report, dl["content"], None, str(dl["file_id"]), dl["report_type"])
+
+
+def import_key(dl: dict) -> str:
+    """Report type as logged in realpage_report_import_log (timeframe variants are separate reports)."""
+    return f"{dl['report_type']}:{dl['timeframe_tag']}" if dl.get("timeframe_tag") else dl["report_type"]
+
+
+def load_latest_imports(conn) -> dict:
+    """Content hashes of the last imports, to skip unchanged downloads (none with --reimport)."""
+    return {} if REIMPORT else latest_imports(conn)
+
+
+def unchanged_report(dl: dict, latest: dict) -> bool:
+    """Archive the download; True when it matches the last import of its property and report type.
+
+    The matching import's log entry is left in dl["unchanged"].
+    """
+    dl["content_sha256"] = archive_report(dl["content"])
+    prev = latest.get((dl["prop_id"], import_key(dl)))
+    if prev and prev["sha256"] == dl["content_sha256"]:
+        dl["unchanged"] = prev
+        return True
+    return False
+
+
+def avoided_work(downloads) -> dict:
+    """What skipping unchanged reports saved: reports, bytes not parsed, records not re-imported."""
+    skipped = [dl for dl in downloads if dl.get("unchanged")]
+    return {
+        "reports": len(skipped),
+        "bytes": sum(len(dl["content"]) for dl in skipped),
+        "records": sum(dl["unchanged"]["records"] for dl in skipped),
+    }
+
+
+def import_report(conn, dl: dict, importers: dict) -> tuple:
+    """Import one downloaded report. Returns (type label, records imported).
+
+    Uses dl["parsed"] (from a parse worker) when present, else parses the
+    downloaded bytes here. The import is logged with the content hash.
+    """
+    from import_reports import log_import
+
+    prop = dl["prop_name"]
+    rtype = dl["report_type"]
+    prop_id = dl["prop_id"]
+    ext = ".csv" if dl.get("report_def", {}).get("download_format") == "csv" else ".xlsx"
+    file_name = f"{dl['file_id']}{ext}"
+
+    result = dl.get("parsed")
+    if result is None:
+        from report_parsers import parse_report
+        result = parse_report(dl["content"], file_id=str(dl["file_id"]), report_type_hint=rtype)
+    records = result.get("records", [])
+    parsed_type = result.get("report_type") or rtype
+    tf_label = f" [{dl['timeframe_tag']}]" if dl.get('timeframe_tag') else ''
+
+    if not records:
+        print(f"  - {prop} / {rtype}: no records parsed" + (f" ({result['error']})" if result.get("error") else ""))
+        log_import(conn, prop_id, prop, import_key(dl), None, file_name, str(dl["file_id"]), 0,
+                   'empty', result.get("error"), content_sha256=dl.get("content_sha256"))
+        return f"{parsed_type}{tf_label}", 0
+
+    for r in records:
+        r["property_id"] = prop_id
+        r["property_name"] = prop  # override with known name
+
+    importer = importers.get(parsed_type)
+    count = 0
+    if importer:
+        # advertising_source takes timeframe_tag kwarg
+        if parsed_type == 'advertising_source' and dl.get('timeframe_tag'):
+            count = importer(conn, records, file_name, str(dl["file_id"]), timeframe_tag=dl['timeframe_tag'])
+        else:
+            count = importer(conn, records, file_name, str(dl["file_id"]))
+
+    if count > 0:
+        print(f"  ✓ {prop} / {parsed_type}{tf_label}: {count} records")
+    else:
+        print(f"  ⚠ {prop} / {parsed_type}{tf_label}: 0 imported from {len(records)} parsed")
+    log_import(conn, prop_id, prop, import_key(dl), records[0].get("report_date"), file_name, str(dl["file_id"]),
+               count, 'success' if count > 0 else 'empty', content_sha256=dl.get("content_sha256"))
+    return f"{parsed_type}{tf_label}", count
+
+
+def import_downloaded(downloads, parse_workers: int = None):
+    """Import downloaded reports into realpage_raw.db.
+
+    Reports are parsed in a process pool; this process is the single SQLite
+    writer and imports each one as its parse finishes. Reports unchanged since
+    their last import are skipped.
+    """
+    conn = open_import_conn()
+    importers = load_importers()
+    latest = load_latest_imports(conn)
+
     total = 0
     results = {}
 
-    for dl in downloads:
-        if not dl.get("content"):
-            continue
-
-        prop = dl["prop_name"]
-        rtype = dl["report_type"]
-        prop_id = dl["prop_id"]
-
-        ext = ".csv" if dl.get("report_def", {}).get("download_format") == "csv" else ".xlsx"
-        temp_path = SCRIPT_DIR / f"temp_{dl['file_id']}{ext}"
-        temp_path.write_bytes(dl["content"])
-
-        try:
-            result = parse_report(str(temp_path), report_type_hint=rtype)
-            records = result.get("records", [])
-            parsed_type = result.get("report_type") or rtype
-
-            if records:
-                for r in records:
-                    r["property_id"] = prop_id
-                    r["property_name"] = prop  # override with known name
-
-                importer = IMPORTERS.get(parsed_type)
-                count = 0
-                if importer:
-                    # advertising_source takes timeframe_tag kwarg
-                    if parsed_type == 'advertising_source' and dl.get('timeframe_tag'):
-                        count = importer(conn, records, str(temp_path), str(dl["file_id"]), timeframe_tag=dl['timeframe_tag'])
-                    else:
-                        count = importer(conn, records, str(temp_path), str(dl["file_id"]))
-
-                tf_label = f" [{dl['timeframe_tag']}]" if dl.get('timeframe_tag') else ''
-                if count > 0:
-                    print(f"  ✓ {prop} / {parsed_type}{tf_label}: {count} records")
-                    total += count
-                    results.setdefault(prop, {})[f"{parsed_type}{tf_label}"] = count
-                else:
-                    print(f"  ⚠ {prop} / {parsed_type}{tf_label}: 0 imported from {len(records)} parsed")
-            else:
-                print(f"  - {prop} / {rtype}: no records parsed")
-        except Exception as e:
-            print(f"  ✗ {prop} / {rtype}: {e}")
-        finally:
-            temp_path.unlink(missing_ok=True)
+    downloads = [dl for dl in downloads if dl.get("content")]
+    changed = [dl for dl in downloads if not unchanged_report(dl, latest)]
+    if len(changed) < len(downloads):
+        avoided = avoided_work(downloads)
+        print(f"  ↺ {avoided['reports']} unchanged reports skipped ({avoided['bytes'] / 1024:.0f} KB,"
+              f" {avoided['records']} records)")
+
+    with parse_pool(parse_workers) as pool:
+        futures = {submit_parse(pool, dl): dl for dl in changed}
+        for future in as_completed(futures):
+            dl = futures[future]
+            try:
+                dl["parsed"] = future.result()
+                label, count = import_report(conn, dl, importers)
+            except Exception as e:
+                print(f"  ✗ {dl['prop_name']} / {dl['report_type']}: {e}")
+                continue
+            if count > 0:
+                total += count
+                results.setdefault(dl["prop_name"], {})[label] = count
 
     conn.close()
     return total, results
 
 
-# ── Main ─────────────────────────────────────────────────────
-def create_instances_with_fallback(needed):
-    """Create instances for all items. If create fails, retry with date stepped back.
-    
-    Date fallback is ONLY for failed creates (API rejects the date).
-    If create succeeds, the file exists — we just need to scan for it.
-    """
-    from datetime import timedelta
-    for idx, item in enumerate(needed):
-        for date_offset in range(MAX_DATE_RETRIES):
-            target = (datetime.now() - timedelta(days=date_offset)).strftime("%m/%d/%Y")
-
-            verbose = (date_offset == 0 and idx == 0)
-            response = create_instance(item["report_def"], item["prop_detail"],
-                                       date_offset=date_offset, verbose=verbose,
-                                       timeframe_tag=item.get("timeframe_tag"),
-                                       run_report_for=item.get("run_report_for"))
-            tf_label = f" [{item['timeframe_tag']}]" if item.get('timeframe_tag') else ''
-            if response:
-                item["instance_id"] = response.get("instanceId")
-                item["date_used"] = target
-                if not verbose:
-                    sys.stdout.write(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✓\n")
-                break
-            else:
-                if date_offset < MAX_DATE_RETRIES - 1:
-                    sys.stdout.write(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✗ (date {target}), retrying -1d\n")
-                    time.sleep(2)  # pause before date retry
-                else:
-                    sys.stdout.write(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✗ all dates failed\n")
-            sys.stdout.flush()
-
-        # Rate limit: 0.5s per request, 3s pause every 20
-        time.sleep(0.5)
-        if (idx + 1) % 20 == 0:
-            time.sleep(3)
-            sys.stdout.write(f"  ... ({idx + 1}/{len(needed)} created)\n")
-            sys.stdout.flush()
-
-    created = sum(1 for n in needed if n.get("instance_id"))
-    return created
+def box_score_date_error(content: bytes) -> bool:
+    """Some properties reject End_Date > their property date: the 'report' is then a short error sheet."""
+    if len(content) >= 15000:
+        return False
+    try:
+        test_df = pd.read_excel(io.BytesIO(content), sheet_name=0, header=None)
+    except Exception:
+        return False
+    full_text = ' '.join(str(x) for x in test_df.values.flatten() if pd.notna(x))
+    return 'Invalid end date' in full_text or 'Invalid start date' in full_text
 
 
+# ── Main ─────────────────────────────────────────────────────
 def main():
     total_props = len(ALL_PROPERTIES)
     total_reports = len(REPORT_TYPES)
@@ -425,7 +480,7 @@ def main():
     print("=" * 60)
     print("  REALPAGE REPORT DOWNLOADER v2 (daily fresh)")
     print(f"  {datetime.now().isoformat()}")
-    print(f"  Strategy: create → poll /my/report-instances → download")
+    print("  Strategy: create → poll /my/report-instances → download → import (pipelined)")
     print(f"  {total_props} properties × {total_reports} report types = {total_jobs} jobs")
     print(f"  Reports: {', '.join(REPORT_TYPES.keys())}")
     tf_reports = [f"{k}×{len(v.get('timeframe_variants',[]))}tf" for k,v in REPORT_TYPES.items() if v.get('timeframe_variants')]
@@ -484,169 +539,108 @@ def main():
 
     print(f"\n📊 Requesting {len(needed)} reports for {total_props} properties")
 
-    # ── Step 1: Create all instances ──────────────────────────
+    # ── Create → poll → download → import, pipelined ──────────
     start_time = datetime.utcnow().strftime("%Y-%m-%dT00:00:00.000Z")
 
     print(f"\n{'='*60}")
-    print(f"  STEP 1: CREATING REPORT INSTANCES")
-    print(f"{'='*60}")
-
-    created = create_instances_with_fallback(needed)
-    print(f"\n  Created {created}/{len(needed)} instances")
-
-    if created == 0:
-        print("❌ Token may be expired. Get a fresh one from the UI.")
-        CLIENT.close()
-        return
-
-    # ── Step 2: Poll for file IDs ────────────────────────────
-    instance_lookup = {}  # instanceId -> needed item
-    for item in needed:
-        if item.get("instance_id"):
-            instance_lookup[item["instance_id"]] = item
-
-    print(f"\n{'='*60}")
-    print(f"  STEP 2: POLLING FOR FILE IDs ({len(instance_lookup)} instances)")
-    print(f"{'='*60}")
-
-    file_map = poll_my_instances(set(instance_lookup.keys()), start_time)
-
-    # Assign file IDs back to needed items
-    for inst_id, file_id in file_map.items():
-        if inst_id in instance_lookup:
-            instance_lookup[inst_id]["file_id"] = file_id
-
-    # ── Step 3: Download files ───────────────────────────────
-    with_file_id = [n for n in needed if n.get("file_id")]
-    print(f"\n{'='*60}")
-    print(f"  STEP 3: DOWNLOADING {len(with_file_id)} FILES")
+    print("  STEPS 1-4: CREATE → POLL → DOWNLOAD → IMPORT")
+    print(f"  ({CREATE_WORKERS} create / {DOWNLOAD_WORKERS} download / {PARSE_WORKERS} parse workers,"
+          f" polling every {MIN_POLL_INTERVAL}-{POLL_INTERVAL}s)")
     print(f"{'='*60}")
 
-    for idx, item in enumerate(with_file_id):
-        sys.stdout.write(f"\r  Downloading {idx + 1}/{len(with_file_id)}: {item['prop_name']} / {item['report_type']}...")
-        sys.stdout.flush()
+    conn = open_import_conn(check_same_thread=False)  # Only the pipeline's writer thread uses it
+    importers = load_importers()
+    latest = load_latest_imports(conn)  # Read once: download threads only look it up
+    total = 0
+    results = {}
 
-        content = download_file(
+    def _import(item):
+        nonlocal total
+        label, count = import_report(conn, item, importers)
+        if count > 0:
+            total += count
+            results.setdefault(item["prop_name"], {})[label] = count
+        return count
+
+    def _create(item, date_offset):
+        response = create_instance(item["report_def"], item["prop_detail"],
+                                   date_offset=date_offset,
+                                   timeframe_tag=item.get("timeframe_tag"),
+                                   run_report_for=item.get("run_report_for"))
+        return response.get("instanceId") if response else None
+
+    def _download(item):
+        return download_file(
             file_id=item["file_id"],
             instance_id=item["instance_id"],
             report_def=item["report_def"],
             property_name=item["prop_name"],
         )
-        if content:
-            item["content"] = content
-        else:
-            print(f"\n    ✗ Failed to download file {item['file_id']}")
-
-        # Rate limit downloads
-        time.sleep(0.3)
-
-    downloaded = sum(1 for n in needed if n.get("content"))
-    print(f"\n  Downloaded {downloaded}/{len(with_file_id)} files")
-
-    # ── Step 3b: Retry box_score reports with date errors ────
-    # Some properties reject End_Date > their property date.
-    # Detect error content and retry with stepped-back dates.
-    box_score_retries = []
-    for item in needed:
-        if item.get("content") and item["report_type"] == "box_score":
-            if len(item["content"]) < 15000:
-                try:
-                    test_df = pd.read_excel(io.BytesIO(item["content"]), sheet_name=0, header=None)
-                    full_text = ' '.join(str(x) for x in test_df.values.flatten() if pd.notna(x))
-                    if 'Invalid end date' in full_text or 'Invalid start date' in full_text:
-                        box_score_retries.append(item)
-                        item["content"] = None  # clear bad content
-                except Exception:
-                    pass
-
-    if box_score_retries:
-        print(f"\n{'='*60}")
-        print(f"  STEP 3b: RETRYING {len(box_score_retries)} BOX SCORE REPORTS (date fallback)")
-        print(f"{'='*60}")
-
-        for date_offset in range(2, MAX_DATE_RETRIES + 5):
-            if not box_score_retries:
-                break
-
-            retry_start = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-            still_failing = []
-
-            for item in box_score_retries:
-                resp = create_instance(item["report_def"], item["prop_detail"],
-                                       date_offset=date_offset)
-                if resp:
-                    item["instance_id"] = resp.get("instanceId")
-                    sys.stdout.write(f"  {item['prop_name']} / box_score (offset -{date_offset}d)... ✓\n")
-                else:
-                    sys.stdout.write(f"  {item['prop_name']} / box_score (offset -{date_offset}d)... ✗\n")
-                sys.stdout.flush()
-                time.sleep(0.5)
-
-            # Poll for the new instances
-            retry_ids = {item["instance_id"] for item in box_score_retries if item.get("instance_id")}
-            if retry_ids:
-                retry_map = poll_my_instances(retry_ids, retry_start)
-                for item in box_score_retries:
-                    iid = item.get("instance_id")
-                    if iid and iid in retry_map:
-                        item["file_id"] = retry_map[iid]
-
-            # Download and check for errors
-            for item in box_score_retries:
-                if not item.get("file_id"):
-                    still_failing.append(item)
-                    continue
-                content = download_file(
-                    file_id=item["file_id"],
-                    instance_id=item["instance_id"],
-                    report_def=item["report_def"],
-                    property_name=item["prop_name"],
-                )
-                if content and len(content) > 15000:
-                    item["content"] = content
-                    print(f"  ✓ {item['prop_name']} box_score OK with offset -{date_offset}d")
-                elif content:
-                    # Check if still an error
-                    try:
-                        test_df = pd.read_excel(io.BytesIO(content), sheet_name=0, header=None)
-                        full_text = ' '.join(str(x) for x in test_df.values.flatten() if pd.notna(x))
-                        if 'Invalid' in full_text:
-                            still_failing.append(item)
-                            item["content"] = None
-                        else:
-                            item["content"] = content
-                            print(f"  ✓ {item['prop_name']} box_score OK with offset -{date_offset}d")
-                    except Exception:
-                        still_failing.append(item)
-                else:
-                    still_failing.append(item)
-                time.sleep(0.3)
-
-            box_score_retries = still_failing
-            if box_score_retries:
-                print(f"  Still {len(box_score_retries)} failing, trying offset -{date_offset + 1}d...")
-
-        if box_score_retries:
-            print(f"  ⚠ {len(box_score_retries)} box_score reports still failing after all date retries")
-
-    # ── Step 4: Import ───────────────────────────────────────
-    with_content = [n for n in needed if n.get("content")]
-    if with_content:
-        print(f"\n{'='*60}")
-        print(f"  STEP 4: IMPORTING {len(with_content)} REPORTS")
-        print(f"{'='*60}")
-        total, results = import_downloaded(with_content)
-
-        print(f"\n{'='*60}")
-        print("  STEP 5: SYNCING TO unified.db")
-        print(f"{'='*60}")
-        import subprocess
-        subprocess.run([sys.executable, "-m", "app.db.sync_realpage_to_unified"], cwd=str(SCRIPT_DIR))
+
+    poller = InstancePoller(fetch_instances_page, since=start_time)
+    parsers = parse_pool()
+    pipeline = ReportPipeline(
+        create=_create,
+        scan=poller.scan,
+        download=_download,
+        parse=lambda item: submit_parse(parsers, item),
+        unchanged=lambda item: unchanged_report(item, latest),
+        import_item=_import,
+        check=lambda item, content: not (item["report_type"] == "box_score" and box_score_date_error(content)),
+        since=start_time,
+        poll_interval=poller.interval,
+        create_workers=CREATE_WORKERS,
+        download_workers=DOWNLOAD_WORKERS,
+        max_create_offset=MAX_DATE_RETRIES,
+        max_retry_offset=MAX_BOX_SCORE_OFFSET,
+    )
+    run = pipeline.run(needed)
+    parsers.shutdown()
+    pruned = prune_archive(conn)
+    conn.close()
+
+    stats, timings = run["stats"], run["timings"]
+    print(f"\n  Created {stats['created']}/{len(needed)} instances"
+          f" ({stats['create_failed']} failed, {stats['recreated']} re-created for date errors)")
+    traffic = poller.traffic
+    print(f"  Ready {stats['ready']} ({stats['timed_out']} timed out after {POLL_TIMEOUT}s)")
+    print(f"  Poll traffic: {traffic['polls']} polls, {traffic['requests']} pages,"
+          f" {traffic['items']} items, {traffic['bytes'] / 1024:.0f} KB")
+    avoided = avoided_work(needed)
+    print(f"  Downloaded {stats['downloaded']} ({stats['download_failed']} failed), imported {stats['imported']},"
+          f" skipped {stats['unchanged']} unchanged")
+    if avoided["reports"]:
+        print(f"  Work avoided: {avoided['bytes'] / 1024 / 1024:.1f} MB not parsed,"
+              f" {avoided['records']} records not re-imported")
+    if pruned:
+        print(f"  Report archive: pruned {pruned} files older than {ARCHIVE_RETENTION_DAYS} days")
+    if STATS_FILE:
+        STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATS_FILE.write_text(json.dumps({**stats, "records_imported": total, "avoided": avoided}, indent=2))
+    print("  Timeline: " + ", ".join(f"{k} {v:.0f}s" for k, v in timings.items()))
+    print("  Throttles: " + ", ".join(
+        f"{name} {t.requests} req / {t.throttled}×429 / {t.delay:.2f}s" for name, t in THROTTLES.items()))
+
+    if stats["created"] == 0:
+        print("❌ Token may be expired. Get a fresh one from the UI.")
+        CLIENT.close()
+        return
+
+    if stats["imported"]:
+        if not SKIP_SYNC:
+            print(f"\n{'='*60}")
+            print("  STEP 5: SYNCING TO unified.db")
+            print(f"{'='*60}")
+            import subprocess
+            subprocess.run([sys.executable, "-m", "app.db.sync_realpage_to_unified"], cwd=str(SCRIPT_DIR))
 
         print(f"\n  Total records imported: {total}")
         for prop, types in sorted(results.items()):
             details = ", ".join(f"{t}: {c}" for t, c in types.items())
             print(f"    {prop}: {details}")
+    elif stats["downloaded"]:
+        print(f"\n  ↺ Downloaded {stats['downloaded']} files, none imported"
+              f" ({stats['unchanged']} unchanged since their last import) — nothing to sync.")
     else:
         print("\n❌ No files downloaded.")
 
@@ -675,7 +669,25 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="RealPage Report Downloader v2")
     parser.add_argument("--target", nargs="+", help="Only these property IDs")
     parser.add_argument("--only-reports", nargs="+", help="Only these report types")
+    parser.add_argument("--create-workers", type=int, default=DEFAULT_CREATE_WORKERS,
+                        help=f"Concurrent report-instance creates (default {DEFAULT_CREATE_WORKERS})")
+    parser.add_argument("--download-workers", type=int, default=DEFAULT_DOWNLOAD_WORKERS,
+                        help=f"Concurrent file downloads (default {DEFAULT_DOWNLOAD_WORKERS})")
+    parser.add_argument("--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS,
+                        help=f"Report parsing processes (default {DEFAULT_PARSE_WORKERS})")
+    parser.add_argument("--reimport", action="store_true",
+                        help="Import reports even when unchanged since their last import")
+    parser.add_argument("--stats-file", type=Path,
+                        help="Write the run's pipeline stats (JSON) here, for refresh_all.py's run report")
+    parser.add_argument("--skip-sync", action="store_true",
+                        help="Skip unified DB sync after importing")
     args = parser.parse_args()
+    CREATE_WORKERS = args.create_workers
+    DOWNLOAD_WORKERS = args.download_workers
+    PARSE_WORKERS = args.parse_workers
+    REIMPORT = args.reimport
+    STATS_FILE = args.stats_file
+    SKIP_SYNC = args.skip_sync
 
     if args.target:
         ALL_PROPERTIES = {k: v for k, v in ALL_PROPERTIES.items() if k in set(args.target)}
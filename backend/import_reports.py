@@ -13,6 +13,7 @@ from datetime import datetime
 from typing import List, Dict, Any
 
 from report_parsers import parse_report, detect_report_type
+from report_archive import archive_report, latest_imports, prune_archive
 from app.db.schema import REALPAGE_DB_PATH, REALPAGE_SCHEMA
 
 # Property ID mapping from report_definitions.json
@@ -129,7 +130,8 @@ def init_report_tables(conn: sqlite3.Connection):
         import_started_at TIMESTAMP,
         import_completed_at TIMESTAMP,
         status TEXT,
-        error_message TEXT
+        error_message TEXT,
+        content_sha256 TEXT
     );
     
     CREATE INDEX IF NOT EXISTS idx_box_score_property ON realpage_box_score(property_id);
@@ -235,6 +237,14 @@ def init_report_tables(conn: sqlite3.Connection):
     """
     
     cursor.executescript(report_tables)
+    # Logs created before content hashing (report_archive) lack the column
+    log_columns = {r[1] for r in cursor.execute("PRAGMA table_info(realpage_report_import_log)").fetchall()}
+    if 'content_sha256' not in log_columns:
+        cursor.execute("ALTER TABLE realpage_report_import_log ADD COLUMN content_sha256 TEXT")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_report_import_log_latest
+        ON realpage_report_import_log(property_id, report_type, status)
+    """)
     conn.commit()
 
 
@@ -1078,25 +1088,34 @@ def import_income_statement(conn: sqlite3.Connection, records: List[Dict], file_
 
 def log_import(conn: sqlite3.Connection, property_id: str, property_name: str,
                report_type: str, report_date: str, file_name: str, file_id: str,
-               records_imported: int, status: str, error: str = None):
-    """Log import to tracking table."""
+               records_imported: int, status: str, error: str = None, content_sha256: str = None):
+    """Log import to tracking table (with the report's archive hash, see report_archive)."""
     cursor = conn.cursor()
     cursor.execute("""
         INSERT INTO realpage_report_import_log
         (property_id, property_name, report_type, report_date, file_name, file_id,
-         records_imported, import_started_at, import_completed_at, status, error_message)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         records_imported, import_started_at, import_completed_at, status, error_message, content_sha256)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         property_id, property_name, report_type, report_date, file_name, file_id,
         records_imported, datetime.now().isoformat(), datetime.now().isoformat(),
-        status, error
+        status, error, content_sha256
     ))
     conn.commit()
 
 
-def import_reports(reports_dir: str = 'reports', db_path: str = None):
+def _file_order(path: Path):
+    """Sort key: files named ``..._<file_id>.xlsx`` by file ID, then the rest by name."""
+    match = re.search(r'_(\d{7,})\.xlsx$', path.name)
+    return (0, int(match.group(1)), path.name) if match else (1, 0, path.name)
+
+
+def import_reports(reports_dir: str = 'reports', db_path: str = None, force: bool = False):
     """
     Import all reports from directory into database.
+
+    Files are archived by content hash; a file identical to the latest import
+    of its property and report type is skipped unless ``force``.
     """
     reports_path = Path(reports_dir)
     db_path = db_path or str(REALPAGE_DB_PATH)
@@ -1110,7 +1129,8 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
     print(f"Scanning {reports_path} for reports...")
     
     # Find all Excel files
-    xlsx_files = list(reports_path.glob('*.xlsx'))
+    # RealPage file IDs increase over time: import oldest first so the newest copy is what stays
+    xlsx_files = sorted(reports_path.glob('*.xlsx'), key=_file_order)
     print(f"Found {len(xlsx_files)} Excel files")
     
     stats = {
@@ -1118,8 +1138,14 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
         'delinquency': 0,
         'monthly_summary': 0,
         'unknown': 0,
-        'errors': 0
+        'errors': 0,
+        'unchanged': 0,
+        'unchanged_bytes': 0,
+        'unchanged_records': 0,
     }
+    # Latest import per (property, type). Identical bytes parse to the same property and
+    # type, so a file whose hash is one of these is unchanged without parsing it.
+    latest = {} if force else latest_imports(conn)
     
     for file_path in xlsx_files:
         file_name = file_path.name
@@ -1131,7 +1157,18 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
         print(f"\nProcessing: {file_name}")
         
         try:
-            result = parse_report(str(file_path))
+            content = file_path.read_bytes()
+            content_sha256 = archive_report(content)
+            key = next((k for k, v in latest.items() if v['sha256'] == content_sha256), None)
+            if key:
+                (property_id, report_type), prev = key, latest[key]
+                print(f"  ↺ Unchanged since file {prev['file_id']} ({property_id} / {report_type}), skipping")
+                stats['unchanged'] += 1
+                stats['unchanged_bytes'] += len(content)
+                stats['unchanged_records'] += prev['records']
+                continue
+
+            result = parse_report(content)
             report_type = result.get('report_type')
             records = result.get('records', [])
             
@@ -1177,7 +1214,8 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
             print(f"  ✓ Imported {imported} records")
             
             log_import(conn, property_id, property_name, report_type, report_date,
-                      file_name, file_id, imported, 'success')
+                      file_name, file_id, imported, 'success', content_sha256=content_sha256)
+            latest[(property_id, report_type)] = {'sha256': content_sha256, 'records': imported, 'file_id': file_id}
             
         except Exception as e:
             print(f"  ✗ Error: {e}")
@@ -1185,6 +1223,7 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
             log_import(conn, 'unknown', None, 'unknown', None,
                       file_name, file_id, 0, 'error', str(e))
     
+    pruned = prune_archive(conn)
     conn.close()
     
     print("\n" + "=" * 50)
@@ -1194,7 +1233,10 @@ def import_reports(reports_dir: str = 'reports', db_path: str = None):
     print(f"  Delinquency records:    {stats['delinquency']}")
     print(f"  Monthly Summary records: {stats['monthly_summary']}")
     print(f"  Unknown/skipped:        {stats['unknown']}")
+    print(f"  Unchanged (skipped):    {stats['unchanged']} files, "
+          f"{stats['unchanged_bytes'] / 1024:.0f} KB not parsed, {stats['unchanged_records']} records not re-imported")
     print(f"  Errors:                 {stats['errors']}")
+    print(f"  Archive pruned:         {pruned} files")
     print(f"\nDatabase: {db_path}")
     
     return stats
@@ -1252,5 +1294,5 @@ if __name__ == '__main__':
     if len(sys.argv) > 1 and sys.argv[1] == '--summary':
         show_summary()
     else:
-        import_reports()
+        import_reports(force='--force' in sys.argv)
         show_summary()
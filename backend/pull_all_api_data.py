@@ -2,20 +2,26 @@
 Pull ALL available data from RealPage SOAP API for ALL Kairoi properties.
 
 Flow:
-1. Loop through all 18 Kairoi properties
-2. For each: pull units, residents, leases, rentable items via SOAP API
-3. Store in realpage_raw.db (clearing old API data per site first)
-4. Run full sync to unified.db
+1. Fan out over all Kairoi properties × (units, residents, leases, rentable
+   items), at most --concurrency SOAP requests in flight, over one shared
+   keep-alive HTTP client
+2. A single writer task replaces each site's API rows in realpage_raw.db,
+   batching whatever results have arrived into one executemany transaction
+3. Run full sync to unified.db
 
 READ-ONLY: Only GET operations against RealPage API.
 """
 
 import asyncio
+import json
 import sqlite3
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+import httpx
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -62,237 +68,299 @@ KAIROI_PROPERTIES = {
 PMC_ID = "4248314"
 
 
-def clear_api_data_for_site(conn, site_id: str):
-    """Clear existing SOAP API data for a site (not report data)."""
-    cursor = conn.cursor()
-    # Only clear API tables, NOT report tables (box_score, rent_roll, etc.)
-    api_tables = [
-        "realpage_units",
-        "realpage_residents", 
-        "realpage_leases",
-        "realpage_rentable_items",
-    ]
-    for table in api_tables:
-        cursor.execute(f"DELETE FROM {table} WHERE site_id = ?", (site_id,))
+# Concurrent SOAP requests per run (--concurrency); one keep-alive client is shared
+DEFAULT_CONCURRENCY = 8
+
+# SOAP API tables, rewritten per site (report tables like box_score are not touched)
+API_TABLES = {
+    "units": "realpage_units",
+    "residents": "realpage_residents",
+    "leases": "realpage_leases",
+    "rentable_items": "realpage_rentable_items",
+}
+
+INSERT_SQL = {
+    "units": """
+        INSERT OR REPLACE INTO realpage_units
+        (pmc_id, site_id, unit_id, unit_number, building_name, floor,
+         floorplan_id, floorplan_name, bedrooms, bathrooms, 
+         rentable_sqft, market_rent, vacant, available, available_date,
+         made_ready_date, on_notice_for_date, extracted_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "residents": """
+        INSERT INTO realpage_residents
+        (pmc_id, site_id, resident_id, unit_id, unit_number,
+         first_name, last_name, lease_status, begin_date, end_date,
+         move_in_date, move_out_date, notice_given_date, rent,
+         extracted_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "leases": """
+        INSERT INTO realpage_leases
+        (pmc_id, site_id, lease_id, resh_id, unit_id,
+         lease_start_date, lease_end_date, lease_term, lease_term_desc,
+         rent_amount, next_lease_id, prior_lease_id, status, status_text,
+         type_code, type_text, move_in_date, sched_move_in_date,
+         applied_date, active_date, inactive_date, last_renewal_date,
+         initial_lease_date, bill_date, payment_due_date,
+         current_balance, total_paid, late_day_of_month, late_charge_pct,
+         evict, head_of_household_name, extracted_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "rentable_items": """
+        INSERT INTO realpage_rentable_items
+        (pmc_id, site_id, rid_id, item_name, item_type, description,
+         billing_amount, frequency, transaction_code_id, in_service,
+         serial_number, status, date_available, unit_id, lease_id,
+         resh_id, resident_member_id, start_date, end_date, extracted_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+
+def _unit_row(site_id: str, unit: dict, now: str) -> tuple:
+    return (
+        PMC_ID, site_id,
+        unit.get('UnitID', ''),
+        unit.get('UnitNumber', ''),
+        unit.get('BuildingName', ''),
+        unit.get('Floor', ''),
+        unit.get('FloorplanID', ''),
+        unit.get('FloorplanName', ''),
+        int(unit.get('Bedrooms', 0) or 0),
+        float(unit.get('Bathrooms', 0) or 0),
+        int(unit.get('RentableSqft', 0) or 0),
+        float(unit.get('MarketRent', 0) or 0),
+        unit.get('Vacant', 'F'),
+        unit.get('Available', 'F'),
+        unit.get('AvailableDate'),
+        unit.get('UnitMadeReadyDate'),
+        unit.get('OnNoticeForDate'),
+        now
+    )
+
+
+def _resident_row(site_id: str, res: dict, now: str) -> tuple:
+    return (
+        PMC_ID, site_id,
+        res.get('resident_id', ''),
+        res.get('unit_id', ''),
+        res.get('unit_number', ''),
+        res.get('first_name', ''),
+        res.get('last_name', ''),
+        res.get('status', ''),
+        res.get('lease_start'),
+        res.get('lease_end'),
+        res.get('move_in_date'),
+        res.get('move_out_date'),
+        res.get('notice_date'),
+        res.get('current_rent', 0),
+        now
+    )
+
+
+def _lease_row(site_id: str, lease: dict, now: str) -> tuple:
+    return (
+        PMC_ID, site_id,
+        lease.get('lease_id'),
+        lease.get('resh_id'),
+        lease.get('unit_id'),
+        lease.get('lease_start_date'),
+        lease.get('lease_end_date'),
+        lease.get('lease_term'),
+        lease.get('lease_term_desc'),
+        lease.get('rent_amount', 0),
+        lease.get('next_lease_id'),
+        lease.get('prior_lease_id'),
+        lease.get('status'),
+        lease.get('status_text'),
+        lease.get('type_code'),
+        lease.get('type_text'),
+        lease.get('move_in_date'),
+        lease.get('sched_move_in_date'),
+        lease.get('applied_date'),
+        lease.get('active_date'),
+        lease.get('inactive_date'),
+        lease.get('last_renewal_date'),
+        lease.get('initial_lease_date'),
+        lease.get('bill_date'),
+        lease.get('payment_due_date'),
+        lease.get('current_balance', 0),
+        lease.get('total_paid', 0),
+        lease.get('late_day_of_month'),
+        lease.get('late_charge_pct', 0),
+        lease.get('evict'),
+        lease.get('head_of_household_name'),
+        now
+    )
+
+
+def _rentable_item_row(site_id: str, item: dict, now: str) -> tuple:
+    return (
+        PMC_ID, site_id,
+        item.get('rid_id'),
+        item.get('item_name'),
+        item.get('item_type'),
+        item.get('description'),
+        item.get('billing_amount', 0),
+        item.get('frequency'),
+        item.get('transaction_code_id'),
+        item.get('in_service'),
+        item.get('serial_number'),
+        item.get('status'),
+        item.get('date_available'),
+        item.get('unit_id'),
+        item.get('lease_id'),
+        item.get('resh_id'),
+        item.get('resident_member_id'),
+        item.get('start_date'),
+        item.get('end_date'),
+        now
+    )
+
+
+# endpoint -> (label, client record stream, row builder)
+ENDPOINTS = {
+    "units":          ("Units",          lambda c, s: c.iter_units_raw(s),              _unit_row),
+    "residents":      ("Residents",      lambda c, s: c.iter_residents(s, status="all"), _resident_row),
+    "leases":         ("Leases",         lambda c, s: c.iter_leases_raw(s),             _lease_row),
+    "rentable_items": ("Rentable Items", lambda c, s: c.iter_rentable_items(s),         _rentable_item_row),
+}
+
+
+def _write_batches(conn, batches: list) -> None:
+    """Replace each (site, endpoint) batch's rows in one transaction."""
+    for site_id, endpoint, rows in batches:
+        conn.execute(f"DELETE FROM {API_TABLES[endpoint]} WHERE site_id = ?", (site_id,))
+        if rows:
+            conn.executemany(INSERT_SQL[endpoint], rows)
     conn.commit()
 
 
-async def pull_property(conn, site_id: str, prop_name: str):
-    """Pull all SOAP API data for a single property."""
+async def _writer(conn, queue: asyncio.Queue) -> int:
+    """
+    Single writer for realpage_raw.db: drains whatever batches are queued and
+    writes them together (off the event loop), until it receives None.
+    """
+    written = 0
+    done = False
+    while not done:
+        batches = [await queue.get()]
+        while not queue.empty():
+            batches.append(queue.get_nowait())
+        if None in batches:
+            done = True
+            batches = [b for b in batches if b is not None]
+        if batches:
+            await asyncio.to_thread(_write_batches, conn, batches)
+            written += sum(len(rows) for _, _, rows in batches)
+    return written
+
+
+async def pull_property(site_id: str, prop_name: str, queue: asyncio.Queue,
+                        semaphore: asyncio.Semaphore, http: httpx.AsyncClient = None):
+    """Pull all SOAP API data for a single property (endpoints fetched concurrently)."""
     settings = get_settings()
     client = RealPageClient(
         url=settings.realpage_url,
         pmcid=PMC_ID,
         siteid=site_id,
         licensekey=settings.realpage_licensekey,
+        http_client=http,
     )
     
     if not client.url or not client.licensekey:
-        print(f"  ❌ RealPage credentials not configured")
+        print(f"  ❌ [{prop_name}] RealPage credentials not configured")
         return {"units": 0, "residents": 0, "leases": 0, "rentable_items": 0, "error": "No credentials"}
     
-    cursor = conn.cursor()
-    results = {"units": 0, "residents": 0, "leases": 0, "rentable_items": 0}
-    
-    # 1. Units
-    try:
-        units = await client.get_units_raw(site_id)
-        for unit in units:
-            cursor.execute("""
-                INSERT OR REPLACE INTO realpage_units
-                (pmc_id, site_id, unit_id, unit_number, building_name, floor,
-                 floorplan_id, floorplan_name, bedrooms, bathrooms, 
-                 rentable_sqft, market_rent, vacant, available, available_date,
-                 made_ready_date, on_notice_for_date, extracted_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                PMC_ID, site_id,
-                unit.get('UnitID', ''),
-                unit.get('UnitNumber', ''),
-                unit.get('BuildingName', ''),
-                unit.get('Floor', ''),
-                unit.get('FloorplanID', ''),
-                unit.get('FloorplanName', ''),
-                int(unit.get('Bedrooms', 0) or 0),
-                float(unit.get('Bathrooms', 0) or 0),
-                int(unit.get('RentableSqft', 0) or 0),
-                float(unit.get('MarketRent', 0) or 0),
-                unit.get('Vacant', 'F'),
-                unit.get('Available', 'F'),
-                unit.get('AvailableDate'),
-                unit.get('UnitMadeReadyDate'),
-                unit.get('OnNoticeForDate'),
-                datetime.now().isoformat()
-            ))
-        results["units"] = len(units)
-        print(f"    Units: {len(units)}")
-    except Exception as e:
-        print(f"    Units: ❌ {e}")
-    
-    # 2. Residents
-    try:
-        residents = await client.get_residents(site_id, status="all")
-        for res in residents:
-            cursor.execute("""
-                INSERT INTO realpage_residents
-                (pmc_id, site_id, resident_id, unit_id, unit_number,
-                 first_name, last_name, lease_status, begin_date, end_date,
-                 move_in_date, move_out_date, notice_given_date, rent,
-                 extracted_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                PMC_ID, site_id,
-                res.get('resident_id', ''),
-                res.get('unit_id', ''),
-                res.get('unit_number', ''),
-                res.get('first_name', ''),
-                res.get('last_name', ''),
-                res.get('status', ''),
-                res.get('lease_start'),
-                res.get('lease_end'),
-                res.get('move_in_date'),
-                res.get('move_out_date'),
-                res.get('notice_date'),
-                res.get('current_rent', 0),
-                datetime.now().isoformat()
-            ))
-        results["residents"] = len(residents)
-        print(f"    Residents: {len(residents)}")
-    except Exception as e:
-        print(f"    Residents: ❌ {e}")
-    
-    # 3. Leases
-    try:
-        leases = await client.get_leases_raw(site_id)
-        for lease in leases:
-            cursor.execute("""
-                INSERT INTO realpage_leases
-                (pmc_id, site_id, lease_id, resh_id, unit_id,
-                 lease_start_date, lease_end_date, lease_term, lease_term_desc,
-                 rent_amount, next_lease_id, prior_lease_id, status, status_text,
-                 type_code, type_text, move_in_date, sched_move_in_date,
-                 applied_date, active_date, inactive_date, last_renewal_date,
-                 initial_lease_date, bill_date, payment_due_date,
-                 current_balance, total_paid, late_day_of_month, late_charge_pct,
-                 evict, head_of_household_name, extracted_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                PMC_ID, site_id,
-                lease.get('lease_id'),
-                lease.get('resh_id'),
-                lease.get('unit_id'),
-                lease.get('lease_start_date'),
-                lease.get('lease_end_date'),
-                lease.get('lease_term'),
-                lease.get('lease_term_desc'),
-                lease.get('rent_amount', 0),
-                lease.get('next_lease_id'),
-                lease.get('prior_lease_id'),
-                lease.get('status'),
-                lease.get('status_text'),
-                lease.get('type_code'),
-                lease.get('type_text'),
-                lease.get('move_in_date'),
-                lease.get('sched_move_in_date'),
-                lease.get('applied_date'),
-                lease.get('active_date'),
-                lease.get('inactive_date'),
-                lease.get('last_renewal_date'),
-                lease.get('initial_lease_date'),
-                lease.get('bill_date'),
-                lease.get('payment_due_date'),
-                lease.get('current_balance', 0),
-                lease.get('total_paid', 0),
-                lease.get('late_day_of_month'),
-                lease.get('late_charge_pct', 0),
-                lease.get('evict'),
-                lease.get('head_of_household_name'),
-                datetime.now().isoformat()
-            ))
-        results["leases"] = len(leases)
-        print(f"    Leases: {len(leases)}")
-    except Exception as e:
-        print(f"    Leases: ❌ {e}")
+    failed = []
     
-    # 4. Rentable Items
-    try:
-        items = await client.get_rentable_items(site_id)
-        for item in items:
-            cursor.execute("""
-                INSERT INTO realpage_rentable_items
-                (pmc_id, site_id, rid_id, item_name, item_type, description,
-                 billing_amount, frequency, transaction_code_id, in_service,
-                 serial_number, status, date_available, unit_id, lease_id,
-                 resh_id, resident_member_id, start_date, end_date, extracted_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                PMC_ID, site_id,
-                item.get('rid_id'),
-                item.get('item_name'),
-                item.get('item_type'),
-                item.get('description'),
-                item.get('billing_amount', 0),
-                item.get('frequency'),
-                item.get('transaction_code_id'),
-                item.get('in_service'),
-                item.get('serial_number'),
-                item.get('status'),
-                item.get('date_available'),
-                item.get('unit_id'),
-                item.get('lease_id'),
-                item.get('resh_id'),
-                item.get('resident_member_id'),
-                item.get('start_date'),
-                item.get('end_date'),
-                datetime.now().isoformat()
-            ))
-        results["rentable_items"] = len(items)
-        print(f"    Rentable Items: {len(items)}")
-    except Exception as e:
-        print(f"    Rentable Items: ❌ {e}")
+    async def _fetch(endpoint: str) -> int:
+        label, stream, to_row = ENDPOINTS[endpoint]
+        now = datetime.now().isoformat()
+        rows = []
+        try:
+            async with semaphore:
+                # Rows are built as records stream out of the response
+                async for record in stream(client, site_id):
+                    rows.append(to_row(site_id, record, now))
+        except Exception as e:
+            print(f"    [{prop_name}] {label}: ❌ {e}")
+            failed.append(f"{label}: {e}")
+            rows = []  # The site's old rows are still replaced, as before
+        else:
+            print(f"    [{prop_name}] {label}: {len(rows)}")
+        await queue.put((site_id, endpoint, rows))
+        return len(rows)
     
-    conn.commit()
-    return results
+    counts = await asyncio.gather(*(_fetch(endpoint) for endpoint in ENDPOINTS))
+    result = dict(zip(ENDPOINTS, counts))
+    if failed:
+        result["error"] = "; ".join(failed)
+    return result
 
 
-async def pull_all_properties():
-    """Pull SOAP API data for all Kairoi properties."""
+async def pull_all_properties(concurrency: int = DEFAULT_CONCURRENCY, stats_file: Path = None):
+    """
+    Pull SOAP API data for all Kairoi properties.
+    
+    Every (site, endpoint) request runs concurrently, bounded by ``concurrency``
+    and sharing one keep-alive HTTP client; a single writer task batches the
+    rows into realpage_raw.db. A property that fails is reported and does not
+    stop the others. ``stats_file`` receives each property's wall time and
+    outcome (JSON), for refresh_all.py's run report.
+    """
     print("=" * 70)
     print("RealPage SOAP API Extraction - ALL Properties")
     print("=" * 70)
     print(f"Properties to pull: {len(KAIROI_PROPERTIES)}")
     print(f"PMC ID: {PMC_ID}")
+    print(f"Concurrency: {concurrency}")
     print()
     
     # Initialize database if needed
     if not REALPAGE_DB_PATH.exists():
         init_database(REALPAGE_DB_PATH, REALPAGE_SCHEMA)
     
-    conn = sqlite3.connect(REALPAGE_DB_PATH)
+    # refresh_all.py may run other writers side by side: wait for them instead
+    # of failing with "database is locked". Only the writer task uses conn.
+    conn = sqlite3.connect(REALPAGE_DB_PATH, timeout=60, check_same_thread=False)
     
     totals = {"units": 0, "residents": 0, "leases": 0, "rentable_items": 0}
     errors = []
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limits = httpx.Limits(max_connections=max(1, concurrency), max_keepalive_connections=max(1, concurrency))
     
-    for unified_id, info in KAIROI_PROPERTIES.items():
-        site_id = info["site_id"]
-        name = info["name"]
-        
-        print(f"\n🏢 [{unified_id}] {name} (site: {site_id})")
-        
-        # Clear old API data for this site
-        clear_api_data_for_site(conn, site_id)
-        
+    async def _pull(unified_id: str, info: dict):
+        print(f"\n🏢 [{unified_id}] {info['name']} (site: {info['site_id']})")
+        started = time.time()
         try:
-            results = await pull_property(conn, site_id, name)
-            for key in totals:
-                totals[key] += results.get(key, 0)
-            if results.get("error"):
-                errors.append(f"{name}: {results['error']}")
+            result = await pull_property(info["site_id"], info["name"], queue, semaphore, http)
         except Exception as e:
-            print(f"  ❌ FAILED: {e}")
-            errors.append(f"{name}: {e}")
+            print(f"  ❌ [{unified_id}] FAILED: {e}")
+            result = {"error": str(e)}
+        result["duration"] = time.time() - started
+        return result
     
-    conn.close()
+    start = time.time()
+    writer = asyncio.create_task(_writer(conn, queue))
+    try:
+        async with httpx.AsyncClient(timeout=30.0, limits=limits) as http:
+            results = await asyncio.gather(*(
+                _pull(unified_id, info) for unified_id, info in KAIROI_PROPERTIES.items()
+            ))
+    finally:
+        await queue.put(None)
+        await writer
+        conn.close()
+    
+    for info, result in zip(KAIROI_PROPERTIES.values(), results):
+        for key in totals:
+            totals[key] += result.get(key, 0)
+        if result.get("error"):
+            errors.append(f"{info['name']}: {result['error']}")
     
     # Summary
     print("\n" + "=" * 70)
@@ -303,12 +371,20 @@ async def pull_all_properties():
     print(f"  Residents:       {totals['residents']:,}")
     print(f"  Leases:          {totals['leases']:,}")
     print(f"  Rentable Items:  {totals['rentable_items']:,}")
+    print(f"  Elapsed:         {time.time() - start:.1f}s")
     
     if errors:
         print(f"\n⚠️ Errors ({len(errors)}):")
         for err in errors:
             print(f"  - {err}")
     
+    if stats_file:
+        stats_file.parent.mkdir(parents=True, exist_ok=True)
+        stats_file.write_text(json.dumps({
+            unified_id: {"success": not result.get("error"), "duration": round(result["duration"], 2)}
+            for unified_id, result in zip(KAIROI_PROPERTIES, results)
+        }, indent=2))
+    
     print(f"\n✅ Data saved to: {REALPAGE_DB_PATH}")
     return totals
 
@@ -326,6 +402,8 @@ def run_sync():
         sync_delinquency,
         sync_units_from_rent_roll,
         sync_residents_from_rent_roll,
+        sync_iso_dates,
+        sync_property_kpis,
     )
     
     sync_properties()
@@ -334,6 +412,8 @@ def run_sync():
     sync_delinquency()
     sync_units_from_rent_roll()
     sync_residents_from_rent_roll()
+    sync_iso_dates()
+    sync_property_kpis()
     
     print("\n✅ Sync complete!")
 
@@ -344,6 +424,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Pull RealPage SOAP API data for all properties")
     parser.add_argument("--skip-sync", action="store_true", help="Skip unified DB sync after extraction")
     parser.add_argument("--only", type=str, help="Only pull for specific property (unified_id)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Concurrent SOAP requests (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--stats-file", type=Path,
+                        help="Write each property's pull time and outcome (JSON) here, for refresh_all.py's run report")
     args = parser.parse_args()
     
     if args.only:
@@ -351,14 +435,11 @@ if __name__ == "__main__":
             print(f"❌ Unknown property: {args.only}")
             print(f"Available: {', '.join(sorted(KAIROI_PROPERTIES.keys()))}")
             sys.exit(1)
-        # Filter to just this one
-        KAIROI_PROPERTIES_FILTERED = {args.only: KAIROI_PROPERTIES[args.only]}
-        # Monkey-patch for single property
-        import pull_all_api_data
-        pull_all_api_data.KAIROI_PROPERTIES = KAIROI_PROPERTIES_FILTERED
+        # Filter to just this one (rebinds the global pull_all_properties reads)
+        KAIROI_PROPERTIES = {args.only: KAIROI_PROPERTIES[args.only]}
     
     # Pull API data
-    asyncio.run(pull_all_properties())
+    asyncio.run(pull_all_properties(args.concurrency, args.stats_file))
     
     # Sync to unified
     if not args.skip_sync:
@@ -2,13 +2,25 @@
 """
 Push local SQLite DBs to the deployed Railway backend.
 
-Uploads unified.db and realpage_raw.db via the admin upload endpoint.
+Uploads unified.db and realpage_raw.db via the admin upload endpoints.
 Used by GitHub Actions (or manual runs) to sync data after report refresh.
 
+By default only the pages that differ from the file the server is serving
+are sent (a page-level delta, see app/db/db_delta.py); the whole file is
+uploaded when the server has no copy yet, the delta would be most of the
+file, or the server rejects it.
+
+Uploads use the chunked protocol (app/db/chunked_upload.py): zstd/gzip
+compressed chunks sent over PARALLEL_STREAMS connections, each checked by
+SHA-256 on arrival, the whole file checked before it is swapped in. A run
+interrupted by a flaky link resumes where it stopped: re-running sends only
+the chunks the server does not have yet.
+
 Usage:
     python push_to_deployed.py                    # Push both DBs
     python push_to_deployed.py --only unified     # Push only unified.db
     python push_to_deployed.py --only realpage    # Push only realpage_raw.db
+    python push_to_deployed.py --full             # Upload whole files, no deltas
     python push_to_deployed.py --dry-run          # Check status only
 
 Env vars:
@@ -16,17 +28,24 @@ Env vars:
     ADMIN_API_KEY     - Shared secret for admin endpoints
 """
 
+import hashlib
+import io
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import httpx
 from dotenv import load_dotenv
 
 SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
 load_dotenv(SCRIPT_DIR / ".env")
 
+from app.db.chunked_upload import CHUNK_SIZE, ENCODINGS, compress
+from app.db.db_delta import MAX_DELTA_RATIO, DeltaError, build_delta, checkpoint, file_manifest
+
 # Config
 RAILWAY_URL = os.environ.get("RAILWAY_API_URL", "").rstrip("/")
 ADMIN_KEY = os.environ.get("ADMIN_API_KEY", "")
@@ -38,6 +57,105 @@ DB_FILES = {
     "realpage": DB_DIR / "realpage_raw.db",
 }
 
+# Per-DB upload size and swap time for this run (printed in the summary)
+RUN_STATS = []
+
+# Chunked uploads
+PARALLEL_STREAMS = 4
+CHUNK_ATTEMPTS = 3   # per chunk, with backoff
+UPLOAD_ROUNDS = 3    # re-open the session and resend what is still missing
+
+
+class UploadIncomplete(Exception):
+    """Chunks were still missing after every round; the upload was left open, not completed."""
+
+
+class ChunkSource:
+    """A file or an in-memory buffer, read chunk by chunk from any thread."""
+
+    def __init__(self, source):
+        self.path = source if isinstance(source, Path) else None
+        self.buffer = None if self.path else memoryview(source)
+        self.size = self.path.stat().st_size if self.path else len(self.buffer)
+        digest = hashlib.sha256()
+        if self.path:
+            with open(self.path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        else:
+            digest.update(self.buffer)
+        self.sha256 = digest.hexdigest()
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self.buffer is not None:
+            return bytes(self.buffer[offset:offset + length])
+        with open(self.path, "rb") as f:
+            return os.pread(f.fileno(), length, offset)
+
+
+def send_chunked(kind: str, name: str, source, params: dict = None):
+    """
+    Upload ``source`` (a Path or bytes) through /admin/uploads.
+    Returns (final response, bytes sent), or None if the server predates the
+    chunked protocol (the caller then uses the single-request endpoint).
+    Raises UploadIncomplete if chunks are still missing after UPLOAD_ROUNDS;
+    the server keeps what it has, so the next run resumes.
+    """
+    data = ChunkSource(source)
+    headers = {"X-Admin-Key": ADMIN_KEY}
+    sent = [0]
+    failed = []
+
+    with httpx.Client(base_url=f"{RAILWAY_URL}/api/admin", headers=headers, timeout=120) as client:
+        for round_no in range(1, UPLOAD_ROUNDS + 1):
+            r = client.post("/uploads", params={
+                "kind": kind, "name": name, "size": data.size, "sha256": data.sha256,
+                "chunk_size": CHUNK_SIZE, **(params or {}),
+            })
+            if r.status_code in (404, 405):
+                return None
+            if r.status_code != 200:
+                return r, sent[0]
+            session = r.json()
+            upload_id, chunk_size = session["upload_id"], session["chunk_size"]
+            encoding = next((e for e in ENCODINGS if e in session["encodings"]), "identity")
+            received = set(session["received"])
+            missing = [o for o in range(0, data.size or 1, chunk_size) if o not in received]
+            if received and missing:
+                print(f"    Resuming: {len(received)} chunks already on the server, {len(missing)} to send")
+            if not missing:
+                break
+
+            def send(offset: int) -> bool:
+                chunk = data.read(offset, chunk_size)
+                payload = compress(chunk, encoding)
+                for attempt in range(CHUNK_ATTEMPTS):
+                    try:
+                        r = client.put(
+                            f"/uploads/{upload_id}/chunks",
+                            params={"offset": offset, "sha256": hashlib.sha256(chunk).hexdigest(),
+                                    "encoding": encoding},
+                            content=payload,
+                        )
+                        if r.status_code == 200:
+                            sent[0] += len(payload)
+                            return True
+                        print(f"    Chunk at {offset}: {r.status_code} {r.text[:120]}")
+                    except httpx.HTTPError as e:
+                        print(f"    Chunk at {offset}: {e}")
+                    time.sleep(2 ** attempt)
+                return False
+
+            with ThreadPoolExecutor(PARALLEL_STREAMS) as pool:
+                failed = [o for o, ok in zip(missing, pool.map(send, missing)) if not ok]
+            if not failed:
+                break
+            print(f"    {len(failed)} chunks failed (round {round_no}/{UPLOAD_ROUNDS})")
+
+        if failed:
+            raise UploadIncomplete(f"{len(failed)} chunks still missing after {UPLOAD_ROUNDS} rounds")
+        return client.post(f"/uploads/{upload_id}/complete", timeout=600), sent[0]
+
 
 def check_status():
     """Check deployed DB status."""
@@ -61,36 +179,137 @@ def check_status():
     return data
 
 
-def upload_db(db_type: str) -> bool:
-    """Upload a single DB file to Railway."""
+def upload_db(db_type: str, full: bool = False) -> bool:
+    """Upload a single DB to Railway: a page delta when possible, else the whole file."""
     local_path = DB_FILES.get(db_type)
     if not local_path or not local_path.exists():
         print(f"  ERROR: Local {db_type} DB not found at {local_path}")
         return False
 
-    size_mb = local_path.stat().st_size / (1024 * 1024)
+    # The main file alone must hold the whole database before it is hashed or sent
+    checkpoint(local_path)
+    if not full:
+        result = upload_db_delta(db_type, local_path)
+        if result is not None:
+            return result
+
+    size_bytes = local_path.stat().st_size
+    size_mb = size_bytes / (1024 * 1024)
     print(f"  Uploading {db_type} ({size_mb:.1f} MB)...")
 
     start = time.time()
-    with open(local_path, "rb") as f:
-        r = httpx.post(
-            f"{RAILWAY_URL}/api/admin/upload-db?db_type={db_type}",
-            headers={"X-Admin-Key": ADMIN_KEY},
-            files={"file": (local_path.name, f, "application/octet-stream")},
-            timeout=120,
-        )
+    try:
+        chunked = send_chunked("db", db_type, local_path)
+    except UploadIncomplete as e:
+        print(f"  ERROR: {e}")
+        return False
+    if chunked:
+        r, sent_bytes = chunked
+    else:
+        with open(local_path, "rb") as f:
+            r = httpx.post(
+                f"{RAILWAY_URL}/api/admin/upload-db?db_type={db_type}",
+                headers={"X-Admin-Key": ADMIN_KEY},
+                files={"file": (local_path.name, f, "application/octet-stream")},
+                timeout=120,
+            )
+        sent_bytes = size_bytes
 
     elapsed = time.time() - start
 
     if r.status_code == 200:
         data = r.json()
-        print(f"  OK: {data.get('size_mb')} MB uploaded in {elapsed:.1f}s")
+        print(f"  OK: {data.get('size_mb')} MB ({sent_bytes / (1024 * 1024):.1f} MB sent) in {elapsed:.1f}s "
+              f"(integrity check {data.get('check_seconds')}s, swap {data.get('swap_seconds')}s)")
+        _record(db_type, "full", sent_bytes, size_bytes, elapsed, data.get("swap_seconds"))
         return True
     else:
         print(f"  ERROR: {r.status_code} {r.text[:300]}")
         return False
 
 
+def upload_db_delta(db_type: str, local_path: Path):
+    """
+    Send only the pages that differ from the server's copy.
+    Returns True/False on success/failure, or None to fall back to a full upload.
+    """
+    r = httpx.get(
+        f"{RAILWAY_URL}/api/admin/db-manifest",
+        params={"db_type": db_type},
+        headers={"X-Admin-Key": ADMIN_KEY},
+        timeout=120,
+    )
+    if r.status_code != 200:
+        print(f"  No server manifest for {db_type} ({r.status_code}) — uploading the full file")
+        return None
+    remote = r.json()
+
+    local = file_manifest(local_path)
+    if local["sha256"] == remote["sha256"]:
+        print(f"  {db_type}: server already has this version ({local['sha256'][:12]}) — skipped")
+        _record(db_type, "unchanged", 0, local["size"], 0.0, None)
+        return True
+
+    delta = io.BytesIO()
+    try:
+        _, pages = build_delta(local_path, remote, delta, local)
+    except DeltaError as e:
+        print(f"  Delta not possible for {db_type}: {e} — uploading the full file")
+        return None
+    if pages > MAX_DELTA_RATIO * local["page_count"]:
+        print(f"  {db_type}: {pages}/{local['page_count']} pages changed — uploading the full file")
+        return None
+
+    delta_bytes = delta.tell()
+    delta.seek(0)
+    print(f"  Uploading {db_type} delta: {pages}/{local['page_count']} pages "
+          f"({delta_bytes / 1024:.0f} KB of {local['size'] / (1024 * 1024):.1f} MB)...")
+
+    params = {
+        "base_sha256": remote["sha256"],
+        "target_sha256": local["sha256"],
+        "page_count": local["page_count"],
+    }
+    start = time.time()
+    try:
+        chunked = send_chunked("db-delta", db_type, delta.getvalue(), params)
+    except UploadIncomplete as e:
+        # A transfer failure, not a rejected delta: a full upload would hit the same link
+        print(f"  ERROR: {e}")
+        return False
+    if chunked:
+        r, sent_bytes = chunked
+    else:
+        r = httpx.post(
+            f"{RAILWAY_URL}/api/admin/upload-db-delta",
+            params={"db_type": db_type, **params},
+            headers={"X-Admin-Key": ADMIN_KEY},
+            files={"file": (f"{local_path.name}.delta", delta, "application/octet-stream")},
+            timeout=120,
+        )
+        sent_bytes = delta_bytes
+    elapsed = time.time() - start
+
+    if r.status_code in (409, 422):
+        print(f"  Delta not applied ({r.status_code}: {r.json().get('detail')}) — uploading the full file")
+        return None
+    if r.status_code == 200:
+        data = r.json()
+        print(f"  OK: {data.get('pages_applied')} pages applied in {elapsed:.1f}s "
+              f"(apply {data.get('apply_seconds')}s, swap {data.get('swap_seconds')}s)")
+        _record(db_type, "delta", sent_bytes, local["size"], elapsed, data.get("swap_seconds"))
+        return True
+    print(f"  ERROR: {r.status_code} {r.text[:300]}")
+    return False
+
+
+def _record(db_type: str, mode: str, sent_bytes: int, file_bytes: int, seconds: float, swap_seconds):
+    RUN_STATS.append({
+        "db_type": db_type, "mode": mode, "sent_bytes": sent_bytes, "file_bytes": file_bytes,
+        "seconds": seconds, "swap_seconds": swap_seconds,
+    })
+
+
 # JSON cache files to push alongside DBs
 CACHE_FILES = [
     DB_DIR / "google_reviews_cache.json",
@@ -108,13 +327,21 @@ def upload_file(local_path: Path) -> bool:
     print(f"  Uploading {local_path.name} ({size_kb:.0f} KB)...")
 
     start = time.time()
-    with open(local_path, "rb") as f:
-        r = httpx.post(
-            f"{RAILWAY_URL}/api/admin/upload-file?filename={local_path.name}",
-            headers={"X-Admin-Key": ADMIN_KEY},
-            files={"file": (local_path.name, f, "application/octet-stream")},
-            timeout=30,
-        )
+    try:
+        chunked = send_chunked("file", local_path.name, local_path)
+    except UploadIncomplete as e:
+        print(f"  ERROR: {e}")
+        return False
+    if chunked:
+        r, _ = chunked
+    else:
+        with open(local_path, "rb") as f:
+            r = httpx.post(
+                f"{RAILWAY_URL}/api/admin/upload-file?filename={local_path.name}",
+                headers={"X-Admin-Key": ADMIN_KEY},
+                files={"file": (local_path.name, f, "application/octet-stream")},
+                timeout=30,
+            )
 
     elapsed = time.time() - start
 
@@ -135,6 +362,7 @@ def main():
         sys.exit(1)
 
     dry_run = "--dry-run" in sys.argv
+    full = "--full" in sys.argv
     only = None
     if "--only" in sys.argv:
         idx = sys.argv.index("--only")
@@ -160,7 +388,7 @@ def main():
     results = {}
 
     for db_type in targets:
-        results[db_type] = upload_db(db_type)
+        results[db_type] = upload_db(db_type, full=full)
 
     # Upload cache files
     if not only:
@@ -177,6 +405,10 @@ def main():
     for name, ok in results.items():
         status = "OK" if ok else "FAILED"
         print(f"  {name}: {status}")
+    for st in RUN_STATS:
+        swap = f"{st['swap_seconds']:.2f}s" if st["swap_seconds"] is not None else "-"
+        print(f"  {st['db_type']}: {st['mode']:<9s} sent {st['sent_bytes'] / 1024:,.0f} KB "
+              f"of {st['file_bytes'] / 1024:,.0f} KB in {st['seconds']:.1f}s, swap {swap}")
 
     # Verify
     print()
@@ -10,6 +10,20 @@ Single command to refresh ALL data sources end-to-end:
   4. Risk scores     → unified.db       (churn & delinquency predictions)
   5. Google reviews  → cache JSON       (PHH properties: Parkside, Nexus East)
 
+The steps form a dependency graph (STEP_GRAPH) rather than a fixed sequence:
+a step starts as soon as the steps it depends on have finished, so risk
+scores and reviews run alongside the RealPage pulls and only the unified
+sync waits for both pulls. Steps that write the same SQLite file declare it
+as a lock and never overlap: the API pull and the report downloads both
+write realpage_raw.db and take turns, as do the sync and risk scores on
+unified.db. The API pull runs as one process
+that fans out over every property itself (``--concurrency`` SOAP requests
+in flight over one shared client, one writer for realpage_raw.db).
+
+Every run writes a JSON report (logs/refresh_runs/) with each step's wall
+time, its per-property sub-tasks, the critical path that bounded the run, and
+the report pipeline's stats (including reports skipped as unchanged).
+
 Usage:
     python refresh_all.py                    # Run everything
     python refresh_all.py --skip api         # Skip SOAP API pull
@@ -18,17 +32,23 @@ Usage:
     python refresh_all.py --skip reviews     # Skip Google Reviews scrape
     python refresh_all.py --only reviews     # Only run reviews scrape
     python refresh_all.py --only sync        # Only run unified sync
+    python refresh_all.py --full-sync        # Rebuild unified tables instead of syncing changes
+    python refresh_all.py --concurrency 16   # Allow 16 SOAP requests in flight
 """
 
 import argparse
+import json
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
 PYTHON = sys.executable
+RUN_REPORT_DIR = SCRIPT_DIR / "logs" / "refresh_runs"
 
 # Step registry: (key, label, description)
 STEPS = [
@@ -38,16 +58,36 @@ STEPS = [
     ("risk",    "Risk Score Sync",       "Snowflake risk scores → unified.db"),
     ("reviews", "Google Reviews Scrape", "PHH property reviews + owner replies → cache"),
 ]
+STEP_LABELS = {key: label for key, label, _ in STEPS}
+
+# Dependency graph: key -> steps that must finish first, and SQLite files the
+# step writes for long stretches (steps sharing a lock never run concurrently).
+# Skipped dependencies count as satisfied, and a failed dependency does not
+# block its dependents: the sync still publishes whatever the pulls fetched,
+# as the sequential pipeline did.
+STEP_GRAPH = {
+    "api":     {"deps": (),                  "locks": ("realpage_raw.db",)},
+    "reports": {"deps": (),                  "locks": ("realpage_raw.db",)},
+    "sync":    {"deps": ("api", "reports"),  "locks": ("unified.db",)},
+    "risk":    {"deps": (),                  "locks": ("unified.db",)},
+    "reviews": {"deps": (),                  "locks": ()},
+}
+
+_print_lock = threading.Lock()
+
+
+def log(text: str = ""):
+    """Print from any step thread without interleaving partial lines."""
+    with _print_lock:
+        print(text, flush=True)
 
 
 def banner(text: str, char: str = "=", width: int = 70):
-    print(f"\n{char * width}")
-    print(f"  {text}")
-    print(f"{char * width}")
+    log(f"\n{char * width}\n  {text}\n{char * width}")
 
 
 def run_step(label: str, cmd: list, cwd: str = None, timeout: int = 600) -> dict:
-    """Run a subprocess step with live output. Returns {success, duration, output}."""
+    """Run a subprocess step with live output (prefixed with its label). Returns {success, duration, output}."""
     start = time.time()
     cwd = cwd or str(SCRIPT_DIR)
 
@@ -64,7 +104,7 @@ def run_step(label: str, cmd: list, cwd: str = None, timeout: int = 600) -> dict
         for line in proc.stdout:
             line = line.rstrip()
             lines.append(line)
-            print(f"  {line}", flush=True)
+            log(f"  [{label}] {line}")
 
         proc.wait(timeout=timeout)
         output = "\n".join(lines)
@@ -83,50 +123,80 @@ def run_step(label: str, cmd: list, cwd: str = None, timeout: int = 600) -> dict
 # Global target property IDs (set via --target CLI arg)
 _TARGET_IDS: list[str] = []
 
+# Unified sync mode (--full-sync rebuilds every table instead of syncing changed properties)
+_FULL_SYNC = False
+
+# Concurrent SOAP requests in the API pull (--concurrency; None uses the pull's default)
+_CONCURRENCY = None
+
 
 def step_api() -> dict:
-    """Step 1: Pull SOAP API data for all properties."""
+    """Step 1: Pull SOAP API data for every property in one process."""
     banner("STEP 1/5: SOAP API PULL")
-    cmd = [PYTHON, "-u", "pull_all_api_data.py"]
     if _TARGET_IDS:
         # pull_all_api_data uses --only with unified_id, not propertyId
         # Skip API pull when targeting — reports are the main data source
-        print(f"  Skipping SOAP API pull (targeting {len(_TARGET_IDS)} properties via reports)")
+        log(f"  Skipping SOAP API pull (targeting {len(_TARGET_IDS)} properties via reports)")
         return {"success": True, "duration": 0, "output": "skipped (--target mode)"}
-    print("  Pulling units, residents, leases for all Kairoi properties...")
-    return run_step("API Pull", cmd, timeout=900)
+
+    log("  Pulling units, residents, leases for all properties...")
+    stats_file = RUN_REPORT_DIR / f"api_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    # The unified sync runs once, as its own step, after every pull has finished
+    cmd = [PYTHON, "-u", "pull_all_api_data.py", "--skip-sync", "--stats-file", str(stats_file)]
+    if _CONCURRENCY:
+        cmd += ["--concurrency", str(_CONCURRENCY)]
+    result = run_step("API Pull", cmd, timeout=900)
+    # Per-property wall times and outcomes; a property that failed fails the step
+    if stats_file.exists():
+        result["subtasks"] = json.loads(stats_file.read_text())
+        stats_file.unlink()
+        failed = sorted(p for p, r in result["subtasks"].items() if not r["success"])
+        if failed:
+            result["success"] = False
+            result["output"] += f"\nfailed: {', '.join(failed)}"
+    return result
 
 
 def step_reports() -> dict:
     """Step 2: Download RealPage reports for all properties."""
     banner("STEP 2/5: REPORT DOWNLOADS")
-    cmd = [PYTHON, "-u", "download_reports_v2.py"]
+    stats_file = RUN_REPORT_DIR / f"reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    # Only the sync step writes unified.db: it runs once both pulls have finished
+    cmd = [PYTHON, "-u", "download_reports_v2.py", "--stats-file", str(stats_file), "--skip-sync"]
     if _TARGET_IDS:
         cmd += ["--target"] + _TARGET_IDS
-        print(f"  Downloading reports for {len(_TARGET_IDS)} targeted properties...")
+        log(f"  Downloading reports for {len(_TARGET_IDS)} targeted properties...")
     else:
-        print("  Downloading box_score, rent_roll, delinquency, lease_exp, projected_occ, activity...")
-    return run_step("Reports", cmd, timeout=1200)
+        log("  Downloading box_score, rent_roll, delinquency, lease_exp, projected_occ, activity...")
+    result = run_step("Reports", cmd, timeout=1200)
+    # Pipeline stats, including the parse/import work avoided for unchanged reports
+    if stats_file.exists():
+        result["details"] = json.loads(stats_file.read_text())
+        stats_file.unlink()
+    return result
 
 
 def step_sync() -> dict:
     """Step 3: Sync realpage_raw.db → unified.db."""
     banner("STEP 3/5: UNIFIED DB SYNC")
-    print("  Syncing properties, occupancy, pricing, units, residents, delinquency...")
-    return run_step("Sync", [PYTHON, "-u", "-m", "app.db.sync_realpage_to_unified"], timeout=120)
+    log("  Syncing properties, occupancy, pricing, units, residents, delinquency...")
+    cmd = [PYTHON, "-u", "-m", "app.db.sync_realpage_to_unified"]
+    if not _FULL_SYNC:
+        cmd.append("--incremental")
+    return run_step("Sync", cmd, timeout=120)
 
 
 def step_risk() -> dict:
     """Step 4: Sync risk scores from Snowflake CSV → unified.db."""
     banner("STEP 4/5: RISK SCORE SYNC")
-    print("  Loading Snowflake risk scores and writing to unified.db...")
+    log("  Loading Snowflake risk scores and writing to unified.db...")
     return run_step("Risk Scores", [PYTHON, "-u", "-m", "app.db.sync_risk_scores"], timeout=120)
 
 
 def step_reviews() -> dict:
     """Step 5: Fetch Google + Apartments.com reviews via Zembra API."""
     banner("STEP 5/5: REVIEWS (ZEMBRA API)")
-    print("  Fetching Google + Apartments.com reviews for PHH properties...")
+    log("  Fetching Google + Apartments.com reviews for PHH properties...")
     return run_step("Reviews", [PYTHON, "-u", "fetch_all_reviews.py"], timeout=300)
 
 
@@ -140,6 +210,116 @@ STEP_FNS = {
 }
 
 
+def run_graph(keys: list, graph: dict = None) -> dict:
+    """
+    Run the selected steps as their dependencies and locks allow.
+
+    Returns {key: result} where each result also carries "started"/"finished"
+    (seconds since the run began) and "waited_on" (the step whose completion
+    released it, for the critical path).
+    """
+    graph = graph or STEP_GRAPH
+    selected = set(keys)
+    results = {}
+    pending = list(keys)
+    running = {}
+    held = {}  # lock -> key holding it
+    last_released = {}  # lock -> key that last released it
+    t0 = time.time()
+
+    def _run(key):
+        started = time.time() - t0
+        try:
+            result = STEP_FNS[key]()
+        except Exception as e:
+            result = {"success": False, "duration": 0, "output": str(e)}
+        result["started"] = round(started, 2)
+        result["finished"] = round(time.time() - t0, 2)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, len(keys))) as pool:
+        while pending or running:
+            for key in list(pending):
+                node = graph[key]
+                deps = [d for d in node["deps"] if d in selected]
+                if any(d not in results for d in deps):
+                    continue
+                if any(lock in held for lock in node["locks"]):
+                    continue
+                # Remember what this step actually waited for: the latest-finishing
+                # dependency or previous holder of one of its locks
+                blockers = deps + [last_released[lock] for lock in node["locks"] if lock in last_released]
+                waited_on = max(blockers, key=lambda k: results[k]["finished"], default=None)
+                for lock in node["locks"]:
+                    held[lock] = key
+                pending.remove(key)
+                running[pool.submit(_run, key)] = (key, waited_on)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, waited_on = running.pop(future)
+                results[key] = future.result()
+                results[key]["waited_on"] = waited_on
+                for lock in graph[key]["locks"]:
+                    held.pop(lock, None)
+                    last_released[lock] = key
+                r = results[key]
+                status = "✅" if r["success"] else "❌"
+                log(f"\n  {status} {STEP_LABELS[key]}: {'done' if r['success'] else 'FAILED'} ({r['duration']:.1f}s)")
+
+    return results
+
+
+def critical_path(results: dict) -> list:
+    """Chain of steps, ending with the last to finish, in which each waited on the previous."""
+    if not results:
+        return []
+    path = [max(results, key=lambda k: results[k]["finished"])]
+    while results[path[-1]].get("waited_on"):
+        path.append(results[path[-1]]["waited_on"])
+    return path[::-1]
+
+
+def build_run_report(results: dict, start_time: datetime, end_time: datetime, args) -> dict:
+    """Machine-readable summary of a refresh: per-step timings and the critical path."""
+    path = critical_path(results)
+    steps = {}
+    for key, label, _ in STEPS:
+        if key not in results:
+            steps[key] = {"label": label, "skipped": True}
+            continue
+        r = results[key]
+        steps[key] = {
+            "label": label,
+            "skipped": False,
+            "deps": list(STEP_GRAPH[key]["deps"]),
+            "success": r["success"],
+            "started": r["started"],
+            "finished": r["finished"],
+            "duration": round(r["duration"], 2),
+            "waited_on": r.get("waited_on"),
+            "on_critical_path": key in path,
+        }
+        if "details" in r:
+            steps[key]["details"] = r["details"]
+        if "subtasks" in r:
+            steps[key]["subtasks"] = r["subtasks"]
+            slowest = max(r["subtasks"].items(), key=lambda item: item[1]["duration"], default=None)
+            steps[key]["slowest_subtask"] = slowest[0] if slowest else None
+    return {
+        "started_at": start_time.isoformat(),
+        "completed_at": end_time.isoformat(),
+        "duration": round((end_time - start_time).total_seconds(), 2),
+        "concurrency": args.concurrency,
+        "target": args.target or [],
+        "full_sync": args.full_sync,
+        "critical_path": path,
+        "critical_path_duration": results[path[-1]]["finished"] if path else 0,
+        "steps": steps,
+    }
+
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="OwnerDashV2 — Complete Data Refresh Pipeline",
@@ -148,7 +328,7 @@ def main():
 Steps:
   api      SOAP API pull (units, residents, leases)
   reports  RealPage report downloads (box_score, rent_roll, etc.)
-  sync     Sync realpage_raw.db → unified.db
+  sync     Sync realpage_raw.db → unified.db         (after api + reports)
   risk     Risk score sync (Snowflake → unified.db)
   reviews  Google Reviews scrape (PHH properties)
 """
@@ -165,10 +345,24 @@ Steps:
         "--target", nargs="+",
         help="Only refresh these RealPage property IDs (e.g. 5472172 5536211 for PHH)"
     )
+    parser.add_argument(
+        "--full-sync", action="store_true",
+        help="Rebuild every unified table instead of only properties whose reports changed"
+    )
+    parser.add_argument(
+        "--concurrency", type=int,
+        help="Concurrent SOAP requests in the API pull (default: pull_all_api_data.py's)"
+    )
+    parser.add_argument(
+        "--report", type=Path,
+        help="Write the JSON run report here (default logs/refresh_runs/refresh_<timestamp>.json)"
+    )
     args = parser.parse_args()
 
-    global _TARGET_IDS
+    global _TARGET_IDS, _FULL_SYNC, _CONCURRENCY
     _TARGET_IDS = args.target or []
+    _FULL_SYNC = args.full_sync
+    _CONCURRENCY = args.concurrency
 
     skip_set = set(args.skip or [])
     only_set = set(args.only or [])
@@ -185,27 +379,22 @@ Steps:
     # Header
     start_time = datetime.now()
     banner("OWNERDASHV2 — COMPLETE DATA REFRESH", "█")
-    print(f"  Started:  {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  Steps:    {len(steps_to_run)} of {len(STEPS)}")
+    log(f"  Started:  {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log(f"  Steps:    {len(steps_to_run)} of {len(STEPS)}")
     for key, label, desc in steps_to_run:
-        print(f"    • {label} — {desc}")
+        deps = [STEP_LABELS[d] for d in STEP_GRAPH[key]["deps"] if d in {k for k, _, _ in steps_to_run}]
+        log(f"    • {label} — {desc}" + (f" (after {', '.join(deps)})" if deps else ""))
 
     # Run steps
-    results = {}
-    for key, label, desc in steps_to_run:
-        fn = STEP_FNS[key]
-        result = fn()
-        results[key] = result
-
-        status = "✅" if result["success"] else "❌"
-        print(f"\n  {status} {label}: {'done' if result['success'] else 'FAILED'} ({result['duration']:.1f}s)")
-
-    # Skipped steps
-    skipped = [label for key, label, _ in STEPS if key not in results]
+    results = run_graph([key for key, _, _ in steps_to_run])
 
     # Final summary
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
+    report = build_run_report(results, start_time, end_time, args)
+    report_path = args.report or RUN_REPORT_DIR / f"refresh_{start_time.strftime('%Y%m%d_%H%M%S')}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2))
 
     banner("REFRESH COMPLETE", "█")
     print(f"  Duration: {duration:.0f}s ({duration/60:.1f} min)")
@@ -215,10 +404,21 @@ Steps:
         if key in results:
             r = results[key]
             icon = "✅" if r["success"] else "❌"
-            print(f"  {icon} {label:<25s} {r['duration']:>6.1f}s")
+            window = f"{r['started']:>6.1f}s → {r['finished']:>6.1f}s"
+            print(f"  {icon} {label:<25s} {r['duration']:>6.1f}s   ({window})")
         else:
             print(f"  ⏭️  {label:<25s} skipped")
 
+    avoided = results.get("reports", {}).get("details", {}).get("avoided")
+    if avoided and avoided["reports"]:
+        print(f"\n  Unchanged reports skipped: {avoided['reports']}"
+              f" ({avoided['bytes'] / 1024 / 1024:.1f} MB not parsed, {avoided['records']} records not re-imported)")
+
+    if report["critical_path"]:
+        print(f"\n  Critical path: {' → '.join(STEP_LABELS[k] for k in report['critical_path'])}"
+              f" ({report['critical_path_duration']:.0f}s)")
+    print(f"  Run report: {report_path}")
+
     failed = [label for key, label, _ in STEPS if key in results and not results[key]["success"]]
     if failed:
         print(f"\n  ⚠️  Failed steps: {', '.join(failed)}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of downloaded RealPage reports.
+
+RealPage often returns byte-identical files from one run to the next (monthly
+summaries, income statements, move-out reasons), which used to be re-parsed
+and re-inserted every time. Each report's bytes are now stored once under
+their SHA-256 (report_archive/<ab>/<abcdef...>) and the hash is recorded with
+the import in realpage_report_import_log.content_sha256.
+
+A report is skipped (no parse, no import) when its hash matches the latest
+successful import for the same property and report type. Only the latest one
+counts: if content A was replaced by B, a later A is imported again so the
+tables end up holding A's data.
+
+prune_archive() keeps the archive bounded: files older than
+ARCHIVE_RETENTION_DAYS are deleted unless they are still the latest import
+of some property and report type.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+ARCHIVE_DIR = Path(__file__).parent / "report_archive"
+ARCHIVE_RETENTION_DAYS = 30
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def archive_path(sha256: str, archive_dir: Path = None) -> Path:
+    return Path(archive_dir or ARCHIVE_DIR) / sha256[:2] / sha256
+
+
+def archive_report(content: bytes, archive_dir: Path = None) -> str:
+    """Store the report bytes under their hash (once) and return the hash."""
+    sha256 = content_hash(content)
+    path = archive_path(sha256, archive_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    return sha256
+
+
+def load_archived(sha256: str, archive_dir: Path = None) -> Optional[bytes]:
+    path = archive_path(sha256, archive_dir)
+    return path.read_bytes() if path.exists() else None
+
+
+def latest_imports(conn: sqlite3.Connection) -> Dict[Tuple[str, str], dict]:
+    """
+    (property_id, report_type) -> {"sha256", "records", "file_id"} of the latest
+    successful import that recorded a content hash.
+    """
+    rows = conn.execute("""
+        SELECT l.property_id, l.report_type, l.content_sha256, l.records_imported, l.file_id
+        FROM realpage_report_import_log l
+        JOIN (
+            SELECT property_id, report_type, MAX(id) AS id
+            FROM realpage_report_import_log
+            WHERE status = 'success'
+            GROUP BY property_id, report_type
+        ) latest ON latest.id = l.id
+        WHERE l.content_sha256 IS NOT NULL
+    """).fetchall()
+    return {
+        (pid, rtype): {"sha256": sha256, "records": records or 0, "file_id": file_id}
+        for pid, rtype, sha256, records, file_id in rows
+    }
+
+
+def prune_archive(conn: sqlite3.Connection, retention_days: int = ARCHIVE_RETENTION_DAYS,
+                  archive_dir: Path = None) -> int:
+    """Delete archived reports older than ``retention_days`` that no latest import uses. Returns files removed."""
+    root = Path(archive_dir or ARCHIVE_DIR)
+    if not root.exists():
+        return 0
+    keep = {v["sha256"] for v in latest_imports(conn).values()}
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for path in root.glob("??/*"):
+        if path.name in keep or path.name.startswith(".tmp-"):
+            continue
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
@@ -2,6 +2,11 @@
 RealPage Report Parsers
 
 Parses downloaded Excel reports and extracts structured data for database storage.
+
+Every parser accepts a file path, the downloaded bytes, or (as parse_report
+does) the already-read sheets, so parse_report reads each workbook exactly
+once and the downloader never writes temp files. Workbooks are read into
+plain row lists (report_rows) rather than DataFrames.
 """
 
 import pandas as pd
@@ -10,14 +15,40 @@ import csv
 import io
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
+
+from report_rows import Sheet, XLS_MAGIC, XLSX_MAGIC, read_first_sheet, read_workbook
+
+# A report file path, its raw bytes, or a pre-read sheet / {sheet name: sheet}
+ReportSource = Union[str, bytes, Sheet, Dict[str, Sheet]]
+
+
+def _as_file(source: ReportSource):
+    """Path as-is; bytes wrapped so pandas can read them like a file."""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _read_sheet(source: ReportSource) -> Sheet:
+    """First sheet of the workbook, header-less (pre-read sheets are passed through)."""
+    if isinstance(source, Sheet):
+        return source
+    if isinstance(source, dict):
+        return next(iter(source.values()))
+    return read_first_sheet(source)
 
 
-def detect_report_type(df: pd.DataFrame) -> Optional[str]:
+def _read_workbook(source: ReportSource) -> Dict[str, Sheet]:
+    """All sheets, header-less. The format (.xls or .xlsx) comes from the content."""
+    if isinstance(source, dict):
+        return source
+    return read_workbook(source)
+
+
+def detect_report_type(sheet: Sheet) -> Optional[str]:
     """Detect report type from content."""
     # Check first 10 rows for report identifiers
-    for i in range(min(10, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).upper()
+    for i in range(min(10, sheet.nrows)):
+        row_text = sheet.text(i).upper()
         
         if 'BOXSCORE' in row_text or 'BOX SCORE' in row_text:
             return 'box_score'
@@ -55,14 +86,14 @@ def detect_report_type(df: pd.DataFrame) -> Optional[str]:
     return None
 
 
-def extract_property_info(df: pd.DataFrame) -> Dict[str, str]:
+def extract_property_info(sheet: Sheet) -> Dict[str, str]:
     """Extract property name and report date from header rows."""
     property_name = None
     report_date = None
     fiscal_period = None
     
-    for i in range(min(15, len(df))):
-        row = df.iloc[i].dropna().tolist()
+    for i in range(min(15, sheet.nrows)):
+        row = sheet.values(i)
         row_text = ' '.join(str(x) for x in row)
         
         # Look for property name (usually contains "LLC" or management company name)
@@ -97,23 +128,23 @@ def extract_property_info(df: pd.DataFrame) -> Dict[str, str]:
     }
 
 
-def parse_box_score(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_box_score(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Box Score report.
     Returns list of floorplan-level metrics.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
     # Extract property info
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     fiscal_period = info['fiscal_period']
     
     # Find header row (contains "Floor Plan" and "Units")
     header_row = None
-    for i in range(min(20, len(df))):
-        row = df.iloc[i].dropna().tolist()
+    for i in range(min(20, sheet.nrows)):
+        row = sheet.values(i)
         row_text = ' '.join(str(x) for x in row).lower()
         if 'floor plan' in row_text and 'unit' in row_text:
             header_row = i
@@ -123,7 +154,7 @@ def parse_box_score(file_path: str, property_id: str = None) -> List[Dict[str, A
         return []
     
     # Get headers
-    headers = df.iloc[header_row].tolist()
+    headers = sheet.row(header_row)
     
     # Map column indices
     col_map = {}
@@ -168,8 +199,8 @@ def parse_box_score(file_path: str, property_id: str = None) -> List[Dict[str, A
     records = []
     current_group = None
     
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(header_row + 1, sheet.nrows):
+        row = sheet.row(i)
         
         # Skip empty rows or subtotal rows
         if pd.isna(row[col_map.get('floorplan', 1)]):
@@ -238,7 +269,7 @@ def parse_box_score(file_path: str, property_id: str = None) -> List[Dict[str, A
     return records
 
 
-def parse_delinquency(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_delinquency(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Delinquency / Delinquent and Prepaid report (reports 4260 and 4009).
     Returns list of resident balance records aggregated by unit.
@@ -258,9 +289,9 @@ def parse_delinquency(file_path: str, property_id: str = None) -> List[Dict[str,
     2. Summary format (74 cols, report 4260): Transaction-code level property summary.
        Provides property-level financial totals by transaction code, not per-unit detail.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
@@ -275,8 +306,8 @@ def parse_delinquency(file_path: str, property_id: str = None) -> List[Dict[str,
     # Detect format: detail format has column headers in early rows
     is_detail = False
     header_row = None
-    for check_row in range(min(5, len(df))):
-        row_vals = [str(x).upper() for x in df.iloc[check_row].dropna().tolist()]
+    for check_row in range(min(5, sheet.nrows)):
+        row_vals = [str(x).upper() for x in sheet.values(check_row)]
         row_text = ' '.join(row_vals)
         if 'BLDG/UNIT' in row_text or ('TOTAL PREPAID' in row_text and 'TOTAL DELINQUENT' in row_text):
             is_detail = True
@@ -284,20 +315,20 @@ def parse_delinquency(file_path: str, property_id: str = None) -> List[Dict[str,
             break
     
     if is_detail:
-        return _parse_delinquency_detail(df, header_row, property_id, property_name, report_date, safe_float)
+        return _parse_delinquency_detail(sheet, header_row, property_id, property_name, report_date, safe_float)
     else:
-        return _parse_delinquency_summary(df, property_id, property_name, report_date, safe_float)
+        return _parse_delinquency_summary(sheet, property_id, property_name, report_date, safe_float)
 
 
-def _parse_delinquency_detail(df, header_row, property_id, property_name, report_date, safe_float):
+def _parse_delinquency_detail(sheet, header_row, property_id, property_name, report_date, safe_float):
     """
     Parse detail format (report 4009, ~25 columns).
     Multiple rows per unit (one per transaction code) — aggregate by unit.
     """
     # Build column index map from header row
     col_map = {}
-    for j in range(df.shape[1]):
-        val = df.iloc[header_row, j]
+    for j in range(sheet.ncols):
+        val = sheet.cell(header_row, j)
         if pd.notna(val):
             col_map[str(val).strip().upper()] = j
     
@@ -315,15 +346,15 @@ def _parse_delinquency_detail(df, header_row, property_id, property_name, report
     COL_OUTSTANDING = col_map.get('OUTSTANDING DEPOSIT', 20)
     
     def get_val(row_idx, col_idx):
-        if col_idx < df.shape[1]:
-            return df.iloc[row_idx, col_idx]
+        if col_idx < sheet.ncols:
+            return sheet.cell(row_idx, col_idx)
         return None
     
     # Aggregate by unit number
     units = {}
     start_row = header_row + 1
     
-    for i in range(start_row, len(df)):
+    for i in range(start_row, sheet.nrows):
         unit_val = get_val(i, COL_UNIT)
         if pd.isna(unit_val):
             continue
@@ -373,7 +404,7 @@ def _parse_delinquency_detail(df, header_row, property_id, property_name, report
     return list(units.values())
 
 
-def _parse_delinquency_summary(df, property_id, property_name, report_date, safe_float):
+def _parse_delinquency_summary(sheet, property_id, property_name, report_date, safe_float):
     """
     Parse summary format (report 4260, ~74 columns).
     Transaction-code level property summary — extract property-level totals.
@@ -389,15 +420,15 @@ def _parse_delinquency_summary(df, property_id, property_name, report_date, safe
     total_delinquent = 0.0
     total_net_balance = 0.0
     
-    for i in range(len(df)):
+    for i in range(sheet.nrows):
         # Look for the totals row (has values in cols 14, 20, 31, 37 but no description in col 3)
-        desc = df.iloc[i, 3] if 3 < df.shape[1] else None
-        acct = df.iloc[i, 8] if 8 < df.shape[1] else None
+        desc = sheet.cell(i, 3) if 3 < sheet.ncols else None
+        acct = sheet.cell(i, 8) if 8 < sheet.ncols else None
         
         if pd.isna(desc) and pd.isna(acct):
-            cur_prepaid = safe_float(df.iloc[i, 20] if 20 < df.shape[1] else None)
-            cur_delinquent = safe_float(df.iloc[i, 37] if 37 < df.shape[1] else None)
-            cur_balance = safe_float(df.iloc[i, 51] if 51 < df.shape[1] else None)
+            cur_prepaid = safe_float(sheet.cell(i, 20) if 20 < sheet.ncols else None)
+            cur_delinquent = safe_float(sheet.cell(i, 37) if 37 < sheet.ncols else None)
+            cur_balance = safe_float(sheet.cell(i, 51) if 51 < sheet.ncols else None)
             
             if cur_prepaid != 0 or cur_delinquent != 0 or cur_balance != 0:
                 total_prepaid = cur_prepaid
@@ -426,21 +457,21 @@ def _parse_delinquency_summary(df, property_id, property_name, report_date, safe
     return []
 
 
-def parse_rent_roll(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_rent_roll(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Rent Roll report.
     Returns list of unit-level rent records.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
     # Find header row with Unit column
     header_row = None
-    for i in range(min(15, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(15, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'unit' in row_text and ('floorplan' in row_text or 'sqft' in row_text):
             header_row = i
             break
@@ -448,7 +479,7 @@ def parse_rent_roll(file_path: str, property_id: str = None) -> List[Dict[str, A
     if header_row is None:
         return []
     
-    headers = df.iloc[header_row].tolist()
+    headers = sheet.row(header_row)
     
     # Map columns
     col_map = {}
@@ -503,8 +534,8 @@ def parse_rent_roll(file_path: str, property_id: str = None) -> List[Dict[str, A
     
     records = []
     
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(header_row + 1, sheet.nrows):
+        row = sheet.row(i)
         
         # Check if this is a unit row (has unit number in first column)
         unit_val = row[col_map.get('unit', 0)]
@@ -577,21 +608,21 @@ def parse_rent_roll(file_path: str, property_id: str = None) -> List[Dict[str, A
     return records
 
 
-def parse_monthly_summary(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_monthly_summary(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Monthly Activity Summary report.
     Returns list of monthly metrics by floorplan.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
     # Find header row
     header_row = None
-    for i in range(min(20, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(20, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'floor' in row_text and ('move' in row_text or 'begin' in row_text):
             header_row = i
             break
@@ -599,7 +630,7 @@ def parse_monthly_summary(file_path: str, property_id: str = None) -> List[Dict[
     if header_row is None:
         return []
     
-    headers = df.iloc[header_row].tolist()
+    headers = sheet.row(header_row)
     
     col_map = {}
     for idx, h in enumerate(headers):
@@ -622,8 +653,8 @@ def parse_monthly_summary(file_path: str, property_id: str = None) -> List[Dict[
             col_map['notices'] = idx
     
     records = []
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(header_row + 1, sheet.nrows):
+        row = sheet.row(i)
         
         floorplan = row[col_map.get('floorplan', 0)]
         if pd.isna(floorplan) or 'total' in str(floorplan).lower():
@@ -652,21 +683,21 @@ def parse_monthly_summary(file_path: str, property_id: str = None) -> List[Dict[
     return records
 
 
-def parse_lease_expiration(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_lease_expiration(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Lease Expiration report.
     Returns list of upcoming lease expirations.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
     # Find header row
     header_row = None
-    for i in range(min(20, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(20, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'unit' in row_text and ('expir' in row_text or 'lease' in row_text):
             header_row = i
             break
@@ -674,7 +705,7 @@ def parse_lease_expiration(file_path: str, property_id: str = None) -> List[Dict
     if header_row is None:
         return []
     
-    headers = df.iloc[header_row].tolist()
+    headers = sheet.row(header_row)
     
     col_map = {}
     for idx, h in enumerate(headers):
@@ -699,8 +730,8 @@ def parse_lease_expiration(file_path: str, property_id: str = None) -> List[Dict
             col_map['renewal_status'] = idx
     
     records = []
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(header_row + 1, sheet.nrows):
+        row = sheet.row(i)
         
         unit = row[col_map.get('unit', 0)]
         if pd.isna(unit) or 'total' in str(unit).lower():
@@ -736,21 +767,21 @@ def parse_lease_expiration(file_path: str, property_id: str = None) -> List[Dict
     return records
 
 
-def parse_activity(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_activity(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Activity Report.
     Returns list of leasing activity events.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
     # Find header row
     header_row = None
-    for i in range(min(20, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(20, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'date' in row_text and ('activity' in row_text or 'type' in row_text):
             header_row = i
             break
@@ -758,7 +789,7 @@ def parse_activity(file_path: str, property_id: str = None) -> List[Dict[str, An
     if header_row is None:
         return []
     
-    headers = df.iloc[header_row].tolist()
+    headers = sheet.row(header_row)
     
     col_map = {}
     for idx, h in enumerate(headers):
@@ -783,8 +814,8 @@ def parse_activity(file_path: str, property_id: str = None) -> List[Dict[str, An
             col_map['lease_term'] = idx
     
     records = []
-    for i in range(header_row + 1, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(header_row + 1, sheet.nrows):
+        row = sheet.row(i)
         
         activity_date = row[col_map.get('activity_date', 0)]
         if pd.isna(activity_date):
@@ -820,7 +851,7 @@ def parse_activity(file_path: str, property_id: str = None) -> List[Dict[str, An
     return records
 
 
-def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_projected_occupancy(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Projected Occupancy report (report 3842).
     
@@ -836,22 +867,22 @@ def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[D
     Total Units found in header area: row with "Total Units:" has the count in the next column.
     Header row is the one containing "Week" + "Ending".
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     
     # Extract total units from header area (row with "Total Units:" → value in next col)
     total_units = 0
-    for i in range(min(20, len(df))):
-        for j in range(min(5, df.shape[1])):
-            val = df.iloc[i, j]
+    for i in range(min(20, sheet.nrows)):
+        for j in range(min(5, sheet.ncols)):
+            val = sheet.cell(i, j)
             if pd.notna(val) and 'total units' in str(val).lower():
                 # The number is in the next column
-                if j + 1 < df.shape[1] and pd.notna(df.iloc[i, j + 1]):
+                if j + 1 < sheet.ncols and pd.notna(sheet.cell(i, j + 1)):
                     try:
-                        total_units = int(float(df.iloc[i, j + 1]))
+                        total_units = int(float(sheet.cell(i, j + 1)))
                     except (ValueError, TypeError):
                         pass
                 break
@@ -860,8 +891,8 @@ def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[D
     
     # Find header row containing "Week" + "Ending"
     header_row = None
-    for i in range(min(20, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(20, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'week' in row_text and 'end' in row_text:
             header_row = i
             break
@@ -872,9 +903,9 @@ def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[D
     # Map columns by scanning header row(s) for known labels
     # The report uses multi-row headers with merged cells, so scan rows header_row-2..header_row+2
     col_map = {}
-    for scan_row in range(max(0, header_row - 2), min(len(df), header_row + 3)):
-        for j in range(df.shape[1]):
-            val = df.iloc[scan_row, j]
+    for scan_row in range(max(0, header_row - 2), min(sheet.nrows, header_row + 3)):
+        for j in range(sheet.ncols):
+            val = sheet.cell(scan_row, j)
             if pd.isna(val):
                 continue
             h = str(val).replace('\n', ' ').replace('\r', '').strip().lower()
@@ -926,8 +957,8 @@ def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[D
     data_start = header_row + 1
     
     records = []
-    for i in range(data_start, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(data_start, sheet.nrows):
+        row = sheet.row(i)
         
         week_ending = safe_str(row[col_map['week_ending']])
         if not week_ending:
@@ -959,7 +990,7 @@ def parse_projected_occupancy(file_path: str, property_id: str = None) -> List[D
     return records
 
 
-def parse_lease_expiration_renewal(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_lease_expiration_renewal(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Lease Expiration Renewal Detail report (Report 4156).
     .xls format (old Compound Document), needs engine='xlrd'.
@@ -971,11 +1002,7 @@ def parse_lease_expiration_renewal(file_path: str, property_id: str = None) -> L
     """
     from datetime import datetime
     
-    try:
-        sheets = pd.read_excel(file_path, sheet_name=None, engine='xlrd', header=None)
-    except Exception:
-        # May be .xlsx format
-        sheets = pd.read_excel(file_path, sheet_name=None, header=None)
+    sheets = _read_workbook(file_path)
     
     report_date = datetime.now().strftime('%Y-%m-%d')
     records = []
@@ -1009,23 +1036,23 @@ def parse_lease_expiration_renewal(file_path: str, property_id: str = None) -> L
     
     # --- Parse Lease Expiration Detail sheet ---
     exp_sheet = None
-    for name, df in sheets.items():
+    for name, sheet in sheets.items():
         if 'expiration' in name.lower() and 'detail' in name.lower():
-            exp_sheet = df
+            exp_sheet = sheet
             break
     
     if exp_sheet is not None:
         # Find header row (contains 'Bldg/Unit')
         header_row = None
         for i in range(min(10, len(exp_sheet))):
-            row_vals = [str(v).strip() for v in exp_sheet.iloc[i].tolist() if pd.notna(v)]
+            row_vals = [str(v).strip() for v in exp_sheet.row(i) if pd.notna(v)]
             if any('bldg' in v.lower() or 'unit' in v.lower() for v in row_vals):
                 header_row = i
                 break
         
         if header_row is not None:
             for i in range(header_row + 1, len(exp_sheet)):
-                row = exp_sheet.iloc[i].tolist()
+                row = exp_sheet.row(i)
                 unit = row[0] if len(row) > 0 else None
                 if pd.isna(unit) or str(unit).strip() == '' or 'total' in str(unit).lower():
                     continue
@@ -1053,22 +1080,22 @@ def parse_lease_expiration_renewal(file_path: str, property_id: str = None) -> L
     
     # --- Parse Summary by Floorplan sheet ---
     summary_sheet = None
-    for name, df in sheets.items():
+    for name, sheet in sheets.items():
         if 'summary' in name.lower() and 'floorplan' in name.lower():
-            summary_sheet = df
+            summary_sheet = sheet
             break
     
     if summary_sheet is not None:
         header_row = None
         for i in range(min(10, len(summary_sheet))):
-            row_vals = [str(v).strip().lower() for v in summary_sheet.iloc[i].tolist() if pd.notna(v)]
+            row_vals = [str(v).strip().lower() for v in summary_sheet.row(i) if pd.notna(v)]
             if any('floor' in v for v in row_vals):
                 header_row = i
                 break
         
         if header_row is not None:
             for i in range(header_row + 1, len(summary_sheet)):
-                row = summary_sheet.iloc[i].tolist()
+                row = summary_sheet.row(i)
                 fp = row[0] if len(row) > 0 else None
                 if pd.isna(fp) or str(fp).strip() == '' or 'total' in str(fp).lower():
                     continue
@@ -1092,7 +1119,7 @@ def parse_lease_expiration_renewal(file_path: str, property_id: str = None) -> L
     return records
 
 
-def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_monthly_transaction_summary(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Monthly Transaction Summary report (report 4020).
     
@@ -1105,17 +1132,17 @@ def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -
     
     Returns list of dicts, each with '_type' = 'detail' or 'summary'.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
     fiscal_period = info['fiscal_period']
     
     # Also extract fiscal period from report content if not found in header
     if not fiscal_period:
-        for i in range(min(10, len(df))):
-            row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist())
+        for i in range(min(10, sheet.nrows)):
+            row_text = sheet.text(i)
             fp_match = re.search(r'Fiscal Period:\s*(\d{6})', row_text)
             if fp_match:
                 fiscal_period = fp_match.group(1)
@@ -1137,8 +1164,8 @@ def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -
     # They appear before the summary section (before "Category" header row)
     summary_start = None
     
-    for i in range(7, len(df)):
-        row = df.iloc[i]
+    for i in range(7, sheet.nrows):
+        row = sheet.row(i)
         col0 = str(row[0]).strip() if pd.notna(row[0]) else ''
         
         # Detect start of summary section
@@ -1245,8 +1272,8 @@ def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -
             'Total Monthly Collections': ('total_monthly_collections', 31),
         }
         
-        for i in range(summary_start, len(df)):
-            row = df.iloc[i]
+        for i in range(summary_start, sheet.nrows):
+            row = sheet.row(i)
             label = str(row[0]).strip() if pd.notna(row[0]) else ''
             
             # Remove trailing colons and asterisks
@@ -1256,8 +1283,8 @@ def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -
                 field, col_idx = label_map[label_clean]
                 # Value might be on the same row or the next row
                 val = safe_float(row[col_idx]) if col_idx < len(row) else 0.0
-                if val == 0.0 and i + 1 < len(df):
-                    next_row = df.iloc[i + 1]
+                if val == 0.0 and i + 1 < sheet.nrows:
+                    next_row = sheet.row(i + 1)
                     val = safe_float(next_row[col_idx]) if col_idx < len(next_row) else 0.0
                 summary[field] = val
     
@@ -1266,14 +1293,14 @@ def parse_monthly_transaction_summary(file_path: str, property_id: str = None) -
     return records
 
 
-def parse_make_ready_summary(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_make_ready_summary(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Make Ready Summary report (report 4186).
     Units in make-ready pipeline, grouped by unit with WO sub-rows.
     Col mapping: c1=days_vacant, c2=date_vacated, c6=date_due, c9=unit, c10=sqft, c11=num_WOs.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
-    info = extract_property_info(df)
+    sheet = _read_sheet(file_path)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
 
@@ -1291,8 +1318,8 @@ def parse_make_ready_summary(file_path: str, property_id: str = None) -> List[Di
 
     # Find header row (contains "Days vacant" and "Unit")
     header_row = None
-    for i in range(min(15, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(15, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'days vacant' in row_text and 'unit' in row_text:
             header_row = i
             break
@@ -1301,8 +1328,8 @@ def parse_make_ready_summary(file_path: str, property_id: str = None) -> List[Di
         return []
 
     records = []
-    for i in range(header_row + 1, len(df)):
-        unit_val = df.iloc[i, 9] if 9 < df.shape[1] else None
+    for i in range(header_row + 1, sheet.nrows):
+        unit_val = sheet.cell(i, 9) if 9 < sheet.ncols else None
         if pd.isna(unit_val):
             continue
         unit_str = str(unit_val).strip()
@@ -1314,25 +1341,25 @@ def parse_make_ready_summary(file_path: str, property_id: str = None) -> List[Di
             'property_name': property_name,
             'report_date': report_date,
             'unit': unit_str,
-            'sqft': safe_int(df.iloc[i, 10]) if 10 < df.shape[1] else 0,
-            'days_vacant': safe_int(df.iloc[i, 1]) if 1 < df.shape[1] else 0,
-            'date_vacated': safe_str(df.iloc[i, 2]) if 2 < df.shape[1] else None,
-            'date_due': safe_str(df.iloc[i, 6]) if 6 < df.shape[1] else None,
-            'num_work_orders': safe_int(df.iloc[i, 11]) if 11 < df.shape[1] else 0,
+            'sqft': safe_int(sheet.cell(i, 10)) if 10 < sheet.ncols else 0,
+            'days_vacant': safe_int(sheet.cell(i, 1)) if 1 < sheet.ncols else 0,
+            'date_vacated': safe_str(sheet.cell(i, 2)) if 2 < sheet.ncols else None,
+            'date_due': safe_str(sheet.cell(i, 6)) if 6 < sheet.ncols else None,
+            'num_work_orders': safe_int(sheet.cell(i, 11)) if 11 < sheet.ncols else 0,
             'status': 'open',
         })
 
     return records
 
 
-def parse_closed_make_ready(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_closed_make_ready(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Closed Make Ready Summary report (report 4189).
     Completed make-ready WOs, grouped by unit.
     Col mapping: c2=unit, c5=num_WOs, c10=date_closed, c12=amount_charged.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
-    info = extract_property_info(df)
+    sheet = _read_sheet(file_path)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
 
@@ -1358,8 +1385,8 @@ def parse_closed_make_ready(file_path: str, property_id: str = None) -> List[Dic
 
     # Find header rows (row with "Bldg" and "Unit")
     header_row = None
-    for i in range(min(15, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(15, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'bldg' in row_text and 'unit' in row_text:
             header_row = i
             break
@@ -1368,8 +1395,8 @@ def parse_closed_make_ready(file_path: str, property_id: str = None) -> List[Dic
         return []
 
     records = []
-    for i in range(header_row + 1, len(df)):
-        unit_val = df.iloc[i, 2] if 2 < df.shape[1] else None
+    for i in range(header_row + 1, sheet.nrows):
+        unit_val = sheet.cell(i, 2) if 2 < sheet.ncols else None
         if pd.isna(unit_val):
             continue
         unit_str = str(unit_val).strip()
@@ -1377,11 +1404,11 @@ def parse_closed_make_ready(file_path: str, property_id: str = None) -> List[Dic
             continue
 
         # Get the first date_closed for this unit from its WO sub-rows
-        date_closed = safe_str(df.iloc[i, 10]) if 10 < df.shape[1] else None
+        date_closed = safe_str(sheet.cell(i, 10)) if 10 < sheet.ncols else None
         if not date_closed:
             # Check next row for date
-            for j in range(i + 1, min(i + 10, len(df))):
-                dc = df.iloc[j, 10] if 10 < df.shape[1] else None
+            for j in range(i + 1, min(i + 10, sheet.nrows)):
+                dc = sheet.cell(j, 10) if 10 < sheet.ncols else None
                 if pd.notna(dc):
                     date_closed = safe_str(dc)
                     break
@@ -1391,15 +1418,15 @@ def parse_closed_make_ready(file_path: str, property_id: str = None) -> List[Dic
             'property_name': property_name,
             'report_date': report_date,
             'unit': unit_str,
-            'num_work_orders': safe_int(df.iloc[i, 5]) if 5 < df.shape[1] else 0,
+            'num_work_orders': safe_int(sheet.cell(i, 5)) if 5 < sheet.ncols else 0,
             'date_closed': date_closed,
-            'amount_charged': safe_float(df.iloc[i, 12]) if 12 < df.shape[1] else 0.0,
+            'amount_charged': safe_float(sheet.cell(i, 12)) if 12 < sheet.ncols else 0.0,
         })
 
     return records
 
 
-def parse_advertising_source(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_advertising_source(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Primary Advertising Source Evaluation report (report 4158).
     37-column wide layout. Only parse first section (before "Totals:" row).
@@ -1407,15 +1434,15 @@ def parse_advertising_source(file_path: str, property_id: str = None) -> List[Di
     c15=return_visits, c19=leases, c25=cancelled_denied, c29=net_leases,
     c35=prospect_to_lease_pct, c36=visit_to_lease_pct.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
-    info = extract_property_info(df)
+    sheet = _read_sheet(file_path)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
 
     # Extract date range from header area
     date_range = ''
-    for i in range(min(10, len(df))):
-        val = df.iloc[i, 3] if 3 < df.shape[1] else None
+    for i in range(min(10, sheet.nrows)):
+        val = sheet.cell(i, 3) if 3 < sheet.ncols else None
         if pd.notna(val) and 'through' in str(val):
             date_range = str(val).strip()
             break
@@ -1443,8 +1470,8 @@ def parse_advertising_source(file_path: str, property_id: str = None) -> List[Di
 
     # Find first "Advertising Source" header row
     start_row = None
-    for i in range(min(20, len(df))):
-        val = df.iloc[i, 0]
+    for i in range(min(20, sheet.nrows)):
+        val = sheet.cell(i, 0)
         if pd.notna(val) and 'Advertising Source' in str(val):
             start_row = i + 1
             break
@@ -1453,8 +1480,8 @@ def parse_advertising_source(file_path: str, property_id: str = None) -> List[Di
         return []
 
     records = []
-    for i in range(start_row, len(df)):
-        src = df.iloc[i, 0]
+    for i in range(start_row, sheet.nrows):
+        src = sheet.cell(i, 0)
         if pd.notna(src):
             src_str = str(src).strip()
             if src_str == 'Totals:' or src_str.startswith('Contact Types'):
@@ -1467,9 +1494,9 @@ def parse_advertising_source(file_path: str, property_id: str = None) -> List[Di
                 if field == 'source':
                     row[field] = src_str
                 elif field in ('prospect_to_lease_pct', 'visit_to_lease_pct'):
-                    row[field] = safe_pct(df.iloc[i, col]) if col < df.shape[1] else 0.0
+                    row[field] = safe_pct(sheet.cell(i, col)) if col < sheet.ncols else 0.0
                 else:
-                    row[field] = safe_int(df.iloc[i, col]) if col < df.shape[1] else 0
+                    row[field] = safe_int(sheet.cell(i, col)) if col < sheet.ncols else 0
 
             # Only include rows with any activity
             if any(row.get(f, 0) > 0 for f in ['new_prospects', 'phone_calls', 'visits', 'leases', 'net_leases']):
@@ -1482,7 +1509,7 @@ def parse_advertising_source(file_path: str, property_id: str = None) -> List[Di
     return records
 
 
-def parse_lost_rent_summary(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_lost_rent_summary(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Lost Rent Summary report (report 4279).
     Clean tabular format starting at row 7 (header at row 6).
@@ -1492,16 +1519,16 @@ def parse_lost_rent_summary(file_path: str, property_id: str = None) -> List[Dic
     c16=vacancy_current, c17=vacancy_adjustments, c18=market_rent_calculated,
     c19=lost_rent_not_charged.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
-    info = extract_property_info(df)
+    sheet = _read_sheet(file_path)
+    info = extract_property_info(sheet)
     property_name = info['property_name']
     report_date = info['report_date']
 
     # Extract fiscal period
     fiscal_period = None
-    for i in range(min(6, len(df))):
-        for c in range(min(10, df.shape[1])):
-            val = df.iloc[i, c]
+    for i in range(min(6, sheet.nrows)):
+        for c in range(min(10, sheet.ncols)):
+            val = sheet.cell(i, c)
             if pd.notna(val) and 'Fiscal period' in str(val):
                 fp_match = re.search(r'(\d{6})', str(val))
                 if fp_match:
@@ -1510,8 +1537,8 @@ def parse_lost_rent_summary(file_path: str, property_id: str = None) -> List[Dic
 
     # Find header row (contains "Market Rent" and "Bldg-Unit")
     header_row = None
-    for i in range(min(10, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist()).lower()
+    for i in range(min(10, sheet.nrows)):
+        row_text = sheet.text(i).lower()
         if 'market rent' in row_text and ('bldg' in row_text or 'unit' in row_text):
             header_row = i
             break
@@ -1534,8 +1561,8 @@ def parse_lost_rent_summary(file_path: str, property_id: str = None) -> List[Dic
         return None
 
     records = []
-    for i in range(header_row + 1, len(df)):
-        unit_val = df.iloc[i, 2] if 2 < df.shape[1] else None
+    for i in range(header_row + 1, sheet.nrows):
+        unit_val = sheet.cell(i, 2) if 2 < sheet.ncols else None
         if pd.isna(unit_val):
             continue
         unit_str = str(unit_val).strip()
@@ -1548,38 +1575,38 @@ def parse_lost_rent_summary(file_path: str, property_id: str = None) -> List[Dic
             'report_date': report_date,
             'fiscal_period': fiscal_period,
             'unit': unit_str,
-            'move_in_date': safe_str(df.iloc[i, 4]) if 4 < df.shape[1] else None,
-            'move_out_date': safe_str(df.iloc[i, 5]) if 5 < df.shape[1] else None,
-            'market_rent': safe_float(df.iloc[i, 7]) if 7 < df.shape[1] else 0.0,
-            'lease_rent': safe_float(df.iloc[i, 8]) if 8 < df.shape[1] else 0.0,
-            'rent_charged': safe_float(df.iloc[i, 9]) if 9 < df.shape[1] else 0.0,
-            'loss_to_rent': safe_float(df.iloc[i, 12]) if 12 < df.shape[1] else 0.0,
-            'gain_to_rent': safe_float(df.iloc[i, 14]) if 14 < df.shape[1] else 0.0,
-            'vacancy_current': safe_float(df.iloc[i, 16]) if 16 < df.shape[1] else 0.0,
-            'vacancy_adjustments': safe_float(df.iloc[i, 17]) if 17 < df.shape[1] else 0.0,
-            'market_rent_calculated': safe_float(df.iloc[i, 18]) if 18 < df.shape[1] else 0.0,
-            'lost_rent_not_charged': safe_float(df.iloc[i, 19]) if 19 < df.shape[1] else 0.0,
+            'move_in_date': safe_str(sheet.cell(i, 4)) if 4 < sheet.ncols else None,
+            'move_out_date': safe_str(sheet.cell(i, 5)) if 5 < sheet.ncols else None,
+            'market_rent': safe_float(sheet.cell(i, 7)) if 7 < sheet.ncols else 0.0,
+            'lease_rent': safe_float(sheet.cell(i, 8)) if 8 < sheet.ncols else 0.0,
+            'rent_charged': safe_float(sheet.cell(i, 9)) if 9 < sheet.ncols else 0.0,
+            'loss_to_rent': safe_float(sheet.cell(i, 12)) if 12 < sheet.ncols else 0.0,
+            'gain_to_rent': safe_float(sheet.cell(i, 14)) if 14 < sheet.ncols else 0.0,
+            'vacancy_current': safe_float(sheet.cell(i, 16)) if 16 < sheet.ncols else 0.0,
+            'vacancy_adjustments': safe_float(sheet.cell(i, 17)) if 17 < sheet.ncols else 0.0,
+            'market_rent_calculated': safe_float(sheet.cell(i, 18)) if 18 < sheet.ncols else 0.0,
+            'lost_rent_not_charged': safe_float(sheet.cell(i, 19)) if 19 < sheet.ncols else 0.0,
         })
 
     return records
 
 
-def parse_move_out_reasons(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_move_out_reasons(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """
     Parse Reasons for Move Out report (3879).
     Returns list of records with category, reason, count, percentage, and resident_type.
     """
-    df = pd.read_excel(file_path, sheet_name=0, header=None)
+    sheet = _read_sheet(file_path)
     
-    info = extract_property_info(df)
+    info = extract_property_info(sheet)
     property_name = info.get('property_name')
     report_date = info.get('report_date')
     
     # Detect resident_type from Parameters row
     resident_type = 'former'
     date_range = None
-    for i in range(min(10, len(df))):
-        row_text = ' '.join(str(x) for x in df.iloc[i].dropna().tolist())
+    for i in range(min(10, sheet.nrows)):
+        row_text = sheet.text(i)
         if 'Parameters:' in row_text:
             if 'Residents On Notice' in row_text:
                 resident_type = 'notice'
@@ -1595,8 +1622,8 @@ def parse_move_out_reasons(file_path: str, property_id: str = None) -> List[Dict
     category_count = 0
     category_pct = 0.0
     
-    for i in range(8, len(df)):
-        row = df.iloc[i].tolist()
+    for i in range(8, sheet.nrows):
+        row = sheet.row(i)
         col0 = str(row[0]).strip() if pd.notna(row[0]) and str(row[0]).strip() else ''
         col3 = str(row[3]).strip() if len(row) > 3 and pd.notna(row[3]) and str(row[3]).strip() else ''
         col4 = row[4] if len(row) > 4 and pd.notna(row[4]) else None
@@ -1631,7 +1658,7 @@ def parse_move_out_reasons(file_path: str, property_id: str = None) -> List[Dict
     return records
 
 
-def parse_income_statement(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_income_statement(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """Parse Income Statement Worksheet report (3836).
     
     HTML-as-Excel format. Uses pd.read_html() to extract tables.
@@ -1643,7 +1670,7 @@ def parse_income_statement(file_path: str, property_id: str = None) -> List[Dict
     Returns list of dicts with gl_account_code, gl_account_name, section, amount, etc.
     """
     try:
-        dfs = pd.read_html(file_path)
+        dfs = pd.read_html(_as_file(file_path))
     except Exception as e:
         return []
     
@@ -1770,7 +1797,7 @@ def parse_income_statement(file_path: str, property_id: str = None) -> List[Dict
     return records
 
 
-def parse_lease_details(file_path: str, property_id: str = None) -> List[Dict[str, Any]]:
+def parse_lease_details(file_path: ReportSource, property_id: str = None) -> List[Dict[str, Any]]:
     """Parse Lease Details report (CSV format from RealPage).
     
     CSV columns: Lease id, Floor plan, Occupancy status, Lease start date,
@@ -1779,7 +1806,10 @@ def parse_lease_details(file_path: str, property_id: str = None) -> List[Dict[st
     Lease Total, Ledger Balance, Move out notice type, Move out reason
     """
     records = []
-    content = Path(file_path).read_text(encoding='utf-8', errors='replace')
+    if isinstance(file_path, (bytes, bytearray)):
+        content = file_path.decode('utf-8', errors='replace')
+    else:
+        content = Path(file_path).read_text(encoding='utf-8', errors='replace')
     reader = csv.DictReader(io.StringIO(content))
     
     for row in reader:
@@ -1822,30 +1852,39 @@ def parse_lease_details(file_path: str, property_id: str = None) -> List[Dict[st
     return records
 
 
-def parse_report(file_path: str, property_id: str = None, file_id: str = None, report_type_hint: str = None) -> Dict[str, Any]:
+def parse_report(file_path: Union[str, bytes], property_id: str = None, file_id: str = None,
+                 report_type_hint: str = None) -> Dict[str, Any]:
     """
-    Parse a report file and return structured data.
+    Parse a report file (path or downloaded bytes) and return structured data.
     Auto-detects report type, falls back to report_type_hint if detection fails.
+    
+    The workbook is read once and the sheets handed to the type-specific
+    parser. Module-level and picklable, so it can run in a process pool.
     """
+    in_memory = isinstance(file_path, (bytes, bytearray))
+    source_name = None if in_memory else str(file_path)
+
     # CSV files: route directly by hint (no Excel auto-detection)
-    if file_path.endswith('.csv') and report_type_hint == 'lease_details':
+    is_csv = not file_path.startswith((XLS_MAGIC, XLSX_MAGIC)) if in_memory else file_path.endswith('.csv')
+    if is_csv and report_type_hint == 'lease_details':
         records = parse_lease_details(file_path, property_id)
         for r in records:
             r['file_id'] = file_id
-        return {'report_type': 'lease_details', 'records': records, 'file_path': str(file_path), 'file_id': file_id}
+        return {'report_type': 'lease_details', 'records': records, 'file_path': source_name, 'file_id': file_id}
 
     try:
-        df = pd.read_excel(file_path, sheet_name=0, header=None)
+        sheets = _read_workbook(file_path)
+        sheet = _read_sheet(sheets)
     except Exception as e:
-        # HTML-as-Excel: pd.read_excel fails but pd.read_html works
+        # HTML-as-Excel: not a workbook, but pd.read_html reads it
         if report_type_hint == 'income_statement':
             records = parse_income_statement(file_path, property_id)
             for r in records:
                 r['file_id'] = file_id
-            return {'report_type': 'income_statement', 'records': records, 'file_path': str(file_path), 'file_id': file_id}
+            return {'report_type': 'income_statement', 'records': records, 'file_path': source_name, 'file_id': file_id}
         return {'error': str(e), 'report_type': None, 'records': []}
     
-    report_type = detect_report_type(df)
+    report_type = detect_report_type(sheet)
     
     # Fall back to hint if auto-detection failed
     if not report_type and report_type_hint:
@@ -1868,33 +1907,33 @@ def parse_report(file_path: str, property_id: str = None, file_id: str = None, r
         report_type = hint_map.get(report_type_hint, report_type_hint)
     
     if report_type == 'box_score':
-        records = parse_box_score(file_path, property_id)
+        records = parse_box_score(sheet, property_id)
     elif report_type == 'delinquency':
-        records = parse_delinquency(file_path, property_id)
+        records = parse_delinquency(sheet, property_id)
     elif report_type == 'monthly_summary':
-        records = parse_monthly_summary(file_path, property_id)
+        records = parse_monthly_summary(sheet, property_id)
     elif report_type == 'rent_roll':
-        records = parse_rent_roll(file_path, property_id)
+        records = parse_rent_roll(sheet, property_id)
     elif report_type == 'lease_expiration':
-        records = parse_lease_expiration(file_path, property_id)
+        records = parse_lease_expiration(sheet, property_id)
     elif report_type == 'activity':
-        records = parse_activity(file_path, property_id)
+        records = parse_activity(sheet, property_id)
     elif report_type == 'lease_expiration_renewal':
-        records = parse_lease_expiration_renewal(file_path, property_id)
+        records = parse_lease_expiration_renewal(sheets, property_id)
     elif report_type == 'projected_occupancy':
-        records = parse_projected_occupancy(file_path, property_id)
+        records = parse_projected_occupancy(sheet, property_id)
     elif report_type == 'monthly_transaction_summary':
-        records = parse_monthly_transaction_summary(file_path, property_id)
+        records = parse_monthly_transaction_summary(sheet, property_id)
     elif report_type == 'make_ready_summary':
-        records = parse_make_ready_summary(file_path, property_id)
+        records = parse_make_ready_summary(sheet, property_id)
     elif report_type == 'closed_make_ready':
-        records = parse_closed_make_ready(file_path, property_id)
+        records = parse_closed_make_ready(sheet, property_id)
     elif report_type == 'advertising_source':
-        records = parse_advertising_source(file_path, property_id)
+        records = parse_advertising_source(sheet, property_id)
     elif report_type == 'lost_rent_summary':
-        records = parse_lost_rent_summary(file_path, property_id)
+        records = parse_lost_rent_summary(sheet, property_id)
     elif report_type == 'move_out_reasons':
-        records = parse_move_out_reasons(file_path, property_id)
+        records = parse_move_out_reasons(sheet, property_id)
     elif report_type == 'lease_details':
         records = parse_lease_details(file_path, property_id)
     elif report_type == 'income_statement':
@@ -1909,7 +1948,7 @@ def parse_report(file_path: str, property_id: str = None, file_id: str = None, r
     return {
         'report_type': report_type,
         'records': records,
-        'file_path': str(file_path),
+        'file_path': source_name,
         'file_id': file_id
     }
 
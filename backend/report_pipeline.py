@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Pipelined scheduler for RealPage report jobs (used by download_reports_v2.py).
+
+The downloader used to run four phases back to back: create every report
+instance, poll until all of them were ready, download every file, then import.
+ReportPipeline overlaps them instead: each job moves on as soon as it can, so a
+report is downloaded and imported the moment its instance reaches status 3
+while other instances are still being created.
+
+  create  (thread pool, ``create_workers``)   -> pending instance IDs
+  poll    (main thread, InstancePoller)        -> ready file IDs
+  download (thread pool, ``download_workers``) -> content, or a re-create
+  parse   (optional, e.g. a process pool)      -> parsed records
+  import  (one writer thread: SQLite has a single writer)
+
+The pipeline only schedules; the RealPage calls, the content check and the
+import are passed in as plain functions. Request pacing is handled by
+AdaptiveThrottle (one per phase), which replaces the old fixed sleeps.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Union
+
+DEFAULT_CREATE_WORKERS = 2
+DEFAULT_DOWNLOAD_WORKERS = 4
+POLL_INTERVAL = 15       # seconds between polls with many instances pending
+MIN_POLL_INTERVAL = 3    # ... and with only a few left
+POLL_BUSY_PENDING = 100  # pending instances at which polling slows to POLL_INTERVAL
+POLL_PAGE_SIZE = 200
+POLL_TIMEOUT = 300       # give up on an instance not ready this long after it was created
+
+
+class AdaptiveThrottle:
+    """
+    Request pacing that follows the API instead of fixed sleeps.
+
+    Requests are spaced ``delay`` seconds apart across all threads sharing the
+    throttle. A 429 doubles the delay (at least Retry-After) and the request is
+    retried; a slow response raises it by half; fast responses ease it back
+    down towards ``min_delay``.
+    """
+
+    def __init__(self, name: str, initial_delay: float = 0.5, min_delay: float = 0.05,
+                 max_delay: float = 30.0, slow_latency: float = 5.0, max_retries: int = 4):
+        self.name = name
+        self.delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.slow_latency = slow_latency
+        self.max_retries = max_retries
+        self.requests = 0
+        self.throttled = 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at)
+            self._next_at = at + self.delay
+        if at > now:
+            time.sleep(at - now)
+
+    def record(self, status_code: int, latency: float, retry_after: Optional[float] = None):
+        with self._lock:
+            self.requests += 1
+            if status_code == 429:
+                self.throttled += 1
+                self.delay = min(self.max_delay, max(self.delay * 2, retry_after or 0, 1.0))
+                self._next_at = max(self._next_at, time.monotonic() + max(self.delay, retry_after or 0))
+            elif latency > self.slow_latency:
+                self.delay = min(self.max_delay, self.delay * 1.5)
+            else:
+                self.delay = max(self.min_delay, self.delay * 0.9)
+
+    def request(self, send: Callable):
+        """Call ``send()`` (returning an httpx response) paced, retrying 429s."""
+        for _ in range(self.max_retries + 1):
+            self.wait()
+            start = time.monotonic()
+            resp = send()
+            retry_after = resp.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            self.record(resp.status_code, time.monotonic() - start, retry_after)
+            if resp.status_code != 429:
+                return resp
+        return resp
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "throttled": self.throttled, "delay": round(self.delay, 2)}
+
+
+class InstancePoller:
+    """
+    Incremental status poller for /my/report-instances.
+
+    The listing is newest-first (OrderBy CreatedDate desc). Rather than paging
+    through every instance since the run started on each poll, a pass stops
+    as soon as every watched instance has been listed, and once all of them
+    have been seen the listing starts at the oldest still-pending instance's
+    CreatedDate (the cursor). Resolved instances leave the watch set, so the
+    tail of a run re-reads one short page instead of the whole history.
+
+    ``fetch_page(start_date, page_number, page_size)`` returns
+    (items, total_count, response bytes), or None on an API error.
+    """
+
+    def __init__(self, fetch_page: Callable, since: str, page_size: int = POLL_PAGE_SIZE,
+                 min_interval: float = MIN_POLL_INTERVAL, max_interval: float = POLL_INTERVAL,
+                 busy_pending: int = POLL_BUSY_PENDING):
+        self.fetch_page = fetch_page
+        self.since = since
+        self.page_size = page_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.busy_pending = busy_pending
+        self._created: Dict[str, str] = {}  # pending instance ID -> CreatedDate from the listing
+        self.traffic = {"polls": 0, "requests": 0, "items": 0, "bytes": 0}
+
+    def cursor(self, watch: Set[str]) -> str:
+        """startDate for the next pass: the oldest pending instance, once all have been listed."""
+        if watch and all(iid in self._created for iid in watch):
+            return min(self._created[iid] for iid in watch)
+        return self.since
+
+    def interval(self, pending: int) -> float:
+        """Poll quickly for the last few instances, less often while many are outstanding."""
+        load = min(1.0, pending / self.busy_pending) if self.busy_pending else 1.0
+        return self.min_interval + (self.max_interval - self.min_interval) * load
+
+    def scan(self, watch: Set[str], since: str = None) -> Dict[str, str]:
+        """
+        Returns {instance_id: file_id} for the watched instances that are ready
+        (status 3). ``since`` is ignored: the poller keeps its own cursor.
+        """
+        start_date = self.cursor(watch)
+        found = {}
+        listed = set()
+        scanned = 0
+        page = 1
+        self.traffic["polls"] += 1
+        while True:
+            result = self.fetch_page(start_date, page, self.page_size)
+            self.traffic["requests"] += 1
+            if result is None:
+                break
+            items, total_count, nbytes = result
+            self.traffic["items"] += len(items)
+            self.traffic["bytes"] += nbytes
+            scanned += len(items)
+
+            for item in items:
+                iid = item.get("sourceReportInstanceId", "")
+                if iid not in watch:
+                    continue
+                listed.add(iid)
+                created = item.get("createdDate") or item.get("CreatedDate")
+                if created:
+                    self._created[iid] = created
+                if item.get("reportFileId") and item.get("status", 0) == 3:
+                    found[iid] = item["reportFileId"]
+
+            # Everything we are waiting for has been listed, or the listing ran out
+            if listed >= watch or not items or len(items) < self.page_size or scanned >= total_count:
+                break
+            page += 1
+
+        # Drop resolved (and no longer watched) instances from the cursor
+        self._created = {iid: d for iid, d in self._created.items() if iid in watch and iid not in found}
+        return found
+
+
+class ReportPipeline:
+    """
+    Runs report jobs (the downloader's ``needed`` dicts) through
+    create -> poll -> download -> import, overlapping the phases.
+
+    Callables:
+      create(item, date_offset) -> instance ID or None
+      scan(pending_ids, since) -> {instance_id: file_id} for the ready ones
+      download(item) -> bytes or None
+      check(item, content) -> True to import, False to re-create the report
+                              one day further back (box score date errors)
+      unchanged(item) -> True when item["content"] was already imported (optional);
+                         such reports are neither parsed nor imported
+      parse(item) -> a Future of the parsed report (optional); the result is
+                     stored as item["parsed"] before import_item sees it
+      import_item(item) -> records imported; always called on the writer thread
+
+    ``poll_interval`` is seconds, or a function of the pending count
+    (InstancePoller.interval).
+
+    Items are updated in place (instance_id, date_used, file_id, content,
+    imported) as they progress, the same fields the sequential flow set.
+    """
+
+    def __init__(self, create: Callable, scan: Callable, download: Callable,
+                 import_item: Callable, check: Callable = None, parse: Callable = None,
+                 unchanged: Callable = None, since: str = "",
+                 create_workers: int = DEFAULT_CREATE_WORKERS,
+                 download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 poll_interval: Union[float, Callable] = POLL_INTERVAL, poll_timeout: float = POLL_TIMEOUT,
+                 max_create_offset: int = 3, max_retry_offset: int = 7,
+                 log: Callable = print):
+        self.create = create
+        self.scan = scan
+        self.download = download
+        self.import_item = import_item
+        self.check = check or (lambda item, content: True)
+        self.parse = parse
+        self.unchanged = unchanged
+        self.since = since
+        self.create_workers = create_workers
+        self.download_workers = download_workers
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.max_create_offset = max_create_offset
+        self.max_retry_offset = max_retry_offset
+        self.log = log
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending: Dict[str, tuple] = {}  # instance_id -> (item, created_at)
+        self._in_flight = 0                   # creates + downloads not yet finished
+        self._imports: queue.Queue = queue.Queue()
+        self.stats = {"created": 0, "create_failed": 0, "ready": 0, "timed_out": 0,
+                      "downloaded": 0, "download_failed": 0, "recreated": 0,
+                      "unchanged": 0, "parsed": 0, "imported": 0, "import_failed": 0, "polls": 0}
+        self.timings = {}
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _mark(self, event: str):
+        """Remember when each phase first produced something (seconds since start)."""
+        with self._lock:
+            self.timings.setdefault(event, round(time.monotonic() - self._t0, 2))
+
+    def _poll_interval(self) -> float:
+        if callable(self.poll_interval):
+            with self._lock:
+                pending = len(self._pending)
+            return self.poll_interval(pending)
+        return self.poll_interval
+
+    def _submit(self, pool: ThreadPoolExecutor, fn: Callable, *args):
+        with self._lock:
+            self._in_flight += 1
+        pool.submit(self._guarded, fn, *args)
+
+    def _guarded(self, fn: Callable, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            self.log(f"  ✗ {fn.__name__}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._wake.set()
+
+    # ── Phases ────────────────────────────────────────────────
+
+    def _create(self, item: dict, first_offset: int, last_offset: int):
+        tf_label = f" [{item['timeframe_tag']}]" if item.get("timeframe_tag") else ""
+        for date_offset in range(first_offset, last_offset):
+            instance_id = self.create(item, date_offset)
+            if instance_id:
+                item.update(instance_id=instance_id, date_offset=date_offset, file_id=None, content=None)
+                with self._lock:
+                    self._pending[instance_id] = (item, time.monotonic())
+                self._count("created")
+                self._mark("first_created")
+                self.log(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✓"
+                         + (f" (offset -{date_offset}d)" if date_offset else ""))
+                self._wake.set()
+                return
+            if date_offset < last_offset - 1:
+                self.log(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✗ (offset -{date_offset}d), retrying -1d")
+        self._count("create_failed")
+        self.log(f"  {item['prop_name']} / {item['report_type']}{tf_label}... ✗ all dates failed")
+
+    def _poll(self, download_pool: ThreadPoolExecutor, create_pool: ThreadPoolExecutor):
+        with self._lock:
+            pending_ids = set(self._pending)
+        if not pending_ids:
+            return
+        ready = self.scan(pending_ids, self.since) or {}
+        self._count("polls")
+
+        now = time.monotonic()
+        with self._lock:
+            ready_items = [(self._pending.pop(iid)[0], fid) for iid, fid in ready.items() if iid in self._pending]
+            expired = [iid for iid, (_, created_at) in self._pending.items() if now - created_at > self.poll_timeout]
+            expired_items = [self._pending.pop(iid)[0] for iid in expired]
+            still_pending = len(self._pending)
+
+        for item, file_id in ready_items:
+            item["file_id"] = file_id
+            self._count("ready")
+            self._mark("first_ready")
+            self._submit(download_pool, self._download, item, create_pool)
+        for item in expired_items:
+            self._count("timed_out")
+            self.log(f"  ⚠ {item['prop_name']} / {item['report_type']}: not ready after {self.poll_timeout:.0f}s")
+        if ready_items or expired_items:
+            self.log(f"  Poll: {len(ready_items)} ready, {still_pending} pending")
+
+    def _download(self, item: dict, create_pool: ThreadPoolExecutor):
+        content = self.download(item)
+        if not content:
+            self._count("download_failed")
+            self.log(f"  ✗ Failed to download file {item['file_id']} ({item['prop_name']} / {item['report_type']})")
+            return
+        self._count("downloaded")
+        self._mark("first_downloaded")
+
+        if not self.check(item, content):
+            next_offset = item.get("date_offset", 0) + 1
+            if next_offset < self.max_retry_offset:
+                self._count("recreated")
+                self.log(f"  ↻ {item['prop_name']} / {item['report_type']}: date rejected, retrying offset -{next_offset}d")
+                self._submit(create_pool, self._create, item, next_offset, next_offset + 1)
+            else:
+                self.log(f"  ⚠ {item['prop_name']} / {item['report_type']}: still failing after all date retries")
+            return
+
+        item["content"] = content
+        if self.unchanged is not None and self.unchanged(item):
+            self._count("unchanged")
+            self.log(f"  ↺ {item['prop_name']} / {item['report_type']}: unchanged since the last import, skipped")
+            return
+        if self.parse is None:
+            self._imports.put(item)
+            return
+        with self._lock:
+            self._in_flight += 1
+        self.parse(item).add_done_callback(lambda future: self._parsed(item, future))
+
+    def _parsed(self, item: dict, future):
+        """Parse finished (on a pool callback thread): hand the result to the writer."""
+        try:
+            item["parsed"] = future.result()
+            self._count("parsed")
+            self._mark("first_parsed")
+        except Exception as e:
+            item["parsed"] = {"error": str(e), "report_type": None, "records": []}
+        self._imports.put(item)
+        with self._lock:
+            self._in_flight -= 1
+        self._wake.set()
+
+    def _writer(self):
+        while True:
+            item = self._imports.get()
+            if item is None:
+                return
+            try:
+                item["imported"] = self.import_item(item) or 0
+                self._count("imported")
+                self._mark("first_imported")
+            except Exception as e:
+                self._count("import_failed")
+                self.log(f"  ✗ {item['prop_name']} / {item['report_type']}: {e}")
+
+    # ── Driver ────────────────────────────────────────────────
+
+    def run(self, items: List[dict]) -> dict:
+        """Run every item through the pipeline; returns stats, phase timings and throttle info."""
+        self._t0 = time.monotonic()
+        writer = threading.Thread(target=self._writer, name="report-import", daemon=True)
+        writer.start()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.create_workers), thread_name_prefix="create") as create_pool, \
+             ThreadPoolExecutor(max_workers=max(1, self.download_workers), thread_name_prefix="download") as download_pool:
+            for item in items:
+                self._submit(create_pool, self._create, item, 0, self.max_create_offset)
+
+            last_poll = 0.0
+            while True:
+                with self._lock:
+                    active = self._in_flight or self._pending
+                if not active:
+                    break
+                interval = self._poll_interval()
+                if time.monotonic() - last_poll >= interval:
+                    last_poll = time.monotonic()
+                    try:
+                        self._poll(download_pool, create_pool)
+                    except Exception as e:
+                        self.log(f"  Poll exception: {e}")
+                self._wake.clear()
+                self._wake.wait(timeout=max(0.0, interval - (time.monotonic() - last_poll)))
+
+        self._imports.put(None)
+        writer.join()
+        self.timings["finished"] = round(time.monotonic() - self._t0, 2)
+        return {"stats": dict(self.stats), "timings": dict(self.timings)}
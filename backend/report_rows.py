@@ -0,0 +1,218 @@
+"""
+Lightweight worksheet reader for the report parsers.
+
+The parsers only ever walk a sheet row by row and cell by cell, so building a
+pandas DataFrame first (pd.read_excel) is pure overhead. read_workbook reads
+.xlsx with openpyxl (read_only, values_only) and .xls with xlrd into Sheet
+objects: plain lists of rows.
+
+Cell values follow what pd.read_excel(header=None) produced, so the parsers'
+output is unchanged: empty cells, Excel errors and pandas' NA strings are NaN,
+integral numbers are ints, and a column is coerced the way pandas infers its
+dtype (numeric text becomes numbers, numbers with gaps become floats, all-date
+columns become Timestamps with NaT for gaps). Trailing empty rows and cells
+are trimmed as pandas does.
+"""
+import io
+import re
+from datetime import datetime, time
+from typing import Dict, List, Union
+
+import pandas as pd
+
+NAN = float("nan")
+
+XLS_MAGIC = b'\xd0\xcf\x11\xe0'  # OLE2 compound document (.xls)
+XLSX_MAGIC = b'PK'               # zip container (.xlsx)
+
+# pd.read_excel's default na_values, plus Excel error values (NaN in pandas)
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#GETTING_DATA',
+}
+
+_MISSING = None  # Placeholder until the column pass picks NaN or NaT
+
+_XLS_EMPTY = (0, 5, 6)  # xlrd.XL_CELL_EMPTY, XL_CELL_ERROR, XL_CELL_BLANK
+_XLS_PLAIN = (1, 2)     # xlrd.XL_CELL_TEXT, XL_CELL_NUMBER
+
+
+class Sheet:
+    """One worksheet as rows of cell values, all padded to ``ncols``."""
+
+    __slots__ = ("name", "rows", "nrows", "ncols")
+
+    def __init__(self, name: str, rows: List[list]):
+        self.name = name
+        self.rows = rows
+        self.nrows = len(rows)
+        self.ncols = len(rows[0]) if rows else 0
+
+    def __len__(self):
+        return self.nrows
+
+    def row(self, i: int) -> list:
+        return self.rows[i]
+
+    def cell(self, i: int, j: int):
+        return self.rows[i][j]
+
+    def values(self, i: int) -> list:
+        """Non-empty cells of row i (``df.iloc[i].dropna().tolist()``)."""
+        return [v for v in self.rows[i] if not isna(v)]
+
+    def text(self, i: int) -> str:
+        """Non-empty cells of row i joined with spaces."""
+        return ' '.join(str(v) for v in self.rows[i] if not isna(v))
+
+
+def isna(value) -> bool:
+    return value is None or value is pd.NaT or (isinstance(value, float) and value != value)
+
+
+def _clean(value):
+    """Cell-level conversion shared by both engines."""
+    if value is None:
+        return _MISSING
+    if isinstance(value, str):
+        return _MISSING if value in NA_STRINGS else value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    return value
+
+
+_INT_TEXT = re.compile(r'\s*[+-]?\d+\s*$')
+
+
+def _as_numbers(values: list):
+    """The column as numbers if every value is one or is numeric text (pandas converts those), else None."""
+    numbers = []
+    for v in values:
+        if isinstance(v, (int, float)):
+            numbers.append(v)
+        elif isinstance(v, str) and '_' not in v:
+            if _INT_TEXT.match(v):
+                numbers.append(int(v))
+                continue
+            try:
+                numbers.append(float(v))
+            except ValueError:
+                return None
+        else:
+            return None
+    return numbers
+
+
+def _finish(name: str, rows: List[list]) -> Sheet:
+    """Trim trailing empties, pad, and type each column the way pandas would."""
+    last = -1
+    for n, row in enumerate(rows):
+        while row and row[-1] is _MISSING:
+            row.pop()
+        if row:
+            last = n
+    rows = rows[:last + 1]
+    width = max((len(r) for r in rows), default=0)
+    for row in rows:
+        if len(row) < width:
+            row.extend([_MISSING] * (width - len(row)))
+
+    for j in range(width):
+        present = [r[j] for r in rows if r[j] is not _MISSING]
+        gaps = len(present) < len(rows)
+        if present and all(isinstance(v, datetime) for v in present):
+            for r in rows:
+                r[j] = pd.NaT if r[j] is _MISSING else pd.Timestamp(r[j])
+        elif present and all(isinstance(v, bool) for v in present) and not gaps:
+            continue
+        elif present and (numbers := _as_numbers(present)) is not None:
+            to_num = float if gaps or any(isinstance(v, float) for v in numbers) else int
+            numbers = iter(numbers)
+            for r in rows:
+                r[j] = NAN if r[j] is _MISSING else to_num(next(numbers))
+        else:
+            for r in rows:
+                if r[j] is _MISSING:
+                    r[j] = NAN
+    return Sheet(name, rows)
+
+
+def _read_xlsx(data: io.BytesIO, first_only: bool) -> Dict[str, Sheet]:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(data, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheets = {}
+        for ws in wb.worksheets[:1] if first_only else wb.worksheets:
+            sheets[ws.title] = _finish(ws.title, [[_clean(v) for v in row] for row in ws.iter_rows(values_only=True)])
+        return sheets
+    finally:
+        wb.close()
+
+
+def _xls_cell(ctype: int, value, datemode: int):
+    import xlrd
+
+    if ctype in _XLS_EMPTY:
+        return _MISSING
+    if ctype == xlrd.XL_CELL_DATE:
+        try:
+            value = xlrd.xldate.xldate_as_datetime(value, datemode)
+        except OverflowError:
+            return value
+        # Time-only cells sit on the epoch day (as pandas reads them)
+        if value.timetuple()[0:3] in ((1899, 12, 31), (1904, 1, 1)):
+            return time(value.hour, value.minute, value.second, value.microsecond)
+        return value
+    if ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+    return _clean(value)
+
+
+def _read_xls(data: bytes, first_only: bool) -> Dict[str, Sheet]:
+    import xlrd
+
+    book = xlrd.open_workbook(file_contents=data, on_demand=True)
+    try:
+        sheets = {}
+        names = book.sheet_names()
+        for idx, name in enumerate(names[:1] if first_only else names):
+            sh = book.sheet_by_index(idx)
+            rows = []
+            for i in range(sh.nrows):
+                types, values = sh.row_types(i), sh.row_values(i)
+                end = len(types)
+                while end and types[end - 1] in _XLS_EMPTY:
+                    end -= 1
+                # Report layouts are mostly empty cells: skip the type dispatch for those and plain values
+                rows.append([
+                    _MISSING if t in _XLS_EMPTY else _clean(v) if t in _XLS_PLAIN else _xls_cell(t, v, book.datemode)
+                    for t, v in zip(types[:end], values[:end])
+                ])
+            sheets[name] = _finish(name, rows)
+        return sheets
+    finally:
+        book.release_resources()
+
+
+def read_workbook(source: Union[str, bytes], first_only: bool = False) -> Dict[str, Sheet]:
+    """
+    {sheet name: Sheet} for a report file path or its bytes (first sheet only
+    with ``first_only``). The format is taken from the content, not the file
+    name: RealPage serves old .xls content under .xlsx names.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+    if data.startswith(XLS_MAGIC):
+        return _read_xls(data, first_only)
+    if data.startswith(XLSX_MAGIC):
+        return _read_xlsx(io.BytesIO(data), first_only)
+    raise ValueError("Excel file format cannot be determined (not .xls or .xlsx content)")
+
+
+def read_first_sheet(source: Union[str, bytes]) -> Sheet:
+    return next(iter(read_workbook(source, first_only=True).values()))
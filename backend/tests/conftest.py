@@ -14,6 +14,7 @@ from unittest.mock import patch
 from httpx import AsyncClient, ASGITransport
 from app.main import app
 from app.db.schema import UNIFIED_SCHEMA, REALPAGE_SCHEMA
+from app.db.iso_dates import backfill_iso_dates
 
 
 # ── Seed data ──────────────────────────────────────────────────────────
@@ -138,6 +139,9 @@ def _seed_unified(db_path: Path):
                 0.0, 0.0, 200.0, 300.0, 0.0, 500.0, 500.0)
     """, (TEST_PROPERTY_ID, SNAPSHOT_DATE))
 
+    # ISO date siblings, as written at the end of every sync
+    backfill_iso_dates(conn)
+
     conn.commit()
     conn.close()
 
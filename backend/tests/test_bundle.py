@@ -0,0 +1,87 @@
+"""Test the property dashboard bundle endpoint."""
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+
+@pytest.mark.asyncio
+async def test_bundle_matches_individual_endpoints(client):
+    """Each bundled section equals the standalone endpoint's payload."""
+    pairs = {
+        "occupancy": "occupancy",
+        "availability": "availability",
+        "delinquency": "delinquency",
+        "consolidated": "consolidated-by-bedroom",
+        "forecast": "occupancy-forecast",
+        "financials": "financials",
+    }
+    resp = await client.get(
+        f"/api/v2/properties/{TEST_PROPERTY_ID}/bundle",
+        params={"sections": ",".join(pairs)},
+    )
+    assert resp.status_code == 200
+    bundle = resp.json()
+    assert bundle["property_id"] == TEST_PROPERTY_ID
+    assert bundle["snapshot_rows"]["unified_units"] == 10
+
+    for section, path in pairs.items():
+        single = await client.get(f"/api/v2/properties/{TEST_PROPERTY_ID}/{path}")
+        if single.status_code == 200:
+            assert bundle["sections"][section] == single.json(), section
+        else:
+            assert section in bundle["errors"], section
+
+
+@pytest.mark.asyncio
+async def test_bundle_reports_timings(client):
+    """Default bundle includes per-section and total timings."""
+    resp = await client.get(f"/api/v2/properties/{TEST_PROPERTY_ID}/bundle")
+    assert resp.status_code == 200
+    data = resp.json()
+    timings = data["timings_ms"]
+    assert "snapshot_load" in timings
+    assert "total" in timings
+    for name in list(data["sections"]) + list(data["errors"]):
+        assert name in timings
+
+
+@pytest.mark.asyncio
+async def test_bundle_rejects_unknown_section(client):
+    resp = await client.get(
+        f"/api/v2/properties/{TEST_PROPERTY_ID}/bundle",
+        params={"sections": "occupancy,not_a_panel"},
+    )
+    assert resp.status_code == 400
+
+
+def test_failed_snapshot_load_closes_its_connection(_patch_db_paths, monkeypatch):
+    """A copy that fails part-way closes the holder (and frees the in-memory DB) before re-raising."""
+    import sqlite3
+    from app.services import property_snapshot
+
+    opened = []
+    real_connect = sqlite3.connect
+
+    def _connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    def _fail(property_id):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(property_snapshot.sqlite3, "connect", _connect)
+    monkeypatch.setattr(property_snapshot, "property_id_variants", _fail)
+    with pytest.raises(sqlite3.OperationalError):
+        property_snapshot.PropertySnapshot(TEST_PROPERTY_ID).load()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_bundle_is_not_response_cached(client):
+    """Live review sections and per-section errors must not be replayed from the cache."""
+    from app.services.response_cache import response_cache
+
+    response_cache.clear()
+    await client.get(f"/api/v2/properties/{TEST_PROPERTY_ID}/bundle")
+    assert "get_property_bundle" not in response_cache.stats()["endpoints"]
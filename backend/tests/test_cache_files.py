@@ -0,0 +1,105 @@
+"""Test the parse-once JSON cache file store."""
+import json
+import os
+
+from app.services.cache_files import CacheFile, CacheFileStore
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_parsed_once_until_file_changes(tmp_path):
+    """Repeated reads share one parse; an in-place rewrite is picked up."""
+    path = tmp_path / "reviews.json"
+    _write(path, {"a": 1})
+    cache = CacheFile(path)
+
+    first = cache.data()
+    assert cache.data() is first
+    assert cache.stats()["loads"] == 1
+
+    _write(path, {"a": 1, "b": 2})
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert cache.data() == {"a": 1, "b": 2}
+    assert cache.stats()["loads"] == 2
+
+
+def test_replaced_file_is_reloaded(tmp_path):
+    """A new file renamed over the old one (same size and mtime) is a new inode."""
+    path = tmp_path / "places.json"
+    _write(path, {"x": 1})
+    cache = CacheFile(path)
+    assert cache.data() == {"x": 1}
+
+    new = tmp_path / "places.json.tmp"
+    _write(new, {"y": 2})
+    st = path.stat()
+    os.utime(new, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(new, path)
+    assert cache.data() == {"y": 2}
+
+
+def test_missing_or_corrupt_file_reads_empty(tmp_path):
+    path = tmp_path / "missing.json"
+    cache = CacheFile(path)
+    assert cache.data() == {}
+
+    path.write_text("{not json")
+    assert cache.data() == {}
+    assert cache.stats()["errors"] == 1
+
+
+def test_index_rebuilt_with_snapshot(tmp_path):
+    """Indexes (incl. alias mappings) are built per load and swap with the data."""
+    aliases = {"5536211": "parkside"}
+    path = tmp_path / "reviews.json"
+    _write(path, {"parkside": {"rating": 4.5}})
+    cache = CacheFile(path)
+    cache.add_index("by_property", lambda data: {
+        **{k: v for k, v in data.items()},
+        **{alias: data.get(key) for alias, key in aliases.items()},
+    })
+
+    assert cache.index("by_property")["5536211"] == {"rating": 4.5}
+
+    cache.write({"parkside": {"rating": 4.7}})
+    assert cache.index("by_property")["5536211"] == {"rating": 4.7}
+    assert json.loads(path.read_text()) == {"parkside": {"rating": 4.7}}
+    # write() installs the snapshot itself: no re-parse on the next read
+    assert cache.stats()["loads"] == 1
+
+
+def test_memo_is_dropped_with_snapshot(tmp_path):
+    path = tmp_path / "ratings.json"
+    _write(path, {"p": 1})
+    cache = CacheFile(path)
+    calls = []
+
+    def compute(snapshot):
+        calls.append(1)
+        return sum(snapshot.data.values())
+
+    assert cache.snapshot().memo("total", compute) == 1
+    assert cache.snapshot().memo("total", compute) == 1
+    assert len(calls) == 1
+
+    cache.write({"p": 1, "q": 2})
+    assert cache.snapshot().memo("total", compute) == 3
+    assert len(calls) == 2
+
+
+def test_store_shares_files_and_reloads(tmp_path):
+    """One CacheFile per path; reload() reports whether anything reads the file."""
+    store = CacheFileStore()
+    path = tmp_path / "apartments.json"
+    _write(path, {"a": 1})
+    cache = store.register(path)
+    assert store.register(tmp_path / "." / "apartments.json") is cache
+    assert cache.data() == {"a": 1}
+
+    assert store.reload(path) is True
+    assert cache.stats()["loads"] == 2
+    assert store.reload(tmp_path / "other.json") is False
+    assert "apartments.json" in store.stats()
+
@@ -0,0 +1,158 @@
+"""Test the chunked, resumable admin upload protocol."""
+import gzip
+import hashlib
+import json
+import sqlite3
+
+import pytest
+
+from app.db.chunked_upload import UploadError, UploadSessions, decompress
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_session_resumes_and_verifies(tmp_path):
+    """Chunks land in any order; reopening lists what arrived; the whole file is hash-checked."""
+    sessions = UploadSessions(lambda: tmp_path)
+    data = bytes(range(256)) * 40  # 10240 bytes -> chunks at 0, 4096, 8192
+    session = sessions.open("file", "x.json", len(data), _sha(data), chunk_size=4096)
+
+    chunk = data[8192:]
+    assert sessions.write_chunk(session.id, 8192, gzip.compress(chunk), "gzip", _sha(chunk)) == 2
+    with pytest.raises(UploadError) as e:
+        sessions.write_chunk(session.id, 0, data[:4096], "identity", _sha(b"other"))
+    assert e.value.status == 422
+
+    # A new process (fresh registry) resumes the same session from disk
+    resumed = UploadSessions(lambda: tmp_path).open("file", "x.json", len(data), _sha(data), chunk_size=4096)
+    assert resumed.id == session.id and resumed.received == {8192}
+    with pytest.raises(UploadError) as e:
+        sessions.finish(session.id)
+    assert e.value.status == 409
+
+    for offset in (0, 4096):
+        sessions.write_chunk(session.id, offset, data[offset:offset + 4096], "identity", _sha(data[offset:offset + 4096]))
+    assert sessions.finish(session.id).part_path.read_bytes() == data
+
+
+def test_oversized_chunk_is_refused(tmp_path):
+    sessions = UploadSessions(lambda: tmp_path)
+    data = b"a" * 100
+    session = sessions.open("file", "x.json", len(data), _sha(data), chunk_size=64)
+    with pytest.raises(UploadError):
+        sessions.write_chunk(session.id, 0, gzip.compress(b"a" * 1000), "gzip", _sha(b"a" * 64))
+    with pytest.raises(UploadError):
+        sessions.write_chunk(session.id, 10, b"a", "identity", _sha(b"a"))
+
+
+@pytest.mark.parametrize("content_size", [True, False])
+def test_oversized_zstd_frame_is_refused(content_size):
+    """The cap holds whether or not the frame declares its content size."""
+    zstandard = pytest.importorskip("zstandard")
+    frame = zstandard.ZstdCompressor(write_content_size=content_size).compress(b"a" * 1_000_000)
+    with pytest.raises(UploadError) as e:
+        decompress(frame, "zstd", 64)
+    assert e.value.status == 400
+    assert decompress(frame, "zstd", 1_000_000) == b"a" * 1_000_000
+
+
+def test_zstd_frame_declaring_too_much_is_refused_before_decompressing(monkeypatch):
+    """A small frame declaring a huge content size must not get that much memory allocated."""
+    zstandard = pytest.importorskip("zstandard")
+    frame = zstandard.ZstdCompressor().compress(b"a" * 1_000_000)
+
+    def _no_decompressor(*args, **kwargs):
+        raise AssertionError("decompressed an oversized frame")
+
+    monkeypatch.setattr(zstandard, "ZstdDecompressor", _no_decompressor)
+    with pytest.raises(UploadError) as e:
+        decompress(frame, "zstd", 64)
+    assert "past its expected 64 bytes" in str(e.value)
+
+
+async def _upload(client, headers, kind, name, data, chunk_size=4096, **params):
+    resp = await client.post("/api/admin/uploads", headers=headers, params={
+        "kind": kind, "name": name, "size": len(data), "sha256": _sha(data), "chunk_size": chunk_size, **params,
+    })
+    assert resp.status_code == 200
+    upload_id = resp.json()["upload_id"]
+    for offset in reversed(range(0, len(data), chunk_size)):
+        chunk = data[offset:offset + chunk_size]
+        resp = await client.put(
+            f"/api/admin/uploads/{upload_id}/chunks", headers=headers,
+            params={"offset": offset, "sha256": _sha(chunk), "encoding": "gzip"}, content=gzip.compress(chunk),
+        )
+        assert resp.status_code == 200
+    return await client.post(f"/api/admin/uploads/{upload_id}/complete", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_chunked_db_upload_checks_integrity(client, tmp_path, monkeypatch):
+    """A DB assembled from chunks is swapped in; a corrupt one is refused before the swap."""
+    from app.api import admin
+
+    served = tmp_path / "served.db"
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    monkeypatch.setitem(admin.DB_PATHS, "yardi", served)
+    headers = {"X-Admin-Key": "secret"}
+
+    source = tmp_path / "source.db"
+    conn = sqlite3.connect(str(source))
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    conn.executemany("INSERT INTO t (v) VALUES (?)", [("row %d" % i,) for i in range(500)])
+    conn.commit()
+    conn.close()
+    data = source.read_bytes()
+
+    resp = await _upload(client, headers, "db", "yardi", data)
+    assert resp.status_code == 200
+    assert resp.json()["mode"] == "full"
+    assert served.read_bytes() == data
+
+    # Same length, valid header, garbage b-tree pages
+    corrupt = data[:4096] + bytes(len(data) - 4096)
+    resp = await _upload(client, headers, "db", "yardi", corrupt)
+    assert resp.status_code == 422
+    assert served.read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_chunked_file_upload(client, tmp_path, monkeypatch):
+    from app.api import admin
+
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    monkeypatch.setattr(admin, "DB_DIR", tmp_path)
+    data = json.dumps({"k": "v" * 10000}).encode()
+    resp = await _upload(client, {"X-Admin-Key": "secret"}, "file", "chunked_test.json", data)
+    assert resp.status_code == 200
+    assert (tmp_path / "chunked_test.json").read_bytes() == data
+
+
+def test_push_does_not_complete_an_upload_with_missing_chunks(monkeypatch):
+    """Chunks that keep failing abort the push before /complete instead of hitting its 409."""
+    import httpx
+    import push_to_deployed
+
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith("/uploads"):
+            return httpx.Response(200, json={"upload_id": "u1", "chunk_size": 1024, "received": [],
+                                             "encodings": ["identity"]})
+        if request.url.path.endswith("/chunks"):
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(200, json={})
+
+    real_client = httpx.Client
+    monkeypatch.setattr(push_to_deployed.httpx, "Client",
+                        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    monkeypatch.setattr(push_to_deployed.time, "sleep", lambda s: None)
+    monkeypatch.setattr(push_to_deployed, "RAILWAY_URL", "http://deployed")
+
+    with pytest.raises(push_to_deployed.UploadIncomplete):
+        push_to_deployed.send_chunked("db-delta", "unified", b"x" * 3000)
+    assert not any(path.endswith("/complete") for _, path in calls)
+    assert sum(path.endswith("/uploads") for _, path in calls) == push_to_deployed.UPLOAD_ROUNDS
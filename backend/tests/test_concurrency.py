@@ -0,0 +1,88 @@
+"""Concurrency regression: blocking DB work must not stall the event loop."""
+import asyncio
+import inspect
+import time
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+import app.api.portfolio as portfolio_api
+import app.api.routes as routes_api
+from app.db.executor import db_executor, offload, run_blocking
+from app.services.response_cache import response_cache
+
+SLOW_QUERY_S = 0.2
+PARALLEL = 8
+
+
+@pytest.fixture
+def slow_db(monkeypatch):
+    """Make every unified.db checkout in the API modules take SLOW_QUERY_S."""
+    for module in (portfolio_api, routes_api):
+        real = module.get_unified_connection
+
+        def _slow(_real=real):
+            time.sleep(SLOW_QUERY_S)
+            return _real()
+
+        monkeypatch.setattr(module, "get_unified_connection", _slow)
+    response_cache.clear()
+
+
+async def _timed_get(client, url, start=None, **params):
+    """GET url; latency is measured from ``start`` (shared burst start) if given."""
+    start = time.perf_counter() if start is None else start
+    resp = await client.get(url, params=params)
+    return resp, time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_offload_preserves_signature_and_context():
+    @offload
+    def handler(property_id: str, days: int = 7):
+        return property_id, days
+
+    assert await handler("p1", days=3) == ("p1", 3)
+    assert asyncio.iscoroutinefunction(handler)
+    assert list(inspect.signature(handler).parameters) == ["property_id", "days"]
+    assert await run_blocking(sum, [1, 2, 3]) == 6
+
+
+@pytest.mark.asyncio
+async def test_parallel_slow_requests_tail_latency(client, slow_db):
+    """N concurrent watchlist/financials requests finish in ~one request time, not N."""
+    _, watchlist_s = await _timed_get(client, "/api/portfolio/watchlist")
+    _, financials_s = await _timed_get(client, f"/api/v2/properties/{TEST_PROPERTY_ID}/financials")
+    response_cache.clear()
+    serialized_s = (watchlist_s + financials_s) * PARALLEL / 2
+
+    urls = [
+        ("/api/portfolio/watchlist", {"occ_threshold": 90 + i}) if i % 2 == 0
+        else (f"/api/v2/properties/{TEST_PROPERTY_ID}/financials", {})
+        for i in range(PARALLEL)
+    ]
+    db_executor.reset_stats()
+    burst_start = time.perf_counter()
+    results = await asyncio.gather(*(_timed_get(client, u, burst_start, **p) for u, p in urls))
+
+    latencies = sorted(t for _, t in results)
+    assert all(r.status_code in (200, 404) for r, _ in results)
+    # Serialized on the event loop the slowest would finish after ~serialized_s
+    assert latencies[-1] < serialized_s / 2
+    assert db_executor.stats()["peak_active"] > 1
+
+
+@pytest.mark.asyncio
+async def test_fast_endpoint_not_blocked_by_slow_ones(client, slow_db):
+    """A cheap request issued alongside slow DB requests is answered promptly."""
+    burst_start = time.perf_counter()
+    slow = [
+        asyncio.ensure_future(
+            _timed_get(client, "/api/portfolio/watchlist", burst_start, occ_threshold=80 + i)
+        )
+        for i in range(PARALLEL)
+    ]
+    await asyncio.sleep(0.01)
+    _, health = await _timed_get(client, "/api/portfolio/health", burst_start)
+    await asyncio.gather(*slow)
+    assert health < SLOW_QUERY_S
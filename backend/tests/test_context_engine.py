@@ -0,0 +1,107 @@
+"""Test parallel AI context assembly (context_engine) and its consumers."""
+import asyncio
+import threading
+import time
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.services.context_engine import ContextEngine
+
+
+@pytest.mark.asyncio
+async def test_blocking_collectors_run_concurrently():
+    engine = ContextEngine(max_workers=4)
+    for name in ("a", "b", "c", "d"):
+        engine.collector(name)(lambda pid, _n=name: time.sleep(0.2) or f"{_n}:{pid}")
+
+    start = time.perf_counter()
+    ctx = await engine.gather("p1", ["a", "b", "c", "d", "a"])
+    elapsed = time.perf_counter() - start
+
+    assert ctx.values == {"a": "a:p1", "b": "b:p1", "c": "c:p1", "d": "d:p1"}
+    assert not ctx.errors
+    assert elapsed < 0.6  # sequential would be 0.8s
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_errors_are_reported():
+    engine = ContextEngine(max_workers=2, slow_ms=50)
+    engine.collector("slow", timeout=0.05)(lambda pid: time.sleep(0.3))
+    engine.collector("broken")(lambda pid: 1 / 0)
+    engine.collector("ok")(lambda pid: 42)
+
+    ctx = await engine.gather("p1", ["slow", "broken", "ok"])
+    assert ctx.values == {"ok": 42}
+    assert ctx.errors["slow"].startswith("timed out")
+    assert "division" in ctx.errors["broken"]
+    assert "slow" in ctx.slow
+
+    stats = engine.stats()["collectors"]
+    assert stats["slow"]["timeouts"] == 1
+    assert stats["broken"]["errors"] == 1
+
+    with pytest.raises(KeyError):
+        await engine.gather("p1", ["missing"])
+
+
+@pytest.mark.asyncio
+async def test_timed_out_collector_is_skipped_until_its_thread_finishes():
+    engine = ContextEngine(max_workers=2)
+    release = threading.Event()
+    engine.collector("stuck", timeout=0.05)(lambda pid: release.wait(5) and pid)
+
+    first = await engine.gather("p1", ["stuck"])
+    assert first.errors["stuck"].startswith("timed out")
+    second = await engine.gather("p1", ["stuck"])
+    assert second.errors["stuck"] == "skipped: previous run still in flight"
+
+    release.set()
+    await asyncio.sleep(0.05)
+    third = await engine.gather("p1", ["stuck"])
+    assert third.values == {"stuck": "p1"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_inflight_run():
+    engine = ContextEngine(max_workers=2)
+    calls = []
+    lock = threading.Lock()
+
+    def collect(pid):
+        with lock:
+            calls.append(pid)
+        time.sleep(0.1)
+        return pid
+
+    engine.collector("x")(collect)
+    first, second = await asyncio.gather(engine.gather("p1", ["x"]), engine.gather("p1", ["x"]))
+    assert first.values == second.values == {"x": "p1"}
+    assert calls == ["p1"]
+    assert engine.stats()["collectors"]["x"]["shared"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watchpoints_use_gathered_metrics(client):
+    resp = await client.get(f"/api/v2/properties/{TEST_PROPERTY_ID}/watchpoints")
+    assert resp.status_code == 200
+    metrics = resp.json()["current_metrics"]
+    assert metrics["vacant_units"] == 1
+    assert metrics["delinquent_units"] == 1  # former residents excluded
+    assert metrics["delinquent_total"] == 250.0
+    assert "atr" in metrics
+
+
+def test_chat_and_insights_delinquency_keep_their_own_rules(_patch_db_paths):
+    from app.api.routes import _collect_chat_delinquency, _collect_delinquency
+
+    # Chat: balances > 0 only, former residents reported separately
+    assert _collect_chat_delinquency(TEST_PROPERTY_ID) == {
+        "current_resident_total": 250.0,
+        "former_resident_total": 500.0,
+        "delinquent_units": 1,
+        "eviction_count": 0,
+    }
+    insights = _collect_delinquency(TEST_PROPERTY_ID)
+    assert (insights["current_total"], insights["current_units"], insights["over_60"]) == (250.0, 1, 50.0)
+    assert "former_total" not in insights
@@ -0,0 +1,127 @@
+"""Test page-level DB deltas (push_to_deployed.py -> /admin/upload-db-delta)."""
+import io
+import shutil
+import sqlite3
+
+import pytest
+
+from app.db.db_delta import DeltaError, apply_delta, build_delta, file_manifest, file_sha256
+
+
+def _make_db(path, rows=2000):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, property_id TEXT, value TEXT)")
+    conn.executemany("INSERT INTO t (property_id, value) VALUES (?, ?)",
+                     [(f"p{i % 20}", "x" * 50) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+
+def _edit(path, sql):
+    conn = sqlite3.connect(str(path))
+    conn.executescript(sql)
+    conn.commit()
+    conn.close()
+
+
+def test_delta_round_trip_sends_only_changed_pages(tmp_path):
+    base, new, out = tmp_path / "base.db", tmp_path / "new.db", tmp_path / "out.db"
+    _make_db(base)
+    shutil.copyfile(base, new)
+    _edit(new, "UPDATE t SET value = 'changed' WHERE id = 1500; INSERT INTO t (property_id, value) VALUES ('p1', 'y');")
+
+    delta = io.BytesIO()
+    local, pages = build_delta(new, file_manifest(base), delta)
+    assert 0 < pages < local["page_count"] / 4
+
+    delta.seek(0)
+    assert apply_delta(base, delta, out, local["page_size"], local["page_count"], local["sha256"]) == pages
+    assert file_sha256(out) == file_sha256(new)
+
+
+def test_delta_can_shrink_the_file(tmp_path):
+    base, new, out = tmp_path / "base.db", tmp_path / "new.db", tmp_path / "out.db"
+    _make_db(base)
+    shutil.copyfile(base, new)
+    _edit(new, "DELETE FROM t WHERE id > 100; VACUUM;")
+
+    delta = io.BytesIO()
+    local, _ = build_delta(new, file_manifest(base), delta)
+    delta.seek(0)
+    apply_delta(base, delta, out, local["page_size"], local["page_count"], local["sha256"])
+    assert out.stat().st_size == new.stat().st_size < base.stat().st_size
+
+
+def test_delta_against_wrong_base_is_rejected(tmp_path):
+    base, other, new, out = (tmp_path / n for n in ("base.db", "other.db", "new.db", "out.db"))
+    _make_db(base)
+    _make_db(other, rows=3000)
+    shutil.copyfile(base, new)
+    _edit(new, "UPDATE t SET value = 'changed' WHERE id = 10;")
+
+    delta = io.BytesIO()
+    local, _ = build_delta(new, file_manifest(base), delta)
+    delta.seek(0)
+    with pytest.raises(DeltaError):
+        apply_delta(other, delta, out, local["page_size"], local["page_count"], local["sha256"])
+    assert not out.exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_db_delta_endpoint(client, tmp_path, monkeypatch):
+    """Manifest -> delta -> swap; a delta built against an older version is refused with 409."""
+    from app.api import admin
+
+    served, new = tmp_path / "served.db", tmp_path / "new.db"
+    _make_db(served)
+    shutil.copyfile(served, new)
+    _edit(new, "INSERT INTO t (property_id, value) VALUES ('p3', 'new row');")
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    monkeypatch.setitem(admin.DB_PATHS, "yardi", served)
+    headers = {"X-Admin-Key": "secret"}
+
+    resp = await client.get("/api/admin/db-manifest", params={"db_type": "yardi"}, headers=headers)
+    assert resp.status_code == 200
+    remote = resp.json()
+
+    delta = io.BytesIO()
+    local, pages = build_delta(new, remote, delta)
+    params = {
+        "db_type": "yardi", "base_sha256": remote["sha256"],
+        "target_sha256": local["sha256"], "page_count": local["page_count"],
+    }
+    resp = await client.post("/api/admin/upload-db-delta", params=params, headers=headers,
+                             files={"file": ("delta", delta.getvalue())})
+    assert resp.status_code == 200
+    assert resp.json()["pages_applied"] == pages
+    assert file_sha256(served) == local["sha256"]
+
+    # Same delta again: the served file is no longer its base
+    resp = await client.post("/api/admin/upload-db-delta", params=params, headers=headers,
+                             files={"file": ("delta", delta.getvalue())})
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_failed_delta_upload_removes_its_copy(client, tmp_path, monkeypatch):
+    """Any failure before the swap (not just DeltaError) leaves no full-size temp copy behind."""
+    from app.api import admin
+
+    served = tmp_path / "served.db"
+    _make_db(served)
+    monkeypatch.setattr(admin, "ADMIN_API_KEY", "secret")
+    monkeypatch.setitem(admin.DB_PATHS, "yardi", served)
+    manifest = file_manifest(served)
+
+    def _disk_full(base_path, delta, out_path, *args):
+        shutil.copyfile(base_path, out_path)
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(admin, "apply_delta", _disk_full)
+    resp = await client.post("/api/admin/upload-db-delta", headers={"X-Admin-Key": "secret"}, params={
+        "db_type": "yardi", "base_sha256": manifest["sha256"],
+        "target_sha256": manifest["sha256"], "page_count": manifest["page_count"],
+    }, files={"file": ("delta", b"")})
+    assert resp.status_code == 500
+    assert not served.with_suffix(".db.tmp").exists()
+    assert file_sha256(served) == manifest["sha256"]
@@ -0,0 +1,130 @@
+"""Test the shared read-only unified.db connection pool."""
+import sqlite3
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db.pool import unified_pool, get_unified_connection
+
+
+def test_pool_connection_is_read_only(_patch_db_paths):
+    """Pooled connections can read but never write."""
+    conn = get_unified_connection()
+    try:
+        row = conn.execute(
+            "SELECT name FROM unified_properties WHERE unified_property_id = ?",
+            (TEST_PROPERTY_ID,),
+        ).fetchone()
+        assert row[0] == "Test Property"
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM unified_properties")
+    finally:
+        conn.close()
+
+
+def test_pool_reuses_released_connection(_patch_db_paths):
+    """close() returns the connection to the pool; next checkout is a hit."""
+    first = get_unified_connection()
+    first.row_factory = sqlite3.Row
+    first.close()
+
+    hits_before = unified_pool.stats()["hits"]
+    second = get_unified_connection()
+    try:
+        assert second is first
+        assert second.row_factory is None  # per-checkout state is reset
+        assert unified_pool.stats()["hits"] == hits_before + 1
+    finally:
+        second.close()
+
+
+def test_pool_nested_checkouts_are_distinct(_patch_db_paths):
+    """A helper opening a connection inside another checkout gets its own."""
+    outer = get_unified_connection()
+    inner = get_unified_connection()
+    try:
+        assert outer is not inner
+    finally:
+        inner.close()
+        outer.close()
+
+
+def test_pool_invalidate_reopens(_patch_db_paths):
+    """After invalidate() (DB upload), stale connections are not handed out."""
+    conn = get_unified_connection()
+    conn.close()
+
+    generation = unified_pool.generation
+    assert unified_pool.invalidate() == generation + 1
+
+    fresh = get_unified_connection()
+    try:
+        assert fresh is not conn
+        assert fresh.execute("SELECT COUNT(*) FROM unified_units").fetchone()[0] == 10
+    finally:
+        fresh.close()
+
+
+def _make_db(path, value):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+
+
+def test_swap_keeps_in_flight_readers_on_old_generation(tmp_path):
+    """After swap(), new checkouts read the new file; a checked-out one finishes on the old."""
+    import threading
+    from app.db.pool import ReadOnlyConnectionPool
+
+    path = tmp_path / "served.db"
+    _make_db(path, "old")
+    pool = ReadOnlyConnectionPool(lambda: path)
+
+    # An idle connection on another thread, and one in flight on this thread
+    def park_idle():
+        pool.connect().close()
+    worker = threading.Thread(target=park_idle)
+    worker.start()
+    worker.join()
+    in_flight = pool.connect()
+    old_generation = pool.generation
+    assert pool.stats()["open_by_generation"] == {str(old_generation): 2}
+
+    new = tmp_path / "served.db.tmp"
+    _make_db(new, "new")
+    generation = pool.swap(new)
+    assert generation == old_generation + 1
+
+    # The other thread's idle connection was closed at swap time
+    assert pool.stats()["open_by_generation"] == {str(old_generation): 1}
+
+    fresh = pool.connect()
+    assert fresh.execute("SELECT v FROM t").fetchone()[0] == "new"
+    assert in_flight.execute("SELECT v FROM t").fetchone()[0] == "old"
+    fresh.close()
+
+    released = pool.stats()["generations_released"]
+    in_flight.close()
+    stats = pool.stats()
+    assert stats["generations_released"] == released + 1
+    assert stats["open_by_generation"] == {str(generation): 1}
+
+
+def test_stream_connections_hold_their_generation(tmp_path):
+    from app.db.pool import ReadOnlyConnectionPool
+
+    path = tmp_path / "served.db"
+    _make_db(path, "old")
+    pool = ReadOnlyConnectionPool(lambda: path)
+    stream = pool.open_stream()
+
+    new = tmp_path / "served.db.tmp"
+    _make_db(new, "new")
+    pool.swap(new)
+    assert stream.execute("SELECT v FROM t").fetchone()[0] == "old"
+    assert pool.stats()["open_by_generation"] == {"0": 1}
+
+    stream.close()
+    assert pool.stats()["open_by_generation"] == {}
+    assert pool.stats()["generations_released"] == 1
@@ -0,0 +1,144 @@
+"""Incremental unified sync: only changed properties are rewritten, and the run leaves a manifest."""
+import sqlite3
+
+import pytest
+
+import app.db.sync_realpage_to_unified as sync_module
+from app.db.incremental_sync import SyncRun, load_sync_manifest
+from app.db.schema import REALPAGE_SCHEMA, UNIFIED_SCHEMA
+
+SITE_A, SITE_B = list(sync_module.PROPERTY_MAPPING)[:2]
+UID_A = sync_module.PROPERTY_MAPPING[SITE_A]["unified_id"]
+UID_B = sync_module.PROPERTY_MAPPING[SITE_B]["unified_id"]
+
+
+@pytest.fixture
+def sync_dbs(tmp_path, monkeypatch):
+    """Raw + unified databases with activity and rent roll rows for two properties."""
+    raw_path, uni_path = tmp_path / "raw.db", tmp_path / "uni.db"
+    raw = sqlite3.connect(raw_path)
+    raw.executescript(REALPAGE_SCHEMA)
+    for site in (SITE_A, SITE_B):
+        raw.executemany("""
+            INSERT INTO realpage_activity (property_id, report_date, activity_date, activity_type, resident_name)
+            VALUES (?, '2026-02-01', ?, ?, ?)
+        """, [(site, "01/0%d/2026" % d, "Move-In", f"Res {d}") for d in range(1, 5)])
+        raw.executemany("""
+            INSERT INTO realpage_rent_roll (property_id, report_date, unit_number, resident_name, actual_rent, status)
+            VALUES (?, '2026-02-01', ?, 'Doe, Jane', 1500, 'Occupied')
+        """, [(site, str(100 + u)) for u in range(3)])
+    raw.commit()
+    raw.close()
+
+    uni = sqlite3.connect(uni_path)
+    uni.executescript(UNIFIED_SCHEMA)
+    # A Yardi resident shares unified_residents and must survive RealPage syncs
+    uni.execute("""
+        INSERT INTO unified_residents (unified_property_id, pms_source, pms_resident_id, unit_number, status)
+        VALUES ('yardi_prop', 'yardi', 'y1', '1', 'current')
+    """)
+    uni.commit()
+    uni.close()
+
+    monkeypatch.setattr(sync_module, "get_realpage_conn", lambda: sqlite3.connect(raw_path))
+    monkeypatch.setattr(sync_module, "get_unified_conn", lambda: sqlite3.connect(uni_path))
+    return raw_path, uni_path
+
+
+def _sync(incremental):
+    run = SyncRun(incremental=incremental)
+    rp, uni = sync_module.get_realpage_conn(), sync_module.get_unified_conn()
+    run.begin(uni, rp, {site: m["unified_id"] for site, m in sync_module.PROPERTY_MAPPING.items()})
+    sync_module.sync_activity(run)
+    sync_module.sync_residents_from_rent_roll(run)
+    run.complete(uni)
+    rp.close()
+    uni.close()
+    return run
+
+
+def _rows(uni_path, table, with_id=False):
+    conn = sqlite3.connect(uni_path)
+    cols = [c[1] for c in conn.execute(f"PRAGMA table_info({table})")
+            if c[1] not in ("synced_at", "snapshot_date") and (with_id or c[1] != "id")]
+    rows = conn.execute(f"SELECT {', '.join(cols)} FROM {table}").fetchall()
+    conn.close()
+    return sorted(rows, key=repr)
+
+
+def test_unchanged_properties_are_not_rewritten(sync_dbs, capsys):
+    raw_path, uni_path = sync_dbs
+    _sync(incremental=False)
+    before = {t: _rows(uni_path, t, with_id=True) for t in ("unified_activity", "unified_residents")}
+
+    _sync(incremental=True)
+    assert "0 properties changed (+0/-0 rows), 2 unchanged" in capsys.readouterr().out
+    assert {t: _rows(uni_path, t, with_id=True) for t in before} == before
+    uni = sqlite3.connect(uni_path)
+    assert load_sync_manifest(uni)["tables"] == {}
+    uni.close()
+
+
+def test_changed_property_matches_full_rebuild(sync_dbs):
+    raw_path, uni_path = sync_dbs
+    _sync(incremental=False)
+    untouched = [r for r in _rows(uni_path, "unified_activity", with_id=True) if r[1] == UID_B]
+
+    raw = sqlite3.connect(raw_path)
+    raw.execute("UPDATE realpage_activity SET activity_type = 'Move-Out' WHERE property_id = ? AND resident_name = 'Res 1'",
+                (SITE_A,))
+    raw.execute("DELETE FROM realpage_rent_roll WHERE property_id = ? AND unit_number = '102'", (SITE_A,))
+    raw.execute("""
+        INSERT INTO realpage_report_import_log (property_id, report_type, file_id) VALUES (?, 'activity', 'F-77')
+    """, (SITE_A,))
+    raw.commit()
+    raw.close()
+
+    run = _sync(incremental=True)
+    assert run.file_ids == {UID_A: ["F-77"]}
+    incremental = {t: _rows(uni_path, t) for t in ("unified_activity", "unified_residents")}
+    assert [r for r in _rows(uni_path, "unified_activity", with_id=True) if r[1] == UID_B] == untouched
+
+    uni = sqlite3.connect(uni_path)
+    manifest = load_sync_manifest(uni)
+    assert manifest["mode"] == "incremental"
+    assert manifest["tables"] == {"unified_activity": [UID_A], "unified_residents": [UID_A]}
+    assert manifest["file_ids"] == {UID_A: ["F-77"]}
+    assert uni.execute(
+        "SELECT rows_inserted, rows_deleted FROM unified_sync_manifest WHERE sync_id = ? AND table_name = ?",
+        (run.sync_id, "unified_activity"),
+    ).fetchall() == [(1, 1)]
+    uni.close()
+
+    # Same end state as rebuilding from scratch; Yardi rows untouched
+    _sync(incremental=False)
+    assert {t: _rows(uni_path, t) for t in incremental} == incremental
+    assert any(r[0] == "yardi_prop" for r in incremental["unified_residents"])
+
+
+def test_report_tables_only_rebuild_properties_with_new_imports(sync_dbs):
+    raw_path, uni_path = sync_dbs
+    _sync(incremental=False)
+    before = _rows(uni_path, "unified_activity", with_id=True)
+
+    # Raw rows changed without a logged import are not even read
+    raw = sqlite3.connect(raw_path)
+    raw.execute("UPDATE realpage_activity SET activity_type = 'Move-Out' WHERE property_id = ?", (SITE_B,))
+    raw.execute("""
+        INSERT INTO realpage_report_import_log (property_id, report_type, file_id) VALUES (?, 'rent_roll', 'F-78')
+    """, (SITE_A,))
+    raw.commit()
+    raw.close()
+
+    run = _sync(incremental=True)
+    uni = sqlite3.connect(uni_path)
+    assert run.rebuild_scope(uni, "unified_activity", ("activity_report", "activity")) == set()
+    uni.close()
+    assert _rows(uni_path, "unified_activity", with_id=True) == before
+
+    # A full sync still picks the change up
+    _sync(incremental=False)
+    uni = sqlite3.connect(uni_path)
+    assert uni.execute("SELECT DISTINCT activity_type FROM unified_activity WHERE unified_property_id = ?",
+                       (UID_B,)).fetchall() == [("Move-Out",)]
+    uni.close()
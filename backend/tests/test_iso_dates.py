@@ -0,0 +1,147 @@
+"""Test sync-normalized ISO date columns and the read paths that filter on them."""
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db import schema
+from app.db.iso_dates import backfill_iso_dates, ensure_iso_date_columns, to_iso_date
+from app.services.occupancy_service import OccupancyService
+
+ISO_PROP = "iso_prop"
+
+
+def test_to_iso_date_formats():
+    assert to_iso_date("02/14/2026") == "2026-02-14"
+    assert to_iso_date("2/4/2026") == "2026-02-04"
+    assert to_iso_date("02/14/26") == "2026-02-14"
+    assert to_iso_date("2026-02-14T00:00:00") == "2026-02-14"
+    assert to_iso_date("2026-02-14") == "2026-02-14"
+    assert to_iso_date("") is None
+    assert to_iso_date(None) is None
+    assert to_iso_date("13/45/2026") is None
+    assert to_iso_date("TBD") is None
+
+
+def test_backfill_and_composite_index(_patch_db_paths):
+    conn = sqlite3.connect(schema.UNIFIED_DB_PATH)
+    try:
+        row = conn.execute(
+            "SELECT lease_end, lease_end_iso FROM unified_residents WHERE unified_property_id = ? LIMIT 1",
+            (TEST_PROPERTY_ID,),
+        ).fetchone()
+        assert row == ("12/31/2025", "2025-12-31")
+
+        plan = " ".join(r[-1] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM unified_leases "
+            "WHERE unified_property_id = ? AND lease_end_iso BETWEEN date('now') AND date('now', '+90 days')",
+            (TEST_PROPERTY_ID,),
+        ).fetchall())
+        assert "idx_unified_leases_prop_lease_end_iso" in plan
+
+        # Idempotent on an already-migrated database
+        assert ensure_iso_date_columns(conn) == 0
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def lease_expirations(_patch_db_paths):
+    """4156 rows in both RealPage (MM/DD/YYYY) and Yardi (ISO timestamp) formats."""
+    today = date.today()
+    rows = [
+        ("101", (today + timedelta(days=10)).strftime("%m/%d/%Y")),
+        ("102", (today + timedelta(days=20)).isoformat() + "T00:00:00"),
+        ("103", (today + timedelta(days=200)).strftime("%m/%d/%Y")),
+    ]
+    conn = sqlite3.connect(schema.UNIFIED_DB_PATH)
+    try:
+        conn.executemany("""
+            INSERT INTO unified_lease_expirations
+                (unified_property_id, pms_source, unit_number, lease_end_date, decision, actual_rent, report_date)
+            VALUES (?, 'realpage', ?, ?, 'Unknown', 1400, '2026-02-14')
+        """, [(ISO_PROP, unit, end) for unit, end in rows])
+        backfill_iso_dates(conn, ["unified_lease_expirations"])
+        conn.commit()
+        yield rows
+    finally:
+        conn.execute("DELETE FROM unified_lease_expirations WHERE unified_property_id = ?", (ISO_PROP,))
+        conn.commit()
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_expiration_details_filter_on_iso_column(client, lease_expirations):
+    resp = await client.get(f"/api/v2/properties/{ISO_PROP}/expirations/details", params={"days": 90})
+    assert resp.status_code == 200
+    leases = resp.json()["leases"]
+    assert [l["unit"] for l in leases] == ["101", "102"]
+    # Raw text is still what the API displays
+    assert leases[0]["lease_end"] == lease_expirations[0][1]
+
+
+def test_occupancy_reconstruction_prefers_iso_fields():
+    service = OccupancyService()
+    residents = [
+        # Synced rows: ISO siblings present
+        {"unit": "1", "move_in_date": "01/15/2025", "move_in_date_iso": "2025-01-15",
+         "move_out_date": "", "move_out_date_iso": None},
+        {"unit": "2", "move_in_date": "03/01/2025", "move_in_date_iso": "2025-03-01",
+         "move_out_date": "06/30/2025", "move_out_date_iso": "2025-06-30"},
+        # Pre-ISO row: parsed from the raw text
+        {"unit": "3", "move_in_date": "02/01/2025", "move_out_date": ""},
+    ]
+    assert service._calculate_occupied_at_date(residents, date(2025, 4, 1)) == 3
+    assert service._calculate_occupied_at_date(residents, date(2025, 7, 1)) == 2
+    assert service._count_moves_in_period(residents, "move_in_date", date(2025, 1, 1), date(2025, 2, 1)) == 2
+    assert service._count_moves_in_period(residents, "move_out_date", date(2025, 6, 1), date(2025, 6, 30)) == 1
+
+
+def test_writer_adds_iso_siblings_and_backfill_fills_only_gaps():
+    from app.db.incremental_sync import UnifiedTableWriter
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE unified_leases (
+            id INTEGER PRIMARY KEY, unified_property_id TEXT, pms_source TEXT,
+            unit_number TEXT, lease_start TEXT, lease_end TEXT, move_in_date TEXT, move_out_date TEXT
+        )
+    """)
+    writer = UnifiedTableWriter(conn, "unified_leases",
+                                ("unified_property_id", "pms_source", "unit_number", "lease_start", "lease_end"))
+    writer.add((ISO_PROP, "realpage", "101", "02/14/2026", "2027-02-13T00:00:00"))
+    writer.finish()
+    assert conn.execute("SELECT lease_start_iso, lease_end_iso FROM unified_leases").fetchone() == (
+        "2026-02-14", "2027-02-13")
+
+    # A row written without its siblings is filled; rows that have them are left alone
+    conn.execute("INSERT INTO unified_leases (unified_property_id, unit_number, lease_start) "
+                 "VALUES (?, '102', '03/01/2026')", (ISO_PROP,))
+    counts = backfill_iso_dates(conn, ["unified_leases"])
+    assert counts == {"unified_leases": 1}
+    assert conn.execute("SELECT lease_start_iso FROM unified_leases WHERE unit_number = '102'").fetchone() == (
+        "2026-03-01",)
+    assert backfill_iso_dates(conn, ["unified_leases"]) == {"unified_leases": 0}
+    conn.close()
+
+
+def test_startup_migrates_a_unified_db_without_iso_columns(tmp_path, monkeypatch):
+    """A unified.db synced before the ISO columns existed gets them before the read-only pool opens it."""
+    import app.main as main_module
+
+    path = tmp_path / "deployed.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE unified_leases (unified_property_id TEXT, lease_start TEXT, lease_end TEXT, "
+                 "move_in_date TEXT, move_out_date TEXT)")
+    conn.execute("INSERT INTO unified_leases VALUES ('p1', '01/01/2026', '12/31/2026', NULL, NULL)")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(main_module.unified_pool, "_path_getter", lambda: path)
+    main_module.migrate_unified_db()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT lease_start_iso, lease_end_iso FROM unified_leases").fetchone() == (
+        "2026-01-01", "2026-12-31")
+    conn.close()
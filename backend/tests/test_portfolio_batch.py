@@ -0,0 +1,131 @@
+"""Portfolio endpoints read all properties set-based, independent of portfolio size."""
+import sqlite3
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+import app.services.portfolio_service as portfolio_module
+from app.db import schema
+from app.models.unified import UnifiedResident, UnifiedUnit
+
+BATCH_PROPS = [f"batch_prop_{i:02d}" for i in range(30)]
+
+
+@pytest.fixture
+def many_properties(_patch_db_paths):
+    """30 extra properties with units, residents and an occupancy snapshot."""
+    conn = sqlite3.connect(schema.UNIFIED_DB_PATH)
+    try:
+        for n, pid in enumerate(BATCH_PROPS):
+            conn.execute("""
+                INSERT INTO unified_properties (unified_property_id, pms_source, pms_property_id, name)
+                VALUES (?, 'realpage', ?, ?)
+            """, (pid, pid, f"Batch {n}"))
+            for u in range(5):
+                occ = ("occupied", "occupied", "vacant_ready", "vacant_not_ready", "occupied")[u]
+                conn.execute("""
+                    INSERT INTO unified_units
+                        (unified_property_id, pms_source, pms_unit_id, unit_number, floorplan, bedrooms,
+                         bathrooms, square_feet, market_rent, status, occupancy_status, available_date,
+                         available_date_iso)
+                    VALUES (?, 'realpage', ?, ?, '2BR', 2, 2, 1000, 2000, ?, ?, '03/01/2026', '2026-03-01')
+                """, (pid, str(u), str(u), "vacant" if "vacant" in occ else "occupied", occ))
+                conn.execute("""
+                    INSERT INTO unified_residents
+                        (unified_property_id, pms_source, pms_resident_id, unit_number, first_name,
+                         status, notice_date, current_rent)
+                    VALUES (?, 'realpage', ?, ?, NULL, 'Current', ?, NULL)
+                """, (pid, f"r{u}", str(u), "02/01/2026" if u == 0 else None))
+            conn.execute("""
+                INSERT INTO unified_occupancy_metrics
+                    (unified_property_id, snapshot_date, total_units, occupied_units, vacant_units,
+                     leased_units, physical_occupancy, leased_percentage)
+                VALUES (?, '2026-02-14', 5, 3, 2, 3, 60.0, 60.0)
+            """, (pid,))
+        conn.commit()
+        yield BATCH_PROPS
+    finally:
+        for table in ("unified_properties", "unified_units", "unified_residents", "unified_occupancy_metrics"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE unified_property_id IN ({','.join('?' * len(BATCH_PROPS))})",
+                BATCH_PROPS,
+            )
+        conn.commit()
+        conn.close()
+
+
+@pytest.fixture
+def checkouts(monkeypatch):
+    """Count unified.db connection checkouts made by the portfolio service."""
+    calls = []
+    real = portfolio_module.get_unified_connection
+
+    def _counting():
+        calls.append(1)
+        return real()
+
+    monkeypatch.setattr(portfolio_module, "get_unified_connection", _counting)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_query_count_flat_in_portfolio_size(client, many_properties, checkouts):
+    for endpoint in ("summary", "units", "residents", "occupancy", "pricing"):
+        checkouts.clear()
+        await client.get(f"/api/portfolio/{endpoint}", params={"property_ids": many_properties[0]})
+        one = len(checkouts)
+
+        checkouts.clear()
+        resp = await client.get(f"/api/portfolio/{endpoint}", params={"property_ids": ",".join(many_properties)})
+        assert resp.status_code == 200
+        assert len(checkouts) == one, endpoint
+
+
+@pytest.mark.asyncio
+async def test_lean_rows_match_response_models(client, many_properties):
+    ids = ",".join([TEST_PROPERTY_ID, *many_properties])
+    units = (await client.get("/api/portfolio/units", params={"property_ids": ids})).json()
+    assert len(units) == 10 + 5 * len(many_properties)
+    for unit in units:
+        assert UnifiedUnit(**unit).model_dump(mode="json") == unit
+
+    vacant = (await client.get("/api/portfolio/units", params={"property_ids": ids, "status": "vacant"})).json()
+    batch_vacant = [u for u in vacant if u["property_id"] == many_properties[0]]
+    assert [(u["ready_status"], u["available"]) for u in batch_vacant] == [("ready", True), ("not_ready", False)]
+    assert batch_vacant[0]["available_date"] == "2026-03-01"
+
+    residents = (await client.get("/api/portfolio/residents", params={"property_ids": ids})).json()
+    assert len(residents) == 8 + 5 * len(many_properties)
+    for res in residents:
+        assert UnifiedResident(**res).model_dump(mode="json") == res
+    first = next(r for r in residents if r["property_id"] == many_properties[0])
+    assert first["resident_id"] == "r0"
+    assert first["status"] == "Notice"  # Current + notice_date
+
+
+@pytest.mark.asyncio
+async def test_summary_rolls_up_all_properties(client, many_properties):
+    ids = ",".join([TEST_PROPERTY_ID, *many_properties])
+    data = (await client.get("/api/portfolio/summary", params={"property_ids": ids})).json()
+    assert data["total_unit_count"] == 10 + 5 * len(many_properties)
+    assert data["total_resident_count"] == 8 + 5 * len(many_properties)
+    assert data["property_names"][:2] == ["Test Property", "Batch 0"]
+    occ = data["occupancy"]
+    assert occ["total_units"] == 10 + 5 * len(many_properties)
+    assert occ["occupied_units"] == 8 + 3 * len(many_properties)
+    assert len(occ["property_breakdown"]) == 1 + len(many_properties)
+
+    row = (await client.get("/api/portfolio/occupancy", params={"property_ids": ids, "mode": "row_metrics"})).json()
+    assert row["total_units"] == row["occupied_units"] + row["vacant_units"]
+
+
+def test_batched_read_only_tolerates_missing_tables(_patch_db_paths):
+    service = portfolio_module.PortfolioService()
+    assert service._query_by_property(
+        "SELECT unified_property_id FROM unified_not_a_table WHERE unified_property_id IN ({ids})",
+        [TEST_PROPERTY_ID],
+    ) == {}
+    with pytest.raises(sqlite3.OperationalError):
+        service._query_by_property(
+            "SELECT not_a_column FROM unified_units WHERE unified_property_id IN ({ids})", [TEST_PROPERTY_ID],
+        )
@@ -0,0 +1,154 @@
+"""Cursor pagination, server-side filters and NDJSON streaming for portfolio drill-through."""
+import json
+import sqlite3
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db import schema
+
+PAGE_PROPS = [f"page_prop_{i:02d}" for i in range(12)]
+IDS = ",".join([TEST_PROPERTY_ID, *PAGE_PROPS])
+
+
+@pytest.fixture
+def paged_properties(_patch_db_paths):
+    """12 properties with 7 units (mixed floorplans/statuses) and 7 residents each."""
+    conn = sqlite3.connect(schema.UNIFIED_DB_PATH)
+    try:
+        for n, pid in enumerate(PAGE_PROPS):
+            conn.execute("""
+                INSERT INTO unified_properties (unified_property_id, pms_source, pms_property_id, name)
+                VALUES (?, 'realpage', ?, ?)
+            """, (pid, pid, f"Page {n}"))
+            for u in range(7):
+                conn.execute("""
+                    INSERT INTO unified_units
+                        (unified_property_id, pms_source, pms_unit_id, unit_number, floorplan, status,
+                         occupancy_status)
+                    VALUES (?, 'realpage', ?, ?, ?, ?, ?)
+                """, (pid, str(u), str(u), "A1" if u % 2 else "B2",
+                      "occupied" if u < 5 else "", "" if u < 5 else "vacant_ready"))
+                conn.execute("""
+                    INSERT INTO unified_residents
+                        (unified_property_id, pms_source, pms_resident_id, unit_number, status, notice_date)
+                    VALUES (?, 'realpage', ?, ?, ?, ?)
+                """, (pid, f"{pid}-{u}", str(u), "Current" if u < 6 else "Past",
+                      "03/01/2026" if u == 0 else None))
+        conn.commit()
+        yield PAGE_PROPS
+    finally:
+        for table in ("unified_properties", "unified_units", "unified_residents"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE unified_property_id IN ({','.join('?' * len(PAGE_PROPS))})",
+                PAGE_PROPS,
+            )
+        conn.commit()
+        conn.close()
+
+
+async def _walk(client, endpoint, limit, **params):
+    rows, cursor, pages = [], None, 0
+    while True:
+        query = {"property_ids": IDS, "limit": limit, **params}
+        if cursor:
+            query["cursor"] = cursor
+        resp = await client.get(f"/api/portfolio/{endpoint}", params=query)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page) <= limit
+        rows.extend(page)
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            return rows, pages
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_row_once(client, paged_properties):
+    full = (await client.get("/api/portfolio/units", params={"property_ids": IDS})).json()
+    assert len(full) == 10 + 7 * len(paged_properties)
+
+    rows, pages = await _walk(client, "units", 13)
+    assert pages == -(-len(full) // 13)
+    key = lambda u: (u["property_id"], u["unit_number"])
+    assert sorted(map(key, rows)) == sorted(map(key, full))
+    assert len(set(map(key, rows))) == len(rows)
+
+    residents, _ = await _walk(client, "residents", 25)
+    assert len({r["resident_id"] for r in residents}) == 8 + 7 * len(paged_properties)
+
+
+@pytest.mark.asyncio
+async def test_filters_run_server_side(client, paged_properties):
+    n = len(paged_properties)
+    vacant, _ = await _walk(client, "units", 5, status="vacant", floorplan="A1")
+    # Unit 5 is the only vacant A1 unit per page_prop
+    assert [(u["unit_number"], u["status"]) for u in vacant if u["property_id"] in paged_properties] == [("5", "vacant")] * n
+
+    full = (await client.get("/api/portfolio/units", params={"property_ids": IDS, "status": "VACANT"})).json()
+    assert all(u["status"] == "vacant" for u in full)
+
+    notice = (await client.get("/api/portfolio/residents", params={"property_ids": IDS, "status": "notice"})).json()
+    assert {r["resident_id"] for r in notice} == {f"{pid}-0" for pid in paged_properties}
+    current = (await client.get("/api/portfolio/residents", params={"property_ids": IDS, "status": "Current"})).json()
+    assert all(r["status"].lower() == "current" for r in current)
+    assert len([r for r in current if r["property_id"] in paged_properties]) == 5 * n
+
+    b2 = (await client.get("/api/portfolio/residents", params={
+        "property_ids": ",".join(paged_properties), "floorplan": "B2",
+    })).json()
+    assert sorted({r["unit_number"] for r in b2}) == ["0", "2", "4", "6"]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream(client, paged_properties):
+    resp = await client.get("/api/portfolio/units", params={"property_ids": IDS, "format": "ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    full = (await client.get("/api/portfolio/units", params={"property_ids": IDS})).json()
+    assert sorted(rows, key=lambda u: (u["property_id"], u["unit_number"])) == \
+        sorted(full, key=lambda u: (u["property_id"], u["unit_number"]))
+
+    # Streaming resumes after a page cursor
+    first = await client.get("/api/portfolio/units", params={"property_ids": IDS, "limit": 20})
+    rest = await client.get("/api/portfolio/units", params={
+        "property_ids": IDS, "format": "ndjson", "cursor": first.headers["x-next-cursor"],
+    })
+    assert len(first.json()) + len(rest.text.splitlines()) == len(full)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(client, paged_properties):
+    for cursor in ("not-a-cursor", "cjoxMg"):  # garbage; a residents cursor on /units
+        resp = await client.get("/api/portfolio/units", params={"property_ids": IDS, "cursor": cursor})
+        assert resp.status_code == 400
+    resp = await client.get("/api/portfolio/units", params={"property_ids": IDS, "limit": 0})
+    assert resp.status_code == 422
+
+
+def test_drill_through_surfaces_database_errors(_patch_db_paths, monkeypatch):
+    """Only a missing table reads as an empty list; other errors must not end paging silently."""
+    from app.models.unified import PMSConfig, PMSSource
+    from app.services.portfolio_service import PortfolioService
+
+    service = PortfolioService()
+    configs = [PMSConfig(pms_type=PMSSource.REALPAGE, property_id=TEST_PROPERTY_ID)]
+    real_query = service._drill_through_query
+
+    def _query(bad_sql):
+        def _build(*args):
+            sql, params = real_query(*args)
+            return sql.replace("FROM unified_units", bad_sql), params
+        return _build
+
+    monkeypatch.setattr(service, "_drill_through_query", _query("FROM unified_units_gone"))
+    assert service.get_drill_through_page("units", configs) == ([], None)
+    assert service.get_all_units(configs) == []
+
+    monkeypatch.setattr(service, "_drill_through_query", _query("FROM unified_units WHERE no_such_column = 1 AND"))
+    with pytest.raises(sqlite3.OperationalError):
+        service.get_drill_through_page("units", configs)
+    with pytest.raises(sqlite3.OperationalError):
+        service.get_all_units(configs)
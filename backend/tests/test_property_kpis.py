@@ -0,0 +1,85 @@
+"""Test the unified_property_kpis materialization and its readers."""
+import sqlite3
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db import schema
+from app.db.property_kpis import (
+    KPI_TABLE, METRIC_COLUMNS, compute_property_kpis, load_property_kpis, write_property_kpis,
+)
+from app.services.watchpoint_service import AVAILABLE_METRICS
+
+
+@pytest.fixture
+def materialized(_patch_db_paths):
+    """Materialize KPIs into the test unified.db; drop the table afterwards."""
+    conn = sqlite3.connect(schema.UNIFIED_DB_PATH)
+    try:
+        count = write_property_kpis(conn, snapshot_date="2026-02-14")
+        conn.commit()
+        yield conn, count
+    finally:
+        conn.execute(f"DROP TABLE IF EXISTS {KPI_TABLE}")
+        conn.commit()
+        conn.close()
+
+
+def test_kpi_table_covers_every_watchable_metric(materialized):
+    conn, count = materialized
+    assert count >= 1
+    columns = {r[1] for r in conn.execute(f"PRAGMA table_info({KPI_TABLE})").fetchall()}
+    assert set(AVAILABLE_METRICS) <= columns
+    assert set(METRIC_COLUMNS) == set(AVAILABLE_METRICS)
+
+
+def test_materialized_values_match_live_computation(materialized):
+    conn, _ = materialized
+    live = compute_property_kpis(conn, [TEST_PROPERTY_ID])[TEST_PROPERTY_ID]
+    stored = load_property_kpis([TEST_PROPERTY_ID])[TEST_PROPERTY_ID]
+    assert stored["snapshot_date"] == "2026-02-14"
+    for col in ("occupancy_pct", "vacant_units", "atr", "delinquent_total", "delinquent_units", "avg_rent"):
+        assert stored[col] == live[col], col
+    assert stored["vacant_units"] == 1
+    assert stored["delinquent_units"] == 1  # former residents excluded
+    assert stored["delinquent_total"] == 250.0
+
+
+def test_loader_falls_back_to_live_without_table(_patch_db_paths):
+    kpi = load_property_kpis([TEST_PROPERTY_ID])[TEST_PROPERTY_ID]
+    assert kpi["snapshot_date"] is None
+    assert kpi["vacant_units"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watchlist_reads_materialized_kpis(client, materialized):
+    conn, _ = materialized
+    conn.execute(
+        f"UPDATE {KPI_TABLE} SET delinquent_total = 99999 WHERE unified_property_id = ?",
+        (TEST_PROPERTY_ID,),
+    )
+    conn.commit()
+    resp = await client.get("/api/portfolio/watchlist")
+    assert resp.status_code == 200
+    prop = next(p for p in resp.json()["watchlist"] if p["id"] == TEST_PROPERTY_ID)
+    assert prop["delinquent_total"] == 99999
+    assert any(f["metric"] == "delinquency" for f in prop["flags"])
+
+
+def test_renewal_window_starts_at_snapshot_date():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(schema.UNIFIED_SCHEMA)
+    conn.execute("""
+        INSERT INTO unified_properties (unified_property_id, pms_source, pms_property_id, name)
+        VALUES ('p1', 'realpage', '1', 'P1')
+    """)
+    conn.executemany("""
+        INSERT INTO unified_lease_expirations
+            (unified_property_id, pms_source, unit_number, lease_end_date, lease_end_date_iso, decision, report_date)
+        VALUES ('p1', 'realpage', ?, ?, ?, ?, '2026-01-01')
+    """, [("1", "02/01/2026", "2026-02-01", "Renewed"), ("2", "03/01/2026", "2026-03-01", "Vacating")])
+
+    assert compute_property_kpis(conn, ["p1"], as_of="2026-01-15")["p1"]["renewal_rate"] == 50.0
+    assert compute_property_kpis(conn, ["p1"], as_of="2026-02-15")["p1"]["renewal_rate"] == 0.0
+    assert compute_property_kpis(conn, ["p1"], as_of="2026-06-01")["p1"]["renewal_rate"] is None
+    conn.close()
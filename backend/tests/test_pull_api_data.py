@@ -0,0 +1,97 @@
+"""Concurrent SOAP extraction: bounded fan-out, one shared HTTP client, single batched writer."""
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+import pull_all_api_data
+from app.db.schema import REALPAGE_SCHEMA
+
+SITES = {f"prop_{i}": {"site_id": f"900{i}", "name": f"Prop {i}"} for i in range(5)}
+
+
+class FakeClient:
+    """Stands in for RealPageClient; tracks in-flight requests and the HTTP client it was given."""
+    in_flight = 0
+    peak = 0
+    http_clients = set()
+
+    def __init__(self, url=None, pmcid=None, siteid=None, licensekey=None, http_client=None):
+        self.url, self.licensekey, self.siteid = "https://rpx.test", "key", siteid
+        FakeClient.http_clients.add(id(http_client))
+
+    async def _call(self, records):
+        FakeClient.in_flight += 1
+        FakeClient.peak = max(FakeClient.peak, FakeClient.in_flight)
+        await asyncio.sleep(0.01)
+        FakeClient.in_flight -= 1
+        return records
+
+    async def iter_units_raw(self, site_id):
+        for unit in await self._call([{"UnitID": f"{site_id}-{n}", "UnitNumber": str(n), "Bedrooms": "2"}
+                                      for n in range(3)]):
+            yield unit
+
+    async def iter_residents(self, site_id, status="all"):
+        for res in await self._call([{"resident_id": f"{site_id}-r1", "unit_number": "1", "status": "Current"}]):
+            yield res
+
+    async def iter_leases_raw(self, site_id):
+        yield {"lease_id": f"{site_id}-L0", "unit_id": f"{site_id}-0", "evict": "N"}
+        if site_id == "9003":
+            await self._call([])
+            raise RuntimeError("SOAP fault")  # Mid-stream: the partial batch is dropped
+        for lease in await self._call([{"lease_id": f"{site_id}-L1", "unit_id": f"{site_id}-1", "evict": "N"}]):
+            yield lease
+
+    async def iter_rentable_items(self, site_id):
+        for item in await self._call([]):
+            yield item
+
+
+@pytest.fixture
+def raw_db(tmp_path, monkeypatch):
+    path = tmp_path / "raw.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(REALPAGE_SCHEMA)
+    # Stale API rows for a site are replaced, other sites' rows are kept
+    conn.execute("INSERT INTO realpage_leases (pmc_id, site_id, lease_id) VALUES ('p', '9003', 'stale')")
+    conn.execute("INSERT INTO realpage_leases (pmc_id, site_id, lease_id) VALUES ('p', '1234', 'other')")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(pull_all_api_data, "REALPAGE_DB_PATH", path)
+    monkeypatch.setattr(pull_all_api_data, "KAIROI_PROPERTIES", SITES)
+    monkeypatch.setattr(pull_all_api_data, "RealPageClient", FakeClient)
+    FakeClient.in_flight = FakeClient.peak = 0
+    FakeClient.http_clients = set()
+    return path
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pull_writes_every_site(raw_db):
+    totals = await pull_all_api_data.pull_all_properties(concurrency=3)
+
+    assert totals == {"units": 15, "residents": 5, "leases": 8, "rentable_items": 0}
+    assert 1 < FakeClient.peak <= 3
+    assert len(FakeClient.http_clients) == 1
+
+    conn = sqlite3.connect(raw_db)
+    assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT site_id) FROM realpage_units").fetchone() == (15, 5)
+    assert conn.execute("SELECT bedrooms FROM realpage_units LIMIT 1").fetchone() == (2,)
+    leases = {r[0] for r in conn.execute("SELECT lease_id FROM realpage_leases")}
+    conn.close()
+    # The failed site's leases are cleared, as the sequential pull did
+    assert leases == {f"900{i}-L{n}" for i in range(5) if i != 3 for n in (0, 1)} | {"other"}
+
+
+@pytest.mark.asyncio
+async def test_stats_file_records_each_property(raw_db, tmp_path):
+    stats_file = tmp_path / "api.json"
+    await pull_all_api_data.pull_all_properties(concurrency=3, stats_file=stats_file)
+
+    stats = json.loads(stats_file.read_text())
+    assert sorted(stats) == sorted(SITES)
+    # The site whose lease stream failed is reported, the others succeed
+    assert [p for p, r in stats.items() if not r["success"]] == ["prop_3"]
@@ -0,0 +1,82 @@
+"""refresh_all.py dependency-graph scheduler: concurrency, locks and the critical path."""
+import json
+import time
+from pathlib import Path
+
+import refresh_all
+
+
+def _fake_step(key, seconds, calls):
+    def _run():
+        calls.append((key, "start", time.time()))
+        time.sleep(seconds)
+        calls.append((key, "end", time.time()))
+        return {"success": key != "reviews", "duration": seconds, "output": ""}
+    return _run
+
+
+def test_independent_steps_overlap_and_locks_serialize(monkeypatch):
+    calls = []
+    durations = {"api": 0.2, "reports": 0.3, "sync": 0.1, "risk": 0.05, "reviews": 0.05}
+    monkeypatch.setattr(refresh_all, "STEP_FNS", {k: _fake_step(k, s, calls) for k, s in durations.items()})
+
+    t0 = time.time()
+    results = refresh_all.run_graph(list(durations))
+    elapsed = time.time() - t0
+
+    # risk and reviews run alongside the pulls; sync waits for both pulls
+    assert elapsed < sum(durations.values()) - 0.05
+    at = {(k, ev): t for k, ev, t in calls}
+    assert at[("sync", "start")] >= max(at[("api", "end")], at[("reports", "end")])
+    assert at[("risk", "start")] - t0 < 0.1
+    assert at[("reviews", "start")] - t0 < 0.1
+    # Steps writing the same SQLite file never overlap: api/reports (realpage_raw.db), sync/risk (unified.db)
+    for a, b in (("api", "reports"), ("sync", "risk")):
+        assert at[(a, "start")] >= at[(b, "end")] or at[(b, "start")] >= at[(a, "end")]
+    # A failed step does not block anything
+    assert not results["reviews"]["success"]
+
+    assert refresh_all.critical_path(results) == ["api", "reports", "sync"]
+
+
+def test_skipped_dependencies_are_satisfied(monkeypatch):
+    calls = []
+    monkeypatch.setattr(refresh_all, "STEP_FNS", {"sync": _fake_step("sync", 0, calls)})
+    results = refresh_all.run_graph(["sync"])
+    assert results["sync"]["waited_on"] is None
+    assert refresh_all.critical_path(results) == ["sync"]
+
+
+def test_api_step_runs_one_pull_and_reports_properties(monkeypatch, tmp_path):
+    cmds = []
+
+    def _run_step(label, cmd, cwd=None, timeout=600):
+        cmds.append(cmd)
+        stats_file = Path(cmd[cmd.index("--stats-file") + 1])
+        stats_file.parent.mkdir(parents=True, exist_ok=True)
+        stats_file.write_text(json.dumps({"p0": {"success": True, "duration": 1.0},
+                                          "p1": {"success": False, "duration": 0.5}}))
+        return {"success": True, "duration": 1.0, "output": ""}
+
+    monkeypatch.setattr(refresh_all, "run_step", _run_step)
+    monkeypatch.setattr(refresh_all, "RUN_REPORT_DIR", tmp_path)
+    monkeypatch.setattr(refresh_all, "_TARGET_IDS", [])
+    monkeypatch.setattr(refresh_all, "_CONCURRENCY", 12)
+    result = refresh_all.step_api()
+
+    # A single pull process for every property, with no sync of its own
+    assert len(cmds) == 1
+    assert "--only" not in cmds[0]
+    assert "--skip-sync" in cmds[0]
+    assert cmds[0][cmds[0].index("--concurrency") + 1] == "12"
+    assert sorted(result["subtasks"]) == ["p0", "p1"]
+    assert not result["success"]
+    assert "failed: p1" in result["output"]
+
+
+def test_reports_step_leaves_unified_sync_to_sync_step(monkeypatch):
+    cmds = []
+    monkeypatch.setattr(refresh_all, "run_step", lambda label, cmd, cwd=None, timeout=600: cmds.append(cmd) or {
+        "success": True, "duration": 0, "output": ""})
+    refresh_all.step_reports()
+    assert "--skip-sync" in cmds[0]
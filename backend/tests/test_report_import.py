@@ -0,0 +1,140 @@
+"""Report import: parsed from memory in worker processes, unchanged content skipped by hash."""
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import download_reports_v2
+import report_archive
+import report_parsers
+from import_reports import init_report_tables
+from report_parsers import parse_report
+
+BACKEND = Path(__file__).resolve().parents[1]
+SAMPLE = BACKEND / "sample_monthly_transaction_summary.xls"
+
+
+def test_parse_from_bytes_matches_file_and_reads_once(monkeypatch):
+    from_file = parse_report(str(SAMPLE), file_id="F1")
+
+    reads = []
+    real_read_workbook = report_parsers.read_workbook
+    monkeypatch.setattr(report_parsers, "read_workbook", lambda *a, **kw: reads.append(kw) or real_read_workbook(*a, **kw))
+    monkeypatch.setattr(pd, "read_excel", lambda *a, **kw: pytest.fail("workbooks are no longer read into DataFrames"))
+    from_bytes = parse_report(SAMPLE.read_bytes(), file_id="F1")
+
+    assert from_bytes["report_type"] == from_file["report_type"] == "monthly_transaction_summary"
+    assert from_bytes["records"] == from_file["records"] and from_bytes["records"]
+    assert from_bytes["file_path"] is None
+    assert len(reads) == 1
+
+
+def test_import_downloaded_parses_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_reports_v2, "DB_PATH", tmp_path / "raw.db")
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.chdir(tmp_path)
+    content = SAMPLE.read_bytes()
+    downloads = [
+        {"prop_id": pid, "prop_name": f"Prop {pid}", "report_type": "monthly_transaction_summary",
+         "report_def": {}, "file_id": f"F{pid}", "content": content}
+        for pid in ("111", "222")
+    ] + [{"prop_id": "333", "prop_name": "Prop 333", "report_type": "box_score", "report_def": {},
+          "file_id": "F333", "content": b"not a workbook"}]
+
+    total, results = download_reports_v2.import_downloaded(downloads, parse_workers=2)
+
+    assert set(results) == {"Prop 111", "Prop 222"}
+    assert total == 2 * results["Prop 111"]["monthly_transaction_summary"] > 0
+    conn = sqlite3.connect(tmp_path / "raw.db")
+    assert {r[0] for r in conn.execute("SELECT DISTINCT property_id FROM realpage_monthly_transaction_detail")} == {"111", "222"}
+    conn.close()
+    # Nothing is written next to the script any more
+    assert not list(BACKEND.glob("temp_F*")) and not list(tmp_path.glob("temp_*"))
+
+
+def test_unchanged_downloads_are_skipped_until_the_content_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_reports_v2, "DB_PATH", tmp_path / "raw.db")
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", tmp_path / "archive")
+    content = SAMPLE.read_bytes()
+    changed = content + b"\0"  # Same records, different bytes
+
+    def run(body):
+        downloads = [{"prop_id": "111", "prop_name": "Prop 111", "report_type": "monthly_transaction_summary",
+                      "report_def": {}, "file_id": f"F{len(body)}", "content": body}]
+        total, _ = download_reports_v2.import_downloaded(downloads, parse_workers=1)
+        return total, downloads[0]
+
+    first, dl = run(content)
+    assert first > 0 and "unchanged" not in dl
+    assert report_archive.load_archived(dl["content_sha256"]) == content
+
+    again, dl = run(content)
+    assert again == 0 and dl["unchanged"]["records"] == first
+    assert download_reports_v2.avoided_work([dl]) == {"reports": 1, "bytes": len(content), "records": first}
+
+    # A -> B -> A: A is no longer what the tables hold, so it is imported again
+    assert run(changed)[0] == first
+    assert run(content)[0] == first
+
+    conn = sqlite3.connect(tmp_path / "raw.db")
+    logged = conn.execute("SELECT content_sha256, status FROM realpage_report_import_log ORDER BY id").fetchall()
+    conn.close()
+    sha_a, sha_b = report_archive.content_hash(content), report_archive.content_hash(changed)
+    assert logged == [(sha_a, "success"), (sha_b, "success"), (sha_a, "success")]
+
+
+def test_import_log_gains_the_hash_column(tmp_path):
+    conn = sqlite3.connect(tmp_path / "raw.db")
+    conn.execute("CREATE TABLE realpage_report_import_log (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                 " property_id TEXT NOT NULL, report_type TEXT NOT NULL, file_id TEXT, records_imported INTEGER,"
+                 " status TEXT)")
+    conn.execute("INSERT INTO realpage_report_import_log (property_id, report_type, file_id, status)"
+                 " VALUES ('111', 'box_score', 'F1', 'success')")
+    init_report_tables(conn)
+
+    assert "content_sha256" in {r[1] for r in conn.execute("PRAGMA table_info(realpage_report_import_log)")}
+    # Imports logged before hashing never match
+    assert report_archive.latest_imports(conn) == {}
+    conn.close()
+
+
+def test_import_reports_reimports_content_that_was_replaced(tmp_path, monkeypatch):
+    """A -> B -> A in one directory run: the last A is imported, not skipped as unchanged."""
+    import import_reports
+
+    monkeypatch.setattr(report_archive, "ARCHIVE_DIR", tmp_path / "archive")
+    content = SAMPLE.read_bytes()
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for file_id, body in ((1000001, content), (1000002, content + b"\0"), (1000003, content)):
+        (reports / f"Summary_{file_id}.xlsx").write_bytes(body)
+
+    stats = import_reports.import_reports(str(reports), str(tmp_path / "raw.db"))
+    assert stats["unchanged"] == 0
+
+    conn = sqlite3.connect(tmp_path / "raw.db")
+    assert [r[0] for r in conn.execute(
+        "SELECT file_id FROM realpage_report_import_log WHERE status = 'success' ORDER BY id")] == [
+        "1000001", "1000002", "1000003"]
+    conn.close()
+
+
+def test_prune_archive_keeps_latest_imports(tmp_path):
+    import os
+
+    conn = sqlite3.connect(tmp_path / "raw.db")
+    init_report_tables(conn)
+    archive = tmp_path / "archive"
+    old, current, recent = (report_archive.archive_report(b, archive) for b in (b"old", b"current", b"recent"))
+    conn.execute("INSERT INTO realpage_report_import_log (property_id, report_type, file_id, status, content_sha256)"
+                 " VALUES ('111', 'box_score', 'F1', 'success', ?)", (current,))
+    stale = 1_000_000
+    for sha in (old, current):
+        os.utime(report_archive.archive_path(sha, archive), (stale, stale))
+
+    assert report_archive.prune_archive(conn, archive_dir=archive) == 1
+    assert report_archive.load_archived(old, archive) is None
+    assert report_archive.load_archived(current, archive) == b"current"
+    assert report_archive.load_archived(recent, archive) == b"recent"
+    conn.close()
@@ -0,0 +1,201 @@
+"""Pipelined report jobs: phases overlap, date-rejected box scores are re-created, polling and throttling adapt."""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
+
+from report_pipeline import AdaptiveThrottle, InstancePoller, ReportPipeline
+
+
+def _items(n, report_type="rent_roll"):
+    return [{"prop_id": str(i), "prop_name": f"Prop {i}", "report_type": report_type, "timeframe_tag": None}
+            for i in range(n)]
+
+
+class FakeReportingApi:
+    """Instances become ready a fixed time after creation; box score 'fails' until offset 2."""
+
+    def __init__(self, ready_after=0.05, create_delay=0.02):
+        self.ready_after = ready_after
+        self.create_delay = create_delay
+        self.created = {}
+        self.events = []
+        self.writer_threads = set()
+        self.lock = threading.Lock()
+
+    def create(self, item, date_offset):
+        time.sleep(self.create_delay)
+        if item["prop_id"] == "bad":
+            return None
+        iid = f"{item['prop_id']}-{date_offset}"
+        with self.lock:
+            self.created[iid] = (time.monotonic(), date_offset)
+            self.events.append(("created", iid, time.monotonic()))
+        return iid
+
+    def scan(self, pending_ids, since):
+        now = time.monotonic()
+        return {iid: f"F{iid}" for iid in pending_ids if now - self.created[iid][0] >= self.ready_after}
+
+    def download(self, item):
+        self.events.append(("downloaded", item["instance_id"], time.monotonic()))
+        return b"offset=%d" % self.created[item["instance_id"]][1]
+
+    def check(self, item, content):
+        return item["report_type"] != "box_score" or content == b"offset=2"
+
+    def import_item(self, item):
+        self.writer_threads.add(threading.get_ident())
+        return 10
+
+
+def test_downloads_start_while_creates_are_still_running():
+    api = FakeReportingApi()
+    items = _items(12)
+    run = ReportPipeline(api.create, api.scan, api.download, api.import_item, check=api.check,
+                         create_workers=1, poll_interval=0.01).run(items)
+
+    assert run["stats"]["created"] == run["stats"]["imported"] == 12
+    last_created = max(t for ev, _, t in api.events if ev == "created")
+    first_downloaded = min(t for ev, _, t in api.events if ev == "downloaded")
+    assert first_downloaded < last_created
+    assert run["timings"]["first_imported"] < run["timings"]["finished"]
+    assert all(item["imported"] == 10 and item["file_id"] for item in items)
+    assert len(api.writer_threads) == 1
+
+
+def test_parse_stage_results_reach_the_writer():
+    api = FakeReportingApi(ready_after=0)
+    seen = []
+
+    def _import(item):
+        seen.append(item["parsed"])
+        return len(item["parsed"]["records"])
+
+    def _parse(item):
+        if item["prop_id"] == "1":
+            raise ValueError("corrupt workbook")
+        return {"report_type": item["report_type"], "records": [item["content"]]}
+
+    with ThreadPoolExecutor(max_workers=2) as parsers:
+        run = ReportPipeline(api.create, api.scan, api.download, _import, poll_interval=0.01,
+                             parse=lambda item: parsers.submit(_parse, item)).run(_items(3))
+
+    assert run["stats"]["parsed"] == 2 and run["stats"]["imported"] == 3
+    assert sorted(len(p["records"]) for p in seen) == [0, 1, 1]
+    assert any(p.get("error") == "corrupt workbook" for p in seen)
+
+
+def test_box_score_date_errors_are_recreated_further_back():
+    api = FakeReportingApi(ready_after=0)
+    items = _items(2, "box_score") + [{"prop_id": "bad", "prop_name": "Bad", "report_type": "rent_roll"}]
+    run = ReportPipeline(api.create, api.scan, api.download, api.import_item, check=api.check,
+                         poll_interval=0.01, max_create_offset=3, max_retry_offset=7).run(items)
+
+    stats = run["stats"]
+    assert stats["recreated"] == 4 and stats["imported"] == 2
+    assert [i["date_offset"] for i in items[:2]] == [2, 2]
+    assert items[0]["content"] == b"offset=2"
+    # A create rejected at every date offset fails without blocking the rest
+    assert stats["create_failed"] == 1 and items[2].get("instance_id") is None
+
+
+def test_instances_that_never_become_ready_time_out():
+    api = FakeReportingApi(ready_after=60)
+    run = ReportPipeline(api.create, api.scan, api.download, api.import_item,
+                         poll_interval=0.01, poll_timeout=0.05).run(_items(3))
+    assert run["stats"]["timed_out"] == 3
+    assert run["stats"]["downloaded"] == 0
+
+
+def test_throttle_backs_off_on_429_and_recovers():
+    throttle = AdaptiveThrottle("test", initial_delay=0.01, min_delay=0.01, max_retries=2)
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200)])
+
+    start = time.monotonic()
+    resp = throttle.request(lambda: next(responses))
+    assert resp.status_code == 200
+    assert throttle.throttled == 1 and throttle.requests == 2
+    assert time.monotonic() - start >= 0.9  # Waited out the backoff before retrying
+
+    backed_off = throttle.delay
+    for _ in range(20):
+        throttle.record(200, latency=0.01)
+    assert throttle.delay < backed_off / 2
+    throttle.record(200, latency=10)
+    assert throttle.delay > throttle.min_delay
+
+
+class FakeInstanceListing:
+    """/my/report-instances: newest first, filtered by startDate, paged."""
+
+    def __init__(self, old_items=1000):
+        # Other users' / earlier runs' instances from the same day
+        self.items = [{"sourceReportInstanceId": f"old{i}", "createdDate": f"2026-01-01T08:{i // 60:02d}:{i % 60:02d}",
+                       "status": 3, "reportFileId": f"Fold{i}"} for i in range(old_items)]
+        self.requests = []
+
+    def add(self, iid, created):
+        self.items.append({"sourceReportInstanceId": iid, "createdDate": created, "status": 1, "reportFileId": ""})
+
+    def finish(self, iid):
+        item = next(i for i in self.items if i["sourceReportInstanceId"] == iid)
+        item.update(status=3, reportFileId=f"F{iid}")
+
+    def fetch_page(self, start_date, page, page_size):
+        self.requests.append((start_date, page))
+        rows = sorted((i for i in self.items if i["createdDate"] >= start_date),
+                      key=lambda i: i["createdDate"], reverse=True)
+        chunk = rows[(page - 1) * page_size:page * page_size]
+        return [dict(i) for i in chunk], len(rows), 100 * len(chunk)
+
+
+def test_poller_stops_early_and_moves_its_cursor_past_resolved_instances():
+    listing = FakeInstanceListing()
+    watch = set()
+    for n in range(30):
+        iid = f"run{n}"
+        listing.add(iid, f"2026-01-01T10:00:{n:02d}")
+        watch.add(iid)
+
+    poller = InstancePoller(listing.fetch_page, since="2026-01-01T00:00:00", page_size=20)
+    assert poller.scan(watch) == {}
+    # Our 30 instances are the newest: two pages, not the 1000 older items
+    assert [p for _, p in listing.requests] == [1, 2]
+
+    for n in range(20):
+        listing.finish(f"run{n}")
+    ready = poller.scan(watch)
+    assert ready == {f"run{n}": f"Frun{n}" for n in range(20)}
+    watch -= set(ready)
+
+    listing.requests.clear()
+    assert poller.scan(watch) == {}
+    # Cursor = oldest still-pending instance: one short page
+    assert listing.requests == [("2026-01-01T10:00:20", 1)]
+    assert poller.traffic["polls"] == 3 and poller.traffic["items"] < 100
+
+
+def test_poll_interval_follows_outstanding_count():
+    poller = InstancePoller(lambda *a: None, since="", min_interval=3, max_interval=15, busy_pending=100)
+    assert poller.interval(0) == 3
+    assert poller.interval(50) == 9
+    assert poller.interval(500) == 15
+
+
+def test_unchanged_reports_skip_parse_and_import():
+    api = FakeReportingApi(ready_after=0)
+    parsed = []
+
+    def _parse(item):
+        parsed.append(item["prop_id"])
+        future = Future()
+        future.set_result({"records": []})
+        return future
+
+    run = ReportPipeline(api.create, api.scan, api.download, api.import_item, parse=_parse,
+                         unchanged=lambda item: item["prop_id"] != "0", poll_interval=0.01).run(_items(3))
+
+    assert run["stats"]["unchanged"] == 2
+    assert parsed == ["0"] and run["stats"]["imported"] == 1
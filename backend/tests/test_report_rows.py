@@ -0,0 +1,59 @@
+"""Row reader: same cell values as pd.read_excel(header=None), without building DataFrames."""
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from report_rows import isna, read_first_sheet, read_workbook
+
+BACKEND = Path(__file__).resolve().parents[1]
+SAMPLES = [BACKEND / "sample_monthly_transaction_summary.xls", BACKEND / "samples" / "mgmt_fee_3865.xls"]
+
+
+def _same(ours, theirs):
+    if isna(theirs):
+        return isna(ours) and (ours is pd.NaT) == (theirs is pd.NaT)
+    return ours == theirs and type(ours).__name__ == type(theirs).__name__.replace("int64", "int").replace("float64", "float")
+
+
+def _assert_matches_pandas(source, sheets):
+    frames = pd.read_excel(source, sheet_name=None, header=None)
+    assert list(sheets) == list(frames)
+    for name, df in frames.items():
+        sheet = sheets[name]
+        assert (sheet.nrows, sheet.ncols) == df.shape
+        for i in range(sheet.nrows):
+            for j, expected in enumerate(df.iloc[i].tolist()):
+                assert _same(sheet.cell(i, j), expected), (name, i, j, sheet.cell(i, j), expected)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda p: p.name)
+def test_xls_matches_read_excel(path):
+    _assert_matches_pandas(path, read_workbook(str(path)))
+    assert read_workbook(path.read_bytes()).keys() == read_workbook(str(path)).keys()
+
+
+def test_xlsx_column_typing_matches_read_excel(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Title", 1, 1.5, datetime(2026, 1, 2), True, " 3 ", "1,000", "N/A", None])
+    ws.append(["x", 2, None, None, False, "0103", 7, 4, None])
+    ws.append([None, 3, 2, datetime(2026, 2, 3), True, "-5", "y", "#DIV/0!"])
+    ws.append([])
+    path = tmp_path / "t.xlsx"
+    wb.save(path)
+
+    sheets = read_workbook(str(path))
+    _assert_matches_pandas(path, sheets)
+    sheet = sheets["Sheet"]
+    assert sheet.values(1) == ["x", 2, False, 103, 7, 4.0]
+    assert sheet.text(0) == "Title 1 1.5 2026-01-02 00:00:00 True 3 1,000"
+
+
+def test_first_sheet_and_unknown_content(tmp_path):
+    sheet = read_first_sheet(SAMPLES[0].read_bytes())
+    assert sheet.nrows and "MONTHLY TRANSACTION SUMMARY" in " ".join(sheet.text(i) for i in range(10)).upper()
+    with pytest.raises(ValueError):
+        read_workbook(b"<html><table></table></html>")
@@ -0,0 +1,86 @@
+"""Test the snapshot-versioned response cache on property endpoints."""
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db.pool import unified_pool
+from app.services.response_cache import response_cache, ResponseCache
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_hits_cache(client):
+    """Second identical request is served from the cache with the same body."""
+    response_cache.clear()
+    url = f"/api/v2/properties/{TEST_PROPERTY_ID}/delinquency"
+
+    first = await client.get(url)
+    second = await client.get(url)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+
+    stats = response_cache.stats()["endpoints"]["get_delinquency"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_params_are_part_of_key(client):
+    """Different query params are cached separately."""
+    response_cache.clear()
+    base = f"/api/v2/properties/{TEST_PROPERTY_ID}/shows"
+    await client.get(base, params={"days": 7})
+    await client.get(base, params={"days": 30})
+
+    stats = response_cache.stats()["endpoints"]["get_shows"]
+    assert stats["misses"] == 2
+    assert stats["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_generation_bump_misses(client):
+    """A DB upload (generation bump) retires previously cached responses."""
+    response_cache.clear()
+    url = f"/api/v2/properties/{TEST_PROPERTY_ID}/occupancy"
+    await client.get(url)
+
+    unified_pool.invalidate()
+    assert response_cache.purge_stale() == 1
+
+    await client.get(url)
+    stats = response_cache.stats()["endpoints"]["get_occupancy"]
+    assert stats["misses"] == 2
+    assert stats["hits"] == 0
+
+
+def test_lru_eviction_is_bounded(_patch_db_paths):
+    """The cache never holds more than max_entries."""
+    cache = ResponseCache(max_entries=2)
+    keys = [cache.make_key("ep", {"i": i}, None) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, i)
+
+    assert cache.get(keys[0]) == (False, None)
+    assert cache.get(keys[2]) == (True, 2)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_empty_results_expire_quickly(_patch_db_paths, monkeypatch):
+    """An empty result (possibly a swallowed read error) is only cached for EMPTY_TTL_S."""
+    from app.services import response_cache as cache_mod
+    response_cache.clear()
+    results = [[], {"periods": []}, ["row"]]
+
+    @cache_mod.cached_response
+    def get_rows(property_id: str):
+        return results.pop(0)
+
+    clock = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: clock[0])
+    assert get_rows("p1") == []
+    assert get_rows("p1") == []  # still within the TTL
+    clock[0] += cache_mod.EMPTY_TTL_S + 1
+    assert get_rows("p1") == {"periods": []}
+    clock[0] += cache_mod.EMPTY_TTL_S + 1
+    assert get_rows("p1") == ["row"]
+    clock[0] += 10 * cache_mod.EMPTY_TTL_S
+    assert get_rows("p1") == ["row"]  # non-empty results live for the whole generation
+    assert response_cache.stats()["endpoints"]["get_rows"] == {"hits": 2, "misses": 3, "hit_rate": 0.4}
@@ -0,0 +1,86 @@
+"""Streaming SOAP record parser: same records as the whole-envelope dict parsing, fed in chunks."""
+import httpx
+import pytest
+from xml.etree import ElementTree as ET
+
+from app.clients.realpage_client import RealPageClient, UNIT_PATHS
+from app.clients.soap_stream import element_to_dict, iter_soap_records
+
+
+def _envelope(records: str) -> str:
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body>
+    <unitlistResponse xmlns="http://tempuri.org/">
+      <unitlistResult>
+        <UnitList>{records}</UnitList>
+      </unitlistResult>
+    </unitlistResponse>
+  </s:Body>
+</s:Envelope>"""
+
+
+UNITS = "".join(
+    f"""<Unit Type="apt"><UnitID>{n}</UnitID><UnitNumber>{100 + n}</UnitNumber><Vacant>F</Vacant>
+          <Address><Line1>{n} Main St</Line1><City>Austin</City></Address>
+          <Amenity>Pool</Amenity><Amenity>Gym</Amenity><Notes/></Unit>"""
+    for n in range(5)
+)
+
+
+def _dict_parse_units(xml: str) -> list:
+    """The pre-streaming path: whole tree -> nested dicts -> walk to the unit list."""
+    body = element_to_dict(ET.fromstring(xml))["Body"]["unitlistResponse"]["unitlistResult"]
+    units = body["UnitList"]["Unit"]
+    return units if isinstance(units, list) else [units]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_streamed_records_match_dict_parsing(chunk_size):
+    xml = _envelope(UNITS).encode()
+    chunks = [xml[i:i + chunk_size] for i in range(0, len(xml), chunk_size)]
+
+    streamed = list(iter_soap_records(chunks, UNIT_PATHS))
+
+    assert streamed == _dict_parse_units(xml.decode())
+    assert streamed[0]["@attributes"] == {"Type": "apt"}
+    assert streamed[0]["Amenity"] == ["Pool", "Gym"]
+    assert streamed[0]["Address"] == {"Line1": "0 Main St", "City": "Austin"}
+
+
+def test_single_and_missing_records():
+    one = _envelope("<Unit><UnitID>7</UnitID></Unit>")
+    assert list(iter_soap_records(one, UNIT_PATHS)) == _dict_parse_units(one) == [{"UnitID": "7"}]
+    # Only direct children of the parent element match; other Unit elements are ignored
+    stray = _envelope("").replace("<UnitList></UnitList>", "<Other><Unit><UnitID>1</UnitID></Unit></Other>")
+    assert list(iter_soap_records(stray, UNIT_PATHS)) == []
+
+
+def test_nested_record_names_stay_inside_their_record():
+    xml = """<LeaseCharges>
+      <Resident><Code>t1</Code><Roommates><Residents><Resident><Code>r1</Code></Resident></Residents></Roommates></Resident>
+    </LeaseCharges>"""
+    records = list(iter_soap_records(xml, [("LeaseCharges", "Resident"), ("Residents", "Resident")]))
+    assert records == [{"Code": "t1", "Roommates": {"Residents": {"Resident": {"Code": "r1"}}}}]
+
+
+def test_malformed_response_raises():
+    with pytest.raises(ET.ParseError):
+        list(iter_soap_records(_envelope(UNITS)[:-40], UNIT_PATHS))
+
+
+@pytest.mark.asyncio
+async def test_realpage_client_streams_from_shared_http_client():
+    payload = _envelope(UNITS).encode()
+
+    def handler(request):
+        assert request.headers["SOAPAction"].endswith("/unitlist")
+        return httpx.Response(200, stream=httpx.ByteStream(payload))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = RealPageClient(url="https://rpx.test", pmcid="1", siteid="2", licensekey="k", http_client=http)
+        units = await client.get_units_raw("2")
+        mapped = await client.get_units("2")
+
+    assert units == _dict_parse_units(payload.decode())
+    assert [u["unit_number"] for u in mapped] == [str(100 + n) for n in range(5)]
@@ -0,0 +1,94 @@
+"""Test the SQLite side store for reviews, places and watchpoints."""
+import json
+import os
+import threading
+
+from app.db.state_store import StateStore
+
+
+def _store_with_source(tmp_path):
+    store = StateStore(lambda: tmp_path / "state.db")
+
+    def import_fn(conn, data):
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT INTO google_reviews (property_id, fetched_at, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(property_id) DO UPDATE SET fetched_at = excluded.fetched_at, data = excluded.data "
+            "WHERE data IS NOT excluded.data",
+            [(pid, entry["ts"], json.dumps(entry["data"])) for pid, entry in data.items()],
+        )
+        return conn.total_changes - before
+
+    store.register_json_source("reviews", lambda: tmp_path / "reviews.json", import_fn)
+    return store
+
+
+def test_json_imported_once_per_version(tmp_path):
+    """A file version is imported once; a new version upserts only the changed entries."""
+    store = _store_with_source(tmp_path)
+    path = tmp_path / "reviews.json"
+    path.write_text(json.dumps({"a": {"ts": 1, "data": {"r": 1}}, "b": {"ts": 1, "data": {"r": 2}}}))
+
+    assert store.sync_json("reviews") == 2
+    assert store.sync_json("reviews") == 0
+
+    path.write_text(json.dumps({"a": {"ts": 1, "data": {"r": 1}}, "b": {"ts": 2, "data": {"r": 3}}}))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert store.sync_json("reviews") == 1
+    assert store.stats()["json_imports"]["reviews"]["entries"] == 1
+
+    # Another process (fresh store) sees the recorded hash and skips the import
+    assert _store_with_source(tmp_path).sync_json("reviews") == 0
+
+
+def test_sync_file_matches_registered_path(tmp_path):
+    store = _store_with_source(tmp_path)
+    (tmp_path / "reviews.json").write_text("{}")
+    assert store.sync_file(tmp_path / "reviews.json") is True
+    assert store.sync_file(tmp_path / "other.json") is False
+
+
+def test_version_bumps_with_writes(tmp_path):
+    store = StateStore(lambda: tmp_path / "state.db")
+    assert store.version("google_places") == 0
+    with store.transaction() as conn:
+        store.bump_version(conn, "google_places")
+    assert store.version("google_places") == 1
+
+
+def test_concurrent_watchpoint_writers(_patch_db_paths):
+    """Writers on different threads no longer overwrite each other's changes."""
+    from app.services import watchpoint_service as svc
+
+    pid = "concurrency_prop"
+    threads = [
+        threading.Thread(target=svc.add_watchpoint, args=(pid, "atr", "gt", float(i)))
+        for i in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    wps = svc.get_watchpoints(pid)
+    assert sorted(w["threshold"] for w in wps) == [float(i) for i in range(8)]
+
+    toggled = svc.toggle_watchpoint(pid, wps[0]["id"])
+    assert toggled["enabled"] is False
+    assert svc.get_watchpoints(pid)[0]["enabled"] is False
+    for wp in wps:
+        assert svc.remove_watchpoint(pid, wp["id"]) is True
+    assert svc.get_watchpoints(pid) == []
+
+
+def test_reviews_entry_upsert_and_site_id_lookup(_patch_db_paths):
+    """Saving one property's reviews leaves the others alone; site IDs resolve to the mapped entry."""
+    from app.services import google_reviews_service as svc
+
+    svc._save_reviews_entry("parkside", {"rating": 4.5, "source": "test"})
+    svc._save_reviews_entry("other_prop", {"rating": 3.9, "source": "test"})
+    svc._save_reviews_entry("parkside", {"rating": 4.6, "source": "test"})
+
+    assert svc.get_cached_reviews_entry("5536211")["data"]["rating"] == 4.6
+    assert svc.get_cached_reviews_entries(["other_prop"])["other_prop"]["data"]["rating"] == 3.9
+    assert svc.get_cached_reviews_entry("no_such_property") is None
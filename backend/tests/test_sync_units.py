@@ -0,0 +1,111 @@
+"""Set-based sync_units_from_rent_roll: rent roll load plus the UPDATE ... FROM enrichments."""
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import app.db.sync_realpage_to_unified as sync_module
+from app.db.schema import REALPAGE_SCHEMA, UNIFIED_SCHEMA
+
+SITE_ID = "5481703"  # 7 East
+UNIFIED_ID = "7_east"
+
+
+@pytest.fixture
+def sync_dbs(tmp_path, monkeypatch):
+    """Small raw + unified databases wired into the sync module."""
+    raw_path, uni_path = tmp_path / "raw.db", tmp_path / "uni.db"
+    moved_out = (date.today() - timedelta(days=12)).strftime("%m/%d/%Y")
+    available = (date.today() + timedelta(days=5)).strftime("%m/%d/%Y")
+
+    raw = sqlite3.connect(raw_path)
+    raw.executescript(REALPAGE_SCHEMA)
+    raw.execute("""
+        CREATE TABLE realpage_lease_details (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, property_id TEXT NOT NULL, lease_id TEXT,
+            floorplan TEXT, occupancy_status TEXT, lease_start_date TEXT, move_out_date TEXT
+        )
+    """)
+    raw.executemany("""
+        INSERT INTO realpage_rent_roll
+            (property_id, report_date, unit_number, floorplan, sqft, market_rent, actual_rent, status)
+        VALUES (?, ?, ?, ?, 700, 1500, ?, ?)
+    """, [
+        (SITE_ID, "2026-01-01", "101", "A1", 1400, "Vacant"),   # superseded by the later report
+        (SITE_ID, "2026-02-01", "101", "A1", 1450, "Occupied"),
+        (SITE_ID, "2026-02-01", "102", "A1", 0, "Vacant-Leased"),
+        (SITE_ID, "2026-02-01", "103", "B2", 0, "Vacant"),
+        (SITE_ID, "2026-02-01", "104", "B2", 0, "Unit/Lease Status"),  # header junk
+        ("999", "2026-02-01", "101", "A1", 0, "Occupied"),  # unmapped property
+    ])
+    raw.executemany("""
+        INSERT INTO realpage_units
+            (pmc_id, site_id, unit_id, unit_number, vacant, available, available_date, market_rent)
+        VALUES ('p', ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (SITE_ID, "U1", "101", "F", "F", "", 1525.0),
+        (SITE_ID, "U2", "102", "T", "T", available, None),
+        (SITE_ID, "U3", "103", "T", "F", "", None),
+    ])
+    raw.execute("""
+        INSERT INTO realpage_floorplan_bedrooms (property_id, floorplan, bedrooms, bathrooms)
+        VALUES (?, 'A1', 1, 1.0)
+    """, (SITE_ID,))
+    raw.executemany("""
+        INSERT INTO realpage_leases (pmc_id, site_id, lease_id, unit_id, status_text, rent_amount)
+        VALUES ('p', ?, ?, ?, ?, ?)
+    """, [(SITE_ID, "L1", "U1", "Current", 1475.0), (SITE_ID, "L3", "U3", "Former", 1300.0)])
+    raw.execute("""
+        INSERT INTO realpage_residents (pmc_id, site_id, unit_number, lease_status, move_in_date)
+        VALUES ('p', ?, '102', 'Future', '03/01/2026')
+    """, (SITE_ID,))
+    raw.execute("""
+        INSERT INTO realpage_lease_details (property_id, lease_id, occupancy_status, move_out_date)
+        VALUES (?, 'L3', 'Former', ?)
+    """, (SITE_ID, moved_out))
+    raw.commit()
+    raw.close()
+
+    uni = sqlite3.connect(uni_path)
+    uni.executescript(UNIFIED_SCHEMA)
+    uni.close()
+
+    monkeypatch.setattr(sync_module, "REALPAGE_DB_PATH", raw_path)
+    monkeypatch.setattr(sync_module, "get_realpage_conn", lambda: sqlite3.connect(raw_path))
+    monkeypatch.setattr(sync_module, "get_unified_conn", lambda: sqlite3.connect(uni_path))
+    return uni_path
+
+
+def test_sync_units_bulk_enrichment(sync_dbs, capsys):
+    assert sync_module.sync_units_from_rent_roll() == 3
+
+    conn = sqlite3.connect(sync_dbs)
+    conn.row_factory = sqlite3.Row
+    units = {r["unit_number"]: dict(r) for r in conn.execute(
+        "SELECT * FROM unified_units WHERE unified_property_id = ?", (UNIFIED_ID,)
+    )}
+    conn.close()
+
+    assert sorted(units) == ["101", "102", "103"]
+    occupied, preleased, vacant = units["101"], units["102"], units["103"]
+
+    # Latest report wins; API market rent and lease rent override the rent roll
+    assert occupied["status"] == "occupied"
+    assert occupied["market_rent"] == 1525.0
+    assert occupied["in_place_rent"] == 1475.0
+    assert (occupied["bedrooms"], occupied["bathrooms"]) == (1, 1.0)
+    assert occupied["available_date"] is None
+
+    # Vacant-Leased: API availability, incoming lease_start from residents
+    assert (preleased["is_preleased"], preleased["occupancy_status"]) == (1, "vacant_ready")
+    assert preleased["lease_start"] == "03/01/2026"
+    assert preleased["days_vacant"] == 0  # available_date fallback, in the future
+
+    # Vacant: days_vacant through realpage_units -> leases -> lease_details
+    assert vacant["occupancy_status"] == "vacant_not_ready"
+    assert vacant["bedrooms"] is None
+    assert vacant["days_vacant"] == 12
+
+    out = capsys.readouterr().out
+    assert "API fields: 3 units" in out
+    assert "days_vacant from lease_details: 1 units" in out
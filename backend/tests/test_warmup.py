@@ -0,0 +1,58 @@
+"""Test the post-swap warmup of unified.db endpoints."""
+import re
+from pathlib import Path
+
+import pytest
+from tests.conftest import TEST_PROPERTY_ID
+
+from app.db.pool import unified_pool
+from app.services import warmup as warmup_mod
+from app.services.response_cache import response_cache
+
+SMOKE_TEST = Path(__file__).resolve().parents[1] / "smoke_test.py"
+
+
+def test_warmup_covers_smoke_test_endpoints():
+    """Every endpoint smoke_test.py requests is either warmed or deliberately skipped."""
+    source = SMOKE_TEST.read_text()
+    smoke = {
+        path.replace("{pid}", "{property_id}")
+        for path in re.findall(r'f"\{base\}(/api/[^"]+)"', source)
+    }
+    listed = set(warmup_mod.PORTFOLIO_ENDPOINTS + warmup_mod.PROPERTY_ENDPOINTS + warmup_mod.SKIPPED_ENDPOINTS)
+    assert smoke == listed
+
+
+@pytest.mark.asyncio
+async def test_warmup_fills_response_cache(_patch_property_config, monkeypatch):
+    """A warmup requests every property's endpoints per owner group and leaves them cached for its users."""
+    monkeypatch.setattr(warmup_mod, "owner_groups", lambda: ["test_group"])
+    response_cache.clear()
+    summary = await warmup_mod.Warmup().run(unified_pool.generation)
+
+    assert summary["status"] == "done"
+    assert summary["groups"] == 1
+    assert summary["properties"] >= 1
+    assert summary["requests"] == (
+        len(warmup_mod.PORTFOLIO_ENDPOINTS) + summary["properties"] * len(warmup_mod.PROPERTY_ENDPOINTS)
+    )
+    endpoints = response_cache.stats()["endpoints"]
+    assert endpoints["get_availability"]["misses"] >= 1
+
+    # The same request from a logged-in user of that group is now a hit
+    hits = endpoints["get_availability"]["hits"]
+    from httpx import ASGITransport, AsyncClient
+    from app.main import app
+    from app.services.auth_service import create_token
+    token = create_token({"username": "someone", "owner_group": "test_group", "display_name": "Someone"})
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get(f"/api/v2/properties/{TEST_PROPERTY_ID}/availability",
+                         headers={"Authorization": f"Bearer {token}"})
+    assert response_cache.stats()["endpoints"]["get_availability"]["hits"] == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_stops_when_superseded(_patch_property_config):
+    summary = await warmup_mod.Warmup().run(unified_pool.generation - 1)
+    assert summary["status"] == "superseded"
+    assert summary["requests"] == 0
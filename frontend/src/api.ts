@@ -647,6 +647,18 @@ export const api = {
     totals: { former: number; notice: number; total: number };
   }> => fetchJson(`${API_BASE}/properties/${propertyId}/move-out-reasons`),
 
+  // Several dashboard panels in one request (one snapshot load server-side)
+  getPropertyBundle: (propertyId: string, sections?: string[]): Promise<{
+    property_id: string;
+    sections: Record<string, unknown>;
+    errors: Record<string, string>;
+    timings_ms: Record<string, number>;
+    snapshot_rows: Record<string, number>;
+  }> => {
+    const q = sections && sections.length ? `?sections=${sections.join(',')}` : '';
+    return fetchJson(`${API_BASE}/properties/${propertyId}/bundle${q}`);
+  },
+
   // Portfolio-level AI Chat (Asset Manager perspective)
   sendPortfolioChatMessage: async (message: string, history: { role: string; content: string }[] = []): Promise<{ response: string; columns?: Array<{key: string; label: string}>; data?: Array<Record<string, unknown>>; actions?: Array<{label: string}> }> => {
     const response = await fetch(`${PORTFOLIO_BASE}/chat`, {